@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ActivityConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "activity"
+
+    def ready(self):
+        # connect signals recording project events
+        from . import signals  # noqa: F401
@@ -0,0 +1,117 @@
+import asyncio
+import contextvars
+import logging
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Max
+
+from .models import ProjectEvent
+
+
+logger = logging.getLogger(__name__)
+
+# max events read per poll, the poller loops at once when a page is full
+POLL_PAGE_SIZE = 500
+
+
+class Subscriber:
+    """An SSE connection waiting for the events of one project"""
+
+    def __init__(self, project_id: int, queue_size: int):
+        self.project_id = project_id
+        # bounded: a client reading slower than events are produced must not grow memory
+        self.queue: asyncio.Queue[ProjectEvent] = asyncio.Queue(queue_size)
+        # set when the queue overflowed: the connection is closed, the client reconnects with its Last-Event-ID
+        # and gets what it missed from the DB
+        self.overflowed = False
+
+    def push(self, event: ProjectEvent):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class ActivityHub:
+    """
+    In-process fan-out of project events to SSE connections, one per worker process.
+
+    Idle connections cost one coroutine and one small queue: a single poller task per process reads new
+    ProjectEvent rows (written by any worker) every ACTIVITY_POLL_SECONDS, whatever the number of connections,
+    and pushes them to the subscribers of their project.
+    """
+
+    def __init__(self):
+        self.subscribers: dict[int, set[Subscriber]] = defaultdict(set)
+        self.last_id: int | None = None
+        # ids below last_id dispatched by the lookback window (see poll_once)
+        self.dispatched: set[int] = set()
+        self.task: asyncio.Task | None = None
+
+    def subscribe(self, project_id: int) -> Subscriber:
+        subscriber = Subscriber(project_id, settings.ACTIVITY_QUEUE_SIZE)
+        self.subscribers[project_id].add(subscriber)
+        self.ensure_poller()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        project_subscribers = self.subscribers.get(subscriber.project_id)
+        if project_subscribers is not None:
+            project_subscribers.discard(subscriber)
+            if not project_subscribers:
+                del self.subscribers[subscriber.project_id]
+
+    def ensure_poller(self):
+        loop = asyncio.get_running_loop()
+        if self.task is None or self.task.done() or self.task.get_loop() is not loop:
+            # fresh context: the poller must not inherit the DB routing of the request which started it
+            self.task = loop.create_task(self.run(), context=contextvars.Context())
+
+    def publish(self, event: ProjectEvent):
+        for subscriber in list(self.subscribers.get(event.project_id, ())):
+            subscriber.push(event)
+
+    async def run(self):
+        self.last_id = None
+        while self.subscribers:
+            try:
+                read = await self.poll_once()
+            except Exception:
+                # e.g. DB restarting: keep connections open and retry
+                logger.exception("Polling project events failed")
+                read = 0
+            if read < POLL_PAGE_SIZE:
+                await asyncio.sleep(settings.ACTIVITY_POLL_SECONDS)
+        # no more connections: stop polling, the next subscriber restarts the poller
+
+    async def poll_once(self) -> int:
+        """Dispatch new events, return the number of rows read"""
+        if self.last_id is None:
+            # start from now: older events are only replayed on Last-Event-ID, from the DB by each connection
+            self.last_id = (await ProjectEvent.objects.aaggregate(last_id=Max("id")))["last_id"] or 0
+            self.dispatched = {
+                event_id
+                async for event_id in ProjectEvent.objects.filter(
+                    id__gt=self.last_id - settings.ACTIVITY_LOOKBACK_IDS
+                ).values_list("id", flat=True)
+            }
+            return 0
+
+        # ids are allocated at insert but visible at commit: with concurrent transactions, an id may become
+        # visible after a greater one. Re-reading a window of recent ids catches such late events.
+        low_id = max(0, self.last_id - settings.ACTIVITY_LOOKBACK_IDS)
+        events = [event async for event in ProjectEvent.objects.filter(id__gt=low_id).order_by("id")[:POLL_PAGE_SIZE]]
+        for event in events:
+            if event.id not in self.dispatched:
+                self.dispatched.add(event.id)
+                self.publish(event)
+        if events:
+            self.last_id = max(self.last_id, events[-1].id)
+            low_id = self.last_id - settings.ACTIVITY_LOOKBACK_IDS
+            self.dispatched = {event_id for event_id in self.dispatched if event_id > low_id}
+        return len(events)
+
+
+hub = ActivityHub()
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from activity.models import ProjectEvent
+from config.db_utils import raw_delete
+
+
+class Command(BaseCommand):
+    help = "Delete project events older than ACTIVITY_RETENTION_DAYS (clients further behind reload their lists)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.ACTIVITY_RETENTION_DAYS, help="Days of events kept")
+
+    def handle(self, *args, **options):
+        deleted = raw_delete(
+            ProjectEvent.objects.filter(created_at__lt=timezone.now() - timedelta(days=options["days"]))
+        )
+        self.stdout.write(self.style.SUCCESS(f"{deleted} project events deleted"))
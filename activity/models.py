@@ -0,0 +1,27 @@
+from django.db import models
+
+
+class ProjectEvent(models.Model):
+    """
+    A change in a project (issue, comment or contributor created, updated or deleted), pushed to SSE clients.
+
+    The table is the notification channel between workers: each worker polls it for new ids.
+    Its auto-incremented id is the SSE event id, so a reconnecting client resumes after its Last-Event-ID.
+    """
+
+    # no FK: events survive their objects, and project purges (raw deletes) do not have to cascade here
+    project_id = models.BigIntegerField()
+    # e.g. "issue.created", "comment.deleted"
+    kind = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    data = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # replay after a Last-Event-ID
+            models.Index(fields=["project_id", "id"], name="project_event_replay_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id} in project {self.project_id}"
@@ -0,0 +1,78 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from issue.models import Comment, Issue
+from issue.serializers import CommentSerializer, IssueSerializer
+from project.models import Contributor, Project
+
+from .models import ProjectEvent
+
+
+# Events are written in the transaction of the change: they are only seen by SSE clients once it is committed,
+# and never if it is rolled back.
+
+
+def record(project_id: int, kind: str, object_id: int, data: dict | None = None):
+    ProjectEvent.objects.create(project_id=project_id, kind=kind, object_id=object_id, data=data or {})
+
+
+@receiver(post_save, sender=Issue)
+def record_issue_save(sender, instance: Issue, created: bool, raw: bool, **kwargs):
+    if raw:
+        return
+    record(
+        instance.project_id,
+        "issue.created" if created else "issue.updated",
+        instance.pk,
+        IssueSerializer(instance).data,
+    )
+
+
+@receiver(post_delete, sender=Issue)
+def record_issue_delete(sender, instance: Issue, **kwargs):
+    record(instance.project_id, "issue.deleted", instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+def record_comment_save(sender, instance: Comment, created: bool, raw: bool, **kwargs):
+    if raw:
+        return
+    data = {"id": instance.pk, "issue": instance.issue_id, **CommentSerializer(instance).data}
+    record(instance.issue.project_id, "comment.created" if created else "comment.updated", instance.pk, data)
+
+
+@receiver(post_delete, sender=Comment)
+def record_comment_delete(sender, instance: Comment, **kwargs):
+    # when the issue is deleted, its comments are deleted first: the issue is still in DB
+    record(instance.issue.project_id, "comment.deleted", instance.pk, {"issue": instance.issue_id})
+
+
+@receiver(post_save, sender=Contributor)
+def record_contributor_save(sender, instance: Contributor, created: bool, raw: bool, **kwargs):
+    if created and not raw:
+        record(instance.project_id, "contributor.created", instance.user_id, {"user": instance.user_id})
+
+
+@receiver(post_delete, sender=Contributor)
+def record_contributor_delete(sender, instance: Contributor, **kwargs):
+    record(instance.project_id, "contributor.deleted", instance.user_id, {"user": instance.user_id})
+
+
+@receiver(m2m_changed, sender=Project.contributors.through)
+def record_contributors_added(sender, instance, action: str, reverse: bool, pk_set: set | None, **kwargs):
+    """
+    project.contributors.add() inserts with bulk_create, which sends no Contributor post_save.
+    (remove() and clear() delete Contributor rows with signals: recorded by record_contributor_delete)
+    """
+    if action != "post_add" or not pk_set:
+        return
+    # reverse: user.contributed_projects.add(*projects)
+    pairs = (
+        [(project_id, instance.pk) for project_id in pk_set]
+        if reverse
+        else [(instance.pk, user_id) for user_id in pk_set]
+    )
+    ProjectEvent.objects.bulk_create(
+        ProjectEvent(project_id=project_id, kind="contributor.created", object_id=user_id, data={"user": user_id})
+        for project_id, user_id in pairs
+    )
@@ -0,0 +1,180 @@
+import asyncio
+
+import pytest
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from activity.hub import Subscriber, hub
+from activity.models import ProjectEvent
+from config.factories import CommentFactory, IssueFactory, ProjectFactory, UserFactory
+from project.models import Contributor
+
+
+@pytest.fixture
+def fast_polling(settings):
+    settings.ACTIVITY_POLL_SECONDS = 0.01
+
+
+def stream_url(project):
+    return reverse("activity:project-events", kwargs={"project_id": project.pk})
+
+
+async def open_stream(client, url, headers=None):
+    response = await client.get(url, headers=headers)
+    return response, aiter(response.streaming_content)
+
+
+async def next_chunk(stream) -> str:
+    return (await asyncio.wait_for(anext(stream), timeout=5)).decode()
+
+
+async def close_stream(stream):
+    await stream.aclose()
+    # the poller stops by itself once idle: do not leave it pending on the test event loop
+    if hub.task is not None:
+        hub.task.cancel()
+
+
+# ==================== Event recording Tests ====================
+
+
+@pytest.mark.django_db
+class TestProjectEvents:
+    """Tests for events recorded on issue, comment and contributor changes"""
+
+    def test_issue_and_comment_events_success(self, create_project):
+        """Success: creations, updates and deletions are recorded with their project"""
+        issue = IssueFactory(project=create_project, author=create_project.author)
+        comment = CommentFactory(issue=issue, author=create_project.author)
+        issue.title = "Updated"
+        issue.save()
+        issue_id, comment_id = issue.pk, comment.pk
+        issue.delete()
+
+        kinds = list(
+            ProjectEvent.objects.filter(project_id=create_project.pk).order_by("id").values_list("kind", "object_id")
+        )
+        assert ("issue.created", issue_id) in kinds
+        assert ("comment.created", comment_id) in kinds
+        assert ("issue.updated", issue_id) in kinds
+        assert kinds[-2:] == [("comment.deleted", comment_id), ("issue.deleted", issue_id)]
+
+    def test_contributor_events_success(self, create_project):
+        """Success: contributors added through the API (model) or the m2m manager are recorded"""
+        first, second = UserFactory.create_batch(2)
+        Contributor.objects.create(project=create_project, user=first)
+        create_project.contributors.add(second)
+        create_project.contributors.remove(first)
+
+        events = ProjectEvent.objects.filter(project_id=create_project.pk, kind__startswith="contributor.")
+        assert list(events.order_by("id").values_list("kind", "object_id"))[-3:] == [
+            ("contributor.created", first.pk),
+            ("contributor.created", second.pk),
+            ("contributor.deleted", first.pk),
+        ]
+
+
+# ==================== SSE stream Tests ====================
+
+
+@pytest.mark.django_db
+class TestProjectEventStream:
+    """Tests for GET /api/project/{project_id}/events/ (text/event-stream)"""
+
+    def test_stream_unauthenticated_failure(self, create_project):
+        """Failure: a token is required"""
+        response = APIClient().get(stream_url(create_project))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_stream_not_contributor_failure(self, authenticated_client):
+        """Failure: only contributors can follow a project"""
+        project = ProjectFactory(author=UserFactory())
+
+        response = authenticated_client.get(stream_url(project))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_stream_pushes_live_events_success(self, authenticated_client, create_project, fast_polling):
+        """Success: a change made after connection is pushed, token accepted in query string (EventSource)"""
+
+        async def scenario():
+            client = AsyncClient()
+            response, stream = await open_stream(
+                client, f"{stream_url(create_project)}?token={authenticated_client.access_token}"
+            )
+            try:
+                assert response["Content-Type"] == "text/event-stream"
+                assert (await next_chunk(stream)).startswith("retry:")
+                # the first read subscribes and reads the current last event id
+                reading = asyncio.ensure_future(next_chunk(stream))
+                await asyncio.sleep(0.1)
+                issue = await sync_to_async(IssueFactory)(project=create_project, author=create_project.author)
+                chunk = await reading
+            finally:
+                await close_stream(stream)
+            return issue, chunk
+
+        issue, chunk = async_to_sync(scenario)()
+
+        assert "event: issue.created" in chunk
+        assert f'"id":{issue.pk}' in chunk
+        assert f'"title":"{issue.title}"' in chunk
+
+    def test_stream_replays_after_last_event_id_success(self, authenticated_client, create_project):
+        """Success: on reconnection, events after Last-Event-ID are replayed from the DB"""
+        first = IssueFactory(project=create_project, author=create_project.author)
+        last_seen = ProjectEvent.objects.get(kind="issue.created", object_id=first.pk).pk
+        missed = IssueFactory(project=create_project, author=create_project.author)
+
+        async def scenario():
+            headers = {"Authorization": f"Bearer {authenticated_client.access_token}", "Last-Event-ID": str(last_seen)}
+            _response, stream = await open_stream(AsyncClient(), stream_url(create_project), headers)
+            try:
+                return [await next_chunk(stream), await next_chunk(stream)]
+            finally:
+                await close_stream(stream)
+
+        retry, replayed = async_to_sync(scenario)()
+
+        assert retry.startswith("retry:")
+        assert "event: issue.created" in replayed
+        assert f'"id":{missed.pk}' in replayed
+
+    def test_stream_resets_after_pruned_events_failure(self, authenticated_client, create_project):
+        """Failure: when events after Last-Event-ID may have been pruned, the client is told to reload its lists"""
+        first = IssueFactory(project=create_project, author=create_project.author)
+        last_seen = ProjectEvent.objects.get(kind="issue.created", object_id=first.pk).pk
+        IssueFactory(project=create_project, author=create_project.author)
+        # prune_project_events reached the last event the client received: later ones may be gone too
+        ProjectEvent.objects.filter(pk__lte=last_seen).delete()
+
+        async def scenario():
+            headers = {"Authorization": f"Bearer {authenticated_client.access_token}", "Last-Event-ID": str(last_seen)}
+            _response, stream = await open_stream(AsyncClient(), stream_url(create_project), headers)
+            try:
+                return [await next_chunk(stream), await next_chunk(stream)]
+            finally:
+                await close_stream(stream)
+
+        _retry, reset = async_to_sync(scenario)()
+
+        assert reset.startswith("event: reset")
+
+
+class TestSubscriber:
+    """Tests for backpressure of slow SSE clients"""
+
+    def test_full_queue_overflows(self):
+        """Failure: a client not reading its events is flagged to be disconnected, events are not buffered"""
+        subscriber = Subscriber(project_id=1, queue_size=2)
+
+        for event_id in range(3):
+            subscriber.push(ProjectEvent(id=event_id, project_id=1, kind="issue.created", object_id=event_id))
+
+        assert subscriber.overflowed
+        assert subscriber.queue.qsize() == 2
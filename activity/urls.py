@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+
+app_name = "activity"
+
+urlpatterns = [
+    path("<int:project_id>/events/", views.ProjectEventStreamView.as_view(), name="project-events"),
+]
@@ -0,0 +1,120 @@
+import asyncio
+import json
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.http import StreamingHttpResponse
+from djangorestframework_camel_case.util import camelize
+from rest_framework.exceptions import NotFound
+
+from config.async_views import AsyncReadOnlyAPIView
+from project.models import Project
+
+from .hub import hub
+from .models import ProjectEvent
+
+
+# milliseconds before an EventSource reconnects after the stream is closed
+RETRY_MS = 3000
+
+
+def format_event(event: ProjectEvent) -> str:
+    data = json.dumps(camelize({"id": event.object_id, **event.data}), separators=(",", ":"))
+    return f"id: {event.id}\nevent: {event.kind}\ndata: {data}\n\n"
+
+
+class ProjectEventStreamView(AsyncReadOnlyAPIView):
+    """
+    Server-Sent Events stream of a project activity: issue, comment and contributor created/updated/deleted.
+
+    Replaces polling of issue and comment lists: the client opens one long-lived connection per project
+    (EventSource, token in ?token= as EventSource cannot send headers) and receives changes as they happen.
+    On reconnection, the browser sends the Last-Event-ID header and missed events are replayed from the DB.
+    A client too slow to read its events is disconnected instead of buffering them: it reconnects and
+    catches up from the DB.
+    """
+
+    token_query_param = "token"
+    query_budgets = {"get": 2}
+
+    async def initial(self, request, *args, **kwargs):
+        user = request.user
+        if not user.is_authenticated:
+            # IsAuthenticated, checked right after, answers 401
+            return
+        project_id = kwargs["project_id"]
+        try:
+            self.project = (
+                await Project.objects.filter(Q(author=user) | Q(contributors=user)).distinct().aget(pk=project_id)
+            )
+        except Project.DoesNotExist as error:
+            raise NotFound(f"Project with id {project_id} does not exist.") from error
+
+    async def list(self, request, *args, **kwargs):
+        response = StreamingHttpResponse(
+            self.stream(request.user.pk, self.get_last_event_id(request)), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # nginx: send events as soon as they are written
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    @staticmethod
+    def get_last_event_id(request) -> int | None:
+        last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+        try:
+            return int(last_event_id)
+        except (TypeError, ValueError):
+            return None
+
+    async def stream(self, user_id: int, last_event_id: int | None):
+        project_id = self.project.pk
+        # subscribe before reading the DB: an event committed in between is queued, and deduplicated below
+        subscriber = hub.subscribe(project_id)
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+
+            if last_event_id is None:
+                # new client: only events from now on
+                start_id = (await ProjectEvent.objects.aaggregate(last_id=Max("id")))["last_id"] or 0
+                replayed = set()
+            else:
+                start_id = last_event_id
+                # from the last event received: pruning deletes the oldest events first, so while it is still stored
+                # every event after it is too
+                missed = [
+                    event
+                    async for event in ProjectEvent.objects.filter(
+                        project_id=project_id, id__gte=last_event_id
+                    ).order_by("id")[: settings.ACTIVITY_REPLAY_LIMIT + 2]
+                ]
+                pruned = not missed or missed[0].id != last_event_id
+                missed = missed[1:]
+                if pruned or len(missed) > settings.ACTIVITY_REPLAY_LIMIT:
+                    # events missed were pruned, or too many to replay: the client must reload lists instead
+                    yield "event: reset\ndata: {}\n\n"
+                    missed = []
+                    start_id = (await ProjectEvent.objects.aaggregate(last_id=Max("id")))["last_id"] or 0
+                replayed = {event.id for event in missed}
+                for event in missed:
+                    yield format_event(event)
+
+            while not subscriber.overflowed:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=settings.ACTIVITY_HEARTBEAT_SECONDS)
+                except TimeoutError:
+                    # comment line: keeps proxies from closing an idle connection, detects gone clients
+                    yield ": keepalive\n\n"
+                    continue
+                if event.id <= start_id or event.id in replayed:
+                    continue
+                yield format_event(event)
+                if (
+                    event.kind == "contributor.deleted"
+                    and event.object_id == user_id
+                    and self.project.author_id != user_id
+                ):
+                    # access revoked
+                    break
+        finally:
+            hub.unsubscribe(subscriber)
@@ -0,0 +1,48 @@
+"""OpenAPI docs of authentication views, applied by config.docs.load_docs() when the schema is first requested"""
+
+from drf_spectacular.utils import extend_schema, extend_schema_view
+
+from .serializers import LogoutSerializer
+from .views import DecoratedTokenObtainPairView, DecoratedTokenRefreshView, LogoutView
+
+
+extend_schema_view(
+    post=extend_schema(
+        summary="Obtain Obtain JWT token pair",
+        description="Takes a set of user credentials and returns an access and refresh JSON web token "
+        "pair. "
+        "<br>Returns a `200` response code on success. "
+        "<br>Raises a `400` error code if the request body is not valid. "
+        "<br>Raises a `401` error code if the user credentials are invalid."
+        "<br>"
+        "<br>**Authentification required**: No"
+        "<br>**Permissions required**: None ",
+        tags=["Auth"],
+    )
+)(DecoratedTokenObtainPairView)
+
+extend_schema_view(
+    post=extend_schema(
+        summary="Refresh JWT token",
+        description="Takes a refresh type JSON web token and returns an access type JSON web token if the refresh "
+        "token is valid. "
+        "<br>Returns a `200` response code on success."
+        "<br>Raises a `400` error code if the request body is not valid."
+        "<br>Raises a `401` error code if the refresh token is invalid."
+        "<br>"
+        "<br>**Authentification required**: No"
+        "<br>**Permissions required**: None",
+        tags=["Auth"],
+    )
+)(DecoratedTokenRefreshView)
+
+
+# as this is a classic APIView, docs are set for each method and not for view
+extend_schema_view(
+    post=extend_schema(
+        request=LogoutSerializer,
+        responses={200: None},
+        summary="Logout user and invalidate refresh token",
+        tags=["Auth"],
+    )
+)(LogoutView)
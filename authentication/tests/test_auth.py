@@ -2,6 +2,8 @@ import pytest
 
 from django.urls import reverse
 from rest_framework import status
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from config.factories import UserFactory, fake
 
@@ -116,3 +118,37 @@ class TestLogout:
         response = authenticated_client.post(url, data, format="json")
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# ==================== Query budget Tests ====================
+
+
+@pytest.mark.django_db
+class TestAuthQueryBudgets:
+    """Tests for the query budgets of authentication views, as refresh tokens of the user grow"""
+
+    def test_login_success(self, api_client, assert_query_budget):
+        """Success: logging in runs as many queries for 1 or 20 refresh tokens of the user"""
+        user = UserFactory()
+        url = reverse(f"{base_auth_url}token_obtain_pair")
+        data = {"username": user.username, "password": user.plain_password}
+
+        def grow(rows):
+            for _ in range(rows - OutstandingToken.objects.filter(user=user).count()):
+                RefreshToken.for_user(user)
+
+        assert_query_budget(lambda: api_client.post(url, data, format="json"), grow)
+
+    @pytest.mark.parametrize("name", ["token_refresh", "logout"])
+    def test_refresh_and_logout_success(self, api_client, assert_query_budget, name):
+        """Success: refreshing and logging out run as many queries for 1 or 20 refresh tokens of the user"""
+        user = UserFactory()
+        url = reverse(f"{base_auth_url}{name}")
+        tokens = []
+
+        def grow(rows):
+            tokens.extend(RefreshToken.for_user(user) for _ in range(rows))
+            # rotation and logout blacklist the token sent: the last issued one is sent each time
+            api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens[-1].access_token}")
+
+        assert_query_budget(lambda: api_client.post(url, {"refresh": str(tokens[-1])}, format="json"), grow)
@@ -1,6 +1,5 @@
 import logging
 
-from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -8,46 +7,19 @@ from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from .serializers import LogoutSerializer
+from config.query_budget import query_budget
 
 
 logger = logging.getLogger(__name__)
 
 
-@extend_schema_view(
-    post=extend_schema(
-        summary="Obtain Obtain JWT token pair",
-        description="Takes a set of user credentials and returns an access and refresh JSON web token "
-        "pair. "
-        "<br>Returns a `200` response code on success. "
-        "<br>Raises a `400` error code if the request body is not valid. "
-        "<br>Raises a `401` error code if the user credentials are invalid."
-        "<br>"
-        "<br>**Authentification required**: No"
-        "<br>**Permissions required**: None ",
-        tags=["Auth"],
-    )
-)
+# documented in docs.py, loaded with the schema
 class DecoratedTokenObtainPairView(TokenObtainPairView):
-    pass
-
-
-@extend_schema_view(
-    post=extend_schema(
-        summary="Refresh JWT token",
-        description="Takes a refresh type JSON web token and returns an access type JSON web token if the refresh "
-        "token is valid. "
-        "<br>Returns a `200` response code on success."
-        "<br>Raises a `400` error code if the request body is not valid."
-        "<br>Raises a `401` error code if the refresh token is invalid."
-        "<br>"
-        "<br>**Authentification required**: No"
-        "<br>**Permissions required**: None",
-        tags=["Auth"],
-    )
-)
+    query_budgets = {"post": 2}
+
+
 class DecoratedTokenRefreshView(TokenRefreshView):
-    pass
+    query_budgets = {"post": 13}
 
 
 class LogoutView(APIView):
@@ -62,14 +34,7 @@ class LogoutView(APIView):
 
     permission_classes = [IsAuthenticated]
 
-    # as this is a classic APIView, @extend_schema for docs
-    # must be set for each method and not for view
-    @extend_schema(
-        request=LogoutSerializer,
-        responses={200: None},
-        summary="Logout user and invalidate refresh token",
-        tags=["Auth"],
-    )
+    @query_budget(8)
     def post(self, request):
         try:
             refresh_token = request.data.get("refresh")
@@ -0,0 +1,69 @@
+"""
+Bandwidth/CPU tradeoff of gzip levels on API responses (bench_compression command): for each level, the size of
+typical pages once compressed, the CPU time to compress them, and the time to send them at a few link speeds,
+compression included, against sending them uncompressed.
+"""
+
+import gzip
+import statistics
+import time
+
+from dataclasses import dataclass
+
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .suite import Dataset
+
+
+LEVELS = (1, 3, 5, 6, 9)
+# link speeds (Mbit/s): mobile, home, datacenter
+BANDWIDTHS_MBPS = (2, 20, 1000)
+
+
+@dataclass
+class LevelResult:
+    level: int
+    # totals over the pages
+    raw_bytes: int
+    compressed_bytes: int
+    # median of the total over the pages
+    compress_ms: float
+
+    @property
+    def ratio(self) -> float:
+        return self.compressed_bytes / self.raw_bytes
+
+    def send_ms(self, mbps: float) -> float:
+        """Time to compress and send the pages at a link speed"""
+        return self.compress_ms + transfer_ms(self.compressed_bytes, mbps)
+
+
+def transfer_ms(size: int, mbps: float) -> float:
+    return size * 8 / (mbps * 1000)
+
+
+def issue_list_pages(data: Dataset, pages: int) -> list[bytes]:
+    """Bodies of the first issue list pages of the benchmark project, as sent to clients not accepting gzip"""
+    client = APIClient()
+    client.force_authenticate(data.user)
+    url = reverse("issue:issue-list", kwargs={"project_id": data.url_kwargs["project_id"]})
+    bodies = []
+    for page in range(1, pages + 1):
+        response = client.get(url, {"page": page})
+        if response.status_code != 200:
+            break
+        bodies.append(response.content)
+    return bodies
+
+
+def compare_levels(bodies: list[bytes], levels=LEVELS, iterations: int = 20) -> list[LevelResult]:
+    results = []
+    for level in levels:
+        durations = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            compressed_bytes = sum(len(gzip.compress(body, compresslevel=level, mtime=0)) for body in bodies)
+            durations.append((time.perf_counter() - start) * 1000)
+        results.append(LevelResult(level, sum(map(len, bodies)), compressed_bytes, statistics.median(durations)))
+    return results
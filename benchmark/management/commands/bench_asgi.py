@@ -0,0 +1,185 @@
+import asyncio
+import os
+import secrets
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from issue.counters import recount_projects
+from issue.models import Issue
+from project.deletion import purge_project
+from project.models import Project
+from user.models import User
+
+
+BENCH_USERNAME = "bench_asgi"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark sync (DRF) and native async read endpoints under uvicorn with many concurrent keep-alive "
+        "connections. Seeds a project in the configured database (the uvicorn server reads it), starts uvicorn on it, "
+        "reports req/s and latency, then deletes the seeded rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=500, help="Number of concurrent connections")
+        parser.add_argument("--duration", type=float, default=10, help="Seconds of load per endpoint")
+        parser.add_argument("--issues", type=int, default=50, help="Number of issues of the benchmarked project")
+        parser.add_argument("--port", type=int, default=8765, help="Port of the uvicorn server started")
+        parser.add_argument("--workers", type=int, default=1, help="Number of uvicorn workers")
+        parser.add_argument(
+            "--endpoint",
+            choices=["project-list", "issue-list", "issue-detail"],
+            default="issue-list",
+            help="Endpoint compared in its sync and async versions",
+        )
+
+    def handle(self, *args, **options):
+        project, issue, token = self.seed(options["issues"])
+        try:
+            self.benchmark(options, project, issue, token)
+        finally:
+            self.clean(project)
+
+    def benchmark(self, options, project, issue, token):
+        paths = {
+            "project-list": "project/",
+            "issue-list": f"project/{project.pk}/issue/",
+            "issue-detail": f"project/{project.pk}/issue/{issue.pk}/",
+        }
+        path = paths[options["endpoint"]]
+
+        server = self.start_server(options["port"], options["workers"])
+        try:
+            self.stdout.write(
+                f"{options['endpoint']}: {options['concurrency']} connections, {options['duration']:.0f}s per mode"
+            )
+            self.stdout.write(f"{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>10}")
+            for mode, url_path in [("sync", f"/api/{path}"), ("async", f"/api/async/{path}")]:
+                latencies, errors, elapsed = asyncio.run(
+                    self.load(options["port"], url_path, token, options["concurrency"], options["duration"])
+                )
+                if not latencies:
+                    raise CommandError(f"No successful {mode} request, check the server output")
+                latencies.sort()
+                self.stdout.write(
+                    f"{mode:<8}{len(latencies) / elapsed:>10.0f}"
+                    f"{statistics.median(latencies):>10.2f}"
+                    f"{self.percentile(latencies, 99):>10.2f}"
+                    f"{errors:>10}"
+                )
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    def seed(self, issue_count):
+        """Create a benchmark user and project of their own, return (project, one issue, access token)"""
+        # unique name: clean() only deletes rows created here, never an existing account
+        user = User(username=f"{BENCH_USERNAME}_{secrets.token_hex(4)}", consent=True)
+        # requests authenticate with a token made here: no password to log in with
+        user.set_unusable_password()
+        user.save()
+        project = Project.objects.create(
+            author=user, name="ASGI benchmark", type=Project.ProjectTypes.backend, description="benchmark"
+        )
+        project.contributors.add(user)
+        Issue.objects.bulk_create(
+            Issue(project=project, author=user, title=f"Issue {index}", content="benchmark")
+            for index in range(max(issue_count, 1))
+        )
+        # bulk_create does not send signals
+        recount_projects([project.pk])
+        issue = Issue.objects.filter(project=project).order_by("id").first()
+        return project, issue, str(RefreshToken.for_user(user).access_token)
+
+    def clean(self, project):
+        """Delete the rows created by seed(): the project, its issues, then the benchmark user and its tokens"""
+        user = project.author
+        purge_project(project.pk)
+        OutstandingToken.objects.filter(user=user).delete()
+        user.delete()
+
+    def start_server(self, port, workers):
+        command = [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "config.asgi:application",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+            # no access log: it would benchmark stdout
+            "--no-access-log",
+        ]
+        # the server uses the same settings, hence the same database, as this command
+        server = subprocess.Popen(command, env=os.environ.copy())
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError("uvicorn exited before accepting connections")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return server
+            except OSError:
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError(f"uvicorn did not listen on port {port} within 30s")
+
+    async def load(self, port, path, token, concurrency, duration):
+        """Open `concurrency` keep-alive connections sending requests until `duration` is elapsed"""
+        request = (
+            f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nAuthorization: Bearer {token}\r\n"
+            "Accept: application/json\r\n\r\n"
+        ).encode()
+        latencies = []
+        errors = 0
+        start = time.perf_counter()
+        deadline = start + duration
+
+        async def connection():
+            nonlocal errors
+            reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=2**20)
+            try:
+                while time.perf_counter() < deadline:
+                    sent = time.perf_counter()
+                    writer.write(request)
+                    head = await reader.readuntil(b"\r\n\r\n")
+                    status_code, length = self.parse_head(head)
+                    await reader.readexactly(length)
+                    if status_code == 200:
+                        latencies.append((time.perf_counter() - sent) * 1000)
+                    else:
+                        errors += 1
+            except (OSError, asyncio.IncompleteReadError):
+                errors += 1
+            finally:
+                writer.close()
+
+        await asyncio.gather(*(connection() for _ in range(concurrency)))
+        return latencies, errors, time.perf_counter() - start
+
+    @staticmethod
+    def parse_head(head):
+        lines = head.decode("latin-1").split("\r\n")
+        status_code = int(lines[0].split()[1])
+        length = 0
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return status_code, length
+
+    @staticmethod
+    def percentile(sorted_values, percent):
+        index = min(len(sorted_values) - 1, round(percent / 100 * (len(sorted_values) - 1)))
+        return sorted_values[index]
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmark.compression import BANDWIDTHS_MBPS, LEVELS, compare_levels, issue_list_pages, transfer_ms
+from benchmark.suite import Volumes, seed, throwaway_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare gzip levels on issue list pages: compression ratio, CPU time, and time to send the pages at a few "
+        "link speeds against sending them uncompressed. Pages of the bench_endpoints dataset, seeded in a throwaway "
+        "test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, default=5, help="Issue list pages compressed")
+        parser.add_argument("--issues", type=int, default=50, help="Issues per project when seeding")
+        parser.add_argument("--iterations", type=int, default=20, help="Compressions per level")
+        parser.add_argument("--levels", type=int, nargs="+", default=list(LEVELS), help="Gzip levels compared (1 to 9)")
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1 or options["pages"] < 1:
+            raise CommandError("--iterations and --pages must be at least 1")
+        if not all(1 <= level <= 9 for level in options["levels"]):
+            raise CommandError("--levels must be between 1 and 9")
+
+        with throwaway_database():
+            self.stdout.write("Seeding...")
+            bodies = issue_list_pages(seed(Volumes(issues=options["issues"])), options["pages"])
+        if not bodies:
+            raise CommandError("No issue list page to compress")
+        results = compare_levels(bodies, options["levels"], options["iterations"])
+
+        raw = results[0].raw_bytes
+        self.stdout.write(f"{len(bodies)} issue list pages, {raw} bytes, {raw / len(bodies):.0f} bytes per page")
+        speeds = "".join(f"{f'{mbps} Mbit/s ms':>16}" for mbps in BANDWIDTHS_MBPS)
+        self.stdout.write(f"{'level':<8}{'bytes':>10}{'ratio':>8}{'cpu ms':>10}{speeds}")
+        self.stdout.write(
+            f"{'none':<8}{raw:>10}{1:>8.2f}{0:>10.2f}"
+            + "".join(f"{transfer_ms(raw, mbps):>16.2f}" for mbps in BANDWIDTHS_MBPS)
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result.level:<8}{result.compressed_bytes:>10}{result.ratio:>8.2f}{result.compress_ms:>10.2f}"
+                + "".join(f"{result.send_ms(mbps):>16.2f}" for mbps in BANDWIDTHS_MBPS)
+            )
@@ -0,0 +1,162 @@
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db.utils import load_backend
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark per-request connections against persistent and pooled connections under concurrent load. "
+        "Uses PostgreSQL (POSTGRES_* env variables) when reachable, a temporary SQLite file otherwise."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000, help="Number of simulated requests per mode")
+        parser.add_argument("--concurrency", type=int, default=16, help="Number of concurrent threads")
+        parser.add_argument("--queries", type=int, default=3, help="Number of queries per simulated request")
+        parser.add_argument("--pool-size", type=int, default=8, help="Max size of the PostgreSQL pool")
+        parser.add_argument("--sqlite", action="store_true", help="Force SQLite even if PostgreSQL is reachable")
+
+    def handle(self, *args, **options):
+        sqlite_path = None
+        settings_dict = None if options["sqlite"] else self.postgres_settings()
+        if settings_dict is None:
+            file_descriptor, sqlite_path = tempfile.mkstemp(suffix=".sqlite3")
+            os.close(file_descriptor)
+            settings_dict = self.base_settings("django.db.backends.sqlite3", sqlite_path)
+            self.stdout.write(self.style.WARNING("PostgreSQL not reachable, benchmarking SQLite"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Benchmarking PostgreSQL on {settings_dict['HOST']}"))
+
+        modes = {
+            "connect per request": (settings_dict, False),
+            "persistent (CONN_MAX_AGE)": (settings_dict, True),
+        }
+        if settings_dict["ENGINE"] == "django.db.backends.postgresql" and self.pool_available():
+            pooled = {
+                **settings_dict,
+                "OPTIONS": {"pool": {"min_size": 1, "max_size": options["pool_size"], "timeout": 30}},
+            }
+            modes["native pool"] = (pooled, False)
+
+        self.stdout.write(
+            f"{options['requests']} requests, {options['concurrency']} threads, {options['queries']} queries/request"
+        )
+        self.stdout.write(f"{'mode':<28}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for name, (mode_settings, persistent) in modes.items():
+            latencies, elapsed = self.run_mode(name, mode_settings, persistent, options)
+            latencies.sort()
+            self.stdout.write(
+                f"{name:<28}{len(latencies) / elapsed:>10.0f}"
+                f"{statistics.median(latencies):>10.2f}"
+                f"{self.percentile(latencies, 95):>10.2f}"
+                f"{self.percentile(latencies, 99):>10.2f}"
+            )
+
+        if sqlite_path is not None:
+            os.unlink(sqlite_path)
+
+    def run_mode(self, name, settings_dict, persistent, options):
+        """Run the simulated requests of one mode and return (latencies in ms, total elapsed seconds)"""
+        backend = load_backend(settings_dict["ENGINE"])
+        local = threading.local()
+        opened = []
+        # the pool is shared by alias: use one alias per mode to get a fresh pool
+        alias = f"bench_{name.split()[0]}"
+
+        def get_connection():
+            connection = getattr(local, "connection", None)
+            if connection is None:
+                connection = backend.DatabaseWrapper(settings_dict, alias)
+                local.connection = connection
+                opened.append(connection)
+            return connection
+
+        def simulated_request(_):
+            start = time.perf_counter()
+            connection = get_connection()
+            with connection.cursor() as cursor:
+                for _query in range(options["queries"]):
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+            if not persistent:
+                # what Django does at the end of a request when CONN_MAX_AGE = 0 (or returns it to the pool)
+                connection.close()
+            return (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            latencies = list(executor.map(simulated_request, range(options["requests"])))
+        elapsed = time.perf_counter() - start
+
+        for connection in opened:
+            # connections were opened by the executor threads
+            connection.inc_thread_sharing()
+            connection.close()
+        if hasattr(backend.DatabaseWrapper, "close_pool"):
+            backend.DatabaseWrapper(settings_dict, alias).close_pool()
+        return latencies, elapsed
+
+    @staticmethod
+    def base_settings(engine, name, **extra):
+        settings_dict = {
+            "ENGINE": engine,
+            "NAME": name,
+            "USER": "",
+            "PASSWORD": "",
+            "HOST": "",
+            "PORT": "",
+            "ATOMIC_REQUESTS": False,
+            "AUTOCOMMIT": True,
+            "CONN_MAX_AGE": 0,
+            "CONN_HEALTH_CHECKS": False,
+            "OPTIONS": {},
+            "TIME_ZONE": None,
+            "TEST": {},
+        }
+        settings_dict.update(extra)
+        return settings_dict
+
+    def postgres_settings(self):
+        """Return PostgreSQL settings if a server is reachable, None otherwise"""
+        try:
+            import psycopg  # noqa: F401
+        except ImportError:
+            return None
+
+        settings_dict = self.base_settings(
+            "django.db.backends.postgresql",
+            os.environ.get("POSTGRES_DB", "postgres"),
+            USER=os.environ.get("POSTGRES_USER", "postgres"),
+            PASSWORD=os.environ.get("POSTGRES_PASSWORD", ""),
+            HOST=os.environ.get("POSTGRES_HOST", "localhost"),
+            PORT=os.environ.get("POSTGRES_PORT", "5432"),
+        )
+        backend = load_backend(settings_dict["ENGINE"])
+        connection = backend.DatabaseWrapper({**settings_dict, "OPTIONS": {"connect_timeout": 2}}, "bench_probe")
+        try:
+            connection.ensure_connection()
+        except Exception:
+            return None
+        finally:
+            connection.close()
+        return settings_dict
+
+    @staticmethod
+    def pool_available():
+        try:
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @staticmethod
+    def percentile(sorted_values, percent):
+        index = min(len(sorted_values) - 1, round(percent / 100 * (len(sorted_values) - 1)))
+        return sorted_values[index]
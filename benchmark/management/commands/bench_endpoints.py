@@ -0,0 +1,80 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmark.suite import DEFAULT_EXCLUDE, Volumes, compare, load_report, run_suite, seed, throwaway_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every route of the API with the DRF test client: p50/p95/p99 latency, queries, rows read and bytes "
+        "per request. Seeds a dataset in a throwaway test database, destroyed at the end: the configured database is "
+        "left untouched."
+    )
+
+    def add_arguments(self, parser):
+        defaults = Volumes()
+        parser.add_argument("--users", type=int, default=defaults.users, help="Number of users seeded")
+        parser.add_argument("--projects", type=int, default=defaults.projects, help="Number of projects seeded")
+        parser.add_argument("--contributors", type=int, default=defaults.contributors, help="Contributors per project")
+        parser.add_argument("--issues", type=int, default=defaults.issues, help="Issues per project")
+        parser.add_argument("--comments", type=int, default=defaults.comments, help="Comments per issue")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed of the generated data")
+        parser.add_argument("--iterations", type=int, default=20, help="Measured requests per route")
+        parser.add_argument("--warmup", type=int, default=2, help="Requests per route before measuring")
+        parser.add_argument("--exclude", default=DEFAULT_EXCLUDE, help="Regex of route names not benchmarked")
+        parser.add_argument("--output", help="Write the report to this JSON file")
+        parser.add_argument("--compare", help="JSON report of a previous run to compare with")
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1")
+        baseline = load_report(options["compare"]) if options["compare"] else None
+
+        volumes = Volumes(
+            options["users"], options["projects"], options["contributors"], options["issues"], options["comments"]
+        )
+        with throwaway_database():
+            self.stdout.write(f"Seeding {volumes}...")
+            data = seed(volumes, options["seed"])
+            report = run_suite(data, options["iterations"], options["warmup"], options["exclude"])
+        self.write_report(report)
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(report, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+        if baseline is not None:
+            self.write_comparison(compare(report, baseline), baseline["meta"].get("commit"))
+
+    def write_report(self, report):
+        meta = report["meta"]
+        self.stdout.write(
+            f"{meta['database']}, commit {meta['commit']}, {meta['iterations']} requests per route, "
+            + ", ".join(f"{count} {name}" for name, count in meta["volumes"].items())
+        )
+        self.stdout.write(
+            f"{'route':<32}{'method':>7}{'status':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+            f"{'queries':>9}{'rows':>9}{'bytes':>10}"
+        )
+        for result in report["results"]:
+            line = (
+                f"{result['name']:<32}{result['method']:>7}{result['status']:>7}{result['p50_ms']:>9.2f}"
+                f"{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}{result['queries']:>9.1f}{result['rows']:>9.1f}"
+                f"{result['bytes']:>10.0f}"
+            )
+            self.stdout.write(self.style.ERROR(line) if result["status"] >= 400 else line)
+        for name, reason in report["skipped"].items():
+            self.stdout.write(f"{name:<32} skipped: {reason}")
+
+    def write_comparison(self, changes, baseline_commit):
+        self.stdout.write(f"\nCompared with commit {baseline_commit}:")
+        self.stdout.write(f"{'route':<32}{'metric':>9}{'before':>12}{'after':>12}{'change':>9}")
+        for name, metric, before, after in changes:
+            if before == after:
+                continue
+            change = f"{(after - before) / before:+.0%}" if before else "new"
+            line = f"{name:<32}{metric:>9}{before:>12.2f}{after:>12.2f}{change:>9}"
+            # latency, queries, rows or bytes more than 10% higher
+            worse = before and (after - before) / before > 0.1
+            self.stdout.write(self.style.WARNING(line) if worse else line)
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmark.seeding import DISTRIBUTIONS, SeedVolumes, seed_data
+from user.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed users, projects, contributors, issues and comments for load tests with bulk inserts. "
+        "The same --seed and volumes produce the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="Number of users")
+        parser.add_argument("--projects", type=int, default=100, help="Number of projects")
+        parser.add_argument(
+            "--contributors", type=int, default=5, help="Mean contributors per project, author included"
+        )
+        parser.add_argument("--issues", type=int, default=10000, help="Number of issues, spread over projects")
+        parser.add_argument("--comments", type=int, default=30000, help="Number of comments, spread over issues")
+        parser.add_argument(
+            "--distribution",
+            choices=DISTRIBUTIONS,
+            default="zipf",
+            help="Spread of issues, comments and members: even (uniform) or a few big projects and issues (zipf)",
+        )
+        parser.add_argument("--skew", type=float, default=1.1, help="Exponent of the zipf distribution")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per bulk insert")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+        parser.add_argument("--password", default="softdesk_api", help="Password of every seeded user")
+        parser.add_argument("--prefix", default="seed_", help="Prefix of seeded usernames ({prefix}{index})")
+
+    def handle(self, *args, **options):
+        volumes = SeedVolumes(
+            options["users"], options["projects"], options["contributors"], options["issues"], options["comments"]
+        )
+        if min(volumes.users, volumes.projects, volumes.issues, volumes.comments) < 0 or volumes.contributors < 1:
+            raise CommandError("Volumes cannot be negative, and a project has at least one contributor")
+        if volumes.projects and not volumes.users:
+            raise CommandError("Projects need at least one user")
+        if volumes.issues and not volumes.projects or volumes.comments and not volumes.issues:
+            raise CommandError("Issues need at least one project, comments at least one issue")
+        if User.objects.filter(username__startswith=options["prefix"]).exists():
+            raise CommandError(f'Users prefixed with "{options["prefix"]}" already exist, choose another --prefix')
+
+        def progress(table, rows, seconds):
+            rate = rows / seconds if seconds else 0
+            self.stdout.write(f"{table:<14}{rows:>10} rows in {seconds:>7.2f}s ({rate:,.0f} rows/s)")
+
+        try:
+            seed_data(
+                volumes,
+                distribution=options["distribution"],
+                skew=options["skew"],
+                batch_size=options["batch_size"],
+                seed=options["seed"],
+                password=options["password"],
+                prefix=options["prefix"],
+                progress=progress,
+            )
+        except RuntimeError as error:
+            raise CommandError(error) from error
+        if volumes.users:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Users {options['prefix']}0 to {options['prefix']}{volumes.users - 1} log in with password "
+                    f'"{options["password"]}"'
+                )
+            )
@@ -0,0 +1,121 @@
+import os
+import re
+import subprocess
+import sys
+import time
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# run in a fresh interpreter: what a worker does from its start to its first response
+PROBE = """
+import asyncio, os, sys
+
+from config.asgi import application
+
+path, host = sys.argv[1], sys.argv[2]
+
+
+async def first_request():
+    messages = []
+    received = []
+
+    async def receive():
+        if received:
+            # Django listens for a disconnect until the response is sent
+            await asyncio.Future()
+        received.append(True)
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", host.encode())], "server": ("127.0.0.1", 8000), "client": ("127.0.0.1", 50000),
+    }
+    await application(scope, receive, send)
+    return messages[0]["status"]
+
+
+print(asyncio.run(first_request()), flush=True)
+# skip interpreter teardown, not part of the startup
+os._exit(0)
+"""
+
+# "import time:  self [us] |  cumulative | <indentation>module"
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile a worker start: time from process start to the first response, and import time per module "
+        "(python -X importtime). Fails when the first response takes longer than --target-ms."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/api/project/", help="Path of the first request")
+        parser.add_argument("--runs", type=int, default=3, help="Timed starts, the fastest one is kept")
+        parser.add_argument("--top", type=int, default=20, help="Number of packages and modules listed")
+        parser.add_argument("--target-ms", type=float, default=1000, help="Max time to the first response")
+
+    def handle(self, *args, **options):
+        host = next((host for host in settings.ALLOWED_HOSTS if host not in ("*", "")), "localhost").lstrip(".")
+        command = [sys.executable, "-c", PROBE, options["path"], host]
+
+        timings = []
+        for _ in range(options["runs"]):
+            start = time.perf_counter()
+            status_code = self.run_probe(command).stdout.strip()
+            timings.append((time.perf_counter() - start) * 1000)
+        first_response_ms = min(timings)
+
+        imports = self.parse_import_times(self.run_probe([command[0], "-X", "importtime", *command[1:]]).stderr)
+        by_package = defaultdict(lambda: [0, 0])
+        for module, self_us, _cumulative_us in imports:
+            by_package[module.split(".")[0]][0] += self_us
+            by_package[module.split(".")[0]][1] += 1
+
+        self.stdout.write(f"{'package':<40}{'modules':>8}{'self ms':>10}")
+        for package, (self_us, count) in sorted(by_package.items(), key=lambda item: -item[1][0])[: options["top"]]:
+            self.stdout.write(f"{package:<40}{count:>8}{self_us / 1000:>10.1f}")
+        self.stdout.write("")
+        self.stdout.write(f"{'module':<60}{'self ms':>10}{'cumul. ms':>10}")
+        for module, self_us, cumulative_us in sorted(imports, key=lambda item: -item[1])[: options["top"]]:
+            self.stdout.write(f"{module:<60}{self_us / 1000:>10.1f}{cumulative_us / 1000:>10.1f}")
+        self.stdout.write("")
+        self.stdout.write(
+            f"{len(imports)} modules imported in {sum(item[1] for item in imports) / 1000:.0f} ms (with importtime "
+            "overhead)"
+        )
+        self.stdout.write(
+            f"First response (GET {options['path']}: {status_code}) {first_response_ms:.0f} ms after process start "
+            f"(runs: {', '.join(f'{timing:.0f}' for timing in timings)} ms)"
+        )
+        if first_response_ms > options["target_ms"]:
+            raise CommandError(
+                f"First response after {first_response_ms:.0f} ms, target is {options['target_ms']:.0f} ms"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Under the {options['target_ms']:.0f} ms target"))
+
+    @staticmethod
+    def run_probe(command):
+        # the probe uses the same settings (DJANGO_SETTINGS_MODULE) as this command
+        result = subprocess.run(command, capture_output=True, text=True, env=os.environ.copy(), check=False)
+        if result.returncode != 0:
+            raise CommandError(f"Startup probe failed:\n{result.stderr[-2000:]}")
+        return result
+
+    @staticmethod
+    def parse_import_times(output):
+        """(module, self us, cumulative us) of every imported module"""
+        imports = []
+        for line in output.splitlines():
+            match = IMPORT_TIME_LINE.match(line)
+            if match:
+                imports.append((match.group(4), int(match.group(1)), int(match.group(2))))
+        return imports
@@ -0,0 +1,212 @@
+"""
+Bulk data seeding for load tests (cf. seed_data command).
+
+Rows are generated in memory from one random generator and inserted with bulk_create in batches: no per-row save,
+signal or password hashing. Denormalized counters (project issue counts, issue comment counts) are computed while
+generating, so the seeded data needs no recount.
+"""
+
+import random
+import time
+
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import connections, router, transaction
+from django.db.models import Model
+from django.utils import timezone
+
+from issue.models import Comment, Issue
+from project.models import Contributor, Project
+from user.models import User
+
+
+DISTRIBUTIONS = ["uniform", "zipf"]
+
+# vocabulary of generated titles and contents
+WORDS = (  # noqa: SIM905
+    "api account backend bug build cache client comment config crash data database deploy docs error export "
+    "feature field filter fix form frontend index issue layout list login mobile model page payment permission "
+    "profile project query release report request response review search server session settings slow sort "
+    "status sync test timeout token update upload user validation view web worker"
+).split()
+
+
+@dataclass(frozen=True)
+class SeedVolumes:
+    users: int
+    projects: int
+    # mean per project, author included
+    contributors: int
+    # totals, spread over projects and issues
+    issues: int
+    comments: int
+
+
+def spread(total: int, buckets: int, distribution: str, skew: float, rng: random.Random) -> array:
+    """
+    Number of items in each bucket: the same share on average (uniform), or a few big buckets and a long tail
+    (zipf: the bucket of rank r weighs 1 / r^skew, ranks are shuffled so big buckets are not the first ids).
+    """
+    counts = array("I", bytes(4 * buckets))
+    if not buckets:
+        return counts
+    if distribution == "zipf":
+        ranks = list(range(1, buckets + 1))
+        rng.shuffle(ranks)
+        cumulative_weights = []
+        weight_sum = 0.0
+        for rank in ranks:
+            weight_sum += 1 / rank**skew
+            cumulative_weights.append(weight_sum)
+        picks = rng.choices(range(buckets), cum_weights=cumulative_weights, k=total)
+    else:
+        picks = (rng.randrange(buckets) for _ in range(total))
+    for index in picks:
+        counts[index] += 1
+    return counts
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words)).capitalize()
+
+
+def insert(model: type[Model], objects: Iterable[Model], batch_size: int) -> array:
+    """bulk_create objects by batches, return their ids in order"""
+    ids = array("q")
+    objects = iter(objects)
+    while batch := list(islice(objects, batch_size)):
+        ids.extend(obj.pk for obj in model.objects.bulk_create(batch))
+    return ids
+
+
+def seed_data(
+    volumes: SeedVolumes,
+    distribution: str = "zipf",
+    skew: float = 1.1,
+    batch_size: int = 5000,
+    seed: int = 0,
+    password: str = "softdesk_api",
+    prefix: str = "seed_",
+    progress: Callable[[str, int, float], None] | None = None,
+) -> dict[str, int]:
+    """
+    Insert users, projects, contributors, issues and comments in one transaction, return rows inserted per table.
+
+    The same seed and arguments produce the same data. Issues are spread over projects and comments over issues
+    with `distribution`, as are memberships beyond project authors. `progress(table, rows, seconds)` is called
+    once each table is inserted.
+    """
+    if not connections[router.db_for_write(Issue)].features.can_return_rows_from_bulk_insert:
+        raise RuntimeError("Seeding needs ids returned by bulk inserts (PostgreSQL, SQLite 3.35+)")
+    rng = random.Random(seed)
+    now = timezone.now()
+    inserted = {}
+
+    def timed(table: str, insert_rows: Callable[[], array]) -> array:
+        start = time.perf_counter()
+        ids = insert_rows()
+        inserted[table] = len(ids)
+        if progress is not None:
+            progress(table, len(ids), time.perf_counter() - start)
+        return ids
+
+    # one PBKDF2 run for every user, instead of one per user
+    password_hash = make_password(password)
+    birth_start = date(1950, 1, 1)
+
+    def users() -> Iterator[User]:
+        for index in range(volumes.users):
+            username = f"{prefix}{index}"
+            yield User(
+                username=username,
+                email=f"{username}@example.com",
+                password=password_hash,
+                date_of_birth=birth_start + timedelta(days=rng.randrange(365 * 55)),
+                consent=True,
+            )
+
+    # per project: members (author first), issue count; per issue: status, comment count
+    issue_counts = spread(volumes.issues, volumes.projects, distribution, skew, rng)
+    extra_members = spread(
+        volumes.projects * max(volumes.contributors - 1, 0), volumes.projects, distribution, skew, rng
+    )
+    statuses = [*Issue.Status]
+    project_types, priorities, tags = [*Project.ProjectTypes], [*Issue.Priority], [*Issue.Tags]
+    issue_statuses = bytes(rng.randrange(len(statuses)) for _ in range(volumes.issues))
+    comment_counts = spread(volumes.comments, volumes.issues, distribution, skew, rng)
+    closed = statuses.index(Issue.Status.closed)
+
+    with transaction.atomic(using=router.db_for_write(Issue)):
+        user_ids = timed("users", lambda: insert(User, users(), batch_size))
+        members = []
+        for project_index in range(volumes.projects):
+            size = min(1 + extra_members[project_index], len(user_ids))
+            members.append(rng.sample(user_ids, size))
+
+        def projects() -> Iterator[Project]:
+            first_issue = 0
+            for project_index in range(volumes.projects):
+                issue_count = issue_counts[project_index]
+                project_statuses = issue_statuses[first_issue : first_issue + issue_count]
+                first_issue += issue_count
+                yield Project(
+                    author_id=members[project_index][0],
+                    name=sentence(rng, 3),
+                    description=sentence(rng, 12),
+                    type=rng.choice(project_types),
+                    issue_count=issue_count,
+                    open_issue_count=issue_count - project_statuses.count(closed),
+                )
+
+        project_ids = timed("projects", lambda: insert(Project, projects(), batch_size))
+
+        def contributors() -> Iterator[Contributor]:
+            for project_id, (author_id, *others) in zip(project_ids, members, strict=True):
+                yield Contributor(project_id=project_id, user_id=author_id, role=Contributor.Role.owner)
+                for user_id in others:
+                    yield Contributor(project_id=project_id, user_id=user_id)
+
+        timed("contributors", lambda: insert(Contributor, contributors(), batch_size))
+
+        # project index of each issue, for comment authors
+        issue_projects = array("I")
+
+        def issues() -> Iterator[Issue]:
+            issue_index = 0
+            for project_index, project_id in enumerate(project_ids):
+                for _ in range(issue_counts[project_index]):
+                    status = statuses[issue_statuses[issue_index]]
+                    issue_projects.append(project_index)
+                    yield Issue(
+                        project_id=project_id,
+                        author_id=rng.choice(members[project_index]),
+                        title=sentence(rng, 6),
+                        content=sentence(rng, 30),
+                        status=status,
+                        priority=rng.choice(priorities),
+                        tags=rng.choice(tags),
+                        comment_count=comment_counts[issue_index],
+                        closed_at=now if status == Issue.Status.closed else None,
+                    )
+                    issue_index += 1
+
+        issue_ids = timed("issues", lambda: insert(Issue, issues(), batch_size))
+
+        def comments() -> Iterator[Comment]:
+            for issue_index, issue_id in enumerate(issue_ids):
+                issue_members = members[issue_projects[issue_index]]
+                for _ in range(comment_counts[issue_index]):
+                    yield Comment(
+                        issue_id=issue_id,
+                        author_id=rng.choice(issue_members),
+                        title=sentence(rng, 4),
+                        content=sentence(rng, 20),
+                    )
+
+        timed("comments", lambda: insert(Comment, comments(), batch_size))
+    return inserted
@@ -0,0 +1,371 @@
+"""
+Endpoint benchmark suite: seeds a dataset with config.factories, then requests every route of config.urls with the
+DRF test client and measures latency, queries, rows read and bytes of each response (cf. bench_endpoints command).
+Commands run it in a throwaway test database: its user, signups and blacklisted tokens never reach the configured one.
+"""
+
+import json
+import platform
+import re
+import subprocess
+import time
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime, timedelta
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import django
+import factory.random
+
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.db.backends.utils import CursorWrapper
+from django.test.utils import override_settings, setup_databases, teardown_databases
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from config.factories import CommentFactory, IssueFactory, ProjectFactory, UserFactory
+from export.artifacts import build_export
+from export.models import Export
+from issue.models import Comment, Issue
+from project.models import Contributor, Project
+from user.models import AccountDeletion, User
+
+
+BENCH_USERNAME = "bench_endpoints"
+BENCH_PASSWORD = "bench-endpoints-password"
+
+# not API routes: the admin, and the docs (schema generation is a one-off cost per worker)
+DEFAULT_EXCLUDE = r"^(admin:|docs$|swagger$|redoc$)"
+
+# routes which cannot be requested in a loop
+SKIPPED = {
+    "activity:project-events": "endless event stream, cf. bench_asgi for concurrent connections",
+    "issue:issue-restore": "needs a new archived issue per request",
+}
+
+
+@dataclass(frozen=True)
+class Volumes:
+    users: int = 50
+    projects: int = 10
+    # per project
+    contributors: int = 5
+    issues: int = 20
+    # per issue
+    comments: int = 3
+
+
+@dataclass
+class Dataset:
+    """Seeded objects whose ids fill the URL kwargs of routes"""
+
+    user: User
+    url_kwargs: dict = field(default_factory=dict)
+    # counter for requests creating a new object at each call (e.g. signup)
+    sequence: int = 0
+
+    def next(self) -> int:
+        self.sequence += 1
+        return self.sequence
+
+
+@contextmanager
+def throwaway_database(verbosity: int = 0):
+    """
+    Create a test database as the test runner does (test_ prefixed name on the same server, in memory for SQLite),
+    point the default connection to it for the block, then destroy it. Reads stay on it (replicas would not have
+    the seeded rows), exports are built in a temporary directory.
+    """
+    old_config = setup_databases(verbosity, interactive=False, aliases={DEFAULT_DB_ALIAS}, serialized_aliases=set())
+    try:
+        with TemporaryDirectory() as export_root, override_settings(REPLICA_DATABASES=[], EXPORT_ROOT=export_root):
+            yield
+    finally:
+        teardown_databases(old_config, verbosity)
+
+
+def seed(volumes: Volumes, random_seed: int = 0) -> Dataset:
+    """
+    Create the dataset with the model factories. The benchmark user authors the first project and contributes to
+    every project, so it reads all of them. Faker values are reproducible for a given random_seed.
+    """
+    factory.random.reseed_random(random_seed)
+    user = UserFactory(username=BENCH_USERNAME, password=BENCH_PASSWORD)
+    others = UserFactory.create_batch(max(volumes.users - 1, 0))
+    projects = []
+    for index in range(volumes.projects):
+        author = user if index == 0 or not others else others[index % len(others)]
+        members = others[index : index + volumes.contributors]
+        projects.append(ProjectFactory(author=author, contributors=[user, *members]))
+    for project in projects:
+        authors = [user, *project.contributors.exclude(pk=user.pk)]
+        for issue_index in range(volumes.issues):
+            issue = IssueFactory(project=project, author=authors[issue_index % len(authors)])
+            CommentFactory.create_batch(volumes.comments, issue=issue, author=authors[issue_index % len(authors)])
+    return dataset(user)
+
+
+def dataset(user: User) -> Dataset:
+    """Ids of the objects read by the benchmark user, with an export and an account deletion to poll"""
+    project = user.projects.order_by("pk").first()
+    issue = project.issues.order_by("pk").first()
+    comment = issue.comments.order_by("pk").first()
+    export = Export.objects.filter(kind=Export.Kind.gdpr, target_id=user.pk, status=Export.Status.done).first()
+    if export is None or not export.path.exists():
+        # far from expiring: downloads stay allowed whatever the duration of runs
+        export = Export.objects.create(
+            kind=Export.Kind.gdpr,
+            target_id=user.pk,
+            data_version=BENCH_USERNAME,
+            expires_at=timezone.now() + timedelta(days=365),
+        )
+        build_export(export)
+    deletion = AccountDeletion.objects.filter(user_id=0).first() or AccountDeletion.objects.create(
+        user_id=0, status=AccountDeletion.Status.done
+    )
+    return Dataset(
+        user=user,
+        url_kwargs={
+            "user_id": user.pk,
+            "project_id": project.pk,
+            "issue_id": issue.pk,
+            "comment_id": comment.pk,
+            "contributor_id": Contributor.objects.filter(project=project).order_by("pk").first().pk,
+            "export_id": export.pk,
+            "deletion_id": deletion.pk,
+        },
+    )
+
+
+# request (method, data) of routes without GET, prepared out of the measured time
+REQUESTS: dict[str, Callable[[Dataset], dict]] = {
+    "auth:token_obtain_pair": lambda data: {
+        "method": "post",
+        "data": {"username": BENCH_USERNAME, "password": BENCH_PASSWORD},
+    },
+    "auth:token_refresh": lambda data: {"method": "post", "data": {"refresh": str(RefreshToken.for_user(data.user))}},
+    "auth:logout": lambda data: {"method": "post", "data": {"refresh": str(RefreshToken.for_user(data.user))}},
+    "user:signup": lambda data: {
+        "method": "post",
+        "data": {
+            "username": f"{BENCH_USERNAME}_{time.time_ns()}_{data.next()}",
+            "password": BENCH_PASSWORD,
+            "dateOfBirth": "1990-01-01",
+            "consent": True,
+        },
+    },
+    "export:create": lambda data: {"method": "post", "data": {"kind": "gdpr"}},
+}
+
+
+@dataclass(frozen=True)
+class Route:
+    name: str
+    path: str
+
+
+def iter_routes(resolver: URLResolver | None = None, namespace: str = "") -> Iterator[tuple[str, URLPattern]]:
+    """(namespaced name, pattern) of every named route"""
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern, f"{namespace}{pattern.namespace}:" if pattern.namespace else namespace)
+        elif pattern.name:
+            yield f"{namespace}{pattern.name}", pattern
+
+
+def discover_routes(data: Dataset, exclude: str = DEFAULT_EXCLUDE) -> tuple[list[Route], dict[str, str]]:
+    """Routes to benchmark, with their URL built from the dataset, and (name: reason) of the skipped ones"""
+    routes = {}
+    skipped = {}
+    for name, pattern in iter_routes():
+        kwargs = set(pattern.pattern.regex.groupindex)
+        # format suffix variants of DRF routers (.json, .csv...) are the same views
+        if "format" in kwargs or (exclude and re.search(exclude, name)):
+            continue
+        if name in SKIPPED:
+            skipped[name] = SKIPPED[name]
+            continue
+        if not has_get(pattern) and name not in REQUESTS:
+            skipped[name] = "no GET, no request body defined"
+            continue
+        try:
+            path = reverse(name, kwargs={kwarg: data.url_kwargs[kwarg] for kwarg in kwargs})
+        except KeyError as error:
+            skipped[name] = f"no seeded object for {error}"
+            continue
+        # routers of several apps share a root (api-root): the first resolved route is the one served
+        if all(route.path != path for route in routes.values()):
+            routes[name] = Route(name, path)
+    return list(routes.values()), skipped
+
+
+def has_get(pattern: URLPattern) -> bool:
+    callback = pattern.callback
+    # viewsets: actions of the route, APIView and generic views: methods of the class, other views: assumed
+    if getattr(callback, "actions", None):
+        return "get" in callback.actions
+    view_class = getattr(callback, "view_class", None) or getattr(callback, "cls", None)
+    return view_class is None or hasattr(view_class, "get")
+
+
+@dataclass
+class Counters:
+    queries: int = 0
+    rows: int = 0
+
+
+@contextmanager
+def count_database_work(counters: Counters):
+    """
+    Count queries executed and rows fetched on every connection, whatever the thread (async views run their
+    queries in a worker thread), by wrapping the cursor class methods used by the ORM.
+    """
+
+    def counted(method):
+        def wrapper(cursor, *args, **kwargs):
+            counters.queries += 1
+            return method(cursor, *args, **kwargs)
+
+        return wrapper
+
+    def fetchone(cursor):
+        row = cursor.cursor.fetchone()
+        counters.rows += row is not None
+        return row
+
+    def fetchmany(cursor, *args):
+        rows = cursor.cursor.fetchmany(*args)
+        counters.rows += len(rows)
+        return rows
+
+    def fetchall(cursor):
+        rows = cursor.cursor.fetchall()
+        counters.rows += len(rows)
+        return rows
+
+    with (
+        patch.object(CursorWrapper, "execute", counted(CursorWrapper.execute)),
+        patch.object(CursorWrapper, "executemany", counted(CursorWrapper.executemany)),
+        patch.object(CursorWrapper, "fetchone", fetchone, create=True),
+        patch.object(CursorWrapper, "fetchmany", fetchmany, create=True),
+        patch.object(CursorWrapper, "fetchall", fetchall, create=True),
+    ):
+        yield
+
+
+@dataclass
+class Result:
+    name: str
+    method: str
+    path: str
+    status: int
+    requests: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries: float
+    rows: float
+    bytes: float
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    index = min(len(sorted_values) - 1, round(percent / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def run_route(client: APIClient, route: Route, data: Dataset, iterations: int, warmup: int) -> Result:
+    """Request a route `warmup` times, then `iterations` measured times; rows, queries and bytes are means"""
+    prepare = REQUESTS.get(route.name, lambda data: {"method": "get", "data": None})
+    latencies = []
+    totals = Counters()
+    size = 0
+    for iteration in range(warmup + iterations):
+        request = prepare(data)
+        counters = Counters()
+        with count_database_work(counters):
+            start = time.perf_counter()
+            response = getattr(client, request["method"])(route.path, request["data"], format="json")
+            # streamed responses are produced while they are read
+            content = b"".join(response.streaming_content) if response.streaming else response.content
+            elapsed = (time.perf_counter() - start) * 1000
+        if iteration < warmup:
+            continue
+        latencies.append(elapsed)
+        totals.queries += counters.queries
+        totals.rows += counters.rows
+        size += len(content)
+    latencies.sort()
+    return Result(
+        name=route.name,
+        method=prepare(data)["method"].upper(),
+        path=route.path,
+        status=response.status_code,
+        requests=iterations,
+        p50_ms=round(percentile(latencies, 50), 3),
+        p95_ms=round(percentile(latencies, 95), 3),
+        p99_ms=round(percentile(latencies, 99), 3),
+        queries=totals.queries / iterations,
+        rows=totals.rows / iterations,
+        bytes=size / iterations,
+    )
+
+
+def run_suite(data: Dataset, iterations: int = 20, warmup: int = 2, exclude: str = DEFAULT_EXCLUDE) -> dict:
+    """Benchmark every route, return the report: run metadata, results per route and skipped routes"""
+    routes, skipped = discover_routes(data, exclude)
+    # before requests creating rows (signup)
+    volumes = {
+        "users": User.objects.count(),
+        "projects": Project.objects.count(),
+        "contributors": Contributor.objects.count(),
+        "issues": Issue.objects.count(),
+        "comments": Comment.objects.count(),
+    }
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(data.user).access_token}")
+    results = [run_route(client, route, data, iterations, warmup) for route in routes]
+    return {
+        "meta": {
+            "date": datetime.now(UTC).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "iterations": iterations,
+            "warmup": warmup,
+            "volumes": volumes,
+        },
+        "results": [asdict(result) for result in results],
+        "skipped": skipped,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def compare(report: dict, baseline: dict) -> list[tuple[str, str, float, float]]:
+    """(route, metric, baseline value, new value) of the metrics of routes present in both reports"""
+    previous = {result["name"]: result for result in baseline["results"]}
+    changes = []
+    for result in report["results"]:
+        if result["name"] not in previous:
+            continue
+        for metric in ("p50_ms", "p95_ms", "queries", "rows", "bytes"):
+            changes.append((result["name"], metric, previous[result["name"]][metric], result[metric]))
+    return changes
+
+
+def load_report(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
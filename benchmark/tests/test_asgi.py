@@ -0,0 +1,27 @@
+import pytest
+
+from config.factories import UserFactory
+from project.models import Project
+from user.models import User
+
+from ..management.commands.bench_asgi import BENCH_USERNAME, Command
+
+
+# ==================== ASGI benchmark Tests ====================
+
+
+@pytest.mark.django_db
+class TestAsgiBenchmarkData:
+    """Tests for the rows seeded by bench_asgi in the configured database"""
+
+    def test_only_seeded_rows_deleted(self):
+        """Success: the benchmark deletes its own user and project, never an existing account of the same name"""
+        existing = UserFactory(username=BENCH_USERNAME)
+        command = Command()
+
+        project, issue, _token = command.seed(3)
+        command.clean(project)
+
+        assert issue.project_id == project.pk
+        assert list(User.objects.values_list("pk", flat=True)) == [existing.pk]
+        assert not Project.all_objects.exists()
@@ -0,0 +1,64 @@
+from contextlib import contextmanager
+from io import StringIO
+
+import pytest
+
+from django.core.management import CommandError, call_command
+from django.db import transaction
+
+from ..compression import LevelResult, compare_levels, issue_list_pages
+from ..suite import Volumes, seed
+
+
+@pytest.fixture
+def rolled_back_database(monkeypatch):
+    """The command runs on the test database of pytest, its writes rolled back instead of creating another database"""
+
+    @contextmanager
+    def rolled_back():
+        with transaction.atomic():
+            yield
+            transaction.set_rollback(True)
+
+    monkeypatch.setattr("benchmark.management.commands.bench_compression.throwaway_database", rolled_back)
+
+
+# ==================== Compression benchmark Tests ====================
+
+
+@pytest.mark.django_db
+class TestCompressionBenchmark:
+    """Tests for the gzip levels benchmark (benchmark.compression, bench_compression command)"""
+
+    def test_levels_compared(self, settings, tmp_path):
+        """Success: every level compresses issue list pages, higher levels not larger"""
+        settings.EXPORT_ROOT = tmp_path
+        bodies = issue_list_pages(seed(Volumes(users=3, projects=1, contributors=2, issues=15, comments=1)), 5)
+
+        results = compare_levels(bodies, levels=(1, 9), iterations=1)
+
+        assert len(bodies) == 2
+        assert [result.level for result in results] == [1, 9]
+        assert results[1].compressed_bytes <= results[0].compressed_bytes < results[0].raw_bytes
+
+    def test_send_time(self):
+        """Success: time to send is compression plus transfer at the link speed"""
+        result = LevelResult(level=1, raw_bytes=4000, compressed_bytes=1000, compress_ms=0.5)
+
+        assert result.ratio == 0.25
+        assert result.send_ms(8) == pytest.approx(1.5)
+
+    def test_command(self, settings, tmp_path, rolled_back_database):
+        """Success: the command seeds a dataset and shows one line per level"""
+        settings.EXPORT_ROOT = tmp_path
+        out = StringIO()
+
+        call_command("bench_compression", issues=3, pages=1, iterations=1, levels=[1, 6], stdout=out)
+
+        lines = out.getvalue().splitlines()
+        assert [line.split()[0] for line in lines[-3:]] == ["none", "1", "6"]
+
+    def test_invalid_level_failure(self):
+        """Failure: levels are between 1 and 9"""
+        with pytest.raises(CommandError):
+            call_command("bench_compression", levels=[0])
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from django.core.management import CommandError, call_command
+
+from issue.counters import recount_issues, recount_projects
+from issue.models import Comment, Issue
+from project.models import Contributor, Project
+from user.models import User
+
+from ..seeding import SeedVolumes, seed_data, spread
+
+
+VOLUMES = SeedVolumes(users=30, projects=5, contributors=4, issues=60, comments=150)
+
+
+# ==================== Data seeding Tests ====================
+
+
+@pytest.mark.django_db
+class TestSeedData:
+    """Tests for bulk data seeding (seed_data command)"""
+
+    def test_volumes_seeded(self):
+        """Success: the requested number of rows is inserted, every project author is a contributor"""
+        inserted = seed_data(VOLUMES)
+
+        assert (inserted["users"], inserted["projects"], inserted["issues"], inserted["comments"]) == (30, 5, 60, 150)
+        assert (User.objects.count(), Issue.objects.count(), Comment.objects.count()) == (30, 60, 150)
+        # the author of each project, plus members spread around the requested mean
+        assert Contributor.objects.count() == inserted["contributors"] >= 5
+        for project in Project.objects.all():
+            assert project.contributors.filter(pk=project.author_id).exists()
+
+    def test_counters_consistent(self):
+        """Success: denormalized counters are set while seeding, nothing to repair"""
+        seed_data(VOLUMES)
+
+        assert recount_projects(list(Project.objects.values_list("pk", flat=True))) == 0
+        assert recount_issues(list(Issue.objects.values_list("pk", flat=True))) == 0
+
+    def test_authors_are_contributors(self):
+        """Success: issues and comments are written by contributors of their project"""
+        seed_data(VOLUMES)
+
+        members = set(Contributor.objects.values_list("project_id", "user_id"))
+        assert all(row in members for row in Issue.objects.values_list("project_id", "author_id"))
+        assert all(row in members for row in Comment.objects.values_list("issue__project_id", "author_id"))
+
+    def test_one_password_hash(self):
+        """Success: every user shares one precomputed hash of the given password"""
+        seed_data(VOLUMES, password="load-test-password")
+
+        assert User.objects.values("password").distinct().count() == 1
+        assert User.objects.first().check_password("load-test-password")
+
+    def test_same_seed_same_data(self):
+        """Success: the same seed produces the same data, another seed other data"""
+
+        def seeded_titles(prefix, seed):
+            seed_data(VOLUMES, prefix=prefix, seed=seed)
+            issues = Issue.objects.filter(author__username__startswith=prefix).order_by("pk")
+            return [(issue.title, issue.status, issue.comment_count) for issue in issues]
+
+        first = seeded_titles("first_", seed=1)
+        assert seeded_titles("second_", seed=1) == first
+        assert seeded_titles("third_", seed=2) != first
+
+    @pytest.mark.parametrize("distribution", ["uniform", "zipf"])
+    def test_spread(self, distribution):
+        """Success: every item is in a bucket, zipf gives a long tail"""
+        counts = spread(10000, 100, distribution, 1.1, random.Random(0))
+
+        assert sum(counts) == 10000
+        if distribution == "zipf":
+            assert max(counts) > 10 * sorted(counts)[50]
+        else:
+            assert max(counts) < 2 * min(counts)
+
+    def test_command(self):
+        """Success: the command seeds the requested volumes"""
+        call_command("seed_data", users=10, projects=2, issues=20, comments=40, distribution="uniform")
+
+        assert Issue.objects.count() == 20
+
+    def test_command_existing_prefix_failure(self):
+        """Failure: seeding twice with the same username prefix is refused"""
+        call_command("seed_data", users=2, projects=1, issues=1, comments=0)
+
+        with pytest.raises(CommandError):
+            call_command("seed_data", users=2, projects=1, issues=1, comments=0)
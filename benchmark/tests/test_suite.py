@@ -0,0 +1,101 @@
+import json
+import os
+
+from contextlib import contextmanager
+
+import pytest
+
+from django.core.management import call_command
+from django.db import transaction
+
+from config.factories import UserFactory
+from user.models import User
+
+from ..suite import BENCH_USERNAME, Counters, Volumes, count_database_work, discover_routes, run_suite, seed
+
+
+@pytest.fixture
+def bench_data(settings, tmp_path):
+    """Small dataset of the benchmark suite"""
+    settings.EXPORT_ROOT = tmp_path
+    return seed(Volumes(users=4, projects=2, contributors=2, issues=3, comments=2))
+
+
+@pytest.fixture
+def rolled_back_database(monkeypatch):
+    """The command runs on the test database of pytest, its writes rolled back instead of creating another database"""
+
+    @contextmanager
+    def rolled_back():
+        with transaction.atomic():
+            yield
+            transaction.set_rollback(True)
+
+    monkeypatch.setattr("benchmark.management.commands.bench_endpoints.throwaway_database", rolled_back)
+
+
+# ==================== Benchmark suite Tests ====================
+
+
+@pytest.mark.django_db
+class TestBenchmarkSuite:
+    """Tests for the endpoint benchmark suite (benchmark.suite, bench_endpoints command)"""
+
+    def test_routes_discovered(self, bench_data):
+        """Success: every API route is benchmarked once, format variants and endless streams are left out"""
+        routes, skipped = discover_routes(bench_data)
+
+        names = [route.name for route in routes]
+        assert {"project:project-list", "issue:comment-detail", "issue_async:issue-list", "export:download"} <= set(
+            names
+        )
+        assert "auth:token_obtain_pair" in names
+        assert len({route.path for route in routes}) == len(routes)
+        assert not any(name.startswith("admin:") for name in names)
+        assert "activity:project-events" in skipped
+
+    def test_database_work_counted(self):
+        """Success: queries executed and rows fetched are counted"""
+        UserFactory.create_batch(3)
+        counters = Counters()
+
+        with count_database_work(counters):
+            list(User.objects.all())
+            User.objects.filter(pk=0).first()
+
+        assert counters.queries == 2
+        assert counters.rows == 3
+
+    def test_command_writes_json_report(self, tmp_path, settings, rolled_back_database):
+        """Success: the command seeds a dataset, benchmarks routes and writes a report comparable to a later one"""
+        settings.EXPORT_ROOT = tmp_path
+        output = tmp_path / "report.json"
+        options = {"users": 3, "projects": 1, "issues": 2, "comments": 1, "iterations": 2, "warmup": 0}
+
+        call_command("bench_endpoints", output=str(output), **options)
+        call_command("bench_endpoints", compare=str(output), **options)
+        assert not User.objects.filter(username__startswith=BENCH_USERNAME).exists()
+
+        report = json.loads(output.read_text())
+        assert report["meta"]["volumes"]["projects"] == 1
+        result = next(result for result in report["results"] if result["name"] == "issue:issue-list")
+        assert result["status"] == 200
+        assert result["queries"] > 0
+        assert result["rows"] > 0
+        assert result["bytes"] > 0
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+class TestEndpointBenchmarks:
+    """Endpoint benchmarks on default volumes, run with pytest -m benchmark (report written to BENCH_OUTPUT if set)"""
+
+    def test_endpoints(self, settings, tmp_path):
+        """Success: every benchmarked route answers without error"""
+        settings.EXPORT_ROOT = tmp_path
+        report = run_suite(seed(Volumes()), iterations=int(os.environ.get("BENCH_ITERATIONS", 20)))
+
+        if os.environ.get("BENCH_OUTPUT"):
+            with open(os.environ["BENCH_OUTPUT"], "w") as file:
+                json.dump(report, file, indent=2)
+        assert [result["name"] for result in report["results"] if result["status"] >= 400] == []
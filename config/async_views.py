@@ -0,0 +1,195 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse
+from django.http.response import HttpResponseBase
+from django.views import View
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated, NotFound, PermissionDenied
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+
+async def authenticate(request, query_param: str | None = None):
+    """
+    Async version of JWTAuthentication.authenticate: header parsing and token validation are pure CPU work,
+    only the user lookup needs the database.
+    If query_param is given, the token may also be sent in this query parameter, for clients which cannot set
+    headers (browsers' EventSource).
+    Return AnonymousUser when no token is sent, so that permissions decide (as DRF does).
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header is not None else None
+    if raw_token is None and query_param is not None:
+        raw_token = request.GET.get(query_param, "").encode() or None
+    if raw_token is None:
+        return AnonymousUser()
+
+    # raises InvalidToken (401) on expired or malformed tokens
+    validated_token = authentication.get_validated_token(raw_token)
+    try:
+        user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+    except KeyError as error:
+        raise AuthenticationFailed(
+            "Token contained no recognizable user identification", code="token_not_valid"
+        ) from error
+
+    try:
+        user = await get_user_model().objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+    except ObjectDoesNotExist as error:
+        raise AuthenticationFailed("User not found", code="user_not_found") from error
+    if not user.is_active:
+        raise AuthenticationFailed("User is inactive", code="user_inactive")
+    return user
+
+
+class AsyncReadOnlyAPIView(View):
+    """
+    Native async list/retrieve endpoint for the ASGI deployment.
+
+    DRF views are sync: under uvicorn each request is handed to a worker thread (sync_to_async), so concurrency is
+    capped by the thread pool. Here authentication, permissions and rendering run on the event loop, and the ORM is
+    awaited through its async API (acount, aget, aiterator).
+    Responses have the same shape as the DRF viewsets (camelCase, PageNumberPagination envelope).
+
+    Subclasses set serializer_class, lookup_url_kwarg and queryset (or get_queryset()), and may override initial()
+    to load URL objects (e.g. the project). Actions return data to render, or a ready response.
+    """
+
+    queryset = None
+    serializer_class = None
+    permission_classes = [IsAuthenticated]
+    lookup_url_kwarg = None
+    # query parameter accepted as token in addition to the Authorization header
+    token_query_param = None
+    page_size = api_settings.PAGE_SIZE
+    http_method_names = ["get", "head", "options"]
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            # OPTIONS and 405 responses are handled by Django
+            return await super().dispatch(request, *args, **kwargs)
+        # HEAD is answered as GET, the server drops the body
+        return await self.get(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        """Retrieve when the URL has lookup_url_kwarg, list otherwise"""
+        try:
+            request.user = await authenticate(request, self.token_query_param)
+            # as ProjectMixin, URL objects are loaded before permissions which may rely on them
+            await self.initial(request, *args, **kwargs)
+            await self.check_permissions(request)
+            if self.lookup_url_kwarg in kwargs:
+                data = await self.retrieve(request, *args, **kwargs)
+            else:
+                data = await self.list(request, *args, **kwargs)
+        except APIException as error:
+            headers = {}
+            if isinstance(error, NotAuthenticated | AuthenticationFailed):
+                headers["WWW-Authenticate"] = JWTAuthentication().authenticate_header(request)
+            return self.render({"detail": error.detail}, status=error.status_code, headers=headers)
+        if isinstance(data, HttpResponseBase):
+            return data
+        return self.render(data)
+
+    async def initial(self, request, *args, **kwargs):
+        """Hook called after authentication, before permissions and the action"""
+
+    async def prefetch(self, objects: list) -> None:
+        """Hook called with the objects of a response before their serialization, e.g. to attach related data"""
+
+    def get_queryset(self):
+        """Objects listed and retrieved: the queryset attribute, or an override restricting it to request.user"""
+        assert self.queryset is not None, (
+            f"'{self.__class__.__name__}' should either include a `queryset` attribute, "
+            "or override the `get_queryset()` method."
+        )
+        # a new queryset per request, as GenericAPIView: results are not cached across requests
+        return self.queryset.all()
+
+    def get_serializer(self, *args, **kwargs):
+        return self.serializer_class(*args, context={"request": self.request, "view": self}, **kwargs)
+
+    def render(self, data, status=200, headers=None):
+        return HttpResponse(
+            CamelCaseJSONRenderer().render(data),
+            status=status,
+            content_type="application/json",
+            headers=headers,
+        )
+
+    # === permissions ===
+
+    async def check_permissions(self, request):
+        for permission in [permission() for permission in self.permission_classes]:
+            if hasattr(permission, "ahas_permission"):
+                allowed = await permission.ahas_permission(request, self)
+            else:
+                # permissions without async twin (e.g. IsAuthenticated) must not query the database
+                allowed = permission.has_permission(request, self)
+            if not allowed:
+                self.permission_denied(request, permission)
+
+    async def check_object_permissions(self, request, obj):
+        for permission in [permission() for permission in self.permission_classes]:
+            if hasattr(permission, "ahas_object_permission"):
+                allowed = await permission.ahas_object_permission(request, self, obj)
+            else:
+                allowed = permission.has_object_permission(request, self, obj)
+            if not allowed:
+                self.permission_denied(request, permission)
+
+    @staticmethod
+    def permission_denied(request, permission):
+        if not request.user.is_authenticated:
+            raise NotAuthenticated()
+        raise PermissionDenied(getattr(permission, "message", None))
+
+    # === actions ===
+
+    async def list(self, request, *args, **kwargs):
+        """Same envelope as PageNumberPagination: count, next, previous, results"""
+        try:
+            page_number = int(request.GET.get("page", 1))
+        except ValueError as error:
+            raise NotFound("Invalid page.") from error
+
+        queryset = self.get_queryset()
+        count = await queryset.acount()
+        start = (page_number - 1) * self.page_size
+        if page_number < 1 or (page_number > 1 and start >= count):
+            raise NotFound("Invalid page.")
+
+        # chunk_size is required by aiterator() to run prefetch_related lookups
+        objects = [obj async for obj in queryset[start : start + self.page_size].aiterator(chunk_size=self.page_size)]
+        await self.prefetch(objects)
+
+        url = request.build_absolute_uri()
+        next_link = replace_query_param(url, "page", page_number + 1) if start + self.page_size < count else None
+        if page_number == 1:
+            previous_link = None
+        elif page_number == 2:
+            previous_link = remove_query_param(url, "page")
+        else:
+            previous_link = replace_query_param(url, "page", page_number - 1)
+
+        return {
+            "count": count,
+            "next": next_link,
+            "previous": previous_link,
+            "results": self.get_serializer(objects, many=True).data,
+        }
+
+    async def retrieve(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        try:
+            obj = await queryset.aget(pk=kwargs[self.lookup_url_kwarg])
+        except ObjectDoesNotExist as error:
+            raise NotFound(f"No {queryset.model._meta.object_name} matches the given query.") from error
+        await self.check_object_permissions(request, obj)
+        await self.prefetch([obj])
+        return self.get_serializer(obj).data
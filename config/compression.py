@@ -0,0 +1,114 @@
+"""
+Gzip compression of API responses. List pages rendered by CamelCaseJSONRenderer repeat the same keys in every object:
+they shrink to a fraction of their size, for a few hundred microseconds of CPU per page (cf. bench_compression
+command to choose settings.GZIP_LEVEL).
+
+Only compressed: responses of settings.GZIP_PATH_PREFIXES, of a settings.GZIP_CONTENT_TYPES type, of at least
+settings.GZIP_MIN_BYTES (smaller ones fit in a few packets anyway), to clients accepting gzip. Streamed CSV exports are
+compressed chunk by chunk as they are sent; file downloads (exports, with range requests) and already encoded
+responses are left as they are.
+"""
+
+import gzip
+import re
+import zlib
+
+from collections.abc import AsyncIterator, Iterator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse
+from django.utils.cache import patch_vary_headers
+
+
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+# gzip header and trailer (wbits 16 + 15) with raw deflate in between
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def compress_chunks(chunks: Iterator[bytes], level: int) -> Iterator[bytes]:
+    """Gzip stream of chunks, flushed after each one so the client receives them as they are produced"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    for chunk in chunks:
+        if data := compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH):
+            yield data
+    yield compressor.flush()
+
+
+async def acompress_chunks(chunks: AsyncIterator[bytes], level: int) -> AsyncIterator[bytes]:
+    """Async twin of compress_chunks, for the streamed responses of ASGI requests"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    async for chunk in chunks:
+        if data := compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH):
+            yield data
+    yield compressor.flush()
+
+
+class GZipMiddleware:
+    """
+    Compress API responses with gzip (cf. module docstring). Disabled when GZIP_ENABLED is False.
+    Placed after MetricsMiddleware: response sizes observed by metrics are the ones sent on the wire.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.GZIP_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.level = settings.GZIP_LEVEL
+        self.min_bytes = settings.GZIP_MIN_BYTES
+        self.content_types = frozenset(settings.GZIP_CONTENT_TYPES)
+        self.path_prefixes = tuple(settings.GZIP_PATH_PREFIXES)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def is_compressible(self, request, response) -> bool:
+        """Whether a response is worth compressing, whatever the client accepts"""
+        if not request.path.startswith(self.path_prefixes) or response.has_header("Content-Encoding"):
+            return False
+        # ranges of downloads are byte offsets in the file
+        if isinstance(response, FileResponse) or response.status_code == 206:
+            return False
+        if response.get("Content-Type", "").split(";", 1)[0].strip() not in self.content_types:
+            return False
+        return response.streaming or len(response.content) >= self.min_bytes
+
+    def compress(self, request, response):
+        if not self.is_compressible(request, response):
+            return response
+        # caches must keep compressed and uncompressed versions apart
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if not ACCEPTS_GZIP.search(request.META.get("HTTP_ACCEPT_ENCODING", "")):
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_chunks(response.streaming_content, self.level)
+            else:
+                response.streaming_content = compress_chunks(response.streaming_content, self.level)
+            del response["Content-Length"]
+        else:
+            compressed = gzip.compress(response.content, compresslevel=self.level, mtime=0)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        # the compressed body is not byte-for-byte the one the ETag was computed from
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = "gzip"
+        return response
@@ -0,0 +1,64 @@
+import random
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+@dataclass
+class RequestRouting:
+    """Routing state of the current request, set by ReplicaRoutingMiddleware"""
+
+    use_replicas: bool = False
+    # set as soon as the request writes to the primary, used to pin the client to the primary afterward
+    has_written: bool = False
+
+
+_request_routing: ContextVar[RequestRouting | None] = ContextVar("request_routing", default=None)
+
+
+def get_request_routing() -> RequestRouting | None:
+    return _request_routing.get()
+
+
+def set_request_routing(routing: RequestRouting | None):
+    """Set routing state for the current context, return a token to restore the previous one"""
+    return _request_routing.set(routing)
+
+
+def reset_request_routing(token):
+    _request_routing.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Send reads to a read replica (settings.REPLICA_DATABASES) and writes to the primary.
+
+    Replicas are only used inside a request allowed to by ReplicaRoutingMiddleware (safe method and client not
+    pinned to the primary). Everything else (management commands, background jobs, writes) uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.REPLICA_DATABASES
+        routing = get_request_routing()
+        if not replicas or routing is None or not routing.use_replicas or routing.has_written:
+            return DEFAULT_DB_ALIAS
+        # reads inside a transaction opened on the primary must see its uncommitted writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        routing = get_request_routing()
+        if routing is not None:
+            routing.has_written = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # primary and replicas hold the same data
+        databases = {DEFAULT_DB_ALIAS, *settings.REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,75 @@
+import time
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.db import connections, router
+from django.db.backends.signals import connection_created
+from django.db.models import QuerySet
+
+
+def raw_delete(queryset: QuerySet) -> int:
+    """
+    Delete rows of queryset with a single DELETE statement and return the number of deleted rows.
+
+    Unlike QuerySet.delete(), no object is loaded in memory: no signal is sent and no on_delete rule (CASCADE,
+    SET_NULL, ...) is applied. Related rows must be deleted (or updated) first.
+    """
+    # same method used by Django deletion Collector for its "fast deletes"
+    return queryset._raw_delete(router.db_for_write(queryset.model))
+
+
+@dataclass
+class QueryCount:
+    queries: int = 0
+    seconds: float = 0.0
+
+
+# counts in progress (nested ones included), in a context variable: it follows requests into sync_to_async threads
+_query_counts: ContextVar[tuple[QueryCount, ...]] = ContextVar("query_counts", default=())
+
+
+def count_query(execute, sql, params, many, context):
+    counts = _query_counts.get()
+    if not counts:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        for count in counts:
+            count.queries += 1
+            count.seconds += elapsed
+
+
+def install_query_counter(connection, **kwargs):
+    """Wrap the queries of a connection with count_query (receiver of the connection_created signal)"""
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+def install_query_counters():
+    """Wrap the queries of the connections open in this thread, and of every connection opened from now on"""
+    for connection in connections.all(initialized_only=True):
+        install_query_counter(connection)
+    connection_created.connect(install_query_counter)
+
+
+@contextmanager
+def count_queries(install: bool = True) -> Iterator[QueryCount]:
+    """
+    Count queries run on every database until exit, and their duration, including from sync_to_async threads of the
+    context. Middlewares call install_query_counters() once at startup and pass install=False: looking up the open
+    connections is most of the cost of a count.
+    """
+    if install:
+        install_query_counters()
+    count = QueryCount()
+    token = _query_counts.set((*_query_counts.get(), count))
+    try:
+        yield count
+    finally:
+        _query_counts.reset(token)
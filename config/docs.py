@@ -1,8 +1,30 @@
 # variables created for docs precisions
+#
+# docs metadata (@extend_schema...) of each app lives in its docs.py module, not on its views: drf_spectacular and
+# the metadata are only imported when the schema is first generated, not at every worker start
 from enum import Enum
 
+from django.utils.module_loading import autodiscover_modules
+from drf_spectacular import generators
+from drf_spectacular.openapi import AutoSchema
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter
+from rest_framework.settings import api_settings
+
+
+def load_docs():
+    """Apply the docs metadata of every app to its views (once: modules are only executed on first import)"""
+    # not set in REST_FRAMEWORK settings, cf. SPECTACULAR_SETTINGS
+    api_settings.DEFAULT_SCHEMA_CLASS = AutoSchema
+    autodiscover_modules("docs")
+
+
+class SchemaGenerator(generators.SchemaGenerator):
+    """Loads docs metadata before the first schema generation: docs views, spectacular command, deploy check"""
+
+    def __init__(self, *args, **kwargs):
+        load_docs()
+        super().__init__(*args, **kwargs)
 
 
 class DocsTypingParameters(Enum):
@@ -25,3 +47,25 @@ class DocsTypingParameters(Enum):
     comment_id = OpenApiParameter(
         name="comment_id", type=OpenApiTypes.INT, location=OpenApiParameter.PATH, description="Comment id"
     )
+
+    include_archived = OpenApiParameter(
+        name="include_archived",
+        type=OpenApiTypes.BOOL,
+        location=OpenApiParameter.QUERY,
+        description="Include archived (old closed) issues",
+    )
+
+    csv_format = OpenApiParameter(
+        name="format",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        enum=["json", "csv"],
+        description="Response format",
+    )
+
+    csv_all = OpenApiParameter(
+        name="all",
+        type=OpenApiTypes.BOOL,
+        location=OpenApiParameter.QUERY,
+        description="With format=csv: export every row at once, not paginated",
+    )
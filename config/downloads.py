@@ -0,0 +1,102 @@
+import os
+import re
+
+from pathlib import Path
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .streaming import file_response
+
+
+# a single range: first-last, first- (to the end) or -length (suffix)
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiableError(ValueError):
+    pass
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    First and last byte positions of a `Range: bytes=...` header, None when it is ignored: invalid or several ranges
+    (the whole file is sent). Raises RangeNotSatisfiableError when the range starts beyond the file.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if match is None or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiableError(header)
+        return max(size - length, 0), size - 1
+    first = int(first)
+    if last and int(last) < first:
+        return None
+    if first >= size:
+        raise RangeNotSatisfiableError(header)
+    return first, min(int(last), size - 1) if last else size - 1
+
+
+class FileRange:
+    """Read-only view of `length` bytes of a file from `start`: FileResponse then sends only this part"""
+
+    def __init__(self, file, start: int, length: int):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.file.read(size) if size > 0 else b""
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def serve_file(request, path: Path, etag: str, filename: str, content_type: str) -> HttpResponse:
+    """
+    Download of a file as an attachment, with an ETag and range requests, so an interrupted download resumes.
+    - If-None-Match with the current ETag: 304, nothing is sent again
+    - Range: 206 with a single range of bytes, 416 when it starts beyond the file. Ignored (whole file sent) when
+      If-Range does not match the current ETag, i.e. the file changed since the first part was downloaded
+    Raises FileNotFoundError if the file does not exist.
+    """
+    etag = quote_etag(etag)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    file = path.open("rb")
+    size = os.fstat(file.fileno()).st_size
+    byte_range = None
+    if "HTTP_RANGE" in request.META and request.META.get("HTTP_IF_RANGE", etag) == etag:
+        try:
+            byte_range = parse_range(request.META["HTTP_RANGE"], size)
+        except RangeNotSatisfiableError:
+            file.close()
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if byte_range is None:
+        response = file_response(request, file, as_attachment=True, filename=filename, content_type=content_type)
+    else:
+        first, last = byte_range
+        response = file_response(
+            request,
+            FileRange(file, first, last - first + 1),
+            status=206,
+            as_attachment=True,
+            filename=filename,
+            content_type=content_type,
+        )
+        response["Content-Range"] = f"bytes {first}-{last}/{size}"
+        response["Content-Length"] = last - first + 1
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    return response
@@ -0,0 +1,60 @@
+import csv
+import hashlib
+
+from collections.abc import Iterable, Iterator
+from datetime import date
+
+from django.db.models import QuerySet
+
+from .renderers import Echo, escape_formula
+
+
+# rows read per DB round trip, and written per chunk of an export
+EXPORT_CHUNK_SIZE = 2000
+
+# part of every data version: bumped when the content of exports changes for the same data, to rebuild them
+EXPORT_FORMAT_VERSION = 2
+
+# (section name, header, rows)
+Section = tuple[str, list[str], Iterator]
+
+
+def values(queryset: QuerySet, fields: list[str]) -> Iterator[tuple]:
+    # values_list() and iterator(): plain tuples read chunk by chunk, neither model instances nor a result cache
+    return queryset.order_by("pk").values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def chain_archived(queryset: QuerySet, archived_queryset: QuerySet, fields: list[str]) -> Iterator[tuple]:
+    """Rows of a table then of its archive table, with an "archived" flag as last value"""
+    for row in values(queryset, fields):
+        yield (*row, False)
+    for row in values(archived_queryset, fields):
+        yield (*row, True)
+
+
+def format_value(value):
+    # same format as the JSON API, text escaped for spreadsheets as in CSVRenderer
+    return value.isoformat() if isinstance(value, date) else escape_formula(value)
+
+
+def data_version(*parts) -> str:
+    """Fingerprint of the data an export is built from: an export is rebuilt once it changes"""
+    return hashlib.sha256(repr((EXPORT_FORMAT_VERSION, parts)).encode()).hexdigest()
+
+
+def stream_sections(sections: Iterable[Section]) -> Iterator[str]:
+    """
+    Multi-section CSV: a `[section]` line, a header line, rows, an empty line.
+
+    Rows are read with chunked iterators and yielded by chunks, so memory stays constant whatever the number of rows.
+    """
+    writer = csv.writer(Echo())
+    for name, header, rows in sections:
+        lines = [writer.writerow([f"[{name}]"]), writer.writerow(header)]
+        for row in rows:
+            lines.append(writer.writerow([format_value(value) for value in row]))
+            if len(lines) >= EXPORT_CHUNK_SIZE:
+                yield "".join(lines)
+                lines = []
+        lines.append(writer.writerow([]))
+        yield "".join(lines)
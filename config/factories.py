@@ -3,7 +3,7 @@ import factory
 from faker import Faker
 
 from issue.models import Comment, Issue
-from project.models import Project
+from project.models import Contributor, Project
 from user.models import User
 
 
@@ -57,7 +57,7 @@ class ProjectFactory(factory.django.DjangoModelFactory):
             return
 
         if self.author:
-            self.contributors.add(self.author)
+            self.contributors.add(self.author, through_defaults={"role": Contributor.Role.owner})
 
         # Add additional contributors if provided
         if extracted:
@@ -87,3 +87,15 @@ class CommentFactory(factory.django.DjangoModelFactory):
     issue = factory.SubFactory(IssueFactory)
     # Do not forget to set author manually as Factory directly create instance in DB not using serializer which
     # usually set the author automatically
+
+
+def create_users(count: int) -> list[User]:
+    """
+    Insert users at once, with unique usernames and no usable password: for tests needing many users who never
+    log in (password hashing is the slowest part of UserFactory).
+    """
+    users = UserFactory.build_batch(count)
+    for index, user in enumerate(users):
+        user.username = f"{user.username}_{fake.unique.random_number(digits=9)}_{index}"
+        user.set_unusable_password()
+    return User.objects.bulk_create(users)
@@ -1,30 +1,45 @@
 from rest_framework import permissions
 
+from project.models import Project
+from project.roles import Permission
+
+
+# permissions are bitmasks of the role of the user, loaded with the project (cf. project.roles): checks run no query,
+# so they serve config.async_views as well
+
 
 class IsObjectAuthor(permissions.BasePermission):
     """
-    Custom permission: only allows users to write.delete Project, Issues, and Comments if they are the author of the
-    object.
+    Custom permission: only allows users to read/write/delete Issues and Comments if they are the author of the
+    object (and may still contribute to its project, to write). A Project is read, written and deleted by its owners
+    only, other members see it in the list only.
     """
 
     # no overwrite has_permission as this one rules safe methods only on request
-    # to read only an object, only authenticated user is required
+    # to list objects, only authenticated user is required
     # yet views filters objects by user_id
     # so it is not a question of permissions, but of views filtering
 
-    # Nevertheless, for write methods, only the author can modify the object
     def has_object_permission(self, request, view, obj):
-        if hasattr(obj, "author"):
-            return obj.author == request.user
-        else:
+        if isinstance(obj, Project):
+            return bool(obj.permissions(request.user) & Permission.MANAGE_PROJECT)
+        if not hasattr(obj, "author_id"):
             # if object has no author attribute, it is not concerned by this permission
             # example: Contributor object has no author attribute
             return True
 
+        # ids are compared: the author is never lazy loaded
+        if obj.author_id != request.user.id:
+            return False
+        # authors demoted to readers keep read access to their objects only
+        return request.method in permissions.SAFE_METHODS or bool(
+            view.project.permissions(request.user) & Permission.CONTRIBUTE
+        )
+
 
 class IsProjectContributor(permissions.BasePermission):
     """
-    Custom permission: only allows project contributors or author to create issues/comments.
+    Custom permission: only allows project members who may contribute (author included) to create issues/comments.
     """
 
     def has_permission(self, request, view):
@@ -32,11 +47,10 @@ class IsProjectContributor(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        # Allow write (POST) methods only if user is a contributor or author of the project
+        # Allow write (POST) methods only if user may contribute to the project (readers may not)
         project = getattr(view, "project", None)
 
         if not project:
             return False
 
-        # Check if user is a contributor or author of the project
-        return project.contributors.filter(id=request.user.id).exists() or project.author == request.user
+        return bool(project.permissions(request.user) & Permission.CONTRIBUTE)
@@ -0,0 +1,136 @@
+import math
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.utils.module_loading import import_string
+
+from .db_routers import RequestRouting, reset_request_routing, set_request_routing
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Allow reads of safe-method requests to go to read replicas (see config.db_routers.ReplicaRouter).
+
+    Once a client has written to the primary, it gets a cookie pinning its reads to the primary for
+    settings.REPLICA_PIN_SECONDS, so it reads its own writes despite replication lag. The end of the pin is also sent
+    in the settings.REPLICA_PIN_HEADER header, which clients without cookies send back with their next requests.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        routing = self.get_routing(request)
+        token = set_request_routing(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_request_routing(token)
+        return self.pin_if_written(routing, response)
+
+    async def __acall__(self, request):
+        routing = self.get_routing(request)
+        token = set_request_routing(routing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            reset_request_routing(token)
+        return self.pin_if_written(routing, response)
+
+    @staticmethod
+    def is_pinned(request) -> bool:
+        if settings.REPLICA_PIN_COOKIE in request.COOKIES:
+            return True
+        try:
+            return float(request.headers.get(settings.REPLICA_PIN_HEADER, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def get_routing(self, request) -> RequestRouting:
+        return RequestRouting(use_replicas=request.method in SAFE_METHODS and not self.is_pinned(request))
+
+    @staticmethod
+    def pin_if_written(routing: RequestRouting, response):
+        if routing.has_written and settings.REPLICA_DATABASES:
+            response[settings.REPLICA_PIN_HEADER] = str(math.ceil(time.time() + settings.REPLICA_PIN_SECONDS))
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class BrowserOnlyMiddleware:
+    """
+    Run settings.BROWSER_MIDDLEWARE (sessions, CSRF, authentication, messages, clickjacking: needed by the admin
+    only) for requests outside settings.API_PATH_PREFIXES. API requests are authenticated by their JWT and skip
+    them: no session or CSRF cookie handling, no Vary: Cookie, one call instead of five middlewares.
+
+    Django's handler only calls the hooks of the middlewares of settings.MIDDLEWARE: process_view hooks of browser
+    middlewares (CSRF check) are called from this one's; other hooks are not supported.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.api_prefixes = tuple(settings.API_PATH_PREFIXES)
+
+        # browser middlewares wrap get_response as Django's handler would: first one outermost. They must support
+        # the mode of get_response (as Django's MiddlewareMixin ones do)
+        self.view_hooks = []
+        handler = get_response
+        for middleware_path in reversed(settings.BROWSER_MIDDLEWARE):
+            try:
+                middleware = import_string(middleware_path)(handler)
+            except MiddlewareNotUsed:
+                continue
+            if hasattr(middleware, "process_exception") or hasattr(middleware, "process_template_response"):
+                raise ImproperlyConfigured(f"{middleware_path}: only process_view hooks run in BROWSER_MIDDLEWARE")
+            if hasattr(middleware, "process_view"):
+                self.view_hooks.insert(0, middleware.process_view)
+            handler = middleware
+        self.browser_handler = handler
+
+    def is_api(self, request) -> bool:
+        return request.path_info.startswith(self.api_prefixes)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.get_response(request) if self.is_api(request) else self.browser_handler(request)
+
+    async def __acall__(self, request):
+        if self.is_api(request):
+            return await self.get_response(request)
+        return await self.browser_handler(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_api(request):
+            return None
+        for process_view in self.view_hooks:
+            response = process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
@@ -1,7 +1,11 @@
 from rest_framework.exceptions import NotFound
+from rest_framework.settings import api_settings
 
 from project.models import Project
 
+from .renderers import CSVRenderer
+from .streaming import streaming_response
+
 
 class ProjectMixin:
     """
@@ -21,9 +25,43 @@ class ProjectMixin:
 
         if project_id:
             try:
-                self.project = Project.objects.get(id=project_id)
+                # with the role of the user: permission checks run no query (cf. project.roles)
+                self.project = Project.objects.with_role_of(request.user).get(id=project_id)
             except Project.DoesNotExist as error:
                 raise NotFound(f"Project with id {project_id} does not exist.") from error
 
         # once self.project is set, call super to proceed with view initialization and permissions
         super().initial(request, *args, **kwargs)
+
+
+class CSVExportMixin:
+    """
+    Mixin adding CSV to list actions of a viewset: `?format=csv` renders the requested page,
+    `?format=csv&all=true` exports every row at once.
+
+    A full export is not paginated: rows are read by chunks with queryset.iterator() and written to a streamed
+    response as they are read, so memory stays constant whatever the number of rows.
+    """
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CSVRenderer]
+    # rows read per DB round trip during a full export
+    csv_export_chunk_size = 2000
+
+    def is_full_export(self) -> bool:
+        requested_all = self.request.query_params.get("all", "").lower() in ("true", "1")
+        return requested_all and self.request.accepted_renderer.format == "csv"
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_full_export():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # one serializer for every row: no per-row serializer instantiation
+        serializer = self.get_serializer()
+        fields = [name for name, field in serializer.fields.items() if not field.write_only]
+        rows = map(serializer.to_representation, queryset.iterator(chunk_size=self.csv_export_chunk_size))
+        response = streaming_response(
+            request, request.accepted_renderer.stream(rows, fields), content_type="text/csv; charset=utf-8"
+        )
+        response["Content-Disposition"] = f'attachment; filename="{self.basename}.csv"'
+        return response
@@ -0,0 +1,108 @@
+"""
+Query budgets: the maximum number of queries a view action may run, whatever the number of rows it reads.
+
+Viewsets declare budgets per action in a `query_budgets` class attribute, other views per HTTP method:
+
+    class IssueModelViewSet(ModelViewSet):
+        query_budgets = {"list": 5, "retrieve": 4, ...}
+
+or with the @query_budget decorator on the action or handler method itself. QueryBudgetMiddleware counts the
+queries of each request and logs (or raises, cf. settings.QUERY_BUDGET_MODE) when its view goes over budget.
+"""
+
+import logging
+
+from collections.abc import Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .db_utils import count_queries, install_query_counters
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceededError(AssertionError):
+    """A view ran more queries than its budget (raised in "raise" mode, meant for tests)"""
+
+
+def query_budget(queries: int) -> Callable:
+    """Decorator declaring the budget of a viewset action or of a view handler method"""
+
+    def decorator(method: Callable) -> Callable:
+        method.query_budget = queries
+        return method
+
+    return decorator
+
+
+def view_action(view_func: Callable, method: str) -> tuple[type | None, str | None]:
+    """(view class, action) served by a view function for an HTTP method: action of viewsets, method otherwise"""
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    actions = getattr(view_func, "actions", None)
+    if actions is not None:
+        return view_class, actions.get(method.lower())
+    return view_class, method.lower()
+
+
+def get_query_budget(view_func: Callable, method: str) -> int | None:
+    """Budget declared for a view function and an HTTP method, None if there is none"""
+    view_class, action = view_action(view_func, method)
+    if view_class is None or action is None:
+        return None
+    budget = getattr(view_class, "query_budgets", {}).get(action)
+    if budget is None:
+        budget = getattr(getattr(view_class, action, None), "query_budget", None)
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the queries of every request, on every database, and compare them with the budget of the view.
+
+    Over budget, a warning is logged ("log" mode) or QueryBudgetExceededError is raised ("raise" mode, so tests
+    fail on the request at fault). Disabled in "off" mode. Queries of streamed content, run once the response has
+    left the middleware, are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if settings.QUERY_BUDGET_MODE == "off":
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install_query_counters()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        with count_queries(install=False) as count:
+            response = self.get_response(request)
+        self.check_budget(request, count.queries)
+        return response
+
+    async def __acall__(self, request):
+        with count_queries(install=False) as count:
+            response = await self.get_response(request)
+        self.check_budget(request, count.queries)
+        return response
+
+    @staticmethod
+    def check_budget(request, queries: int):
+        match = request.resolver_match
+        if match is None:
+            return
+        budget = get_query_budget(match.func, request.method)
+        if budget is None or queries <= budget:
+            return
+        message = f"{request.method} {request.path} ({match.view_name}) ran {queries} queries, budget is {budget}"
+        if settings.QUERY_BUDGET_MODE == "raise":
+            raise QueryBudgetExceededError(message)
+        logger.warning(message)
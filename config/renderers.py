@@ -0,0 +1,77 @@
+import csv
+
+from collections.abc import Iterable, Iterator
+
+from djangorestframework_camel_case.util import camelize
+from rest_framework import renderers
+
+
+class Echo:
+    """File-like object returning what is written: csv.writer then produces lines without buffering them"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+# first characters making spreadsheets (Excel, LibreOffice, Google Sheets) evaluate a cell as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_formula(value):
+    """Text cells a spreadsheet would run as a formula (CSV injection) are prefixed with ', so they show as typed"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def flatten(data: dict, prefix: str = "") -> dict:
+    """One column per leaf value: {"user": {"id": 1}} becomes {"user.id": 1}. Values are escaped for spreadsheets."""
+    flat = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = escape_formula(value)
+    return flat
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    """
+    CSV rendering of objects, with the camelCase field names of the JSON API and nested objects flattened.
+
+    render() renders a response at once: one object, a list, or a page of results (?format=csv on a paginated list).
+    stream() writes rows as they are produced, for full exports (cf. config.mixins.CSVExportMixin).
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+    # lines per chunk written by stream()
+    chunk_size = 500
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return ""
+        if isinstance(data, dict):
+            # page of a paginated list, or a single object (detail, error)
+            data = data.get("results", [data])
+        return "".join(self.stream(data))
+
+    def stream(self, rows: Iterable[dict], fields: list[str] | None = None) -> Iterator[str]:
+        """CSV lines of rows, by chunks. Columns are the keys of the first row, or `fields` if there is no row."""
+        writer = csv.writer(Echo())
+        header = None
+        lines = []
+        for row in rows:
+            row = flatten(camelize(row))
+            if header is None:
+                header = list(row)
+                lines.append(writer.writerow(header))
+            lines.append(writer.writerow([row.get(column) for column in header]))
+            if len(lines) >= self.chunk_size:
+                yield "".join(lines)
+                lines = []
+        if header is None and fields:
+            lines.append(writer.writerow(camelize(dict.fromkeys(fields))))
+        if lines:
+            yield "".join(lines)
@@ -0,0 +1,422 @@
+"""
+Production launcher: preloads Django once, then forks uvicorn workers sharing the listening socket.
+
+    python -m config.server --host 0.0.0.0 --port 8000 --workers auto
+    python -m config.server --stats
+
+`uvicorn --workers N` spawns N fresh interpreters which each import Django and the whole project. Here the master
+imports and warms the application before forking, so workers start at once and share its memory pages
+copy-on-write. The master then supervises workers:
+- a worker which exits (crash, or max requests reached) is replaced
+- SIGHUP: rolling restart, workers are replaced one by one, each new worker being ready before the old one stops
+  (workers are forked from the master: code upgrades need a new master, i.e. a new container)
+- SIGTERM/SIGINT: graceful shutdown
+- SIGUSR1: log per-worker stats (also readable with --stats)
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import logging
+import math
+import os
+import random
+import select
+import signal
+import socket
+import sys
+import tempfile
+import time
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+logger = logging.getLogger("config.server")
+
+DEFAULT_STATS_DIR = os.path.join(tempfile.gettempdir(), "ocpy10-serve")
+# seconds between two writes of a worker stats file
+STATS_INTERVAL = 5
+
+
+# === worker sizing ===
+
+
+def recommended_workers(cpu_count: int, sync_ratio: float) -> int:
+    """
+    Number of worker processes for a given share of requests served by sync views.
+
+    Async views only use the event loop: one worker per core keeps every core busy. Sync views (DRF) run in
+    threads of the worker, which spend most of their time waiting for the DB but contend for the worker's GIL
+    while they compute: more processes than cores keep cores busy meanwhile, up to the classic 2 x cores + 1
+    for a fully sync application.
+    """
+    sync_ratio = min(max(sync_ratio, 0.0), 1.0)
+    return max(1, math.floor(cpu_count * (1 + sync_ratio) + sync_ratio))
+
+
+def available_cpus() -> int:
+    # CPUs this process may run on (container cpusets), not the host count
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# === per-worker stats ===
+
+
+class WorkerStatsMiddleware:
+    """ASGI middleware counting the requests of this worker, written as JSON in stats_dir/<pid>.json"""
+
+    def __init__(self, app, stats_dir: str, max_requests: int | None = None):
+        self.app = app
+        self.stats_dir = stats_dir
+        self.max_requests = max_requests
+        self.started_at = time.time()
+        self.requests = 0
+        self.in_flight = 0
+        self.total_ms = 0.0
+        self.flusher: asyncio.Task | None = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        if self.flusher is None:
+            self.flusher = asyncio.create_task(self.flush_periodically())
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+            self.requests += 1
+            self.total_ms += (time.perf_counter() - start) * 1000
+
+    def snapshot(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "started_at": self.started_at,
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "avg_ms": round(self.total_ms / self.requests, 2) if self.requests else None,
+            "max_requests": self.max_requests,
+            "rss_kb": current_rss_kb(),
+        }
+
+    def flush(self):
+        os.makedirs(self.stats_dir, exist_ok=True)
+        path = os.path.join(self.stats_dir, f"{os.getpid()}.json")
+        # atomic replace: readers never see a partial file
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(self.snapshot(), file)
+        os.replace(f"{path}.tmp", path)
+
+    async def flush_periodically(self):
+        while True:
+            self.flush()
+            await asyncio.sleep(STATS_INTERVAL)
+
+
+def flush_metrics():
+    """Write the last metrics of an exiting worker, so that /metrics still counts them (cf. metrics.store)"""
+    from django.conf import settings
+
+    if settings.METRICS_ENABLED:
+        from metrics.middleware import store
+
+        store.flush(Path(settings.METRICS_DIR))
+
+
+def current_rss_kb() -> int | None:
+    """Resident memory of this process (Linux), shared copy-on-write pages included"""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def read_stats(stats_dir: str) -> list[dict]:
+    stats = []
+    if os.path.isdir(stats_dir):
+        for name in sorted(os.listdir(stats_dir)):
+            if name.endswith(".json"):
+                try:
+                    with open(os.path.join(stats_dir, name)) as file:
+                        stats.append(json.load(file))
+                except (OSError, ValueError):
+                    continue
+    return stats
+
+
+def format_stats(stats: list[dict]) -> str:
+    lines = [f"{'pid':>8}{'uptime s':>10}{'requests':>10}{'in flight':>10}{'avg ms':>10}{'max req':>10}{'rss MB':>8}"]
+    for worker in stats:
+        rss = f"{worker['rss_kb'] / 1024:.0f}" if worker.get("rss_kb") else "-"
+        lines.append(
+            f"{worker['pid']:>8}{time.time() - worker['started_at']:>10.0f}{worker['requests']:>10}"
+            f"{worker['in_flight']:>10}{worker['avg_ms'] if worker['avg_ms'] is not None else '-':>10}"
+            f"{worker['max_requests'] or '-':>10}{rss:>8}"
+        )
+    return "\n".join(lines)
+
+
+# === master ===
+
+
+def preload():
+    """Import and warm everything a request needs, so that forked workers inherit it"""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    from django.db import connections
+    from django.urls import get_resolver
+    from rest_framework.settings import api_settings
+
+    from config.asgi import application
+
+    # imports every urls, views, serializers and permissions module
+    get_resolver().url_patterns  # noqa: B018
+    # DRF resolves its default classes lazily, on first request
+    for setting in (
+        "DEFAULT_RENDERER_CLASSES",
+        "DEFAULT_PARSER_CLASSES",
+        "DEFAULT_AUTHENTICATION_CLASSES",
+        "DEFAULT_PERMISSION_CLASSES",
+        "DEFAULT_PAGINATION_CLASS",
+    ):
+        getattr(api_settings, setting)
+    # a DB connection must never be shared by forked processes
+    connections.close_all()
+    # objects created so far are never freed: keep the GC from touching (thus copying) their pages in workers
+    gc.collect()
+    gc.freeze()
+    return application
+
+
+@dataclass
+class Worker:
+    pid: int
+    ready_fd: int
+    started_at: float = field(default_factory=time.monotonic)
+
+
+class Master:
+    def __init__(self, application, listener: socket.socket, options):
+        self.application = application
+        self.listener = listener
+        self.options = options
+        self.workers: dict[int, Worker] = {}
+        self.stopping = False
+        self.rolling = False
+        self.show_stats = False
+
+    # --- workers ---
+
+    def spawn(self) -> Worker:
+        ready_read, ready_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_read)
+            self.run_worker(ready_write)
+            os._exit(0)
+        os.close(ready_write)
+        worker = Worker(pid, ready_read)
+        self.workers[pid] = worker
+        logger.info("Worker %s started", pid)
+        return worker
+
+    def run_worker(self, ready_fd: int):
+        import uvicorn
+
+        # the master handlers must not run in workers, uvicorn installs its own
+        for signum in (signal.SIGHUP, signal.SIGUSR1, signal.SIGCHLD):
+            signal.signal(signum, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        max_requests = self.options.max_requests or None
+        if max_requests:
+            # jitter: workers started together must not all restart together
+            max_requests += random.randint(0, self.options.max_requests_jitter)
+        app = WorkerStatsMiddleware(self.application, self.options.stats_dir, max_requests)
+
+        class Server(uvicorn.Server):
+            async def startup(self, sockets=None):
+                await super().startup(sockets)
+                app.flush()
+                os.write(ready_fd, b"1")
+                os.close(ready_fd)
+
+        config = uvicorn.Config(
+            app,
+            lifespan="off",
+            limit_max_requests=max_requests,
+            timeout_graceful_shutdown=self.options.graceful_timeout,
+            timeout_keep_alive=self.options.keep_alive,
+            access_log=False,
+            log_level=self.options.log_level,
+        )
+        try:
+            Server(config).run(sockets=[self.listener])
+        finally:
+            app.flush()
+            flush_metrics()
+
+    def wait_ready(self, worker: Worker) -> bool:
+        readable, _, _ = select.select([worker.ready_fd], [], [], self.options.graceful_timeout)
+        return bool(readable) and os.read(worker.ready_fd, 1) == b"1"
+
+    def reap(self) -> list[int]:
+        """Collect exited workers, return their pids"""
+        exited = []
+        while self.workers:
+            try:
+                pid, _status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            worker = self.workers.pop(pid, None)
+            if worker is not None:
+                os.close(worker.ready_fd)
+                self.remove_stats(pid)
+                exited.append(pid)
+        return exited
+
+    def remove_stats(self, pid: int):
+        with contextlib.suppress(OSError):
+            os.unlink(os.path.join(self.options.stats_dir, f"{pid}.json"))
+
+    def stop_worker(self, pid: int):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        deadline = time.monotonic() + self.options.graceful_timeout + 5
+        while pid in self.workers and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.05)
+        if pid in self.workers:
+            os.kill(pid, signal.SIGKILL)
+        logger.info("Worker %s stopped", pid)
+
+    def rolling_restart(self):
+        logger.info("Rolling restart of %s workers", len(self.workers))
+        for pid in list(self.workers):
+            if self.stopping:
+                return
+            replacement = self.spawn()
+            if not self.wait_ready(replacement):
+                logger.error("Worker %s not ready, rolling restart aborted", replacement.pid)
+                return
+            self.stop_worker(pid)
+
+    # --- main loop ---
+
+    def handle_signal(self, signum, frame):
+        if signum in (signal.SIGTERM, signal.SIGINT):
+            self.stopping = True
+        elif signum == signal.SIGHUP:
+            self.rolling = True
+        elif signum == signal.SIGUSR1:
+            self.show_stats = True
+
+    def run(self):
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1):
+            signal.signal(signum, self.handle_signal)
+        # wake time.sleep() up when a worker exits
+        signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+
+        for _ in range(self.options.workers):
+            self.spawn()
+
+        while not self.stopping:
+            for pid in self.reap():
+                logger.info("Worker %s exited", pid)
+            if not self.stopping:
+                for _ in range(self.options.workers - len(self.workers)):
+                    self.spawn()
+            if self.rolling:
+                self.rolling = False
+                self.rolling_restart()
+            if self.show_stats:
+                self.show_stats = False
+                logger.info("Worker stats:\n%s", format_stats(read_stats(self.options.stats_dir)))
+            time.sleep(1)
+
+        logger.info("Stopping %s workers", len(self.workers))
+        for pid in list(self.workers):
+            os.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.options.graceful_timeout + 5
+        while self.workers and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in self.workers:
+            os.kill(pid, signal.SIGKILL)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Preload Django, then fork and supervise uvicorn workers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument(
+        "--workers",
+        default=os.environ.get("WORKERS", "auto"),
+        help="Number of workers, or 'auto' to size them from the CPU count and --sync-ratio",
+    )
+    parser.add_argument(
+        "--sync-ratio",
+        type=float,
+        default=float(os.environ.get("SYNC_RATIO", 0.8)),
+        help="Share of requests served by sync (DRF) views, 0 to 1: used by --workers auto",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=int(os.environ.get("MAX_REQUESTS", 10000)),
+        help="Requests served by a worker before it is replaced, to bound memory growth (0: never)",
+    )
+    parser.add_argument("--max-requests-jitter", type=int, default=int(os.environ.get("MAX_REQUESTS_JITTER", 1000)))
+    parser.add_argument("--graceful-timeout", type=int, default=30, help="Seconds to finish in-flight requests")
+    parser.add_argument("--keep-alive", type=int, default=5, help="Seconds to keep idle connections open")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--stats-dir", default=os.environ.get("SERVE_STATS_DIR", DEFAULT_STATS_DIR))
+    parser.add_argument("--stats", action="store_true", help="Print stats of the running workers and exit")
+    options = parser.parse_args(argv)
+    if options.workers == "auto":
+        options.workers = recommended_workers(available_cpus(), options.sync_ratio)
+    else:
+        options.workers = int(options.workers)
+    return options
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    if options.stats:
+        print(format_stats(read_stats(options.stats_dir)))
+        return
+
+    logging.basicConfig(level=options.log_level.upper(), format="[%(asctime)s] %(name)s: %(message)s")
+    start = time.perf_counter()
+    application = preload()
+    logger.info("Application preloaded in %.0f ms", (time.perf_counter() - start) * 1000)
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((options.host, options.port))
+    listener.listen(options.backlog)
+    listener.set_inheritable(True)
+
+    # stats of a previous run
+    for stale in read_stats(options.stats_dir):
+        os.unlink(os.path.join(options.stats_dir, f"{stale['pid']}.json"))
+
+    logger.info("Listening on %s:%s with %s workers", options.host, options.port, options.workers)
+    Master(application, listener, options).run()
+    listener.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
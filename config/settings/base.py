@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from datetime import timedelta
 
 from pathlib import Path
@@ -50,17 +51,36 @@ INSTALLED_APPS = [
     "authentication",
     "project",
     "issue",
+    "benchmark",
+    "job",
+    "activity",
+    "export",
+    "metrics",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "metrics.profiling.ProfilerMiddleware",
+    "metrics.middleware.MetricsMiddleware",
+    "config.compression.GZipMiddleware",
+    "metrics.slow_queries.SlowQueryMiddleware",
+    "config.query_budget.QueryBudgetMiddleware",
+    "config.middleware.ReplicaRoutingMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "config.middleware.BrowserOnlyMiddleware",
+]
+
+# API requests (JWT authentication) skip the middlewares of the admin (cf. config.middleware.BrowserOnlyMiddleware)
+API_PATH_PREFIXES = ["/api/"]
+BROWSER_MIDDLEWARE = [
+    "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
+# the admin checks look for its middlewares in MIDDLEWARE only: they are in BROWSER_MIDDLEWARE
+SILENCED_SYSTEM_CHECKS = ["admin.E408", "admin.E409", "admin.E410"]
 
 ROOT_URLCONF = "config.urls"
 
@@ -82,6 +102,18 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 
 
+# Read replicas
+# reads of safe-method requests go to one of REPLICA_DATABASES (aliases of DATABASES), writes to "default"
+DATABASE_ROUTERS = ["config.db_routers.ReplicaRouter"]
+REPLICA_DATABASES = []
+# after a write, the client reads from the primary for this number of seconds to see its own changes
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 5))
+REPLICA_PIN_COOKIE = "replica_pin"
+# the pin is also sent in this response header (end of the pin, as a Unix timestamp), for clients without cookies
+# (e.g. JWT API clients): they send it back as a request header while it has not expired
+REPLICA_PIN_HEADER = "Replica-Pin"
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -153,3 +185,99 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
+
+# Max contributor ids per project in project payloads (cf. project.contributors), unbounded when 0: clients may ask
+# for fewer with ?contributors_limit=N, contributorsCount always gives the total
+PROJECT_CONTRIBUTORS_LIMIT = int(os.environ.get("PROJECT_CONTRIBUTORS_LIMIT", 0)) or None
+
+# Background jobs (cf. job.queue and run_jobs command)
+# workers refresh the heartbeat of the jobs they hold this often while running one
+JOB_HEARTBEAT_SECONDS = int(os.environ.get("JOB_HEARTBEAT_SECONDS", 60))
+# a job held without heartbeat for longer is considered lost (worker killed) and queued again
+JOB_STALE_SECONDS = int(os.environ.get("JOB_STALE_SECONDS", 3600))
+# finished jobs are kept this long for metrics (job_stats command)
+JOB_RETENTION_DAYS = int(os.environ.get("JOB_RETENTION_DAYS", 7))
+
+# Project activity stream (Server-Sent Events, cf. activity app)
+# seconds between two reads of new events by each worker process
+ACTIVITY_POLL_SECONDS = float(os.environ.get("ACTIVITY_POLL_SECONDS", 1))
+# events buffered per connection: a client further behind is disconnected and catches up on reconnection
+ACTIVITY_QUEUE_SIZE = int(os.environ.get("ACTIVITY_QUEUE_SIZE", 100))
+# seconds between keepalive comments on idle connections
+ACTIVITY_HEARTBEAT_SECONDS = float(os.environ.get("ACTIVITY_HEARTBEAT_SECONDS", 15))
+# recent ids re-read at each poll, to catch events committed after a greater id (concurrent transactions)
+ACTIVITY_LOOKBACK_IDS = 50
+# max events replayed after a Last-Event-ID, a client further behind is asked to reload its lists
+ACTIVITY_REPLAY_LIMIT = 1000
+ACTIVITY_RETENTION_DAYS = int(os.environ.get("ACTIVITY_RETENTION_DAYS", 7))
+
+# Exports built in background (cf. export app)
+# directory of export files, in the persisted data volume of docker
+EXPORT_ROOT = Path(os.environ.get("EXPORT_ROOT", BASE_DIR / "data" / "exports"))
+# an export expires this long after it is built, its file is deleted by the prune_exports command
+EXPORT_TTL_SECONDS = int(os.environ.get("EXPORT_TTL_SECONDS", 24 * 3600))
+
+# Query budgets of views (cf. config.query_budget): "off" (middleware not loaded), "log" or "raise"
+QUERY_BUDGET_MODE = os.environ.get("QUERY_BUDGET_MODE", "off")
+
+# Prometheus metrics of requests (cf. metrics app), served at /metrics
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+# each worker writes its histograms there (at most every METRICS_FLUSH_SECONDS), merged on scrape
+METRICS_DIR = Path(os.environ.get("METRICS_DIR", Path(tempfile.gettempdir()) / "ocpy10-metrics"))
+METRICS_FLUSH_SECONDS = float(os.environ.get("METRICS_FLUSH_SECONDS", 5))
+# when set, scrapes must send "Authorization: Bearer <token>", else the API JWT of a staff user
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Gzip compression of API responses (cf. config.compression)
+GZIP_ENABLED = os.environ.get("GZIP_ENABLED", "true").lower() in ("1", "true", "yes")
+# 1 (fastest) to 9 (smallest): on issue list pages, 5 is within 1% of the size of 9 (about 40% of the JSON) for
+# 20% less CPU (cf. bench_compression command)
+GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", 5))
+# smaller responses fit in a few packets: compressing them costs more CPU than it saves
+GZIP_MIN_BYTES = int(os.environ.get("GZIP_MIN_BYTES", 1024))
+GZIP_CONTENT_TYPES = ["application/json", "text/csv"]
+GZIP_PATH_PREFIXES = ["/api/"]
+
+# Slow-query log (cf. metrics.slow_queries): JSON lines, summarized by the slow_queries command
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 100))
+# share of slow queries logged, 0 disables the log
+SLOW_QUERY_SAMPLE_RATE = float(os.environ.get("SLOW_QUERY_SAMPLE_RATE", 1))
+# file of the log, stderr when empty
+SLOW_QUERY_LOG = os.environ.get("SLOW_QUERY_LOG", "")
+
+# On-demand profiling of requests of staff users (cf. metrics.profiling): X-Profile header or ?profile=1
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "true").lower() in ("1", "true", "yes")
+# directory of the profiles (collapsed stacks, for flame graphs)
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", Path(tempfile.gettempdir()) / "ocpy10-profiles"))
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", 1))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"message": {"format": "%(message)s"}},
+    "handlers": {
+        "slow_queries": (
+            {"class": "logging.handlers.WatchedFileHandler", "filename": SLOW_QUERY_LOG, "delay": True}
+            if SLOW_QUERY_LOG
+            else {"class": "logging.StreamHandler"}
+        )
+        | {"formatter": "message"},
+    },
+    "loggers": {"metrics.slow_queries": {"handlers": ["slow_queries"], "level": "WARNING"}},
+}
+
+# API docs, served when drf_spectacular is installed (local settings)
+# no DEFAULT_SCHEMA_CLASS in REST_FRAMEWORK: routers read it at startup, which would import drf_spectacular schema
+# generation in every worker. The generator sets it, and loads docs metadata, on first schema generation.
+SPECTACULAR_SETTINGS = {
+    'TITLE': 'SoftDesk API',
+    'DESCRIPTION': 'Project management API',
+    'VERSION': '1.0.0',
+    'SERVE_INCLUDE_SCHEMA': False, # create response schema on request, not in initial html template
+    'CAMELIZE_NAMES': True,
+    'DEFAULT_GENERATOR_CLASS': 'config.docs.SchemaGenerator',
+    'ENUM_NAME_OVERRIDES': {
+        # same choices for work run in background: account deletions, exports
+        'BackgroundStatusEnum': 'export.models.Export.Status',
+    },
+}
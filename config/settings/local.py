@@ -6,23 +6,12 @@ DEBUG = True
 ALLOWED_HOSTS = ["localhost", "127.0.0.1", "[::1]"]
 
 # add swagger
-INSTALLED_APPS += [
+# (new list: += would extend the list of base, shared by every settings module imported in the process)
+INSTALLED_APPS = [
+    *INSTALLED_APPS,
     'drf_spectacular',
 ]
 
-REST_FRAMEWORK = {
-    **REST_FRAMEWORK,
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-}
-
-SPECTACULAR_SETTINGS = {
-    'TITLE': 'SoftDesk API',
-    'DESCRIPTION': 'Project management API',
-    'VERSION': '1.0.0',
-    'SERVE_INCLUDE_SCHEMA': False, # create response schema on request, not in initial html template
-    'CAMELIZE_NAMES': True,
-}
-
 # SQLite DB for dev
 DATABASES = {
     "default": {
@@ -31,6 +20,9 @@ DATABASES = {
     }
 }
 
+# warn about views running more queries than their budget
+QUERY_BUDGET_MODE = os.environ.get("QUERY_BUDGET_MODE", "log")
+
 # Console email backend to test email in local
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
@@ -0,0 +1,81 @@
+import os
+
+from .base import *
+
+
+def env_bool(name, default=False):
+    return os.environ.get(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+
+def env_seconds(name, default):
+    """Number of seconds, or None (no limit) when set empty or to None"""
+    value = os.environ.get(name, str(default)).strip()
+    return None if value.lower() in ("", "none") else int(value)
+
+
+# never run production with DEBUG on: Django keeps every executed SQL query in memory
+# (connection.queries) when DEBUG is True, which grows without bound in long-lived workers
+DEBUG = env_bool("DEBUG", False)
+
+# no fallback here: production must provide its own secret key
+SECRET_KEY = os.environ["SECRET_KEY"]
+
+ALLOWED_HOSTS = [host.strip() for host in os.environ.get("ALLOWED_HOSTS", "").split(",") if host.strip()]
+
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+# === Database ===
+# PostgreSQL is used as soon as POSTGRES_DB is set, SQLite (persisted in data/ by docker volume) otherwise.
+#
+# Connection lifetime, in seconds: 0 opens and closes a connection on every request, None (set DB_CONN_MAX_AGE to
+# "None" or empty) keeps it forever. Reusing connections saves the TCP + auth handshake on every request.
+DB_CONN_MAX_AGE = env_seconds("DB_CONN_MAX_AGE", 60)
+# check a reused connection is still alive before the first query of a request
+# (cheap: only done once per request, and only on reused connections)
+DB_CONN_HEALTH_CHECKS = env_bool("DB_CONN_HEALTH_CHECKS", True)
+# native psycopg pool (Django >= 5.1, requires psycopg[pool]): connections are shared by all threads of a worker
+# instead of being bound to one thread, which suits uvicorn's thread pool better than persistent connections
+DB_POOL = env_bool("DB_POOL", False)
+
+if os.environ.get("POSTGRES_DB"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ["POSTGRES_DB"],
+            "USER": os.environ.get("POSTGRES_USER", "postgres"),
+            "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+            "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
+            "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": DB_CONN_HEALTH_CHECKS,
+            "OPTIONS": {},
+        }
+    }
+    # read replicas (comma separated hosts): same credentials as the primary
+    replica_hosts = [host.strip() for host in os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(",") if host.strip()]
+    REPLICA_DATABASES = [f"replica_{index}" for index in range(len(replica_hosts))]
+    for alias, host in zip(REPLICA_DATABASES, replica_hosts):
+        DATABASES[alias] = {**DATABASES["default"], "HOST": host, "OPTIONS": {}}
+    if DB_POOL:
+        # pooling and persistent connections are mutually exclusive in Django: the pool owns connection lifetime
+        for alias in ["default", *REPLICA_DATABASES]:
+            DATABASES[alias]["CONN_MAX_AGE"] = 0
+            DATABASES[alias]["OPTIONS"]["pool"] = {
+                "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+                "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+                # seconds to wait for a free connection before raising
+                "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+            }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("SQLITE_PATH", BASE_DIR / "data" / "db.sqlite3"),
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": DB_CONN_HEALTH_CHECKS,
+            "OPTIONS": {
+                # wait for the write lock instead of failing with "database is locked" under concurrent requests
+                "timeout": int(os.environ.get("SQLITE_TIMEOUT", 20)),
+            },
+        }
+    }
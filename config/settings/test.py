@@ -6,10 +6,30 @@ ALLOWED_HOSTS = ["*"]
 
 SECRET_KEY = "test-secret-key-not-for-production"
 
-# DB in RAM to make tests faster, and reset after each test
+# two SQLite databases standing in for a primary and its read replica
+# (without TEST NAME, Django creates both test databases in memory, shared by the threads of the run). Nothing
+# replicates between them: tests copy rows to the replica, then the replica lags behind later writes to the primary
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": ":memory:",
-    }
+    "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / "db.sqlite3"},
+    "replica": {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / "db.replica.sqlite3"},
 }
+
+# test databases are created from models rather than migrations (TEST_MIGRATIONS=1 runs them, e.g. to test a new
+# migration): all apps or none, as migrations depend on those of other apps. test_migrations checks that models
+# have no change missing from migrations, so both give the same schema.
+if os.environ.get("TEST_MIGRATIONS", "").lower() not in ("1", "true", "yes"):
+    MIGRATION_MODULES = {app.rsplit(".", 1)[-1]: None for app in INSTALLED_APPS}
+
+# hashing is most of the cost of creating users (UserFactory sets a password): PBKDF2 is slow on purpose
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+REPLICA_DATABASES = ["replica"]
+
+# docs installed as in local settings, for docs tests: loaded on first docs request, they cost nothing to other tests
+INSTALLED_APPS = [*INSTALLED_APPS, "drf_spectacular"]
+
+# a view over its query budget fails the test of the request
+QUERY_BUDGET_MODE = "raise"
+
+# metrics of each test run in a directory of their own
+METRICS_DIR = Path(tempfile.gettempdir()) / f"ocpy10-metrics-test-{os.getpid()}"
@@ -0,0 +1,45 @@
+from collections.abc import AsyncIterator, Iterator
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, StreamingHttpResponse
+
+
+def streaming_response(request, content: Iterator, **kwargs) -> StreamingHttpResponse:
+    """
+    StreamingHttpResponse sending a sync iterator (e.g. rows read with queryset.iterator()) chunk by chunk.
+
+    Under ASGI, Django consumes a sync iterator entirely into a list before sending it: the whole export would be
+    held in memory. Chunks are read one at a time in the sync thread of the request instead, where its DB
+    connection lives.
+    """
+    if is_asgi(request):
+        content = iterate_in_thread(content)
+    return StreamingHttpResponse(content, **kwargs)
+
+
+def file_response(request, file, **kwargs) -> FileResponse:
+    """FileResponse of an open file, read block by block in the request thread under ASGI (cf. streaming_response)"""
+    response = FileResponse(file, **kwargs)
+    if is_asgi(request):
+        # headers (length, filename) are already set from the file; block_size is set by the ASGI handler
+        response.streaming_content = iterate_in_thread(iter(lambda: file.read(response.block_size), b""))
+    return response
+
+
+def is_asgi(request) -> bool:
+    # DRF Request wraps the Django one
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
+
+
+async def iterate_in_thread(iterator: Iterator) -> AsyncIterator:
+    iterator = iter(iterator)
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await next_chunk(iterator, None)) is not None:
+            yield chunk
+    finally:
+        # client gone: release the DB cursor of the generator
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=True)()
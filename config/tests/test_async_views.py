@@ -0,0 +1,37 @@
+import pytest
+
+from django.test import RequestFactory
+
+from config.async_views import AsyncReadOnlyAPIView
+from config.factories import UserFactory
+from user.models import User
+
+
+class UserListView(AsyncReadOnlyAPIView):
+    queryset = User.objects.order_by("pk")
+
+
+# ==================== AsyncReadOnlyAPIView Tests ====================
+
+
+@pytest.mark.django_db
+class TestAsyncReadOnlyAPIView:
+    """Tests for the base class of native async endpoints"""
+
+    def test_queryset_attribute(self):
+        """Success: without get_queryset() override, a new queryset of the queryset attribute is read"""
+        UserFactory()
+        view = UserListView()
+
+        first, second = view.get_queryset(), view.get_queryset()
+
+        assert first is not second
+        assert first.count() == 1
+
+    def test_queryset_missing_failure(self):
+        """Failure: a view without queryset nor get_queryset() override is a programming error, as in DRF"""
+        view = AsyncReadOnlyAPIView()
+        view.setup(RequestFactory().get("/"))
+
+        with pytest.raises(AssertionError):
+            view.get_queryset()
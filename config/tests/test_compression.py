@@ -0,0 +1,135 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+
+from config.compression import GZipMiddleware, acompress_chunks, compress_chunks
+from config.factories import IssueFactory, ProjectFactory
+
+
+@pytest.fixture
+def issue_list_url(authenticated_client):
+    user = authenticated_client.user
+    project = ProjectFactory(author=user)
+    IssueFactory.create_batch(10, project=project, author=user)
+    return reverse("issue:issue-list", kwargs={"project_id": project.pk})
+
+
+def middleware(response):
+    return GZipMiddleware(lambda request: response)
+
+
+def gzip_request(path="/api/project/"):
+    return RequestFactory().get(path, HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+
+
+# ==================== Chunks Tests ====================
+
+
+class TestCompressChunks:
+    """Tests for the compression of streamed responses"""
+
+    def test_sync_chunks(self):
+        """Success: chunks form a single gzip stream, one compressed chunk per chunk sent"""
+        chunks = list(compress_chunks(iter([b"id,title\r\n", b"1,a\r\n" * 100]), 5))
+
+        assert len(chunks) == 3
+        assert gzip.decompress(b"".join(chunks)) == b"id,title\r\n" + b"1,a\r\n" * 100
+
+    def test_async_chunks(self):
+        """Success: async streams (ASGI) are compressed the same way"""
+
+        async def chunks():
+            yield b"a" * 10
+            yield b"b" * 10
+
+        async def consume():
+            return b"".join([chunk async for chunk in acompress_chunks(chunks(), 5)])
+
+        assert gzip.decompress(asyncio.run(consume())) == b"a" * 10 + b"b" * 10
+
+
+# ==================== GZipMiddleware Tests ====================
+
+
+@pytest.mark.django_db
+class TestGZipMiddleware:
+    """Tests for the compression of API responses"""
+
+    def test_list_compressed(self, authenticated_client, issue_list_url):
+        """Success: large JSON pages are compressed for clients accepting gzip"""
+        response = authenticated_client.get(issue_list_url, HTTP_ACCEPT_ENCODING="gzip")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response["Vary"]
+        assert int(response["Content-Length"]) == len(response.content)
+        assert json.loads(gzip.decompress(response.content))["count"] == 10
+
+    def test_client_without_gzip(self, authenticated_client, issue_list_url):
+        """Success: other clients get the JSON as is, caches are told it varies with Accept-Encoding"""
+        response = authenticated_client.get(issue_list_url)
+
+        assert "Content-Encoding" not in response
+        assert "Accept-Encoding" in response["Vary"]
+        assert response.json()["count"] == 10
+
+    def test_small_response_not_compressed(self, authenticated_client, settings):
+        """Success: responses under GZIP_MIN_BYTES are sent as is"""
+        settings.GZIP_MIN_BYTES = 10_000
+
+        response = authenticated_client.get(reverse("project:project-list"), HTTP_ACCEPT_ENCODING="gzip")
+
+        assert "Content-Encoding" not in response
+
+    def test_csv_export_streamed_compressed(self, authenticated_client, issue_list_url):
+        """Success: streamed CSV exports are compressed chunk by chunk"""
+        response = authenticated_client.get(
+            issue_list_url, {"format": "csv", "all": "true"}, HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        assert response.streaming
+        assert response["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in response
+        rows = list(csv.reader(io.StringIO(gzip.decompress(b"".join(response.streaming_content)).decode())))
+        assert len(rows) == 11
+
+    def test_other_paths_and_types_skipped(self):
+        """Success: only responses of API paths and allowed content types are compressed"""
+        body = b"x" * 5000
+
+        outside = middleware(HttpResponse(body, content_type="application/json"))(gzip_request("/admin/"))
+        html = middleware(HttpResponse(body, content_type="text/html"))(gzip_request())
+        sse = middleware(StreamingHttpResponse(iter([body]), content_type="text/event-stream"))(gzip_request())
+
+        assert not any(response.has_header("Content-Encoding") for response in (outside, html, sse))
+
+    def test_encoded_and_file_responses_skipped(self):
+        """Success: already encoded responses and file downloads (byte ranges) are left as they are"""
+        encoded = HttpResponse(b"x" * 5000, content_type="application/json", headers={"Content-Encoding": "br"})
+        download = FileResponse(io.BytesIO(b"x" * 5000), content_type="text/csv")
+
+        assert middleware(encoded)(gzip_request())["Content-Encoding"] == "br"
+        assert not middleware(download)(gzip_request()).has_header("Content-Encoding")
+
+    def test_etag_weakened(self):
+        """Success: strong ETags become weak once the body is compressed"""
+        response = HttpResponse(b"x" * 5000, content_type="application/json", headers={"ETag": '"abc"'})
+
+        assert middleware(response)(gzip_request())["ETag"] == 'W/"abc"'
+
+    def test_disabled(self, settings):
+        """Success: when compression is disabled, the middleware is not loaded at all"""
+        settings.GZIP_ENABLED = False
+
+        with pytest.raises(MiddlewareNotUsed):
+            GZipMiddleware(lambda request: None)
@@ -0,0 +1,105 @@
+import copy
+import time
+
+import pytest
+
+from django.conf import settings
+from django.urls import reverse
+from rest_framework import status
+
+from config.db_routers import ReplicaRouter, RequestRouting, reset_request_routing, set_request_routing
+from config.factories import IssueFactory
+from issue.models import Issue
+from project.models import Contributor
+
+
+def replicate(*objects):
+    """Copy rows to the replica as they are now: later writes to the primary stand for changes not replicated yet"""
+    for obj in objects:
+        type(obj).objects.using("replica").bulk_create([copy.copy(obj)])
+
+
+# ==================== ReplicaRouter Tests ====================
+
+
+class TestReplicaRouter:
+    """Tests for routing decisions of ReplicaRouter"""
+
+    def test_read_outside_request_uses_primary(self):
+        """Success: management commands and jobs read from the primary"""
+        assert ReplicaRouter().db_for_read(Issue) == "default"
+
+    def test_safe_request_reads_from_replica(self):
+        """Success: reads of a safe-method request go to a replica"""
+        token = set_request_routing(RequestRouting(use_replicas=True))
+        try:
+            assert ReplicaRouter().db_for_read(Issue) in settings.REPLICA_DATABASES
+        finally:
+            reset_request_routing(token)
+
+    def test_read_after_write_uses_primary(self):
+        """Success: once a request has written, its reads go to the primary"""
+        router = ReplicaRouter()
+        token = set_request_routing(RequestRouting(use_replicas=True))
+        try:
+            assert router.db_for_write(Issue) == "default"
+            assert router.db_for_read(Issue) == "default"
+        finally:
+            reset_request_routing(token)
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+class TestReplicaRouting:
+    """Tests for replica routing through the API, the replica database is never written to (no replication)"""
+
+    def test_get_reads_from_replica(self, authenticated_client, create_project):
+        """Success: GET requests read from the replica, which does not hold primary data"""
+        url = reverse("project:project-list")
+
+        response = authenticated_client.get(url)
+
+        # authentication itself reads the user from the replica
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.fixture
+    def issue_url(self, authenticated_client, create_project):
+        """URL of an issue of the client, whose rows are copied to the replica with the title Replicated"""
+        issue = IssueFactory(project=create_project, author=authenticated_client.user, title="Replicated")
+        replicate(authenticated_client.user, create_project, *Contributor.objects.filter(project=create_project), issue)
+        return reverse("issue:issue-detail", kwargs={"project_id": create_project.pk, "issue_id": issue.pk})
+
+    def test_replica_lags_behind_primary(self, authenticated_client, issue_url):
+        """Success: without pin, GET requests read the replica, where changes to the primary are not replicated"""
+        Issue.objects.update(title="Not replicated")
+
+        response = authenticated_client.get(issue_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["title"] == "Replicated"
+
+    def test_write_pins_client_to_primary(self, authenticated_client, issue_url):
+        """Success: after a write, the client reads its own writes from the primary (pin cookie)"""
+        response = authenticated_client.patch(issue_url, {"title": "Pinned to primary"}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert settings.REPLICA_PIN_COOKIE in response.cookies
+
+        response = authenticated_client.get(issue_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["title"] == "Pinned to primary"
+
+    def test_pin_header(self, authenticated_client, issue_url):
+        """Success: clients without cookies stay pinned by sending back the pin header"""
+        response = authenticated_client.patch(issue_url, {"title": "Pinned to primary"}, format="json")
+        pin = response[settings.REPLICA_PIN_HEADER]
+        authenticated_client.cookies.clear()
+
+        assert float(pin) >= time.time() + settings.REPLICA_PIN_SECONDS - 1
+        pinned_response = authenticated_client.get(issue_url, HTTP_REPLICA_PIN=pin)
+        unpinned_response = authenticated_client.get(issue_url)
+        expired_response = authenticated_client.get(issue_url, HTTP_REPLICA_PIN=str(time.time() - 1))
+
+        assert pinned_response.data["title"] == "Pinned to primary"
+        assert unpinned_response.data["title"] == "Replicated"
+        assert expired_response.data["title"] == "Replicated"
@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+import pytest
+
+from django.urls import reverse
+from rest_framework import status
+
+
+# imports the application and every URL module, as a worker does at startup
+STARTUP = (
+    "from config.asgi import application; from django.urls import get_resolver; get_resolver().url_patterns; "
+    "import sys; print(sorted(module for module in ('drf_spectacular.openapi', 'drf_spectacular.views', "
+    "'project.docs', 'user.docs') if module in sys.modules))"
+)
+
+
+# ==================== Docs Tests ====================
+
+
+@pytest.mark.django_db
+class TestDocs:
+    """Tests for the lazily loaded API docs"""
+
+    def test_docs_not_loaded_at_startup(self):
+        """Success: drf_spectacular schema generation and docs metadata are not imported by a worker start"""
+        result = subprocess.run([sys.executable, "-c", STARTUP], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "[]"
+
+    def test_schema_has_docs_metadata(self, api_client):
+        """Success: the schema includes summaries declared in the docs modules of apps"""
+        response = api_client.get(reverse("docs"))
+
+        assert response.status_code == status.HTTP_200_OK
+        content = response.content.decode()
+        assert "Get all Projects" in content
+        assert "Logout user and invalidate refresh token" in content
+        assert "Deactivate the account at once and delete it in background" in content
+
+    def test_schema_generated_twice_is_identical(self, api_client):
+        """Success: docs metadata is only applied once, whatever the number of schema requests"""
+        first = api_client.get(reverse("docs")).content
+        second = api_client.get(reverse("docs")).content
+
+        assert first == second
+
+    @pytest.mark.parametrize("url_name", ["swagger", "redoc"])
+    def test_docs_ui(self, api_client, url_name):
+        """Success: Swagger and Redoc pages are served"""
+        response = api_client.get(reverse(url_name))
+
+        assert response.status_code == status.HTTP_200_OK
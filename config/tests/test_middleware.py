@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
+from django.urls import reverse
+from rest_framework import status
+
+from config.factories import UserFactory
+from config.middleware import BrowserOnlyMiddleware
+
+
+class ExceptionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def process_exception(self, request, exception):
+        return None
+
+
+# ==================== BrowserOnlyMiddleware Tests ====================
+
+
+@pytest.mark.django_db
+class TestBrowserOnlyMiddleware:
+    """Tests for the API requests skipping the middlewares of the admin"""
+
+    def test_api_request_skips_browser_middlewares(self, authenticated_client):
+        """Success: API requests get no session, no CSRF cookie and no Vary: Cookie"""
+        response = authenticated_client.get(reverse("project:project-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not hasattr(response.wsgi_request, "session")
+        assert "csrftoken" not in response.cookies
+        assert "Cookie" not in response.get("Vary", "")
+        assert "X-Frame-Options" not in response
+
+    def test_admin_keeps_browser_middlewares(self):
+        """Success: the admin gets its session, CSRF cookie and clickjacking protection"""
+        response = Client().get("/admin/login/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert hasattr(response.wsgi_request, "session")
+        assert "csrftoken" in response.cookies
+        assert response["X-Frame-Options"] == "DENY"
+
+    def test_admin_csrf_checked(self):
+        """Failure: CSRF checks (process_view) still protect the admin login"""
+        user = UserFactory(is_staff=True, is_superuser=True)
+        client = Client(enforce_csrf_checks=True)
+
+        forged = client.post("/admin/login/", {"username": user.username, "password": "password"})
+
+        assert forged.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_admin_login_success(self):
+        """Success: a staff user logs in the admin, with the CSRF token of the login page"""
+        user = UserFactory(is_staff=True, is_superuser=True)
+        user.set_password("password")
+        user.save()
+        client = Client(enforce_csrf_checks=True)
+        token = client.get("/admin/login/").cookies["csrftoken"].value
+
+        response = client.post(
+            "/admin/login/", {"username": user.username, "password": "password", "csrfmiddlewaretoken": token}
+        )
+
+        assert response.status_code == status.HTTP_302_FOUND
+        assert client.get("/admin/").status_code == status.HTTP_200_OK
+
+    def test_docs_not_framed(self):
+        """Success: docs pages, under /api/, still forbid framing"""
+        response = Client().get(reverse("swagger"))
+
+        assert response["X-Frame-Options"] == "DENY"
+
+    def test_async_mode(self):
+        """Success: under ASGI, API requests go straight to the view, others through the browser middlewares"""
+
+        async def view(request):
+            return HttpResponse(str(hasattr(request, "session")))
+
+        middleware = BrowserOnlyMiddleware(view)
+        factory = RequestFactory()
+
+        api_response = asyncio.run(middleware(factory.get("/api/project/")))
+        admin_response = asyncio.run(middleware(factory.get("/admin/")))
+
+        assert (api_response.content, admin_response.content) == (b"False", b"True")
+
+    def test_unsupported_hooks(self, settings):
+        """Failure: browser middlewares with hooks other than process_view are rejected"""
+        settings.BROWSER_MIDDLEWARE = [f"{__name__}.ExceptionMiddleware"]
+
+        with pytest.raises(ImproperlyConfigured):
+            BrowserOnlyMiddleware(lambda request: None)
@@ -0,0 +1,19 @@
+import pytest
+
+from django.core.management import call_command
+
+
+# ==================== Migrations Tests ====================
+
+
+# makemigrations checks the migration history of every database
+@pytest.mark.django_db(databases=["default", "replica"])
+class TestMigrations:
+    """Tests for the migrations of apps, not run by tests (cf. MIGRATION_MODULES of test settings)"""
+
+    def test_no_missing_migration(self, settings):
+        """Success: models have no change missing from migrations, so test databases have the migrated schema"""
+        settings.MIGRATION_MODULES = {}
+
+        # exits with status 1 when a migration would be created
+        call_command("makemigrations", "--check", "--dry-run", verbosity=0)
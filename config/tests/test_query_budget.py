@@ -0,0 +1,130 @@
+import logging
+import re
+
+import pytest
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import reverse
+from rest_framework import status
+
+from authentication.views import LogoutView
+from benchmark.suite import iter_routes
+from config.db_utils import count_queries
+from config.factories import ProjectFactory, UserFactory
+from config.query_budget import QueryBudgetExceededError, QueryBudgetMiddleware, get_query_budget
+from issue.views import IssueModelViewSet
+from project.async_views import AsyncProjectView
+from project.views import ProjectModelViewSet
+from user.models import User
+
+
+# routes without budget: not API views, or served by another route (format suffixes)
+UNBUDGETED_ROUTES = r"^(admin:|docs$|swagger$|redoc$|.*:api-root$)"
+
+
+# ==================== Budget declaration Tests ====================
+
+
+class TestGetQueryBudget:
+    """Tests for reading the budget of a view function"""
+
+    def test_viewset_action_budget(self):
+        """Success: viewsets declare a budget per action"""
+        view = ProjectModelViewSet.as_view({"get": "list", "post": "create"})
+
+        assert get_query_budget(view, "GET") == ProjectModelViewSet.query_budgets["list"]
+        assert get_query_budget(view, "POST") == ProjectModelViewSet.query_budgets["create"]
+
+    def test_decorated_action_budget(self):
+        """Success: @query_budget declares the budget of a viewset extra action or a handler method"""
+        assert get_query_budget(IssueModelViewSet.as_view({"post": "restore"}), "POST") == 10
+        assert get_query_budget(LogoutView.as_view(), "POST") == 8
+
+    def test_no_budget(self):
+        """Failure: methods not routed and views without budget have none"""
+        assert get_query_budget(ProjectModelViewSet.as_view({"get": "list"}), "DELETE") is None
+        assert get_query_budget(lambda request: None, "GET") is None
+
+    def test_every_api_route_has_budgets(self):
+        """Success: every action of every API route declares its budget"""
+        missing = []
+        for name, pattern in iter_routes():
+            if re.search(UNBUDGETED_ROUTES, name) or "format" in pattern.pattern.regex.groupindex:
+                continue
+            callback = pattern.callback
+            actions = getattr(callback, "actions", None)
+            view_class = getattr(callback, "cls", None) or getattr(callback, "view_class", None)
+            methods = actions or [
+                method for method in ("get", "post", "put", "patch", "delete") if hasattr(view_class, method)
+            ]
+            missing.extend(
+                f"{method.upper()} {name}" for method in methods if get_query_budget(callback, method) is None
+            )
+
+        assert missing == []
+
+
+# ==================== Query counting Tests ====================
+
+
+@pytest.mark.django_db
+class TestCountQueries:
+    """Tests for counting the queries of a block"""
+
+    def test_nested_counts(self):
+        """Success: a query is counted by every count in progress"""
+        with count_queries() as outer:
+            User.objects.count()
+            with count_queries() as inner:
+                User.objects.count()
+
+        assert (outer.queries, inner.queries) == (2, 1)
+
+
+# ==================== QueryBudgetMiddleware Tests ====================
+
+
+@pytest.mark.django_db
+class TestQueryBudgetMiddleware:
+    """Tests for the enforcement of query budgets on requests"""
+
+    def test_within_budget_success(self, authenticated_client, create_project):
+        """Success: a request within the budget of its view is served"""
+        response = authenticated_client.get(reverse("project:project-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_over_budget_raises_failure(self, authenticated_client, create_project, monkeypatch):
+        """Failure: in raise mode (tests), a request over budget raises, naming the route and both counts"""
+        monkeypatch.setitem(ProjectModelViewSet.query_budgets, "list", 1)
+
+        with pytest.raises(
+            QueryBudgetExceededError, match=r"GET /api/project/ \(project:project-list\) ran \d+ queries, budget is 1"
+        ):
+            authenticated_client.get(reverse("project:project-list"))
+
+    def test_over_budget_logs_failure(self, authenticated_client, create_project, monkeypatch, settings, caplog):
+        """Failure: in log mode (development), a request over budget is served and logged"""
+        settings.QUERY_BUDGET_MODE = "log"
+        monkeypatch.setitem(ProjectModelViewSet.query_budgets, "list", 1)
+
+        with caplog.at_level(logging.WARNING, logger="config.query_budget"):
+            response = authenticated_client.get(reverse("project:project-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "budget is 1" in caplog.text
+
+    def test_off_mode_not_loaded(self, settings):
+        """Success: in off mode (production), the middleware is not loaded at all"""
+        settings.QUERY_BUDGET_MODE = "off"
+
+        with pytest.raises(MiddlewareNotUsed):
+            QueryBudgetMiddleware(lambda request: None)
+
+    def test_async_view_queries_counted(self, authenticated_client, monkeypatch):
+        """Failure: queries of async views, run in sync_to_async threads, are counted too"""
+        ProjectFactory(author=authenticated_client.user, contributors=[UserFactory()])
+        monkeypatch.setitem(AsyncProjectView.query_budgets, "get", 1)
+
+        with pytest.raises(QueryBudgetExceededError):
+            authenticated_client.get(reverse("project_async:project-list"))
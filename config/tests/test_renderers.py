@@ -0,0 +1,63 @@
+import csv
+
+from config.exports import stream_sections
+from config.renderers import CSVRenderer, flatten
+
+
+def parse(content: str) -> list[list[str]]:
+    return list(csv.reader(content.splitlines()))
+
+
+# ==================== CSVRenderer Tests ====================
+
+
+class TestCSVRenderer:
+    """Tests for CSV rendering of API data"""
+
+    def test_render_page_of_results(self):
+        """Success: a paginated page renders its results, with camelCase column names"""
+        data = {"count": 2, "next": None, "previous": None, "results": [{"comment_count": 1}, {"comment_count": 2}]}
+
+        assert parse(CSVRenderer().render(data)) == [["commentCount"], ["1"], ["2"]]
+
+    def test_render_single_object(self):
+        """Success: an object (detail, error) renders as one row"""
+        assert parse(CSVRenderer().render({"detail": "Not found."})) == [["detail"], ["Not found."]]
+
+    def test_nested_objects_are_flattened(self):
+        """Success: nested objects get one column per value"""
+        assert flatten({"user": {"id": 1, "user_name": "bob"}, "id": 2}) == {
+            "user.id": 1,
+            "user.user_name": "bob",
+            "id": 2,
+        }
+
+    def test_stream_by_chunks(self):
+        """Success: rows are written lazily, by chunks of lines"""
+        renderer = CSVRenderer()
+        renderer.chunk_size = 2
+        rows = ({"id": index} for index in range(5))
+
+        chunks = list(renderer.stream(rows))
+
+        assert len(chunks) == 3
+        assert parse("".join(chunks)) == [["id"], *([str(index)] for index in range(5))]
+
+    def test_stream_without_rows(self):
+        """Success: an empty export still has its header, from the serializer fields"""
+        assert parse("".join(CSVRenderer().stream([], fields=["id", "created_at"]))) == [["id", "createdAt"]]
+
+    def test_formulas_escaped(self):
+        """Success: text cells starting like a spreadsheet formula are prefixed with ', other values are kept"""
+        rows = [{"title": '=HYPERLINK("http://evil")', "user": {"name": "@SUM(A1)"}, "score": -1, "tag": "a-b"}]
+
+        assert parse(CSVRenderer().render(rows)) == [
+            ["title", "user.name", "score", "tag"],
+            ['\'=HYPERLINK("http://evil")', "'@SUM(A1)", "-1", "a-b"],
+        ]
+
+    def test_export_sections_formulas_escaped(self):
+        """Success: exports (cf. config.exports) escape formulas too"""
+        sections = [("issues", ["title", "count"], iter([("+1+cmd|' /C calc'!A0", 3), ("-2", -2)]))]
+
+        assert parse("".join(stream_sections(sections)))[2:4] == [["'+1+cmd|' /C calc'!A0", "3"], ["'-2", "-2"]]
@@ -0,0 +1,110 @@
+import pytest
+
+from asgiref.sync import async_to_sync
+
+from config.server import WorkerStatsMiddleware, format_stats, parse_args, read_stats, recommended_workers
+
+
+# ==================== Worker sizing Tests ====================
+
+
+class TestRecommendedWorkers:
+    """Tests for the number of workers sized from CPUs and the sync/async mix"""
+
+    @pytest.mark.parametrize(
+        ("cpu_count", "sync_ratio", "expected"),
+        [(4, 0, 4), (4, 1, 9), (4, 0.5, 6), (1, 0, 1), (1, 1, 3)],
+    )
+    def test_recommended_workers(self, cpu_count, sync_ratio, expected):
+        """Success: one worker per core for async, up to 2 x cores + 1 for sync"""
+        assert recommended_workers(cpu_count, sync_ratio) == expected
+
+    def test_ratio_is_clamped(self):
+        """Success: out of range ratios are clamped between 0 and 1"""
+        assert recommended_workers(2, -1) == 2
+        assert recommended_workers(2, 3) == 5
+
+    def test_auto_workers_option(self, monkeypatch):
+        """Success: --workers auto is resolved from the available CPUs"""
+        monkeypatch.setattr("config.server.available_cpus", lambda: 2)
+        assert parse_args(["--workers", "auto", "--sync-ratio", "1"]).workers == 5
+        assert parse_args(["--workers", "3"]).workers == 3
+
+
+# ==================== WorkerStatsMiddleware Tests ====================
+
+
+class TestWorkerStatsMiddleware:
+    """Tests for the per-worker request stats"""
+
+    @staticmethod
+    def call(middleware, scope_type="http"):
+        async def send(message):
+            pass
+
+        async def receive():
+            return {"type": "http.request"}
+
+        async def scenario():
+            await middleware({"type": scope_type}, receive, send)
+            if middleware.flusher is not None:
+                middleware.flusher.cancel()
+
+        async_to_sync(scenario)()
+
+    def test_counts_requests(self, tmp_path):
+        """Success: served requests and their latency are counted"""
+
+        async def app(scope, receive, send):
+            pass
+
+        middleware = WorkerStatsMiddleware(app, str(tmp_path), max_requests=100)
+        self.call(middleware)
+        self.call(middleware)
+
+        snapshot = middleware.snapshot()
+        assert snapshot["requests"] == 2
+        assert snapshot["in_flight"] == 0
+        assert snapshot["avg_ms"] is not None
+        assert snapshot["max_requests"] == 100
+
+    def test_failed_request_is_counted(self, tmp_path):
+        """Success: a request raising an exception is still counted and no longer in flight"""
+
+        async def app(scope, receive, send):
+            raise ValueError
+
+        middleware = WorkerStatsMiddleware(app, str(tmp_path))
+        with pytest.raises(ValueError):
+            self.call(middleware)
+
+        assert middleware.requests == 1
+        assert middleware.in_flight == 0
+
+    def test_lifespan_is_not_counted(self, tmp_path):
+        """Success: non HTTP scopes are passed through without being counted"""
+
+        async def app(scope, receive, send):
+            pass
+
+        middleware = WorkerStatsMiddleware(app, str(tmp_path))
+        self.call(middleware, scope_type="lifespan")
+
+        assert middleware.requests == 0
+
+    def test_flush_and_read_stats(self, tmp_path):
+        """Success: stats are written per worker and read back for display"""
+
+        async def app(scope, receive, send):
+            pass
+
+        middleware = WorkerStatsMiddleware(app, str(tmp_path))
+        self.call(middleware)
+        middleware.flush()
+        # a partially written file of another worker is ignored
+        (tmp_path / "1.json").write_text("{")
+
+        stats = read_stats(str(tmp_path))
+        assert [worker["requests"] for worker in stats] == [1]
+        assert not list(tmp_path.glob("*.tmp"))
+        assert str(stats[0]["pid"]) in format_stats(stats)
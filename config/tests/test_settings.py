@@ -0,0 +1,33 @@
+import importlib
+
+import pytest
+
+
+# ==================== Production settings Tests ====================
+
+
+class TestProdSettings:
+    """Tests for production settings read from the environment"""
+
+    @staticmethod
+    def load(monkeypatch, **environ):
+        monkeypatch.setenv("SECRET_KEY", "test")
+        monkeypatch.delenv("POSTGRES_DB", raising=False)
+        for name, value in environ.items():
+            monkeypatch.setenv(name, value)
+        return importlib.reload(importlib.import_module("config.settings.prod"))
+
+    @pytest.mark.parametrize(
+        ("value", "expected"), [("0", 0), ("300", 300), ("None", None), ("none", None), ("", None)]
+    )
+    def test_conn_max_age(self, monkeypatch, value, expected):
+        """Success: DB_CONN_MAX_AGE is a number of seconds, None or empty keeps connections forever"""
+        prod = self.load(monkeypatch, DB_CONN_MAX_AGE=value)
+
+        assert (prod.DB_CONN_MAX_AGE, prod.DATABASES["default"]["CONN_MAX_AGE"]) == (expected, expected)
+
+    def test_conn_max_age_default(self, monkeypatch):
+        """Success: connections are kept 60 seconds by default"""
+        monkeypatch.delenv("DB_CONN_MAX_AGE", raising=False)
+
+        assert self.load(monkeypatch).DB_CONN_MAX_AGE == 60
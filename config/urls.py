@@ -15,13 +15,17 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.apps import apps
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+
+from metrics.views import metrics
 
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    # Prometheus metrics of every worker
+    path("metrics", metrics, name="metrics"),
     # auth
     path("api/auth/", include("authentication.urls")),
     # user object related
@@ -34,8 +38,15 @@ urlpatterns = [
     # as comments depend on issues, which depend on projects, url still contains
     # /project/{{ project_id }}/issue/{{ issue_id }}
     path("api/project/", include("issue.urls")),
-    # docs
-    path("api/docs/", SpectacularAPIView.as_view(), name="docs"),
-    path("api/docs/swagger/", SpectacularSwaggerView.as_view(url_name="docs"), name="swagger"),
-    path("api/docs/redoc/", SpectacularRedocView.as_view(url_name="docs"), name="redoc"),
+    # project activity stream (Server-Sent Events)
+    path("api/project/", include("activity.urls")),
+    # exports built in background (GDPR, project)
+    path("api/export/", include("export.urls")),
+    # native async read-only endpoints (list/retrieve), same paths under /api/async/
+    path("api/async/project/", include("project.async_urls")),
+    path("api/async/project/", include("issue.async_urls")),
 ]
+
+# docs, loaded on first request
+if apps.is_installed("drf_spectacular"):
+    urlpatterns.append(path("api/docs/", include("config.docs_urls")))
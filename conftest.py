@@ -1,9 +1,16 @@
+import time
+
+from collections import defaultdict
+from collections.abc import Callable
+
 import pytest
 
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from config.db_utils import count_queries
 from config.factories import CommentFactory, IssueFactory, ProjectFactory, UserFactory
+from config.query_budget import get_query_budget
 
 
 # === Fixtures ===
@@ -28,6 +35,15 @@ def authenticated_client(api_client, db):
     return api_client
 
 
+@pytest.fixture
+def staff_client(api_client, db):
+    """Return an API client authenticated as a staff user"""
+    user = UserFactory(is_staff=True)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+    api_client.user = user
+    return api_client
+
+
 @pytest.fixture
 def create_project(authenticated_client, db):
     """Create a project with the authenticated user as author"""
@@ -44,3 +60,74 @@ def create_issue(authenticated_client, db):
 def create_comment(authenticated_client, db):
     """Create a comment for the given issue"""
     return CommentFactory(author=authenticated_client.user)
+
+
+@pytest.fixture
+def assert_query_budget(db):
+    """
+    Return a checker of the query budget of an endpoint (cf. config.query_budget) as data volume grows.
+
+    check(send, grow): for each row count of `rows` (1, then 20 by default), grow(rows) brings the data read by the
+    endpoint to that count, then send() makes the request. Its queries must be within the budget declared by the
+    view every time, and not grow with rows (no query per row). Return the query count of each request.
+    """
+
+    def check(send: Callable, grow: Callable[[int], None], rows: tuple[int, ...] = (1, 20)) -> list[int]:
+        counts = []
+        for row_count in rows:
+            grow(row_count)
+            with count_queries() as count:
+                response = send()
+            assert response.status_code < 400, f"{response.status_code} response: {getattr(response, 'data', '')}"
+            counts.append(count.queries)
+
+        request = response.wsgi_request
+        budget = get_query_budget(request.resolver_match.func, request.method)
+        assert budget is not None, f"No query budget declared for {request.method} {request.resolver_match.view_name}"
+        assert max(counts) <= budget, (
+            f"{request.method} {request.path}: {counts} queries for {rows} rows, budget {budget}"
+        )
+        assert len(set(counts)) == 1, f"{request.method} {request.path}: {counts} queries for {rows} rows"
+        return counts
+
+    return check
+
+
+# === Fixture timings ===
+
+# setup time of each fixture (its dependencies excluded), per fixture name: [total seconds, setups, max seconds]
+fixture_timings: dict[str, list[float]] = defaultdict(lambda: [0.0, 0, 0.0])
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--fixture-durations",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Show the N fixtures with the longest total setup time (0: none)",
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    start = time.perf_counter()
+    try:
+        return (yield)
+    finally:
+        elapsed = time.perf_counter() - start
+        timing = fixture_timings[fixturedef.argname]
+        timing[0] += elapsed
+        timing[1] += 1
+        timing[2] = max(timing[2], elapsed)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    count = config.getoption("fixture_durations")
+    if not count or not fixture_timings:
+        return
+    terminalreporter.write_sep("=", f"slowest {count} fixtures (setup)")
+    terminalreporter.write_line(f"{'total s':>9}{'setups':>8}{'max s':>8}  fixture")
+    slowest = sorted(fixture_timings.items(), key=lambda item: item[1][0], reverse=True)[:count]
+    for name, (total, setups, longest) in slowest:
+        terminalreporter.write_line(f"{total:>9.2f}{setups:>8}{longest:>8.3f}  {name}")
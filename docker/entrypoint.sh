@@ -11,17 +11,28 @@ set -e
 # n workers X n tread shoudl be equal to 4
 
 
-WORKERS=${WORKERS:-1}
+WORKERS=${WORKERS:-auto}
 
 echo "Starting application in $ENVIRONMENT mode..."
 
+# background processes query the job and deletion tables: started once migrations are applied
+start_background() {
     echo "Starting background scheduler..."
     sh /usr/local/bin/scheduler.sh &
 
+    echo "Starting background job workers..."
+    # catch up deletions requested before the job queue existed, then run jobs (cf. job app)
+    sh -c 'python manage.py purge_deleted_projects
+        python manage.py process_account_deletions
+        exec python manage.py run_jobs --workers "${JOB_WORKERS:-1}"' &
+}
+
 if [ "$ENVIRONMENT" = "local" ]; then
     echo "Running database migrations..."
     python manage.py migrate --noinput
 
+    start_background
+
     echo "Creating test users..."
     python manage.py create_test_users
 
@@ -31,9 +42,12 @@ else
     echo "Running database migrations..."
     python manage.py migrate --noinput
 
+    start_background
+
     echo "Collecting static files..."
     python manage.py collectstatic --noinput
 
     echo "Running production server with uvicorn (workers: $WORKERS)..."
-    exec uvicorn config.asgi:application --host 0.0.0.0 --port 8000 --workers "$WORKERS"
+    # preloads the app then forks workers, see config/server.py
+    exec python -m config.server --host 0.0.0.0 --port 8000 --workers "$WORKERS"
 fi
@@ -1,6 +1,6 @@
 #!/bin/sh
 
-echo "Background scheduler started: delete expired DRF tokens every day at 03:00 am"
+echo "Background scheduler started: delete expired DRF tokens, archive old closed issues, prune project events and expired exports every day at 03:00 am"
 
 while true; do
 
@@ -10,6 +10,12 @@ while true; do
     if [ "$current_hour" = "03" ]; then
         echo "[$(date)] Running flushexpiredtokens..."
         python manage.py flushexpiredtokens
+        echo "[$(date)] Running archive_issues..."
+        python manage.py archive_issues --days "${ARCHIVE_AFTER_DAYS:-90}"
+        echo "[$(date)] Running prune_project_events..."
+        python manage.py prune_project_events
+        echo "[$(date)] Running prune_exports..."
+        python manage.py prune_exports
         echo "[$(date)] Task completed"
 
         # wait until hour 03:00 is passed
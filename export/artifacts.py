@@ -0,0 +1,117 @@
+import hashlib
+import logging
+import os
+import uuid
+
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Model
+from django.utils import timezone
+
+from job.queue import enqueue
+
+from .kinds import KINDS
+from .models import Export
+
+
+logger = logging.getLogger(__name__)
+
+
+def expiry():
+    return timezone.now() + timedelta(seconds=settings.EXPORT_TTL_SECONDS)
+
+
+def start_export(kind: str, target: Model) -> Export:
+    """
+    Export of the current data of a target: a built or building export of the same data version when there is one,
+    otherwise a new export, built in background by the export.build task.
+    """
+    version = KINDS[kind].data_version(target)
+    reusable = (
+        Export.objects.filter(kind=kind, target_id=target.pk, data_version=version, expires_at__gt=timezone.now())
+        .exclude(status=Export.Status.failed)
+        .order_by("-created_at")
+        .first()
+    )
+    # a file deleted by hand is rebuilt
+    # reused until its own expiry: downloads must not keep an export alive past EXPORT_TTL_SECONDS
+    if reusable is not None and (reusable.status != Export.Status.done or reusable.path.exists()):
+        return reusable
+
+    export = Export.objects.create(kind=kind, target_id=target.pk, data_version=version, expires_at=expiry())
+    enqueue("export.build", {"export_id": str(export.pk)})
+    return export
+
+
+def expire_exports(kind: str, target_ids) -> int:
+    """
+    Make the exports of targets unavailable at once, e.g. once they hold data of a deleted user (files are deleted
+    by prune_exports). Return their number.
+    """
+    now = timezone.now()
+    return Export.objects.filter(kind=kind, target_id__in=target_ids, expires_at__gt=now).update(expires_at=now)
+
+
+def build_export(export: Export):
+    """
+    Write the file of an export, with its size and SHA-256.
+
+    The file is written under a temporary name then renamed: a download never reads a partial file.
+    """
+    Export.objects.filter(pk=export.pk).update(status=Export.Status.running)
+    kind = KINDS[export.kind]
+    path = export.path
+    temporary_path = path.with_suffix(".tmp")
+    try:
+        target = kind.get_target(export.target_id)
+        if target is None:
+            raise LookupError(f"{export.get_kind_display()} {export.target_id} does not exist anymore")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        with temporary_path.open("wb") as file:
+            for chunk in kind.stream(target):
+                data = chunk.encode("utf-8")
+                file.write(data)
+                digest.update(data)
+                size += len(data)
+        os.replace(temporary_path, path)
+    except Exception as error:
+        temporary_path.unlink(missing_ok=True)
+        Export.objects.filter(pk=export.pk).update(
+            status=Export.Status.failed, error=str(error), finished_at=timezone.now()
+        )
+        raise
+
+    # update(), not save(): an export pruned while it was built must not be inserted again
+    updated = Export.objects.filter(pk=export.pk).update(
+        status=Export.Status.done, size=size, sha256=digest.hexdigest(), finished_at=timezone.now(), expires_at=expiry()
+    )
+    if not updated:
+        path.unlink(missing_ok=True)
+
+
+def prune_exports() -> int:
+    """Delete expired exports with their files, and files without export (e.g. left by a killed build)"""
+    expired = list(Export.objects.filter(expires_at__lte=timezone.now()))
+    for export in expired:
+        export.path.unlink(missing_ok=True)
+        export.path.with_suffix(".tmp").unlink(missing_ok=True)
+    Export.objects.filter(pk__in=[export.pk for export in expired]).delete()
+
+    root = Path(settings.EXPORT_ROOT)
+    files = {}
+    for path in root.iterdir() if root.is_dir() else []:
+        try:
+            files[path] = uuid.UUID(path.stem)
+        except ValueError:
+            # not an export file
+            continue
+    known = set(Export.objects.filter(pk__in=set(files.values())).values_list("pk", flat=True))
+    for path, export_id in files.items():
+        if export_id not in known:
+            logger.info("Deleting orphan export file %s", path.name)
+            path.unlink(missing_ok=True)
+    return len(expired)
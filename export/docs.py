@@ -0,0 +1,45 @@
+"""OpenAPI docs of export views, applied by config.docs.load_docs() when the schema is first requested"""
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+
+from .serializers import ExportSerializer
+from .views import ExportCreateView, ExportDownloadView, ExportStatusView
+
+
+export_id = OpenApiParameter(
+    name="export_id", type=OpenApiTypes.UUID, location=OpenApiParameter.PATH, description="Export id"
+)
+
+extend_schema(
+    summary="Start an export (GDPR data of the user, or a project)",
+    tags=["Export"],
+    responses={200: ExportSerializer, 202: ExportSerializer},
+)(ExportCreateView)
+
+extend_schema(summary="Get the status of an export", tags=["Export"], parameters=[export_id])(ExportStatusView)
+
+extend_schema(
+    summary="Download a built export",
+    tags=["Export"],
+    parameters=[
+        export_id,
+        OpenApiParameter(
+            name="Range",
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.HEADER,
+            description="A single range of bytes, e.g. `bytes=1000-`, to resume a download",
+        ),
+        OpenApiParameter(
+            name="If-None-Match",
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.HEADER,
+            description="ETag of a file already downloaded",
+        ),
+    ],
+    responses={
+        200: OpenApiResponse(response=OpenApiTypes.BINARY, description="Multi-section CSV file"),
+        206: OpenApiResponse(response=OpenApiTypes.BINARY, description="Requested range of the file"),
+        304: OpenApiResponse(description="File not modified since the download of this ETag"),
+    },
+)(ExportDownloadView)
@@ -0,0 +1,16 @@
+from job.queue import task
+
+from .artifacts import build_export
+from .models import Export
+
+
+# build_export records failures on the Export itself, a new request starts a new export: no automatic retry
+@task("export.build", max_attempts=1)
+def build(export_id: str):
+    # running: the job of a killed worker, queued again (cf. requeue_stale_jobs)
+    export = Export.objects.filter(pk=export_id, status__in=[Export.Status.pending, Export.Status.running]).first()
+    # pruned before it was built
+    if export is None:
+        return None
+    build_export(export)
+    return Export.objects.filter(pk=export_id).values("size").first()
@@ -0,0 +1,39 @@
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+
+from django.db.models import Model
+
+from project.export import project_data_version, stream_project_export
+from project.models import Project
+from project.roles import Permission
+from user.export import gdpr_data_version, stream_gdpr_export
+from user.models import User
+
+from .models import Export
+
+
+@dataclass(frozen=True)
+class ExportKind:
+    # of the exported object: User, Project
+    model: type[Model]
+    # whether a user may start and download exports of the object
+    can_read: Callable[[User, Model], bool]
+    data_version: Callable[[Model], str]
+    stream: Callable[[Model], Iterator[str]]
+
+    def get_target(self, target_id: int) -> Model | None:
+        return self.model.objects.filter(pk=target_id).first()
+
+
+def is_user_self(user: User, target: User) -> bool:
+    return user.pk == target.pk
+
+
+def is_contributor(user: User, project: Project) -> bool:
+    return bool(project.permissions(user) & Permission.VIEW)
+
+
+KINDS = {
+    Export.Kind.gdpr: ExportKind(User, is_user_self, gdpr_data_version, stream_gdpr_export),
+    Export.Kind.project: ExportKind(Project, is_contributor, project_data_version, stream_project_export),
+}
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from export.artifacts import prune_exports
+
+
+class Command(BaseCommand):
+    help = "Delete expired exports and their files (cf. EXPORT_TTL_SECONDS), and export files left without export"
+
+    def handle(self, *args, **options):
+        deleted = prune_exports()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} expired exports deleted"))
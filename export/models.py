@@ -0,0 +1,60 @@
+import uuid
+
+from pathlib import Path
+
+from django.conf import settings
+from django.db import models
+
+
+class Export(models.Model):
+    """
+    An export built in background (cf. export.artifacts), saved as a file in EXPORT_ROOT.
+
+    The file is reused by later requests as long as the exported data has the same version, and deleted once the
+    export expires (cf. prune_exports command).
+    """
+
+    class Kind(models.TextChoices):
+        gdpr = "gdpr", "GDPR personal data"
+        project = "project", "Project"
+
+    class Status(models.TextChoices):
+        pending = "pending", "Pending"
+        running = "running", "Running"
+        done = "done", "Done"
+        failed = "failed", "Failed"
+
+    # random id: not guessable in download URLs
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(choices=Kind)
+    # user id of a GDPR export, project id of a project export
+    target_id = models.BigIntegerField()
+    # fingerprint of the exported data when the export was requested (cf. config.exports.data_version)
+    data_version = models.CharField(max_length=64)
+    status = models.CharField(choices=Status, default=Status.pending)
+    # of the file once built, its SHA-256 is the ETag of downloads
+    size = models.BigIntegerField(null=True, blank=True)
+    sha256 = models.CharField(max_length=64, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # pushed back each time the export is reused
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # lookup of a reusable export
+            models.Index(fields=["kind", "target_id", "data_version"], name="export_reuse_idx"),
+            models.Index(fields=["expires_at"], name="export_expiry_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} export of {self.target_id} ({self.status})"
+
+    @property
+    def path(self) -> Path:
+        return Path(settings.EXPORT_ROOT) / f"{self.pk}.csv"
+
+    @property
+    def filename(self) -> str:
+        return f"{self.kind}-export-{self.target_id}.csv"
@@ -0,0 +1,44 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from .models import Export
+
+
+class ExportCreateSerializer(serializers.Serializer):
+    """Serializer for an export request: the GDPR export of the authenticated user, or a project export"""
+
+    kind = serializers.ChoiceField(choices=Export.Kind.choices)
+    project_id = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        if attrs["kind"] == Export.Kind.project and "project_id" not in attrs:
+            raise serializers.ValidationError({"project_id": "This field is required for a project export."})
+        return attrs
+
+
+class ExportSerializer(serializers.ModelSerializer):
+    """Serializer for the status of an export, with its download URL once built"""
+
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Export
+        fields = [
+            "id",
+            "kind",
+            "target_id",
+            "status",
+            "size",
+            "sha256",
+            "error",
+            "created_at",
+            "finished_at",
+            "expires_at",
+            "download_url",
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, export: Export) -> str | None:
+        if export.status != Export.Status.done:
+            return None
+        return self.context["request"].build_absolute_uri(reverse("export:download", kwargs={"export_id": export.pk}))
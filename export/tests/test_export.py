@@ -0,0 +1,395 @@
+import hashlib
+import warnings
+
+from dataclasses import replace
+from datetime import timedelta
+
+import pytest
+
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from config.downloads import RangeNotSatisfiableError, parse_range
+from config.factories import IssueFactory, ProjectFactory, UserFactory
+from issue.archive import archive_issues
+from issue.models import Issue
+from project.models import Project
+from user.deletion import delete_user_account
+from user.models import User
+
+from ..kinds import KINDS
+from ..models import Export
+
+
+base_export_url = "export:"
+
+
+@pytest.fixture(autouse=True)
+def export_root(settings, tmp_path):
+    settings.EXPORT_ROOT = tmp_path
+    return tmp_path
+
+
+def start(client, **data):
+    return client.post(reverse(f"{base_export_url}create"), data, format="json")
+
+
+def build(client, **data) -> Export:
+    """Start an export and run its build job"""
+    response = start(client, **data)
+    call_command("run_jobs", once=True)
+    return Export.objects.get(pk=response.data["id"])
+
+
+def download(client, export: Export, **headers):
+    return client.get(reverse(f"{base_export_url}download", kwargs={"export_id": export.pk}), headers=headers)
+
+
+# ==================== Export jobs Tests ====================
+
+
+@pytest.mark.django_db
+class TestExportJobs:
+    """Tests for exports built in background (POST /api/export/, GET /api/export/{export_id}/)"""
+
+    def test_start_gdpr_export(self, authenticated_client):
+        """Success: a GDPR export is queued, its status URL is returned"""
+        response = start(authenticated_client, kind="gdpr")
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        export = Export.objects.get()
+        assert export.target_id == authenticated_client.user.pk
+        assert response["Location"].endswith(reverse(f"{base_export_url}status", kwargs={"export_id": export.pk}))
+
+    def test_build_export(self, authenticated_client):
+        """Success: the job writes the export file, its status gives the download URL"""
+        project = ProjectFactory(author=authenticated_client.user)
+        IssueFactory.create_batch(3, project=project, author=authenticated_client.user)
+
+        export = build(authenticated_client, kind="project", projectId=project.pk)
+        response = authenticated_client.get(reverse(f"{base_export_url}status", kwargs={"export_id": export.pk}))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["status"] == Export.Status.done
+        assert response.data["download_url"].endswith(
+            reverse(f"{base_export_url}download", kwargs={"export_id": export.pk})
+        )
+        content = export.path.read_bytes()
+        assert content.startswith(b"[project]")
+        assert export.size == len(content)
+        assert export.sha256 == hashlib.sha256(content).hexdigest()
+
+    def test_export_reused_while_data_unchanged(self, authenticated_client):
+        """Success: a built export is returned again, without new job, while its data does not change"""
+        export = build(authenticated_client, kind="gdpr")
+
+        response = start(authenticated_client, kind="gdpr")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["id"] == str(export.pk)
+        assert Export.objects.count() == 1
+
+    def test_pending_export_reused(self, authenticated_client):
+        """Success: an export requested twice before it is built is only built once"""
+        first = start(authenticated_client, kind="gdpr")
+        second = start(authenticated_client, kind="gdpr")
+
+        assert second.status_code == status.HTTP_202_ACCEPTED
+        assert second.data["id"] == first.data["id"]
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            pytest.param(lambda project, issue: IssueFactory(project=project), id="issue created"),
+            pytest.param(lambda project, issue: archive_issues([issue.pk]), id="issue archived"),
+            pytest.param(lambda project, issue: Project.objects.filter(pk=project.pk).update(name="New"), id="renamed"),
+            pytest.param(lambda project, issue: project.contributors.add(UserFactory()), id="contributor added"),
+            pytest.param(
+                lambda project, issue: User.objects.filter(pk=project.author_id).update(username="renamed"),
+                id="contributor renamed",
+            ),
+        ],
+    )
+    def test_export_rebuilt_once_data_changed(self, authenticated_client, change):
+        """Success: a change of the exported data makes a new export"""
+        project = ProjectFactory(author=authenticated_client.user)
+        issue = IssueFactory(project=project, status=Issue.Status.closed)
+        export = build(authenticated_client, kind="project", projectId=project.pk)
+
+        change(project, issue)
+        response = start(authenticated_client, kind="project", projectId=project.pk)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data["id"] != str(export.pk)
+
+    def test_reuse_keeps_expiry(self, authenticated_client):
+        """Success: a reused export expires when it was meant to, however often it is requested"""
+        export = build(authenticated_client, kind="gdpr")
+
+        start(authenticated_client, kind="gdpr")
+
+        assert Export.objects.get(pk=export.pk).expires_at == export.expires_at
+
+    def test_exports_expired_on_account_deletion(self, authenticated_client):
+        """Success: exports of the projects of a deleted user, and their GDPR export, are no longer available"""
+        member = UserFactory()
+        project = ProjectFactory(author=authenticated_client.user, contributors=[member])
+        IssueFactory(project=project, author=member)
+        export = build(authenticated_client, kind="project", projectId=project.pk)
+
+        delete_user_account(member.pk)
+
+        assert Export.objects.get(pk=export.pk).expires_at <= timezone.now()
+        assert start(authenticated_client, kind="project", projectId=project.pk).data["id"] != str(export.pk)
+
+    def test_gdpr_export_rebuilt_once_profile_changed(self, authenticated_client):
+        """Success: the GDPR export follows profile changes"""
+        user = authenticated_client.user
+        export = build(authenticated_client, kind="gdpr")
+
+        user.first_name = "Changed"
+        user.save()
+
+        assert start(authenticated_client, kind="gdpr").data["id"] != str(export.pk)
+
+    def test_failed_export_not_reused(self, authenticated_client, export_root, monkeypatch):
+        """Success: a failed build is reported, and a new request starts a new export"""
+        project = ProjectFactory(author=authenticated_client.user)
+
+        def fail(project):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setitem(KINDS, Export.Kind.project, replace(KINDS[Export.Kind.project], stream=fail))
+        export = build(authenticated_client, kind="project", projectId=project.pk)
+
+        assert export.status == Export.Status.failed
+        assert export.error == "disk full"
+        assert list(export_root.iterdir()) == []
+        assert start(authenticated_client, kind="project", projectId=project.pk).data["id"] != str(export.pk)
+
+    def test_project_export_not_contributor_failure(self, authenticated_client):
+        """Failure: a project export is refused to a user who is not a contributor"""
+        project = ProjectFactory(author=UserFactory())
+
+        response = start(authenticated_client, kind="project", projectId=project.pk)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert not Export.objects.exists()
+
+    def test_project_export_without_project_failure(self, authenticated_client):
+        """Failure: a project export requires a project id"""
+        response = start(authenticated_client, kind="project")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_status_of_other_user_failure(self, authenticated_client, api_client):
+        """Failure: the GDPR export of a user is not readable by another user"""
+        export = build(authenticated_client, kind="gdpr")
+        other_client = api_client.__class__()
+        other_client.force_authenticate(UserFactory())
+
+        response = other_client.get(reverse(f"{base_export_url}status", kwargs={"export_id": export.pk}))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+# ==================== Export download Tests ====================
+
+
+@pytest.mark.django_db
+class TestExportDownload:
+    """Tests for the download of built exports (GET /api/export/{export_id}/download/)"""
+
+    @pytest.fixture
+    def export(self, authenticated_client):
+        user = authenticated_client.user
+        IssueFactory.create_batch(5, project=ProjectFactory(author=user), author=user)
+        return build(authenticated_client, kind="gdpr")
+
+    def test_download(self, authenticated_client, export):
+        """Success: the file is sent as an attachment, with its hash as ETag"""
+        response = download(authenticated_client, export)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert b"".join(response.streaming_content) == export.path.read_bytes()
+        assert response["ETag"] == f'"{export.sha256}"'
+        assert response["Content-Length"] == str(export.size)
+        assert response["Accept-Ranges"] == "bytes"
+        assert f'filename="gdpr-export-{authenticated_client.user.pk}.csv"' in response["Content-Disposition"]
+
+    def test_download_not_modified(self, authenticated_client, export):
+        """Success: nothing is sent again for the ETag of the current file"""
+        response = download(authenticated_client, export, **{"If-None-Match": f'"{export.sha256}"'})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.parametrize(
+        ("header", "start", "end"),
+        [("bytes=10-19", 10, 20), ("bytes=10-", 10, None), ("bytes=-10", -10, None), ("bytes=0-999999", 0, None)],
+    )
+    def test_download_range(self, authenticated_client, export, header, start, end):
+        """Success: a range of bytes is sent, to resume a download"""
+        content = export.path.read_bytes()
+        expected = content[start:end]
+
+        response = download(authenticated_client, export, Range=header)
+
+        assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert b"".join(response.streaming_content) == expected
+        assert response["Content-Length"] == str(len(expected))
+        first = content.index(expected) if start >= 0 else len(content) + start
+        assert response["Content-Range"] == f"bytes {first}-{first + len(expected) - 1}/{len(content)}"
+
+    def test_download_range_of_changed_file(self, authenticated_client, export):
+        """Success: the whole file is sent if it changed since the first part was downloaded (If-Range)"""
+        response = download(authenticated_client, export, Range="bytes=10-", **{"If-Range": '"outdated"'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert b"".join(response.streaming_content) == export.path.read_bytes()
+
+    def test_download_range_not_satisfiable_failure(self, authenticated_client, export):
+        """Failure: a range beyond the end of the file is refused"""
+        response = download(authenticated_client, export, Range=f"bytes={export.size}-")
+
+        assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        assert response["Content-Range"] == f"bytes */{export.size}"
+
+    def test_download_not_built_failure(self, authenticated_client):
+        """Failure: an export cannot be downloaded before it is built"""
+        response = start(authenticated_client, kind="gdpr")
+
+        response = download(authenticated_client, Export.objects.get(pk=response.data["id"]))
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    def test_download_expired_failure(self, authenticated_client, export):
+        """Failure: an expired export is not downloadable anymore"""
+        Export.objects.filter(pk=export.pk).update(expires_at=timezone.now())
+
+        response = download(authenticated_client, export)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_download_is_streamed_under_asgi(self, authenticated_client, export):
+        """Success: under ASGI, the file is sent block by block instead of being read at once"""
+        url = reverse(f"{base_export_url}download", kwargs={"export_id": export.pk})
+
+        async def scenario():
+            response = await AsyncClient().get(
+                url, headers={"Authorization": f"Bearer {authenticated_client.access_token}", "Range": "bytes=5-"}
+            )
+            return response, [chunk async for chunk in response.streaming_content]
+
+        with warnings.catch_warnings():
+            # raised by Django when it consumes a sync iterator into a list
+            warnings.simplefilter("error")
+            response, chunks = async_to_sync(scenario)()
+
+        assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert response.is_async
+        assert b"".join(chunks) == export.path.read_bytes()[5:]
+
+
+# ==================== Query budget Tests ====================
+
+
+@pytest.mark.django_db
+class TestExportQueryBudgets:
+    """Tests for the query budgets of export views, as the exported rows grow"""
+
+    @pytest.fixture
+    def project(self, authenticated_client):
+        return ProjectFactory(author=authenticated_client.user)
+
+    @pytest.fixture
+    def grow(self, authenticated_client, project):
+        """Issues of the project, written by the user"""
+
+        def grow(rows):
+            IssueFactory.create_batch(rows - project.issues.count(), project=project, author=authenticated_client.user)
+
+        return grow
+
+    @pytest.mark.parametrize("kind", ["gdpr", "project"])
+    def test_create_success(self, authenticated_client, project, grow, assert_query_budget, kind):
+        """Success: starting an export runs as many queries for 1 or 20 issues"""
+        data = {"kind": kind, "project_id": project.pk} if kind == "project" else {"kind": kind}
+
+        assert_query_budget(lambda: start(authenticated_client, **data), grow)
+
+    @pytest.mark.parametrize("name", ["status", "download"])
+    def test_read_success(self, authenticated_client, project, grow, assert_query_budget, name):
+        """Success: reading the status of an export, or downloading it, runs as many queries for 1 or 20 issues"""
+        exports = []
+
+        def grow_and_build(rows):
+            grow(rows)
+            exports.append(build(authenticated_client, kind="project", project_id=project.pk))
+
+        assert_query_budget(
+            lambda: authenticated_client.get(reverse(f"{base_export_url}{name}", kwargs={"export_id": exports[-1].pk})),
+            grow_and_build,
+        )
+
+
+# ==================== Export pruning Tests ====================
+
+
+@pytest.mark.django_db
+class TestPruneExports:
+    """Tests for the prune_exports command"""
+
+    def test_prune_expired_exports(self, authenticated_client, export_root):
+        """Success: expired exports and their files are deleted, others are kept"""
+        expired = build(authenticated_client, kind="gdpr")
+        Export.objects.filter(pk=expired.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        kept = build(authenticated_client, kind="gdpr")
+
+        call_command("prune_exports")
+
+        assert list(Export.objects.values_list("pk", flat=True)) == [kept.pk]
+        assert list(export_root.iterdir()) == [kept.path]
+
+    def test_prune_orphan_files(self, export_root):
+        """Success: files left without export are deleted, files unrelated to exports are kept"""
+        (export_root / "3f1c5a3e-8d2b-4a8e-9a77-0d9f4e7c1b20.tmp").write_bytes(b"partial")
+        (export_root / "README").write_text("kept")
+
+        call_command("prune_exports")
+
+        assert [path.name for path in export_root.iterdir()] == ["README"]
+
+
+# ==================== Range parsing Tests ====================
+
+
+class TestParseRange:
+    """Tests for config.downloads.parse_range"""
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("bytes=0-9", (0, 9)),
+            ("bytes=90-", (90, 99)),
+            ("bytes=-20", (80, 99)),
+            ("bytes=-200", (0, 99)),
+            ("bytes=50-500", (50, 99)),
+            ("bytes=0-9,20-29", None),
+            ("bytes=9-0", None),
+            ("items=0-9", None),
+            ("bytes=-", None),
+        ],
+    )
+    def test_parse_range(self, header, expected):
+        """Success: single ranges are parsed, other ones are ignored"""
+        assert parse_range(header, 100) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=100-", "bytes=-0"])
+    def test_parse_range_not_satisfiable_failure(self, header):
+        """Failure: a range out of the file is not satisfiable"""
+        with pytest.raises(RangeNotSatisfiableError):
+            parse_range(header, 100)
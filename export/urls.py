@@ -0,0 +1,12 @@
+from django.urls import path
+
+from . import views
+
+
+app_name = "export"
+
+urlpatterns = [
+    path("", views.ExportCreateView.as_view(), name="create"),
+    path("<uuid:export_id>/", views.ExportStatusView.as_view(), name="status"),
+    path("<uuid:export_id>/download/", views.ExportDownloadView.as_view(), name="download"),
+]
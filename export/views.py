@@ -0,0 +1,112 @@
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import CreateAPIView, RetrieveAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from config.downloads import serve_file
+
+from .artifacts import start_export
+from .kinds import KINDS
+from .models import Export
+from .serializers import ExportCreateSerializer, ExportSerializer
+
+
+class ExportCreateView(CreateAPIView):
+    """
+    Starts an export: the GDPR export of the authenticated user, or the export of a project, as a multi-section CSV.
+    <br>Returns a `200` response code when a built export of the same data exists: it is reused as is.
+    <br>Returns a `202` response code otherwise, with the export status URL in `Location`: the export is built in
+    background (an export already being built for the same data is reused).
+    <br>Raises a `400` error code if the kind is unknown, or the project id is missing for a project export.
+    <br>Raises a `404` error code if the project is not found, or the user is not one of its contributors.
+    <br>
+    <br>**Authentification required**: Yes
+    <br>**Permissions required**: Contributor of the project, for a project export
+    """
+
+    serializer_class = ExportCreateSerializer
+    permission_classes = [IsAuthenticated]
+    query_budgets = {"post": 15}
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        kind = serializer.validated_data["kind"]
+        target_id = request.user.pk if kind == Export.Kind.gdpr else serializer.validated_data["project_id"]
+        target = KINDS[kind].get_target(target_id)
+        if target is None or not KINDS[kind].can_read(request.user, target):
+            raise NotFound(f"Project with id {target_id} does not exist.")
+
+        export = start_export(kind, target)
+        status_url = request.build_absolute_uri(reverse("export:status", kwargs={"export_id": export.pk}))
+        return Response(
+            ExportSerializer(export, context=self.get_serializer_context()).data,
+            status=status.HTTP_200_OK if export.status == Export.Status.done else status.HTTP_202_ACCEPTED,
+            headers={"Location": status_url},
+        )
+
+
+class ExportMixin:
+    """Export of the URL, readable by the users allowed to start it only"""
+
+    queryset = Export.objects.all()
+    serializer_class = ExportSerializer
+    permission_classes = [IsAuthenticated]
+    lookup_url_kwarg = "export_id"
+
+    def get_object(self):
+        export = super().get_object()
+        kind = KINDS[export.kind]
+        target = kind.get_target(export.target_id)
+        # same response as a missing export: export ids of others are not disclosed
+        if target is None or not kind.can_read(self.request.user, target):
+            raise NotFound()
+        return export
+
+
+class ExportStatusView(ExportMixin, RetrieveAPIView):
+    """
+    Represents the status of an export, with its download URL once built.
+    <br>Returns a `200` response code on success.
+    <br>Raises a `404` error code if the export is not found, or the user may not read it.
+    <br>
+    <br>**Authentification required**: Yes
+    <br>**Permissions required**: The user of a GDPR export, contributor of the project of a project export
+    """
+
+    query_budgets = {"get": 3}
+
+
+class ExportDownloadView(ExportMixin, RetrieveAPIView):
+    """
+    Downloads a built export, as a CSV file.
+    <br>Returns a `200` response code on success, with the SHA-256 of the file as `ETag`.
+    <br>Returns a `206` response code for a `Range` request (a single range), to resume a download.
+    <br>Returns a `304` response code if `If-None-Match` is the current `ETag`.
+    <br>Raises a `404` error code if the export is not found, expired, or the user may not read it.
+    <br>Raises a `409` error code if the export is not built yet, or failed.
+    <br>Raises a `416` error code if the range starts beyond the file.
+    <br>
+    <br>**Authentification required**: Yes
+    <br>**Permissions required**: The user of a GDPR export, contributor of the project of a project export
+    """
+
+    query_budgets = {"get": 3}
+
+    def perform_content_negotiation(self, request, force=False):
+        # the file is sent whatever the Accept header (e.g. text/csv), renderers only render errors
+        return super().perform_content_negotiation(request, force=True)
+
+    def retrieve(self, request, *args, **kwargs):
+        export = self.get_object()
+        if export.status != Export.Status.done:
+            return Response({"detail": f"Export is {export.status}."}, status=status.HTTP_409_CONFLICT)
+        if export.expires_at <= timezone.now():
+            raise NotFound("Export expired, start a new one.")
+        try:
+            return serve_file(request, export.path, export.sha256, export.filename, "text/csv; charset=utf-8")
+        except FileNotFoundError as error:
+            raise NotFound("Export expired, start a new one.") from error
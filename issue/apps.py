@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class IssueConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "issue"
+
+    def ready(self):
+        # connect counter signals
+        from . import signals  # noqa: F401
@@ -0,0 +1,69 @@
+import logging
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from config.db_utils import raw_delete
+
+from .models import ArchivedComment, ArchivedIssue, Comment, Issue
+
+
+logger = logging.getLogger("issues")
+
+# columns copied between hot and archive tables (archive tables have the same ones, plus archived_at)
+ISSUE_COLUMNS = [field.attname for field in Issue._meta.concrete_fields]
+COMMENT_COLUMNS = [field.attname for field in Comment._meta.concrete_fields]
+
+
+def archivable_issue_ids(older_than_days: int, chunk_size: int) -> list[int]:
+    """Return the ids of the next chunk of issues closed for more than older_than_days"""
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    return list(
+        Issue.objects.filter(status=Issue.Status.closed)
+        # issues closed before closed_at existed: use their creation date
+        .annotate(closed_since=Coalesce(F("closed_at"), F("created_at")))
+        .filter(closed_since__lt=cutoff)
+        .order_by("pk")
+        .values_list("pk", flat=True)[:chunk_size]
+    )
+
+
+@transaction.atomic
+def archive_issues(issue_ids: list[int]) -> int:
+    """
+    Move closed issues, and their comments, to archive tables. Return the number of archived issues.
+
+    Rows are copied then removed with plain DELETE statements: project counters are not updated, as archived
+    issues still belong to their project.
+    """
+    issues = Issue.objects.filter(pk__in=issue_ids, status=Issue.Status.closed).values(*ISSUE_COLUMNS)
+    archived_issues = ArchivedIssue.objects.bulk_create(ArchivedIssue(**row) for row in issues)
+    archived_ids = [archived_issue.pk for archived_issue in archived_issues]
+
+    comments = Comment.objects.filter(issue_id__in=archived_ids).values(*COMMENT_COLUMNS)
+    ArchivedComment.objects.bulk_create(ArchivedComment(**row) for row in comments)
+
+    raw_delete(Comment.objects.filter(issue_id__in=archived_ids))
+    raw_delete(Issue.objects.filter(pk__in=archived_ids))
+    return len(archived_ids)
+
+
+@transaction.atomic
+def restore_issue(archived_issue: ArchivedIssue) -> Issue:
+    """Move an archived issue, and its comments, back to hot tables, with the same ids"""
+    issue = Issue(**{column: getattr(archived_issue, column) for column in ISSUE_COLUMNS})
+    # bulk_create does not send post_save: project counters already count archived issues
+    Issue.objects.bulk_create([issue])
+    Comment.objects.bulk_create(
+        Comment(**{column: getattr(comment, column) for column in COMMENT_COLUMNS})
+        for comment in archived_issue.comments.all()
+    )
+
+    raw_delete(ArchivedComment.objects.filter(issue_id=archived_issue.pk))
+    raw_delete(ArchivedIssue.objects.filter(pk=archived_issue.pk))
+    logger.info("Issue %s restored from archive", issue.pk)
+    return issue
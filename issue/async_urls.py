@@ -0,0 +1,21 @@
+from django.urls import path
+
+from . import async_views
+
+
+app_name = "issue_async"
+
+urlpatterns = [
+    path("<int:project_id>/issue/", async_views.AsyncIssueView.as_view(), name="issue-list"),
+    path("<int:project_id>/issue/<int:issue_id>/", async_views.AsyncIssueView.as_view(), name="issue-detail"),
+    path(
+        "<int:project_id>/issue/<int:issue_id>/comment/",
+        async_views.AsyncCommentView.as_view(),
+        name="comment-list",
+    ),
+    path(
+        "<int:project_id>/issue/<int:issue_id>/comment/<int:comment_id>/",
+        async_views.AsyncCommentView.as_view(),
+        name="comment-detail",
+    ),
+]
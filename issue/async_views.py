@@ -0,0 +1,72 @@
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+
+from config.async_views import AsyncReadOnlyAPIView
+from config.global_permissions import IsObjectAuthor, IsProjectContributor
+from project.models import Project
+
+from .models import Comment, Issue
+from .serializers import CommentSerializer, IssueSerializer
+
+
+class AsyncProjectMixin:
+    """Async version of config.mixins.ProjectMixin"""
+
+    project = None
+
+    async def initial(self, request, *args, **kwargs):
+        project_id = kwargs.get("project_id")
+        try:
+            self.project = await Project.objects.with_role_of(request.user).aget(id=project_id)
+        except Project.DoesNotExist as error:
+            raise NotFound(f"Project with id {project_id} does not exist.") from error
+
+
+class AsyncIssueView(AsyncProjectMixin, AsyncReadOnlyAPIView):
+    """
+    Async list/retrieve of active issues, same queryset and permissions as IssueModelViewSet.
+    Archived issues (include_archived) are only served by the sync endpoints.
+    """
+
+    serializer_class = IssueSerializer
+    permission_classes = [IsAuthenticated, IsObjectAuthor, IsProjectContributor]
+    lookup_url_kwarg = "issue_id"
+    # list and retrieve (cf. config.query_budget)
+    query_budgets = {"get": 4}
+
+    def get_queryset(self):
+        return (
+            Issue.objects.select_related("project", "author")
+            .filter(project=self.project)
+            .filter(Q(author=self.request.user) | Q(project__contributors=self.request.user))
+            .distinct()
+            .order_by("id")
+        )
+
+
+class AsyncCommentView(AsyncProjectMixin, AsyncReadOnlyAPIView):
+    """Async list/retrieve of comments of an active issue, same queryset and permissions as CommentModelViewSet"""
+
+    serializer_class = CommentSerializer
+    permission_classes = [IsAuthenticated, IsObjectAuthor, IsProjectContributor]
+    lookup_url_kwarg = "comment_id"
+    # list and retrieve (cf. config.query_budget)
+    query_budgets = {"get": 5}
+
+    async def initial(self, request, *args, **kwargs):
+        await super().initial(request, *args, **kwargs)
+        issue_id = kwargs.get("issue_id")
+        try:
+            self.issue = await Issue.objects.aget(id=issue_id, project=self.project)
+        except Issue.DoesNotExist as error:
+            raise NotFound(f"Issue with id {issue_id} does not exist.") from error
+
+    def get_queryset(self):
+        return (
+            Comment.objects.select_related("issue", "author")
+            .filter(issue=self.issue)
+            .filter(Q(author=self.request.user) | Q(issue__project__contributors=self.request.user))
+            .distinct()
+            .order_by("id")
+        )
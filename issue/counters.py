@@ -0,0 +1,58 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Q, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from project.models import Project
+
+from .models import ArchivedIssue, Comment, Issue
+
+
+def count_subquery(queryset: QuerySet, field: str):
+    """Count rows of queryset grouped by field, as an expression usable in an annotation or an UPDATE"""
+    counts = queryset.filter(**{field: OuterRef("pk")}).values(field).annotate(total=Count("pk")).values("total")
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def actual_project_counters() -> dict:
+    return {
+        # archived issues still belong to their project (they are all closed)
+        "actual_issue_count": count_subquery(Issue.objects.all(), "project")
+        + count_subquery(ArchivedIssue.objects.all(), "project"),
+        "actual_open_issue_count": count_subquery(Issue.objects.filter(~Q(status=Issue.Status.closed)), "project"),
+    }
+
+
+def actual_issue_counters() -> dict:
+    return {"actual_comment_count": count_subquery(Comment.objects.all(), "issue")}
+
+
+def recount_projects(project_ids: list[int]) -> int:
+    """Repair counters of the given projects, return the number of projects which had drifted"""
+    counters = actual_project_counters()
+    drifted_ids = list(
+        Project.objects.filter(pk__in=project_ids)
+        .annotate(**counters)
+        .filter(
+            ~Q(issue_count=F("actual_issue_count")) | ~Q(open_issue_count=F("actual_open_issue_count")),
+        )
+        .values_list("pk", flat=True)
+    )
+    if drifted_ids:
+        Project.objects.filter(pk__in=drifted_ids).update(
+            issue_count=counters["actual_issue_count"],
+            open_issue_count=counters["actual_open_issue_count"],
+        )
+    return len(drifted_ids)
+
+
+def recount_issues(issue_ids: list[int]) -> int:
+    """Repair counters of the given issues, return the number of issues which had drifted"""
+    counters = actual_issue_counters()
+    drifted_ids = list(
+        Issue.objects.filter(pk__in=issue_ids)
+        .annotate(**counters)
+        .filter(~Q(comment_count=F("actual_comment_count")))
+        .values_list("pk", flat=True)
+    )
+    if drifted_ids:
+        Issue.objects.filter(pk__in=drifted_ids).update(comment_count=counters["actual_comment_count"])
+    return len(drifted_ids)
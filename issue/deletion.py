@@ -0,0 +1,26 @@
+from django.db import transaction
+
+from activity.models import ProjectEvent
+from config.db_utils import raw_delete
+
+from .models import Issue
+
+
+@transaction.atomic
+def delete_issue(issue: Issue):
+    """
+    Delete an issue and its comments with a fixed number of queries.
+
+    Issue.delete() cascades to comments one by one: each sends post_delete, which updates the comment count of
+    the issue being deleted and records its event (3 queries per comment). Comment events are bulk inserted here,
+    comments raw deleted, then the issue is deleted with its own signals (project counters, issue event).
+    """
+    comment_ids = list(issue.comments.order_by("pk").values_list("pk", flat=True))
+    ProjectEvent.objects.bulk_create(
+        ProjectEvent(
+            project_id=issue.project_id, kind="comment.deleted", object_id=comment_id, data={"issue": issue.pk}
+        )
+        for comment_id in comment_ids
+    )
+    raw_delete(issue.comments.all())
+    issue.delete()
@@ -0,0 +1,129 @@
+"""OpenAPI docs of issue and comment views, applied by config.docs.load_docs() when the schema is first requested"""
+
+from drf_spectacular.utils import extend_schema, extend_schema_view
+
+from config.docs import DocsTypingParameters
+
+from .views import CommentModelViewSet, IssueModelViewSet
+
+
+extend_schema_view(
+    list=extend_schema(
+        summary="Get all Issues",
+        tags=["Issue"],
+        parameters=[
+            DocsTypingParameters.project_id.value,
+            DocsTypingParameters.include_archived.value,
+            DocsTypingParameters.csv_format.value,
+            DocsTypingParameters.csv_all.value,
+        ],
+    ),
+    retrieve=extend_schema(
+        summary="Get an Issue",
+        tags=["Issue"],
+        parameters=[
+            DocsTypingParameters.issue_id.value,
+            DocsTypingParameters.project_id.value,
+            DocsTypingParameters.include_archived.value,
+        ],
+    ),
+    create=extend_schema(
+        summary="Create an Issue",
+        tags=["Issue"],
+        parameters=[
+            DocsTypingParameters.project_id.value,
+        ],
+    ),
+    update=extend_schema(
+        summary="Update entirely an Issue",
+        tags=["Issue"],
+        parameters=[
+            DocsTypingParameters.issue_id.value,
+            DocsTypingParameters.project_id.value,
+        ],
+    ),
+    partial_update=extend_schema(
+        summary="Update one or many Issue's fields",
+        tags=["Issue"],
+        parameters=[
+            DocsTypingParameters.issue_id.value,
+            DocsTypingParameters.project_id.value,
+        ],
+    ),
+    destroy=extend_schema(
+        summary="Delete an Issue",
+        tags=["Issue"],
+        parameters=[
+            DocsTypingParameters.issue_id.value,
+            DocsTypingParameters.project_id.value,
+        ],
+    ),
+    restore=extend_schema(
+        summary="Restore an archived Issue",
+        tags=["Issue"],
+        request=None,
+        parameters=[
+            DocsTypingParameters.issue_id.value,
+            DocsTypingParameters.project_id.value,
+        ],
+    ),
+)(IssueModelViewSet)
+
+extend_schema_view(
+    list=extend_schema(
+        summary="Get all Comments",
+        tags=["Comment"],
+        parameters=[
+            DocsTypingParameters.issue_id.value,
+            DocsTypingParameters.project_id.value,
+            DocsTypingParameters.include_archived.value,
+            DocsTypingParameters.csv_format.value,
+            DocsTypingParameters.csv_all.value,
+        ],
+    ),
+    retrieve=extend_schema(
+        summary="Get an Comment",
+        tags=["Comment"],
+        parameters=[
+            DocsTypingParameters.comment_id.value,
+            DocsTypingParameters.issue_id.value,
+            DocsTypingParameters.project_id.value,
+            DocsTypingParameters.include_archived.value,
+        ],
+    ),
+    create=extend_schema(
+        summary="Create an Comment",
+        tags=["Comment"],
+        parameters=[
+            DocsTypingParameters.issue_id.value,
+            DocsTypingParameters.project_id.value,
+        ],
+    ),
+    update=extend_schema(
+        summary="Update entirely an Comment",
+        tags=["Comment"],
+        parameters=[
+            DocsTypingParameters.comment_id.value,
+            DocsTypingParameters.issue_id.value,
+            DocsTypingParameters.project_id.value,
+        ],
+    ),
+    partial_update=extend_schema(
+        summary="Update one or many Comment's fields",
+        tags=["Comment"],
+        parameters=[
+            DocsTypingParameters.comment_id.value,
+            DocsTypingParameters.issue_id.value,
+            DocsTypingParameters.project_id.value,
+        ],
+    ),
+    destroy=extend_schema(
+        summary="Delete an Comment",
+        tags=["Comment"],
+        parameters=[
+            DocsTypingParameters.comment_id.value,
+            DocsTypingParameters.issue_id.value,
+            DocsTypingParameters.project_id.value,
+        ],
+    ),
+)(CommentModelViewSet)
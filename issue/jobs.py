@@ -0,0 +1,11 @@
+from job.queue import task
+
+from .counters import recount_issues, recount_projects
+
+
+@task("issue.recount")
+def recount(project_ids: list[int] | None = None, issue_ids: list[int] | None = None):
+    return {
+        "drifted_projects": recount_projects(project_ids or []),
+        "drifted_issues": recount_issues(issue_ids or []),
+    }
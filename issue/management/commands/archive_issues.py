@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from issue.archive import archivable_issue_ids, archive_issues
+
+
+class Command(BaseCommand):
+    help = "Move issues closed for more than N days, with their comments, to archive tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=90, help="Archive issues closed for more than this many days")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Number of issues moved per transaction")
+
+    def handle(self, *args, **options):
+        total = 0
+        # one short transaction per chunk: hot tables are never locked for long
+        while issue_ids := archivable_issue_ids(options["days"], options["chunk_size"]):
+            total += archive_issues(issue_ids)
+            self.stdout.write(f"{total} issues archived...")
+
+        self.stdout.write(self.style.SUCCESS(f"{total} issues closed for more than {options['days']} days archived"))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from issue.counters import recount_issues, recount_projects
+from issue.models import Issue
+from project.models import Project
+
+
+class Command(BaseCommand):
+    help = "Repair drift of denormalized counters (Project.issue_count, Project.open_issue_count, Issue.comment_count)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of rows recounted per UPDATE")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        for model, recount in ((Project, recount_projects), (Issue, recount_issues)):
+            checked = drifted = 0
+            last_pk = 0
+            # keyset pagination: each batch is a short query and a short UPDATE, no long table lock
+            while True:
+                pks = list(
+                    model.objects.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:batch_size]
+                )
+                if not pks:
+                    break
+                drifted += recount(pks)
+                checked += len(pks)
+                last_pk = pks[-1]
+
+            style = self.style.WARNING if drifted else self.style.SUCCESS
+            self.stdout.write(style(f"{model.__name__}: {drifted} drifted counters repaired out of {checked} rows"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issue', '0002_remove_issue_assigned_users_alter_comment_author_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='comment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, field):
+    """Count rows of queryset grouped by field, as an expression usable in an UPDATE"""
+    counts = queryset.filter(**{field: OuterRef("pk")}).values(field).annotate(total=Count("pk")).values("total")
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def backfill_counters(apps, schema_editor):
+    Project = apps.get_model("project", "Project")
+    Issue = apps.get_model("issue", "Issue")
+    Comment = apps.get_model("issue", "Comment")
+
+    Project.objects.update(
+        issue_count=count_subquery(Issue.objects.all(), "project"),
+        open_issue_count=count_subquery(Issue.objects.filter(~Q(status="closed")), "project"),
+    )
+    Issue.objects.update(comment_count=count_subquery(Comment.objects.all(), "issue"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issue', '0003_issue_comment_count'),
+        ('project', '0003_project_issue_count_project_open_issue_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
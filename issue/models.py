@@ -2,6 +2,7 @@ import logging
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 from project.models import Project
 
@@ -36,6 +37,32 @@ class Issue(models.Model):
     priority = models.CharField(choices=Priority, default=Priority.low)
     tags = models.CharField(choices=Tags, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # denormalized counter, kept up to date by issue.signals (and repaired by the recount command)
+    comment_count = models.IntegerField(default=0, editable=False)
+    # set when status becomes closed, used to archive old closed issues (cf. issue.archive)
+    closed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # closed issues can be moved to ArchivedIssue, which has the same columns
+    archived = False
+
+    def save(self, *args, **kwargs):
+        if self.is_open:
+            self.closed_at = None
+        elif self.closed_at is None:
+            self.closed_at = timezone.now()
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remember status as stored in DB, to update project open issues counter when it changes
+        if "status" in field_names:
+            instance.stored_status = values[field_names.index("status")]
+        return instance
+
+    @property
+    def is_open(self) -> bool:
+        return self.status != self.Status.closed
 
 
 class Comment(models.Model):
@@ -45,3 +72,36 @@ class Comment(models.Model):
     title = models.CharField(max_length=255)
     content = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+
+
+# === Archive tier ===
+# Old closed issues are moved with their comments to the following tables (cf. issue.archive), to keep issue and
+# comment tables (and their indexes) small. Columns are the same, in the same order, as Issue and Comment ones, so
+# that archived rows can be UNION-ed with hot ones, and ids are kept so that restored issues keep their URL.
+
+
+class ArchivedIssue(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    author = models.ForeignKey(to=settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name="+")
+    project = models.ForeignKey(to=Project, on_delete=models.CASCADE, related_name="archived_issues")
+    title = models.CharField(max_length=255)
+    content = models.TextField(blank=True)
+    status = models.CharField(choices=Issue.Status, default=Issue.Status.closed)
+    priority = models.CharField(choices=Issue.Priority, default=Issue.Priority.low)
+    tags = models.CharField(choices=Issue.Tags, blank=True)
+    created_at = models.DateTimeField()
+    comment_count = models.IntegerField(default=0)
+    closed_at = models.DateTimeField(null=True, blank=True)
+    # last column: not part of the UNION with Issue
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    archived = True
+
+
+class ArchivedComment(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    issue = models.ForeignKey(to=ArchivedIssue, on_delete=models.CASCADE, related_name="comments")
+    author = models.ForeignKey(to=settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name="+")
+    title = models.CharField(max_length=255)
+    content = models.TextField(blank=True)
+    created_at = models.DateTimeField()
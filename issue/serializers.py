@@ -1,13 +1,29 @@
-from rest_framework.serializers import ModelSerializer
+from rest_framework.serializers import BooleanField, ModelSerializer
 
 from .models import Comment, Issue
 
 
 class IssueSerializer(ModelSerializer):
+    # also used to render ArchivedIssue objects, which have the same fields
+    archived = BooleanField(read_only=True)
+
     class Meta:
         model = Issue
-        fields = ["title", "content", "status", "priority", "tags", "created_at", "project", "author"]
-        read_only_fields = ["author", "project", "created_at"]
+        fields = [
+            "id",
+            "title",
+            "content",
+            "status",
+            "priority",
+            "tags",
+            "created_at",
+            "closed_at",
+            "project",
+            "author",
+            "comment_count",
+            "archived",
+        ]
+        read_only_fields = ["id", "author", "project", "created_at", "closed_at", "comment_count"]
 
     def create(self, validated_data):
         """Automatically set author and project from context"""
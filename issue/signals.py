@@ -0,0 +1,53 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from project.models import Project
+
+from .models import Comment, Issue
+
+
+# Counters are updated with F() expressions: the increment is done by the DB in a single UPDATE,
+# so concurrent requests cannot overwrite each other's count.
+
+
+@receiver(post_save, sender=Issue)
+def update_counters_on_issue_save(sender, instance: Issue, created: bool, raw: bool, **kwargs):
+    # raw is True when loading fixtures: counters come with the fixture
+    if raw:
+        return
+
+    if created:
+        Project.objects.filter(pk=instance.project_id).update(
+            issue_count=F("issue_count") + 1,
+            open_issue_count=F("open_issue_count") + int(instance.is_open),
+        )
+    else:
+        stored_status = getattr(instance, "stored_status", None)
+        was_open = stored_status is not None and stored_status != Issue.Status.closed
+        if stored_status is not None and was_open != instance.is_open:
+            Project.objects.filter(pk=instance.project_id).update(
+                open_issue_count=F("open_issue_count") + (1 if instance.is_open else -1)
+            )
+    instance.stored_status = instance.status
+
+
+@receiver(post_delete, sender=Issue)
+def update_counters_on_issue_delete(sender, instance: Issue, **kwargs):
+    # status as stored in DB, in case it was changed in memory without being saved
+    was_open = getattr(instance, "stored_status", instance.status) != Issue.Status.closed
+    Project.objects.filter(pk=instance.project_id).update(
+        issue_count=F("issue_count") - 1,
+        open_issue_count=F("open_issue_count") - int(was_open),
+    )
+
+
+@receiver(post_save, sender=Comment)
+def update_counters_on_comment_save(sender, instance: Comment, created: bool, raw: bool, **kwargs):
+    if created and not raw:
+        Issue.objects.filter(pk=instance.issue_id).update(comment_count=F("comment_count") + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def update_counters_on_comment_delete(sender, instance: Comment, **kwargs):
+    Issue.objects.filter(pk=instance.issue_id).update(comment_count=F("comment_count") - 1)
@@ -0,0 +1,146 @@
+from datetime import timedelta
+
+import pytest
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from config.factories import CommentFactory, IssueFactory
+from issue.archive import archive_issues
+from issue.models import ArchivedComment, ArchivedIssue, Comment, Issue
+
+
+base_url = "issue:"
+
+
+@pytest.fixture
+def old_closed_issue(authenticated_client, create_project):
+    """Create an issue closed 100 days ago, with a comment"""
+    issue = IssueFactory(project=create_project, author=authenticated_client.user, status=Issue.Status.closed)
+    Issue.objects.filter(pk=issue.pk).update(closed_at=timezone.now() - timedelta(days=100))
+    CommentFactory(issue=issue, author=authenticated_client.user)
+    return issue
+
+
+# ==================== Archive Tests ====================
+
+
+@pytest.mark.django_db
+class TestArchiveCommand:
+    """Tests for the archive_issues management command"""
+
+    def test_archive_old_closed_issues(self, authenticated_client, create_project, old_closed_issue):
+        """Success: Old closed issues and their comments are moved, other issues are kept"""
+        recent_closed = IssueFactory(project=create_project, status=Issue.Status.closed)
+        open_issue = IssueFactory(project=create_project, status=Issue.Status.todo)
+
+        call_command("archive_issues", days=30, chunk_size=1)
+
+        assert ArchivedIssue.objects.filter(pk=old_closed_issue.pk).exists()
+        assert not Issue.objects.filter(pk=old_closed_issue.pk).exists()
+        assert ArchivedComment.objects.filter(issue_id=old_closed_issue.pk).count() == 1
+        assert not Comment.objects.filter(issue_id=old_closed_issue.pk).exists()
+        assert set(Issue.objects.values_list("pk", flat=True)) == {recent_closed.pk, open_issue.pk}
+        # archived issues still count in their project
+        create_project.refresh_from_db()
+        assert create_project.issue_count == 3
+
+
+@pytest.mark.django_db
+class TestArchivedIssueRead:
+    """Tests for reading archived issues (?include_archived=true)"""
+
+    def test_list_excludes_archived_by_default(self, authenticated_client, create_project, old_closed_issue):
+        """Success: Archived issues are not listed by default"""
+        call_command("archive_issues", days=30)
+        url = reverse(f"{base_url}issue-list", kwargs={"project_id": create_project.pk})
+
+        response = authenticated_client.get(url)
+
+        assert response.data["results"] == []
+
+    def test_list_includes_archived(self, authenticated_client, create_project, old_closed_issue):
+        """Success: Archived issues are listed with hot ones when requested"""
+        hot_issue = IssueFactory(project=create_project, author=authenticated_client.user)
+        call_command("archive_issues", days=30)
+        url = reverse(f"{base_url}issue-list", kwargs={"project_id": create_project.pk})
+
+        response = authenticated_client.get(url, {"include_archived": "true"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 2
+        archived_by_id = {item["id"]: item["archived"] for item in response.data["results"]}
+        assert archived_by_id == {old_closed_issue.pk: True, hot_issue.pk: False}
+
+    def test_retrieve_archived_issue_and_comments(self, authenticated_client, create_project, old_closed_issue):
+        """Success: An archived issue and its comments can be read when requested"""
+        call_command("archive_issues", days=30)
+        kwargs = {"project_id": create_project.pk, "issue_id": old_closed_issue.pk}
+
+        response = authenticated_client.get(reverse(f"{base_url}issue-detail", kwargs=kwargs))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = authenticated_client.get(reverse(f"{base_url}issue-detail", kwargs=kwargs), {"include_archived": 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["title"] == old_closed_issue.title
+        assert response.data["archived"] is True
+
+        response = authenticated_client.get(reverse(f"{base_url}comment-list", kwargs=kwargs), {"include_archived": 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 1
+
+
+@pytest.mark.django_db
+class TestArchivedIssueRestore:
+    """Tests for restoring an archived issue (POST /projects/{project_id}/issues/{id}/restore/)"""
+
+    def test_restore_success(self, authenticated_client, create_project, old_closed_issue):
+        """Success: Author restores an archived issue, with the same id and its comments"""
+        call_command("archive_issues", days=30)
+        url = reverse(
+            f"{base_url}issue-restore", kwargs={"project_id": create_project.pk, "issue_id": old_closed_issue.pk}
+        )
+
+        response = authenticated_client.post(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["archived"] is False
+        assert Issue.objects.filter(pk=old_closed_issue.pk).exists()
+        assert Comment.objects.filter(issue_id=old_closed_issue.pk).count() == 1
+        assert not ArchivedIssue.objects.exists()
+
+    def test_restore_not_archived_failure(self, authenticated_client, create_project):
+        """Failure: Cannot restore an issue which is not archived"""
+        issue = IssueFactory(project=create_project, author=authenticated_client.user)
+        url = reverse(f"{base_url}issue-restore", kwargs={"project_id": create_project.pk, "issue_id": issue.pk})
+
+        response = authenticated_client.post(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+# ==================== Query budget Tests ====================
+
+
+@pytest.mark.django_db
+class TestRestoreQueryBudget:
+    """Tests for the query budget of issue restoration, as comments grow"""
+
+    def test_restore_success(self, authenticated_client, create_project, assert_query_budget):
+        """Success: restoring an issue runs as many queries for 1 or 20 comments"""
+        issues = []
+
+        def grow(rows):
+            issue = IssueFactory(project=create_project, author=authenticated_client.user, status=Issue.Status.closed)
+            CommentFactory.create_batch(rows, issue=issue, author=authenticated_client.user)
+            archive_issues([issue.pk])
+            issues.append(issue)
+
+        assert_query_budget(
+            lambda: authenticated_client.post(
+                reverse(f"{base_url}issue-restore", kwargs={"project_id": create_project.pk, "issue_id": issues[-1].pk})
+            ),
+            grow,
+        )
@@ -0,0 +1,145 @@
+import pytest
+
+from django.urls import reverse
+from rest_framework import status
+
+from config.factories import CommentFactory, IssueFactory, ProjectFactory, UserFactory
+
+
+base_url = "issue_async:"
+
+
+@pytest.mark.django_db
+class TestAsyncIssue:
+    """Tests for async issue list/retrieve (GET /api/async/project/{project_id}/issue/)"""
+
+    def test_list_issues_success(self, authenticated_client, create_project):
+        """Success: list issues of a project where user is contributor"""
+        issue = IssueFactory(project=create_project, author=authenticated_client.user)
+        url = reverse(f"{base_url}issue-list", kwargs={"project_id": create_project.pk})
+
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert [item["id"] for item in results] == [issue.pk]
+        assert results[0]["commentCount"] == 0
+
+    def test_list_issues_not_contributor_failure(self, authenticated_client):
+        """Failure: issues of a project user is not contributor of are filtered out"""
+        other_author = UserFactory()
+        other_project = ProjectFactory(author=other_author)
+        IssueFactory(project=other_project, author=other_author)
+        url = reverse(f"{base_url}issue-list", kwargs={"project_id": other_project.pk})
+
+        response = authenticated_client.get(url)
+
+        assert response.json()["results"] == []
+
+    def test_list_issues_unknown_project_failure(self, authenticated_client):
+        """Failure: unknown project is a 404"""
+        url = reverse(f"{base_url}issue-list", kwargs={"project_id": 0})
+
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_retrieve_issue_success(self, authenticated_client, create_project):
+        """Success: retrieve an issue where user is contributor"""
+        issue = IssueFactory(project=create_project, author=authenticated_client.user)
+        url = reverse(f"{base_url}issue-detail", kwargs={"project_id": create_project.pk, "issue_id": issue.pk})
+
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["title"] == issue.title
+        assert response.json()["author"] == authenticated_client.user.pk
+
+    def test_retrieve_issue_not_author_failure(self, authenticated_client, create_project):
+        """Failure: object permissions are the same as the sync endpoint (IsObjectAuthor)"""
+        other_contributor = UserFactory()
+        create_project.contributors.add(other_contributor)
+        issue = IssueFactory(project=create_project, author=other_contributor)
+        url = reverse(f"{base_url}issue-detail", kwargs={"project_id": create_project.pk, "issue_id": issue.pk})
+
+        response = authenticated_client.get(url)
+
+        sync_response = authenticated_client.get(
+            reverse("issue:issue-detail", kwargs={"project_id": create_project.pk, "issue_id": issue.pk})
+        )
+        assert response.status_code == sync_response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestAsyncComment:
+    """Tests for async comment list/retrieve (GET /api/async/project/{project_id}/issue/{issue_id}/comment/)"""
+
+    def test_list_comments_success(self, authenticated_client, create_project):
+        """Success: list comments of an issue where user is contributor"""
+        issue = IssueFactory(project=create_project, author=authenticated_client.user)
+        comment = CommentFactory(issue=issue, author=authenticated_client.user)
+        url = reverse(f"{base_url}comment-list", kwargs={"project_id": create_project.pk, "issue_id": issue.pk})
+
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["title"] for item in response.json()["results"]] == [comment.title]
+
+    def test_retrieve_comment_success(self, authenticated_client, create_project):
+        """Success: retrieve a comment where user is contributor"""
+        issue = IssueFactory(project=create_project, author=authenticated_client.user)
+        comment = CommentFactory(issue=issue, author=authenticated_client.user)
+        url = reverse(
+            f"{base_url}comment-detail",
+            kwargs={"project_id": create_project.pk, "issue_id": issue.pk, "comment_id": comment.pk},
+        )
+
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["content"] == comment.content
+
+    def test_list_comments_unknown_issue_failure(self, authenticated_client, create_project):
+        """Failure: issue must belong to the project"""
+        issue = IssueFactory(project=ProjectFactory(author=UserFactory()), author=authenticated_client.user)
+        url = reverse(f"{base_url}comment-list", kwargs={"project_id": create_project.pk, "issue_id": issue.pk})
+
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+# ==================== Query budget Tests ====================
+
+
+@pytest.mark.django_db
+class TestAsyncQueryBudgets:
+    """Tests for the query budgets of async issue and comment views, as issues and comments grow"""
+
+    @pytest.fixture
+    def issue(self, authenticated_client):
+        project = ProjectFactory(author=UserFactory(), contributors=[authenticated_client.user])
+        return IssueFactory(project=project, author=authenticated_client.user)
+
+    def test_issues_success(self, authenticated_client, issue, assert_query_budget):
+        """Success: listing and reading issues run as many queries for 1 or 20 issues"""
+        project = issue.project
+
+        def grow(rows):
+            IssueFactory.create_batch(rows - project.issues.count(), project=project, author=authenticated_client.user)
+
+        for name, kwargs in [("issue-list", {}), ("issue-detail", {"issue_id": issue.pk})]:
+            url = reverse(f"{base_url}{name}", kwargs={"project_id": project.pk, **kwargs})
+            assert_query_budget(lambda url=url: authenticated_client.get(url), grow)
+
+    def test_comments_success(self, authenticated_client, issue, assert_query_budget):
+        """Success: listing and reading comments run as many queries for 1 or 20 comments"""
+        comment = CommentFactory(issue=issue, author=authenticated_client.user)
+
+        def grow(rows):
+            CommentFactory.create_batch(rows - issue.comments.count(), issue=issue, author=authenticated_client.user)
+
+        kwargs = {"project_id": issue.project_id, "issue_id": issue.pk}
+        for name, extra_kwargs in [("comment-list", {}), ("comment-detail", {"comment_id": comment.pk})]:
+            url = reverse(f"{base_url}{name}", kwargs={**kwargs, **extra_kwargs})
+            assert_query_budget(lambda url=url: authenticated_client.get(url), grow)
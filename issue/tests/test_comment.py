@@ -1,3 +1,5 @@
+import csv
+
 import pytest
 
 from django.urls import reverse
@@ -43,6 +45,24 @@ class TestCommentList:
         assert data == []
 
 
+@pytest.mark.django_db
+class TestCommentCSVExport:
+    """Tests for CSV export of comments (GET .../comment/?format=csv&all=true)"""
+
+    def test_csv_full_export_success(self, authenticated_client, create_project):
+        """Success: every comment of the issue is exported"""
+        issue = IssueFactory(project=create_project, author=authenticated_client.user)
+        CommentFactory.create_batch(3, issue=issue, author=authenticated_client.user)
+        url = reverse(f"{base_url}list", kwargs={"project_id": create_project.pk, "issue_id": issue.pk})
+
+        response = authenticated_client.get(url, {"format": "csv", "all": "true"})
+
+        assert response.status_code == status.HTTP_200_OK
+        rows = list(csv.reader(b"".join(response.streaming_content).decode().splitlines()))
+        assert rows[0] == ["title", "content", "author", "createdAt"]
+        assert len(rows) == 4
+
+
 @pytest.mark.django_db
 class TestCommentRetrieve:
     """Tests for retrieving a single comment (GET /projects/{project_id}/issues/{issue_id}/comments/{id}/)"""
@@ -242,3 +262,62 @@ class TestCommentDelete:
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
         assert Comment.objects.filter(pk=comment.pk).exists()
+
+
+# ==================== Query budget Tests ====================
+
+
+@pytest.mark.django_db
+class TestCommentQueryBudgets:
+    """Tests for the query budgets of comment actions, as comments grow"""
+
+    @pytest.fixture
+    def issue(self, authenticated_client):
+        """An issue of a project of another author: the user is a contributor, so every permission check runs"""
+        project = ProjectFactory(author=UserFactory(), contributors=[authenticated_client.user])
+        return IssueFactory(project=project, author=authenticated_client.user)
+
+    @pytest.fixture
+    def grow(self, authenticated_client, issue):
+        def grow(rows):
+            CommentFactory.create_batch(rows - issue.comments.count(), issue=issue, author=authenticated_client.user)
+
+        return grow
+
+    def comment_data(self):
+        return {"title": fake.sentence(), "content": fake.text()}
+
+    def test_list_success(self, authenticated_client, issue, grow, assert_query_budget):
+        """Success: listing comments runs as many queries for 1 or 20 comments"""
+        url = reverse(f"{base_url}list", kwargs={"project_id": issue.project_id, "issue_id": issue.pk})
+
+        assert_query_budget(lambda: authenticated_client.get(url), grow)
+
+    def test_create_success(self, authenticated_client, issue, grow, assert_query_budget):
+        """Success: commenting does not depend on the comments of the issue"""
+        url = reverse(f"{base_url}list", kwargs={"project_id": issue.project_id, "issue_id": issue.pk})
+
+        assert_query_budget(lambda: authenticated_client.post(url, self.comment_data(), format="json"), grow)
+
+    @pytest.mark.parametrize("method", ["get", "put", "patch", "delete"])
+    def test_detail_success(self, authenticated_client, issue, grow, assert_query_budget, method):
+        """Success: reading, updating and deleting a comment runs as many queries for 1 or 20 comments"""
+        urls = []
+
+        def grow_and_prepare(rows):
+            grow(rows)
+            urls.append(
+                reverse(
+                    f"{base_url}detail",
+                    kwargs={
+                        "project_id": issue.project_id,
+                        "issue_id": issue.pk,
+                        "comment_id": issue.comments.last().pk,
+                    },
+                )
+            )
+
+        data = None if method in ("get", "delete") else self.comment_data()
+        assert_query_budget(
+            lambda: getattr(authenticated_client, method)(urls[-1], data, format="json"), grow_and_prepare
+        )
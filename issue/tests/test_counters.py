@@ -0,0 +1,97 @@
+import pytest
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from config.factories import CommentFactory, IssueFactory, fake
+from issue.models import Issue
+from project.models import Project
+
+
+base_url = "issue:"
+
+
+# ==================== Denormalized counters Tests ====================
+
+
+@pytest.mark.django_db
+class TestIssueCounters:
+    """Tests for Project.issue_count, Project.open_issue_count and Issue.comment_count"""
+
+    def test_create_issue_increments_project_counters(self, authenticated_client, create_project):
+        """Success: Creating an open issue increments both project counters"""
+        url = reverse(f"{base_url}issue-list", kwargs={"project_id": create_project.pk})
+        data = {"title": fake.sentence(), "status": Issue.Status.todo}
+
+        response = authenticated_client.post(url, data, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        create_project.refresh_from_db()
+        assert create_project.issue_count == 1
+        assert create_project.open_issue_count == 1
+
+    def test_close_and_reopen_issue_updates_open_counter(self, authenticated_client, create_project):
+        """Success: Closing then reopening an issue updates open issues counter only"""
+        issue = IssueFactory(project=create_project, author=authenticated_client.user, status=Issue.Status.todo)
+        url = reverse(f"{base_url}issue-detail", kwargs={"project_id": create_project.pk, "issue_id": issue.pk})
+
+        authenticated_client.patch(url, {"status": Issue.Status.closed}, format="json")
+        create_project.refresh_from_db()
+        assert (create_project.issue_count, create_project.open_issue_count) == (1, 0)
+
+        authenticated_client.patch(url, {"status": Issue.Status.in_progress}, format="json")
+        create_project.refresh_from_db()
+        assert (create_project.issue_count, create_project.open_issue_count) == (1, 1)
+
+    def test_delete_issue_decrements_project_counters(self, authenticated_client, create_project):
+        """Success: Deleting an issue decrements project counters"""
+        issue = IssueFactory(project=create_project, author=authenticated_client.user, status=Issue.Status.todo)
+        url = reverse(f"{base_url}issue-detail", kwargs={"project_id": create_project.pk, "issue_id": issue.pk})
+
+        response = authenticated_client.delete(url)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        create_project.refresh_from_db()
+        assert (create_project.issue_count, create_project.open_issue_count) == (0, 0)
+
+    def test_comments_update_issue_counter(self, authenticated_client, create_project):
+        """Success: Creating and deleting comments updates the issue counter, exposed by the serializer"""
+        issue = IssueFactory(project=create_project, author=authenticated_client.user)
+        comments = CommentFactory.create_batch(3, issue=issue, author=authenticated_client.user)
+        comments[0].delete()
+        url = reverse(f"{base_url}issue-detail", kwargs={"project_id": create_project.pk, "issue_id": issue.pk})
+
+        response = authenticated_client.get(url)
+
+        assert response.data["comment_count"] == 2
+
+    def test_project_serializer_exposes_counters(self, authenticated_client, create_project):
+        """Success: Project payload contains counters"""
+        IssueFactory.create_batch(2, project=create_project, author=authenticated_client.user, status=Issue.Status.todo)
+        IssueFactory(project=create_project, author=authenticated_client.user, status=Issue.Status.closed)
+        url = reverse("project:project-detail", kwargs={"project_id": create_project.pk})
+
+        response = authenticated_client.get(url)
+
+        assert response.data["issue_count"] == 3
+        assert response.data["open_issue_count"] == 2
+
+
+@pytest.mark.django_db
+class TestRecountCommand:
+    """Tests for the recount management command"""
+
+    def test_recount_repairs_drift(self, create_project):
+        """Success: Drifted counters are recomputed from actual rows"""
+        issue = IssueFactory(project=create_project, status=Issue.Status.todo)
+        CommentFactory(issue=issue)
+        Project.objects.filter(pk=create_project.pk).update(issue_count=42, open_issue_count=-1)
+        Issue.objects.filter(pk=issue.pk).update(comment_count=0)
+
+        call_command("recount", batch_size=1)
+
+        create_project.refresh_from_db()
+        issue.refresh_from_db()
+        assert (create_project.issue_count, create_project.open_issue_count) == (1, 1)
+        assert issue.comment_count == 1
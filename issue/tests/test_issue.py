@@ -1,10 +1,13 @@
+import csv
+
 import pytest
 
 from django.urls import reverse
 from rest_framework import status
 
-from config.factories import IssueFactory, ProjectFactory, UserFactory, fake
-from issue.models import Issue
+from activity.models import ProjectEvent
+from config.factories import CommentFactory, IssueFactory, ProjectFactory, UserFactory, fake
+from issue.models import Comment, Issue
 
 
 base_url = "issue:"
@@ -43,6 +46,51 @@ class TestIssueList:
         assert data == []
 
 
+@pytest.mark.django_db
+class TestIssueCSVExport:
+    """Tests for CSV lists of issues (GET /projects/{project_id}/issues/?format=csv)"""
+
+    def test_csv_page_success(self, authenticated_client, create_project):
+        """Success: ?format=csv renders the requested page only"""
+        IssueFactory.create_batch(12, project=create_project, author=authenticated_client.user)
+        url = reverse(f"{base_url}issue-list", kwargs={"project_id": create_project.pk})
+
+        response = authenticated_client.get(url, {"format": "csv"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/csv")
+        rows = list(csv.reader(response.content.decode().splitlines()))
+        assert "commentCount" in rows[0]
+        # header + page size
+        assert len(rows) == 11
+
+    def test_csv_full_export_success(self, authenticated_client, create_project):
+        """Success: ?format=csv&all=true streams every issue, without pagination"""
+        issues = IssueFactory.create_batch(12, project=create_project, author=authenticated_client.user)
+        url = reverse(f"{base_url}issue-list", kwargs={"project_id": create_project.pk})
+
+        response = authenticated_client.get(url, {"format": "csv", "all": "true"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert "attachment" in response["Content-Disposition"]
+        rows = list(csv.DictReader(b"".join(response.streaming_content).decode().splitlines()))
+        assert sorted(int(row["id"]) for row in rows) == sorted(issue.pk for issue in issues)
+
+    def test_csv_full_export_not_contributor_failure(self, authenticated_client):
+        """Failure: a full export only contains issues visible in the JSON list"""
+        other_author = UserFactory()
+        other_project = ProjectFactory(author=other_author)
+        IssueFactory(project=other_project, author=other_author)
+        url = reverse(f"{base_url}issue-list", kwargs={"project_id": other_project.pk})
+
+        response = authenticated_client.get(url, {"format": "csv", "all": "true"})
+
+        rows = list(csv.reader(b"".join(response.streaming_content).decode().splitlines()))
+        # header only
+        assert len(rows) == 1
+
+
 @pytest.mark.django_db
 class TestIssueRetrieve:
     """Tests for retrieving a single issue (GET /projects/{project_id}/issues/{id}/)"""
@@ -221,3 +269,71 @@ class TestIssueDelete:
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
         assert Issue.objects.filter(pk=issue.pk).exists()
+
+
+# ==================== Query budget Tests ====================
+
+
+@pytest.mark.django_db
+class TestIssueQueryBudgets:
+    """Tests for the query budgets of issue actions, as issues and comments grow"""
+
+    @pytest.fixture
+    def project(self, authenticated_client):
+        """A project of another author: the user is a contributor, so every permission check runs"""
+        return ProjectFactory(author=UserFactory(), contributors=[authenticated_client.user])
+
+    def issue_data(self):
+        return {"title": fake.sentence(), "content": fake.text(), "status": "todo", "priority": "low", "tags": "bug"}
+
+    def grow_issues(self, project, user):
+        def grow(rows):
+            IssueFactory.create_batch(rows - project.issues.count(), project=project, author=user)
+
+        return grow
+
+    def test_list_success(self, authenticated_client, project, assert_query_budget):
+        """Success: listing issues runs as many queries for 1 or 20 issues"""
+        url = reverse(f"{base_url}issue-list", kwargs={"project_id": project.pk})
+
+        assert_query_budget(lambda: authenticated_client.get(url), self.grow_issues(project, authenticated_client.user))
+
+    def test_create_success(self, authenticated_client, project, assert_query_budget):
+        """Success: creating an issue does not depend on the issues of the project"""
+        url = reverse(f"{base_url}issue-list", kwargs={"project_id": project.pk})
+
+        assert_query_budget(
+            lambda: authenticated_client.post(url, self.issue_data(), format="json"),
+            self.grow_issues(project, authenticated_client.user),
+        )
+
+    @pytest.mark.parametrize("method", ["get", "put", "patch"])
+    def test_detail_success(self, authenticated_client, project, assert_query_budget, method):
+        """Success: reading and updating an issue runs as many queries for 1 or 20 comments"""
+        # same status as sent: no open issue counter update
+        issue = IssueFactory(project=project, author=authenticated_client.user, status=Issue.Status.todo)
+        url = reverse(f"{base_url}issue-detail", kwargs={"project_id": project.pk, "issue_id": issue.pk})
+
+        def grow(rows):
+            CommentFactory.create_batch(rows - issue.comments.count(), issue=issue, author=authenticated_client.user)
+
+        data = None if method == "get" else self.issue_data()
+        assert_query_budget(lambda: getattr(authenticated_client, method)(url, data, format="json"), grow)
+
+    def test_delete_success(self, authenticated_client, project, assert_query_budget):
+        """Success: deleting an issue runs as many queries for 1 or 20 comments"""
+        issues = []
+
+        def grow(rows):
+            issues.append(IssueFactory(project=project, author=authenticated_client.user))
+            CommentFactory.create_batch(rows, issue=issues[-1], author=authenticated_client.user)
+
+        assert_query_budget(
+            lambda: authenticated_client.delete(
+                reverse(f"{base_url}issue-detail", kwargs={"project_id": project.pk, "issue_id": issues[-1].pk})
+            ),
+            grow,
+        )
+        assert not Comment.objects.filter(issue__in=issues).exists()
+        deleted_comments = ProjectEvent.objects.filter(project_id=project.pk, kind="comment.deleted").count()
+        assert deleted_comments == 1 + 20
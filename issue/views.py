@@ -1,75 +1,35 @@
-from django.db.models import Q
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from django.db.models import Q, Value
+from django.http import Http404
+from rest_framework.decorators import action
 from rest_framework.exceptions import NotFound
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from config.docs import DocsTypingParameters
 from config.global_permissions import IsObjectAuthor, IsProjectContributor
-from config.mixins import ProjectMixin
+from config.mixins import CSVExportMixin, ProjectMixin
+from config.query_budget import query_budget
 
-from .models import Comment, Issue
+from .archive import restore_issue
+from .deletion import delete_issue
+from .models import ArchivedComment, ArchivedIssue, Comment, Issue
 from .serializers import CommentSerializer, IssueSerializer
 
 
-@extend_schema_view(
-    list=extend_schema(
-        summary="Get all Issues",
-        tags=["Issue"],
-        parameters=[
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-    retrieve=extend_schema(
-        summary="Get an Issue",
-        tags=["Issue"],
-        parameters=[
-            DocsTypingParameters.issue_id.value,
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-    create=extend_schema(
-        summary="Create an Issue",
-        tags=["Issue"],
-        parameters=[
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-    update=extend_schema(
-        summary="Update entirely an Issue",
-        tags=["Issue"],
-        parameters=[
-            DocsTypingParameters.issue_id.value,
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-    partial_update=extend_schema(
-        summary="Update one or many Issue's fields",
-        tags=["Issue"],
-        parameters=[
-            DocsTypingParameters.issue_id.value,
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-    destroy=extend_schema(
-        summary="Delete an Issue",
-        tags=["Issue"],
-        parameters=[
-            DocsTypingParameters.issue_id.value,
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-)
-class IssueModelViewSet(ProjectMixin, ModelViewSet):
+class IssueModelViewSet(ProjectMixin, CSVExportMixin, ModelViewSet):
     serializer_class = IssueSerializer
     permission_classes = [IsAuthenticated, IsObjectAuthor, IsProjectContributor]
     lookup_url_kwarg = "issue_id"
+    # retrieve: an archived issue is looked up after the active one (include_archived)
+    query_budgets = {"list": 4, "create": 5, "retrieve": 4, "update": 6, "partial_update": 6, "destroy": 12}
 
-    def get_queryset(self):
-        """Filter by project_id from URL"""
+    def include_archived(self) -> bool:
+        return self.request.query_params.get("include_archived", "").lower() in ("true", "1")
+
+    def filter_visible(self, queryset):
+        """Filter issues (or archived issues) by project_id from URL"""
         return (
-            Issue.objects.select_related("project", "author")
-            .filter(project=self.project)
+            queryset.filter(project=self.project)
             # object__attribute syntax to go through relationship
             # project__contributors = project.contributors.user
             .filter(Q(author=self.request.user) | Q(project__contributors=self.request.user))
@@ -77,65 +37,52 @@ class IssueModelViewSet(ProjectMixin, ModelViewSet):
             .distinct()
         )
 
+    def get_queryset(self):
+        if self.action == "list" and self.include_archived():
+            # history view: UNION of hot and archived issues, both sides must select the same columns,
+            # so no select_related, and archived_at is left out. Rows are all built as Issue objects.
+            return (
+                self.filter_visible(Issue.objects.annotate(archived=Value(False)))
+                .union(self.filter_visible(ArchivedIssue.objects.defer("archived_at").annotate(archived=Value(True))))
+                .order_by("created_at", "id")
+            )
+        return self.filter_visible(Issue.objects.select_related("project", "author"))
+
+    def get_archived_object(self) -> ArchivedIssue:
+        queryset = self.filter_visible(ArchivedIssue.objects.select_related("project", "author"))
+        try:
+            archived_issue = queryset.get(pk=self.kwargs[self.lookup_url_kwarg])
+        except ArchivedIssue.DoesNotExist as error:
+            raise NotFound(f"Archived issue with id {self.kwargs[self.lookup_url_kwarg]} does not exist.") from error
+        self.check_object_permissions(self.request, archived_issue)
+        return archived_issue
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            # an archived issue is only read if explicitly requested
+            if self.action == "retrieve" and self.include_archived():
+                return self.get_archived_object()
+            raise
+
+    def perform_destroy(self, instance: Issue):
+        delete_issue(instance)
 
-@extend_schema_view(
-    list=extend_schema(
-        summary="Get all Comments",
-        tags=["Comment"],
-        parameters=[
-            DocsTypingParameters.issue_id.value,
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-    retrieve=extend_schema(
-        summary="Get an Comment",
-        tags=["Comment"],
-        parameters=[
-            DocsTypingParameters.comment_id.value,
-            DocsTypingParameters.issue_id.value,
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-    create=extend_schema(
-        summary="Create an Comment",
-        tags=["Comment"],
-        parameters=[
-            DocsTypingParameters.issue_id.value,
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-    update=extend_schema(
-        summary="Update entirely an Comment",
-        tags=["Comment"],
-        parameters=[
-            DocsTypingParameters.comment_id.value,
-            DocsTypingParameters.issue_id.value,
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-    partial_update=extend_schema(
-        summary="Update one or many Comment's fields",
-        tags=["Comment"],
-        parameters=[
-            DocsTypingParameters.comment_id.value,
-            DocsTypingParameters.issue_id.value,
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-    destroy=extend_schema(
-        summary="Delete an Comment",
-        tags=["Comment"],
-        parameters=[
-            DocsTypingParameters.comment_id.value,
-            DocsTypingParameters.issue_id.value,
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-)
-class CommentModelViewSet(ProjectMixin, ModelViewSet):
+    @action(detail=True, methods=["post"])
+    @query_budget(10)
+    def restore(self, request, *args, **kwargs):
+        """Move an archived issue, with its comments, back to active issues"""
+        issue = restore_issue(self.get_archived_object())
+        return Response(self.get_serializer(issue).data)
+
+
+class CommentModelViewSet(ProjectMixin, CSVExportMixin, ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated, IsObjectAuthor, IsProjectContributor]
     lookup_url_kwarg = "comment_id"
+    # list and retrieve: the issue of archived comments is looked up after the active one (include_archived)
+    query_budgets = {"list": 6, "create": 6, "retrieve": 5, "update": 6, "partial_update": 6, "destroy": 7}
 
     def initial(self, request, *args, **kwargs):
         """
@@ -151,15 +98,25 @@ class CommentModelViewSet(ProjectMixin, ModelViewSet):
             # do not forget to filter by project, to ensure the issue is part of the current project
             self.issue = Issue.objects.select_related("project", "author").get(id=issue_id, project=self.project)
         except Issue.DoesNotExist as error:
-            raise NotFound(f"Issue with id {issue_id} does not exist.") from error
+            # comments of an archived issue can be read (not written) if explicitly requested
+            include_archived = request.query_params.get("include_archived", "").lower() in ("true", "1")
+            if not (include_archived and request.method in SAFE_METHODS):
+                raise NotFound(f"Issue with id {issue_id} does not exist.") from error
+            try:
+                self.issue = ArchivedIssue.objects.select_related("project", "author").get(
+                    id=issue_id, project=self.project
+                )
+            except ArchivedIssue.DoesNotExist:
+                raise NotFound(f"Issue with id {issue_id} does not exist.") from error
 
     def get_queryset(self):
         """Filter comments by issue"""
+        model = ArchivedComment if self.issue.archived else Comment
         # object__attribute syntax to go through relationship
         # issue__project__contributors = issue.project.contributor.user
         return (
             (
-                (Comment.objects.select_related("issue", "author").filter(issue=self.issue)).filter(
+                (model.objects.select_related("issue", "author").filter(issue=self.issue)).filter(
                     Q(author=self.request.user) | Q(issue__project__contributors=self.request.user)
                 )
             )
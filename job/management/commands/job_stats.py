@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from job.queue import job_stats, running_jobs
+
+
+class Command(BaseCommand):
+    help = "Show the number of background jobs by status and their timing metrics, per task"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--running", action="store_true", help="Also list running jobs and their progress")
+
+    def handle(self, *args, **options):
+        columns = ["queued", "running", "done", "failed", "avg_wait_ms", "avg_duration_ms", "max_duration_ms"]
+        self.stdout.write(f"{'task':<28}" + "".join(f"{column:>17}" for column in columns))
+        for row in job_stats():
+            values = ["-" if row[column] is None else f"{row[column]:.0f}" for column in columns]
+            self.stdout.write(f"{row['name']:<28}" + "".join(f"{value:>17}" for value in values))
+        if options["running"]:
+            self.stdout.write("")
+            for job in running_jobs():
+                progress = ", ".join(f"{step}: {count}" for step, count in job["progress"].items()) or "-"
+                self.stdout.write(
+                    f"{job['name']} #{job['id']} on {job['locked_by']} since {job['started_at']}: {progress}"
+                )
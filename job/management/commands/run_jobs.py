@@ -0,0 +1,82 @@
+import multiprocessing
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from job.queue import claim_jobs, prune_jobs, release_jobs, requeue_stale_jobs, run_job, worker_name
+
+
+# seconds between two maintenance passes (stale jobs, old jobs)
+MAINTENANCE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = "Run background jobs stored in DB (cf. job.queue), until stopped with SIGTERM/SIGINT"
+
+    stopping = False
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+        parser.add_argument("--batch-size", type=int, default=10, help="Number of jobs claimed per query")
+        parser.add_argument("--sleep", type=float, default=1.0, help="Seconds to wait when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Run due jobs then exit, instead of polling forever")
+
+    def handle(self, *args, **options):
+        previous_handlers = {signum: signal.signal(signum, self.stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            if options["workers"] <= 1:
+                self.work(options)
+            else:
+                self.fork_workers(options)
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+    def fork_workers(self, options):
+        # forked processes must not share the parent DB connections
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=self.work, args=(options,)) for _ in range(options["workers"])]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"{len(processes)} job workers started")
+        for process in processes:
+            # children got the signal handlers too: they stop after their current job
+            process.join()
+
+    def stop(self, signum, frame):
+        self.stopping = True
+
+    def work(self, options):
+        worker = worker_name()
+        processed = 0
+        last_maintenance = 0.0
+        while not self.stopping:
+            if time.monotonic() - last_maintenance > MAINTENANCE_INTERVAL:
+                requeue_stale_jobs()
+                prune_jobs()
+                last_maintenance = time.monotonic()
+
+            jobs = claim_jobs(worker, options["batch_size"])
+            for index, job in enumerate(jobs):
+                if self.stopping:
+                    # stop after the current job: the rest of the batch goes back to the queue for other workers
+                    released = release_jobs(jobs[index:])
+                    self.stdout.write(f"[{worker}] stopping, {released} claimed jobs queued again")
+                    break
+                if run_job(job) is None:
+                    self.stdout.write(self.style.WARNING(f"[{worker}] {job}: lost, left to its new worker"))
+                    continue
+                self.stdout.write(f"[{worker}] {job}: {job.duration_ms} ms")
+                processed += 1
+            if options["once"]:
+                if not jobs:
+                    break
+                continue
+            # long-running worker, as after a request: drop connections which are broken or older than CONN_MAX_AGE
+            close_old_connections()
+            if not jobs:
+                time.sleep(options["sleep"])
+        self.stdout.write(self.style.SUCCESS(f"[{worker}] {processed} jobs processed"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0002_job_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='claim_token',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
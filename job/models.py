@@ -0,0 +1,49 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """A unit of background work, claimed and run by the run_jobs workers"""
+
+    class Status(models.TextChoices):
+        queued = "queued", "Queued"
+        running = "running", "Running"
+        done = "done", "Done"
+        failed = "failed", "Failed"
+
+    # name of a task registered with job.queue.task
+    name = models.CharField(max_length=100)
+    # keyword arguments of the task, must be JSON serializable
+    payload = models.JSONField(default=dict)
+    # higher first
+    priority = models.SmallIntegerField(default=0)
+    status = models.CharField(choices=Status, default=Status.queued, max_length=10)
+    # not claimed before this date: used to delay retries
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    # worker (host:pid) running the job
+    locked_by = models.CharField(max_length=255, blank=True)
+    # unique to the claim which gave the job to its worker: finds the batch of a claim again, releases it
+    claim_token = models.CharField(max_length=32, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    # reported by the task while it runs (cf. job.queue.report_progress), e.g. rows deleted so far per table
+    progress = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # refreshed while the worker holding the job is alive: jobs without recent heartbeat are taken as lost
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # metrics of the last attempt: time spent waiting in queue once due, and running
+    wait_ms = models.PositiveIntegerField(null=True, blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # claim query: WHERE status = 'queued' AND run_at <= now ORDER BY priority DESC, run_at
+            models.Index(fields=["status", "-priority", "run_at"], name="job_claim_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
@@ -0,0 +1,252 @@
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Avg, Count, F, Max, Q
+from django.utils import timezone
+
+from .models import Job
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    func: Callable
+    max_attempts: int
+    # seconds before the first retry, doubled on each following attempt
+    retry_delay: int
+
+
+# filled by the @task decorator when apps' jobs.py modules are imported (cf. JobConfig.ready)
+TASKS: dict[str, Task] = {}
+
+# job whose task is running, set by run_job for report_progress
+_current_job: ContextVar[Job | None] = ContextVar("current_job", default=None)
+
+
+def task(name: str, max_attempts: int = 3, retry_delay: int = 30):
+    """Register a function as a task, run by workers with the job payload as keyword arguments"""
+
+    def decorator(func):
+        TASKS[name] = Task(name, func, max_attempts, retry_delay)
+        return func
+
+    return decorator
+
+
+def enqueue(name: str, payload: dict | None = None, priority: int = 0, run_at=None) -> Job:
+    """Store a job to run in background. Inside a transaction, the job is only visible once committed"""
+    if name not in TASKS:
+        raise ValueError(f"No task registered as {name}")
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        priority=priority,
+        run_at=run_at or timezone.now(),
+        max_attempts=TASKS[name].max_attempts,
+    )
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_jobs(worker: str, limit: int = 1) -> list[Job]:
+    """
+    Mark up to `limit` due jobs as running for this worker and return them, highest priority first.
+
+    Claiming a batch costs the same queries as claiming one job, the worker then holds the batch: run_job keeps its
+    heartbeat, and sets started_at again when each job actually starts. Concurrent workers never get the same job:
+    - PostgreSQL: SELECT ... FOR UPDATE SKIP LOCKED, rows locked by another worker are skipped instead of waited for
+    - SQLite: no row locks, but one UPDATE holds the database write lock, and re-checking status = 'queued'
+      in its WHERE clause makes a job claimed by a concurrent UPDATE unclaimable. The claimed jobs are then
+      selected again by the claim_token set by that UPDATE, unique to the claim
+    """
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    due = Job.objects.filter(status=Job.Status.queued, run_at__lte=now).order_by("-priority", "run_at", "id")
+    claim = {
+        "status": Job.Status.running,
+        "locked_by": worker,
+        "claim_token": token,
+        "started_at": now,
+        "heartbeat_at": now,
+        "attempts": F("attempts") + 1,
+    }
+    database = router.db_for_write(Job)
+
+    if connections[database].features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=database):
+            ids = list(due.select_for_update(skip_locked=True).values_list("id", flat=True)[:limit])
+            Job.objects.filter(id__in=ids).update(**claim)
+        claimed = Job.objects.filter(id__in=ids)
+    else:
+        Job.objects.filter(id__in=due.values("id")[:limit], status=Job.Status.queued).update(**claim)
+        claimed = Job.objects.filter(claim_token=token, status=Job.Status.running)
+    return list(claimed.order_by("-priority", "run_at", "id"))
+
+
+def release_jobs(jobs: list[Job]) -> int:
+    """
+    Queue again claimed jobs which their worker did not start (stopping worker), return their number.
+    Their attempt is not counted, and jobs lost meanwhile to another worker are left to it.
+    """
+    return Job.objects.filter(
+        pk__in=[job.pk for job in jobs],
+        status=Job.Status.running,
+        claim_token__in={job.claim_token for job in jobs},
+    ).update(status=Job.Status.queued, locked_by="", claim_token="", attempts=F("attempts") - 1)
+
+
+class Heartbeat:
+    """
+    Refresh heartbeat_at of the jobs held by a worker (the running one and the rest of its batch) every `interval`
+    seconds while the block runs, from a thread: requeue_stale_jobs leaves them to their worker however long they take
+    """
+
+    def __init__(self, worker: str, interval: float):
+        self.worker = worker
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.beat, name=f"job-heartbeat-{worker}", daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+    def beat(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                try:
+                    Job.objects.filter(status=Job.Status.running, locked_by=self.worker).update(
+                        heartbeat_at=timezone.now()
+                    )
+                except Exception:
+                    logger.exception("Heartbeat of %s failed", self.worker)
+        finally:
+            # DB connections are per thread: close the ones of this thread
+            connections.close_all()
+
+
+# fields saved when a job ends, whatever its outcome
+FINISH_FIELDS = ("status", "run_at", "result", "error", "progress", "finished_at", "wait_ms", "duration_ms")
+
+
+def run_job(job: Job) -> Job | None:
+    """
+    Run a job claimed by its worker (job.locked_by), then mark it done, failed, or queued again for a delayed retry.
+
+    Start and end are conditional on the worker still holding the job: a job taken as stale meanwhile (queued again,
+    maybe claimed by another worker) is not run, or its outcome not saved over the new holder's: None is returned.
+    """
+    held = Job.objects.filter(pk=job.pk, status=Job.Status.running, locked_by=job.locked_by)
+    job.started_at = timezone.now()
+    # progress of this attempt only
+    job.progress = {}
+    if not held.update(started_at=job.started_at, heartbeat_at=job.started_at, progress=job.progress):
+        logger.warning("Job %s lost by %s before it started", job, job.locked_by)
+        return None
+
+    registered = TASKS.get(job.name)
+    job.wait_ms = max(0, int((job.started_at - job.run_at).total_seconds() * 1000))
+    start = time.perf_counter()
+    token = _current_job.set(job)
+    try:
+        if registered is None:
+            raise LookupError(f"No task registered as {job.name}")
+        with Heartbeat(job.locked_by, settings.JOB_HEARTBEAT_SECONDS):
+            job.result = registered.func(**job.payload)
+    except Exception as error:
+        logger.exception("Job %s failed (attempt %s/%s)", job, job.attempts, job.max_attempts)
+        job.error = f"{type(error).__name__}: {error}"
+        if registered is not None and job.attempts < job.max_attempts:
+            job.status = Job.Status.queued
+            job.run_at = timezone.now() + timedelta(seconds=registered.retry_delay * 2 ** (job.attempts - 1))
+        else:
+            job.status = Job.Status.failed
+    else:
+        job.status = Job.Status.done
+        job.error = ""
+    finally:
+        _current_job.reset(token)
+    job.duration_ms = int((time.perf_counter() - start) * 1000)
+    job.finished_at = timezone.now()
+    if not held.update(**{field: getattr(job, field) for field in FINISH_FIELDS}):
+        logger.warning("Job %s lost by %s while running, its outcome is not saved", job, job.locked_by)
+        return None
+    return job
+
+
+def report_progress(step: str, count: int):
+    """
+    Save the progress of the running job (count of `step` done so far) on its row, for job_stats --running.
+    Signature of the `progress` callbacks of long operations (e.g. project.deletion.purge_project). No-op outside jobs.
+    """
+    job = _current_job.get()
+    if job is None:
+        return
+    job.progress[step] = count
+    Job.objects.filter(pk=job.pk, status=Job.Status.running, locked_by=job.locked_by).update(progress=job.progress)
+
+
+def requeue_stale_jobs(timeout: int | None = None) -> int:
+    """
+    Queue again jobs left running by a worker which died (killed, OOM...), return their number.
+    A job is taken as lost once its heartbeat is older than `timeout` seconds (cf. Heartbeat).
+    """
+    timeout = settings.JOB_STALE_SECONDS if timeout is None else timeout
+    stale = Job.objects.filter(status=Job.Status.running, heartbeat_at__lt=timezone.now() - timedelta(seconds=timeout))
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.Status.failed, error="Worker lost", finished_at=timezone.now()
+    )
+    return failed + stale.update(status=Job.Status.queued, locked_by="", claim_token="")
+
+
+def prune_jobs(days: int | None = None) -> int:
+    """Delete finished jobs older than `days`, return their number"""
+    days = settings.JOB_RETENTION_DAYS if days is None else days
+    deleted, _ = Job.objects.filter(
+        status__in=[Job.Status.done, Job.Status.failed], finished_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    return deleted
+
+
+def running_jobs() -> list[dict]:
+    """Jobs running now, longest running first, with their worker and progress"""
+    return list(
+        Job.objects.filter(status=Job.Status.running)
+        .order_by("started_at")
+        .values("id", "name", "locked_by", "started_at", "progress")
+    )
+
+
+def job_stats():
+    """Per task: number of jobs by status, and timing metrics of finished jobs"""
+    by_status = {status: Count("id", filter=Q(status=status)) for status in Job.Status.values}
+    return list(
+        Job.objects.values("name")
+        .annotate(
+            **by_status,
+            avg_wait_ms=Avg("wait_ms"),
+            avg_duration_ms=Avg("duration_ms", filter=Q(status=Job.Status.done)),
+            max_duration_ms=Max("duration_ms", filter=Q(status=Job.Status.done)),
+        )
+        .order_by("name")
+    )
@@ -0,0 +1,275 @@
+import os
+import signal
+import time
+
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+import pytest
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from job.models import Job
+from job.queue import (
+    Heartbeat,
+    claim_jobs,
+    enqueue,
+    job_stats,
+    report_progress,
+    requeue_stale_jobs,
+    run_job,
+    running_jobs,
+    task,
+)
+
+
+calls = []
+
+
+@task("test.record", retry_delay=60)
+def record(value, fail=False):
+    if fail:
+        raise RuntimeError("boom")
+    calls.append(value)
+    return {"value": value}
+
+
+@task("test.steal")
+def steal(job_id):
+    # another worker took the job meanwhile (queued again as stale, then claimed)
+    Job.objects.filter(pk=job_id).update(locked_by="worker-2")
+
+
+@task("test.sigterm")
+def sigterm():
+    # the worker is asked to stop while it runs this job
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+@task("test.progress")
+def progress(steps):
+    seen = []
+    for step in range(steps):
+        report_progress("rows", step + 1)
+        # what job_stats --running shows meanwhile
+        seen.append(running_jobs()[0]["progress"])
+    return seen
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+# ==================== Queue Tests ====================
+
+
+@pytest.mark.django_db
+class TestClaim:
+    """Tests for claiming jobs"""
+
+    def test_enqueue_unknown_task_failure(self):
+        """Failure: only registered tasks can be queued"""
+        with pytest.raises(ValueError):
+            enqueue("test.unknown")
+
+    def test_claim_by_priority_success(self):
+        """Success: jobs are claimed highest priority first, a batch at a time"""
+        low = enqueue("test.record", {"value": "low"})
+        high = enqueue("test.record", {"value": "high"}, priority=5)
+        enqueue("test.record", {"value": "other"})
+
+        claimed = claim_jobs("worker-1", limit=2)
+
+        assert [job.pk for job in claimed] == [high.pk, low.pk]
+        assert all(job.status == Job.Status.running and job.attempts == 1 for job in claimed)
+        assert all(job.locked_by == "worker-1" for job in claimed)
+
+    def test_claimed_job_not_claimed_again_success(self):
+        """Success: a job is given to one worker only"""
+        enqueue("test.record", {"value": 1})
+
+        first = claim_jobs("worker-1", limit=10)
+        second = claim_jobs("worker-2", limit=10)
+
+        assert len(first) == 1
+        assert second == []
+
+    def test_job_not_due_failure(self):
+        """Failure: a job is not claimed before its run_at date"""
+        enqueue("test.record", {"value": 1}, run_at=timezone.now() + timedelta(minutes=5))
+
+        assert claim_jobs("worker-1") == []
+
+    def test_claims_at_same_time_kept_apart_success(self):
+        """Success: a claim returns its own jobs only, even when the worker claimed others at the same instant"""
+        first_job = enqueue("test.record", {"value": 1})
+        second_job = enqueue("test.record", {"value": 2})
+
+        with mock.patch("django.utils.timezone.now", return_value=timezone.now()):
+            first = claim_jobs("worker-1")
+            second = claim_jobs("worker-1")
+
+        assert [job.pk for job in first] == [first_job.pk]
+        assert [job.pk for job in second] == [second_job.pk]
+
+
+@pytest.mark.django_db
+class TestRun:
+    """Tests for running jobs, retries and metrics"""
+
+    def test_run_job_success(self):
+        """Success: the task runs with the payload, result and timings are stored"""
+        enqueue("test.record", {"value": 42})
+        [job] = claim_jobs("worker-1")
+
+        run_job(job)
+
+        job.refresh_from_db()
+        assert calls == [42]
+        assert job.status == Job.Status.done
+        assert job.result == {"value": 42}
+        assert job.duration_ms is not None
+        assert job.wait_ms is not None
+
+    def test_failed_job_is_retried_later_success(self):
+        """Success: a failed attempt is queued again with a delay"""
+        enqueue("test.record", {"value": 1, "fail": True})
+        [job] = claim_jobs("worker-1")
+
+        run_job(job)
+
+        job.refresh_from_db()
+        assert job.status == Job.Status.queued
+        assert job.run_at > timezone.now() + timedelta(seconds=50)
+        assert "boom" in job.error
+
+    def test_job_fails_after_max_attempts_failure(self):
+        """Failure: after its last attempt, a job is failed for good"""
+        job = enqueue("test.record", {"value": 1, "fail": True})
+        Job.objects.filter(pk=job.pk).update(attempts=job.max_attempts - 1)
+        [job] = claim_jobs("worker-1")
+
+        run_job(job)
+
+        job.refresh_from_db()
+        assert job.status == Job.Status.failed
+
+    def test_stale_job_is_requeued_success(self):
+        """Success: a job left running by a dead worker is queued again"""
+        enqueue("test.record", {"value": 1})
+        [job] = claim_jobs("worker-1")
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=2))
+
+        assert requeue_stale_jobs(timeout=3600) == 1
+        assert claim_jobs("worker-2")[0].pk == job.pk
+
+    def test_waiting_job_of_batch_not_stale_success(self):
+        """Success: a job claimed long ago but kept alive by its worker heartbeat is not queued again"""
+        enqueue("test.record", {"value": 1})
+        [job] = claim_jobs("worker-1")
+        Job.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(hours=2))
+
+        assert requeue_stale_jobs(timeout=3600) == 0
+
+    def test_started_at_set_when_job_starts_success(self):
+        """Success: wait time counts from the start of the job, not from the claim of its batch"""
+        enqueue("test.record", {"value": 1})
+        [job] = claim_jobs("worker-1")
+        claimed_at = job.started_at
+
+        run_job(job)
+
+        job.refresh_from_db()
+        assert job.started_at > claimed_at
+
+    def test_lost_job_not_run_failure(self):
+        """Failure: a job queued again and claimed by another worker is not run by the worker which lost it"""
+        enqueue("test.record", {"value": 1})
+        [lost] = claim_jobs("worker-1")
+        Job.objects.filter(pk=lost.pk).update(heartbeat_at=timezone.now() - timedelta(hours=2))
+        requeue_stale_jobs(timeout=3600)
+        claim_jobs("worker-2")
+
+        assert run_job(lost) is None
+        assert calls == []
+        assert Job.objects.get(pk=lost.pk).locked_by == "worker-2"
+
+    def test_lost_job_outcome_not_saved_failure(self):
+        """Failure: a worker which lost its job while running it does not overwrite the state of the new holder"""
+        job = enqueue("test.steal")
+        Job.objects.filter(pk=job.pk).update(payload={"job_id": job.pk})
+        [job] = claim_jobs("worker-1")
+
+        assert run_job(job) is None
+        job.refresh_from_db()
+        assert (job.status, job.locked_by, job.finished_at) == (Job.Status.running, "worker-2", None)
+
+    def test_worker_command_and_stats_success(self):
+        """Success: the worker runs every due job, stats count them by status"""
+        for value in range(3):
+            enqueue("test.record", {"value": value})
+
+        call_command("run_jobs", once=True, batch_size=2)
+
+        assert sorted(calls) == [0, 1, 2]
+        [stats] = [row for row in job_stats() if row["name"] == "test.record"]
+        assert stats["done"] == 3
+        assert stats["queued"] == 0
+
+    def test_progress_saved_while_running_success(self):
+        """Success: progress reported by a task is on its job row while it runs, and kept once done"""
+        enqueue("test.progress", {"steps": 2})
+        [job] = claim_jobs("worker-1")
+
+        job = run_job(job)
+
+        assert job.result == [{"rows": 1}, {"rows": 2}]
+        job.refresh_from_db()
+        assert job.progress == {"rows": 2}
+        # no job outside workers: nothing to save
+        report_progress("rows", 3)
+
+    def test_job_stats_lists_running_jobs_success(self):
+        """Success: job_stats --running shows each running job with its progress"""
+        job = enqueue("test.progress", {"steps": 2})
+        claim_jobs("worker-1")
+        Job.objects.filter(pk=job.pk).update(progress={"rows": 2})
+        out = StringIO()
+
+        call_command("job_stats", running=True, stdout=out)
+
+        assert f"test.progress #{job.pk} on worker-1 since " in out.getvalue()
+        assert "rows: 2" in out.getvalue()
+
+    def test_stopped_worker_releases_its_batch_success(self):
+        """Success: on SIGTERM the worker ends its current job and queues again the rest of its batch"""
+        stopping = enqueue("test.sigterm", priority=5)
+        waiting = [enqueue("test.record", {"value": value}) for value in range(2)]
+
+        call_command("run_jobs", batch_size=10)
+
+        assert calls == []
+        assert Job.objects.get(pk=stopping.pk).status == Job.Status.done
+        for job in waiting:
+            job.refresh_from_db()
+            assert (job.status, job.locked_by, job.claim_token, job.attempts) == (Job.Status.queued, "", "", 0)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestHeartbeat:
+    """Tests for the heartbeat of the jobs held by a worker"""
+
+    def test_heartbeat_refreshed_success(self):
+        """Success: while a job runs, every job held by its worker gets a fresh heartbeat"""
+        for value in range(2):
+            enqueue("test.record", {"value": value})
+        claim_jobs("worker-1", limit=2)
+        Job.objects.update(heartbeat_at=timezone.now() - timedelta(hours=2))
+
+        with Heartbeat("worker-1", interval=0.01):
+            time.sleep(0.2)
+
+        assert requeue_stale_jobs(timeout=3600) == 0
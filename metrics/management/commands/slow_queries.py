@@ -0,0 +1,58 @@
+import json
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from metrics.slow_queries import summarize
+
+
+class Command(BaseCommand):
+    help = "Summarize a slow-query log: the queries (per view) that took the most time"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "log", nargs="?", help="Slow-query log file, '-' for stdin (e.g. docker logs), default SLOW_QUERY_LOG"
+        )
+        parser.add_argument("--top", type=int, default=10, help="Number of offenders shown")
+        parser.add_argument("--sort", choices=["total", "count", "max", "avg"], default="total")
+
+    def handle(self, *args, **options):
+        path = options["log"] or settings.SLOW_QUERY_LOG
+        if not path:
+            raise CommandError("No log given and SLOW_QUERY_LOG is not set (slow queries are logged to stderr)")
+        if path == "-":
+            offenders = summarize(read_records(sys.stdin), options["top"], options["sort"])
+        else:
+            try:
+                with open(path) as file:
+                    offenders = summarize(read_records(file), options["top"], options["sort"])
+            except OSError as error:
+                raise CommandError(f"Cannot read {path}: {error}") from error
+
+        if not offenders:
+            self.stdout.write("No slow query logged")
+            return
+        self.stdout.write(f"{'count':>7}{'total ms':>11}{'avg ms':>9}{'max ms':>9}  view / query / origin")
+        for offender in offenders:
+            self.stdout.write(
+                f"{offender['count']:>7}{offender['total_ms']:>11.0f}{offender['avg_ms']:>9.0f}"
+                f"{offender['max_ms']:>9.0f}  {offender['view'] or '-'}"
+            )
+            self.stdout.write(f"{'':>38}{offender['sql'][:120]}")
+            if offender["stack"]:
+                self.stdout.write(f"{'':>38}at {offender['stack'][-1]}")
+
+
+def read_records(lines):
+    """Slow-query records of a log, other lines (e.g. of other loggers, in a container output) skipped"""
+    for line in lines:
+        start = line.find("{")
+        if start == -1:
+            continue
+        try:
+            record = json.loads(line[start:])
+        except ValueError:
+            continue
+        if isinstance(record, dict) and "sql" in record and "duration_ms" in record:
+            yield record
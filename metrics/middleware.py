@@ -0,0 +1,95 @@
+import time
+
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from config.db_utils import count_queries, install_query_counters
+from config.query_budget import view_action
+
+from .registry import DB_DURATION, DB_QUERIES, REQUEST_DURATION, RESPONSE_SIZE, SERIALIZATION_DURATION, registry
+from .store import WorkerStore
+
+
+store = WorkerStore(registry)
+
+
+def view_labels(request) -> tuple[str, str]:
+    """(view, action) labels of a request, e.g. ("IssueModelViewSet", "list")"""
+    match = request.resolver_match
+    if match is None:
+        return "unresolved", ""
+    view_class, action = view_action(match.func, request.method)
+    if view_class is None:
+        # function views, or callable objects (e.g. LazyDocsView)
+        view_class = match.func if hasattr(match.func, "__name__") else type(match.func)
+    return view_class.__name__, action or ""
+
+
+class MetricsMiddleware:
+    """
+    Observe the latency, database queries (count and time), rendering time and body size of every request in the
+    histograms of metrics.registry, labelled with the view class and action that served it.
+
+    Rendering time is the time DRF renderers take to serialize the response data (JSON, CSV...), timed between
+    process_template_response of this middleware (the last one called) and a post-render callback. Disabled when
+    METRICS_ENABLED is False.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install_query_counters()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        start = time.perf_counter()
+        with count_queries(install=False) as count:
+            response = self.get_response(request)
+        self.observe(request, response, time.perf_counter() - start, count)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with count_queries(install=False) as count:
+            response = await self.get_response(request)
+        self.observe(request, response, time.perf_counter() - start, count)
+        return response
+
+    def process_template_response(self, request, response):
+        start = time.perf_counter()
+
+        def rendered(response):
+            request.metrics_render_seconds = time.perf_counter() - start
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def observe(request, response, seconds: float, count):
+        view, action = view_labels(request)
+        labels = (view, action)
+        observations = [
+            (REQUEST_DURATION, (view, action, request.method, str(response.status_code)), seconds),
+            (DB_QUERIES, labels, count.queries),
+            (DB_DURATION, labels, count.seconds),
+        ]
+        render_seconds = getattr(request, "metrics_render_seconds", None)
+        if render_seconds is not None:
+            observations.append((SERIALIZATION_DURATION, labels, render_seconds))
+        if not response.streaming:
+            observations.append((RESPONSE_SIZE, labels, len(response.content)))
+        registry.observe(observations)
+        if time.monotonic() >= store.next_flush:
+            store.flush(Path(settings.METRICS_DIR), settings.METRICS_FLUSH_SECONDS)
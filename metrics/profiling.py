@@ -0,0 +1,234 @@
+"""
+On-demand profiling of single requests, for staff users: send `X-Profile: 1` (or `?profile=1`) with a request to run
+it under a sampling profiler (cf. Sampler). The profile is saved in settings.PROFILE_DIR as collapsed stacks
+("folded" format, read by flamegraph.pl, speedscope, inferno...), and the response gets:
+
+- X-Profile: name of the profile file
+- Server-Timing: total time and time spent in the ORM, serializers, renderers and permissions (shown by browsers'
+  dev tools)
+
+`?profile=folded` returns the profile itself instead of the response. Requests without the header or parameter only
+pay for two dict lookups; the header and parameter are ignored for other users.
+"""
+
+import sys
+import sysconfig
+import threading
+import time
+
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .middleware import view_labels
+
+
+STDLIB = sysconfig.get_paths()["stdlib"]
+
+# frames (cf. Sampler.stack_of) containing one of these mark a sample as time spent in that category
+CATEGORIES = {
+    "orm": ("(django/db/",),
+    "serializer": ("serializers.py:", "(rest_framework/fields.py:", "(rest_framework/relations.py:"),
+    "renderer": ("renderers.py:", "(djangorestframework_camel_case/render.py:"),
+    "permissions": ("permissions.py:",),
+}
+
+
+class Sampler:
+    """
+    Profile function (sys.setprofile) sampling the stack of its threads: at the first call or return event after each
+    interval, the time elapsed since the previous sample is added to the current stack. Unlike a sampling thread,
+    which only gets the GIL every switch interval (5 ms), samples are taken while the request holds the GIL.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        # microseconds per collapsed stack
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.last = time.perf_counter()
+        self.names: dict = {}
+        # fed by the event loop thread and the thread of the request sync code (ASGI)
+        self.lock = threading.Lock()
+
+    def __call__(self, frame, event, arg):
+        if time.perf_counter() - self.last < self.interval:
+            return
+        with self.lock:
+            now = time.perf_counter()
+            if now - self.last >= self.interval:
+                self.stacks[self.stack_of(frame)] += round((now - self.last) * 1_000_000)
+                self.last = now
+
+    def stack_of(self, frame) -> tuple[str, ...]:
+        """Functions of a stack, outermost first, as "function (path:line)" """
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            name = self.names.get(code)
+            if name is None:
+                name = self.names[code] = f"{code.co_name} ({short_path(code.co_filename)}:{code.co_firstlineno})"
+            stack.append(name)
+            frame = frame.f_back
+        return tuple(reversed(stack))
+
+
+# sampler of the request being run: the event loop thread runs the code of every request in flight, only the frames
+# of the profiled one (its task, and the sync_to_async threads it calls, which copy its context) are sampled
+current_sampler: ContextVar[Sampler | None] = ContextVar("current_sampler", default=None)
+
+# thread id: [profiled requests running code on the thread, profile function of the thread before the first one]
+installed: dict[int, list] = {}
+installed_lock = threading.Lock()
+
+
+def sample_current(frame, event, arg):
+    """Profile function of threads running profiled requests: hands events to the sampler of the current context"""
+    sampler = current_sampler.get()
+    if sampler is not None:
+        sampler(frame, event, arg)
+
+
+def install():
+    """Profile the current thread with sample_current, until as many uninstall() calls on it"""
+    with installed_lock:
+        entry = installed.get(threading.get_ident())
+        if entry is None:
+            installed[threading.get_ident()] = [1, sys.getprofile()]
+            sys.setprofile(sample_current)
+        else:
+            entry[0] += 1
+
+
+def uninstall():
+    """Restore the profile function the current thread had before profiled requests, once the last one is done"""
+    with installed_lock:
+        entry = installed[threading.get_ident()]
+        entry[0] -= 1
+        if entry[0] == 0:
+            del installed[threading.get_ident()]
+            sys.setprofile(entry[1])
+
+
+def short_path(filename: str) -> str:
+    """Path of a module relative to the project, its site-packages or the standard library"""
+    if "-packages/" in filename:
+        return filename.rsplit("-packages/", 1)[-1]
+    for directory in (str(settings.BASE_DIR), STDLIB):
+        if filename.startswith(directory):
+            return filename[len(directory) + 1 :]
+    return filename
+
+
+def folded(stacks: Counter) -> str:
+    """Collapsed stacks: one line per stack, frames separated by ";" followed by its weight (microseconds)"""
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in stacks.most_common())
+
+
+def category_seconds(stacks: Counter, seconds: float) -> dict[str, float]:
+    """Time spent in each category (inclusive: the ORM queries of a permission check count in both)"""
+    total = sum(stacks.values())
+    weights = dict.fromkeys(CATEGORIES, 0)
+    for stack, weight in stacks.items():
+        for category, markers in CATEGORIES.items():
+            if any(marker in frame for frame in stack for marker in markers):
+                weights[category] += weight
+    return {category: seconds * weight / total if total else 0.0 for category, weight in weights.items()}
+
+
+def profile_mode(request) -> str | None:
+    """Profile requested by a request ("1" or "folded"), None if not requested (cheap: no query string parsing)"""
+    mode = request.META.get("HTTP_X_PROFILE")
+    if mode is None and "profile=" in request.META.get("QUERY_STRING", ""):
+        mode = request.GET.get("profile")
+    return mode or None
+
+
+def is_staff(request) -> bool:
+    """Whether the user of a request, authenticated by its API JWT, is staff"""
+    try:
+        authenticated = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return authenticated is not None and authenticated[0].is_active and authenticated[0].is_staff
+
+
+class ProfilerMiddleware:
+    """
+    Profile requests of staff users carrying X-Profile or ?profile (cf. module docstring). First middleware: the
+    profile covers the others, and its user query is not counted by the query budget and metrics middlewares.
+    Disabled when PROFILING_ENABLED is False.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        mode = profile_mode(request)
+        if mode is None or not is_staff(request):
+            return self.get_response(request)
+
+        sampler = Sampler(settings.PROFILE_INTERVAL_MS / 1000)
+        token = current_sampler.set(sampler)
+        install()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            uninstall()
+            current_sampler.reset(token)
+        return self.profiled(request, response, mode, sampler.stacks, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        mode = profile_mode(request)
+        if mode is None or not await sync_to_async(is_staff)(request):
+            return await self.get_response(request)
+
+        # sync code of the request (DRF views, ORM) runs in the thread of its ThreadSensitiveContext: both this
+        # thread and the event loop one are profiled, without the frames of other requests (cf. current_sampler)
+        sampler = Sampler(settings.PROFILE_INTERVAL_MS / 1000)
+        token = current_sampler.set(sampler)
+        install()
+        await sync_to_async(install)()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(uninstall)()
+            uninstall()
+            current_sampler.reset(token)
+        return self.profiled(request, response, mode, sampler.stacks, time.perf_counter() - start)
+
+    @staticmethod
+    def profiled(request, response, mode: str, stacks: Counter, seconds: float):
+        profile = folded(stacks)
+        if mode == "folded":
+            return HttpResponse(profile, content_type="text/plain; charset=utf-8")
+
+        view, action = view_labels(request)
+        directory = Path(settings.PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{view}.{action or 'none'}-{time.time_ns() % 10**9}.folded"
+        path.write_text(profile)
+
+        timings = {"total": seconds, **category_seconds(stacks, seconds)}
+        response["X-Profile"] = path.name
+        response["Server-Timing"] = ", ".join(f"{name};dur={value * 1000:.1f}" for name, value in timings.items())
+        return response
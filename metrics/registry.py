@@ -0,0 +1,138 @@
+"""
+Histograms observed by this worker process, and their Prometheus text format.
+
+Each worker observes its own requests in memory (one lock per request, no I/O); metrics.store shares them with the
+other workers through files, merged when /metrics is scraped.
+"""
+
+import os
+import threading
+
+from bisect import bisect_left
+from dataclasses import dataclass
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+@dataclass(frozen=True)
+class Histogram:
+    name: str
+    help: str
+    labels: tuple[str, ...]
+    buckets: tuple[float, ...]
+
+
+REQUEST_DURATION = Histogram(
+    "softdesk_http_request_duration_seconds",
+    "Time to respond (first byte of streamed responses), from the first middleware",
+    ("view", "action", "method", "status"),
+    LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram("softdesk_db_queries", "Database queries per request", ("view", "action"), QUERY_BUCKETS)
+DB_DURATION = Histogram(
+    "softdesk_db_duration_seconds", "Time spent in database queries per request", ("view", "action"), LATENCY_BUCKETS
+)
+SERIALIZATION_DURATION = Histogram(
+    "softdesk_serialization_duration_seconds",
+    "Time rendering DRF responses (JSON, CSV) per request",
+    ("view", "action"),
+    LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "softdesk_http_response_size_bytes",
+    "Size of response bodies (streamed responses excepted)",
+    ("view", "action"),
+    SIZE_BUCKETS,
+)
+HISTOGRAMS = [REQUEST_DURATION, DB_QUERIES, DB_DURATION, SERIALIZATION_DURATION, RESPONSE_SIZE]
+
+# histogram name: [(label values, [count of each bucket (not cumulative)..., count above the last bucket, sum])]
+Snapshot = dict[str, list[tuple[tuple[str, ...], list[float]]]]
+
+
+class Registry:
+    """Observations of this process, per histogram and label values"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+        # a forked worker must not report observations of its parent
+        os.register_at_fork(after_in_child=self.reset)
+
+    def reset(self):
+        self.series: dict[str, dict[tuple[str, ...], list[float]]] = {histogram.name: {} for histogram in HISTOGRAMS}
+
+    def observe(self, observations: list[tuple[Histogram, tuple[str, ...], float]]):
+        """Record (histogram, label values, value) observations of one request at once"""
+        with self.lock:
+            for histogram, labels, value in observations:
+                series = self.series[histogram.name]
+                values = series.get(labels)
+                if values is None:
+                    values = series[labels] = [0] * (len(histogram.buckets) + 2)
+                # first bucket whose upper bound is >= value, or the overflow slot
+                values[bisect_left(histogram.buckets, value)] += 1
+                values[-1] += value
+
+    def snapshot(self) -> Snapshot:
+        with self.lock:
+            return {
+                name: [(labels, list(values)) for labels, values in series.items()]
+                for name, series in self.series.items()
+            }
+
+
+registry = Registry()
+
+
+def merge(snapshots: list[Snapshot]) -> Snapshot:
+    """Sum of the observations of several snapshots (e.g. one per worker)"""
+    merged: dict[str, dict[tuple[str, ...], list[float]]] = {histogram.name: {} for histogram in HISTOGRAMS}
+    for snapshot in snapshots:
+        for name, series in snapshot.items():
+            if name not in merged:
+                continue
+            for labels, values in series:
+                labels = tuple(labels)
+                total = merged[name].get(labels)
+                if total is None or len(total) != len(values):
+                    merged[name][labels] = list(values)
+                else:
+                    merged[name][labels] = [a + b for a, b in zip(total, values, strict=True)]
+    return {name: sorted(series.items()) for name, series in merged.items()}
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def format_bound(bound: float) -> str:
+    return str(int(bound)) if float(bound).is_integer() else str(bound)
+
+
+def format_sum(value: float) -> str:
+    """Exact text of a sum: integer sums (query counts) as integers, the others with every digit (repr)"""
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+def format_metrics(snapshot: Snapshot) -> str:
+    """Prometheus text exposition format (version 0.0.4) of a snapshot"""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.append(f"# HELP {histogram.name} {histogram.help}")
+        lines.append(f"# TYPE {histogram.name} histogram")
+        for labels, values in snapshot.get(histogram.name, []):
+            pairs = zip(histogram.labels, labels, strict=True)
+            label_text = ",".join(f'{name}="{escape(value)}"' for name, value in pairs)
+            # counts as integers: a float format rounding them (e.g. :g, 6 digits) would make counters stall
+            cumulative = 0
+            for bound, count in zip((*histogram.buckets, None), values[:-1], strict=True):
+                cumulative += count
+                le = "+Inf" if bound is None else format_bound(bound)
+                lines.append(f'{histogram.name}_bucket{{{label_text},le="{le}"}} {int(cumulative)}')
+            lines.append(f"{histogram.name}_sum{{{label_text}}} {format_sum(values[-1])}")
+            lines.append(f"{histogram.name}_count{{{label_text}}} {int(cumulative)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,180 @@
+"""
+Slow-query log: queries slower than settings.SLOW_QUERY_MS are logged as JSON lines, with the view and action of the
+request which ran them and the application frames that led to them:
+
+    {"at": "...", "duration_ms": 812.4, "database": "default", "sql": "SELECT ...", "params": ["int", "str*3"],
+     "view": "IssueModelViewSet.list", "method": "GET", "path": "/api/project/1/issue/", "stack": [...]}
+
+Parameter values are never logged (personal data), only their types. The slow_queries command summarizes a log.
+"""
+
+import json
+import logging
+import random
+import re
+import time
+import traceback
+
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+
+from config import db_utils, query_budget
+
+from . import middleware
+from .middleware import view_labels
+
+
+logger = logging.getLogger(__name__)
+
+# application frames kept, innermost last
+STACK_DEPTH = 8
+# execute wrappers and middlewares of the instrumentation itself
+INSTRUMENTATION_FILES = {__file__, db_utils.__file__, query_budget.__file__, middleware.__file__}
+SQL_MAX_LENGTH = 2000
+
+# request being served, in a context variable: it follows requests into sync_to_async threads
+_current_request = ContextVar("slow_query_request", default=None)
+
+
+def params_shape(params, many: bool):
+    """Types of query parameters, repeated types collapsed (["int*500"] for a long IN list)"""
+    if params is None:
+        return None
+    if many:
+        return {"rows": len(params) if isinstance(params, list | tuple) else None}
+    if isinstance(params, dict):
+        return {name: type(value).__name__ for name, value in params.items()}
+    shape: list[list] = []
+    for value in params:
+        name = type(value).__name__
+        if shape and shape[-1][0] == name:
+            shape[-1][1] += 1
+        else:
+            shape.append([name, 1])
+    return [name if count == 1 else f"{name}*{count}" for name, count in shape]
+
+
+def app_stack() -> list[str]:
+    """Innermost frames of project code (not libraries, nor instrumentation), as "path:line in function" """
+    base_dir = str(settings.BASE_DIR)
+    frames = traceback.StackSummary.extract(traceback.walk_stack(None), lookup_lines=False)
+    stack = []
+    for frame in frames:
+        filename = frame.filename
+        if not filename.startswith(base_dir) or filename in INSTRUMENTATION_FILES or "-packages" in filename:
+            continue
+        stack.append(f"{Path(filename).relative_to(base_dir)}:{frame.lineno} in {frame.name}")
+        if len(stack) == STACK_DEPTH:
+            break
+    return stack[::-1]
+
+
+def log_slow_query(execute, sql, params, many, context):
+    """Execute wrapper logging the query when slower than SLOW_QUERY_MS, for a SLOW_QUERY_SAMPLE_RATE share of them"""
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        if duration_ms >= settings.SLOW_QUERY_MS and random.random() < settings.SLOW_QUERY_SAMPLE_RATE:
+            logger.warning(json.dumps(slow_query_record(sql, params, many, context, duration_ms)))
+
+
+def slow_query_record(sql, params, many, context, duration_ms: float) -> dict:
+    record = {
+        "at": timezone.now().isoformat(),
+        "duration_ms": round(duration_ms, 1),
+        "database": context["connection"].alias,
+        "sql": sql[:SQL_MAX_LENGTH],
+        "params": params_shape(params, many),
+        "view": None,
+    }
+    request = _current_request.get()
+    if request is not None:
+        view, action = view_labels(request)
+        record.update(view=f"{view}.{action}" if action else view, method=request.method, path=request.path)
+    record["stack"] = app_stack()
+    return record
+
+
+def install_slow_query_logger(connection, **kwargs):
+    """Wrap the queries of a connection with log_slow_query (receiver of the connection_created signal)"""
+    if log_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_slow_query)
+
+
+class SlowQueryMiddleware:
+    """
+    Log the slow queries of every database connection (cf. log_slow_query), attributed to the request being served.
+    Disabled when SLOW_QUERY_SAMPLE_RATE is 0.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if settings.SLOW_QUERY_SAMPLE_RATE <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        for connection in connections.all(initialized_only=True):
+            install_slow_query_logger(connection)
+        connection_created.connect(install_slow_query_logger)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        token = _current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_request.reset(token)
+
+    async def __acall__(self, request):
+        token = _current_request.set(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            _current_request.reset(token)
+
+
+# === summary ===
+
+PLACEHOLDER_LISTS = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+QUOTED_VALUES = re.compile(r"'(?:[^']|'')*'")
+NUMBERS = re.compile(r"\b\d+\b")
+
+
+def fingerprint(sql: str) -> str:
+    """SQL of a query with its literals and lists of placeholders of any length replaced, to group similar queries"""
+    sql = PLACEHOLDER_LISTS.sub("(...)", sql)
+    sql = QUOTED_VALUES.sub("?", sql)
+    return " ".join(NUMBERS.sub("?", sql).split())
+
+
+def summarize(records, top: int = 10, sort: str = "total") -> list[dict]:
+    """Slowest (view, query) pairs of slow-query records: count, total, average and max duration, first frame"""
+    groups: dict[tuple, dict] = {}
+    for record in records:
+        key = (record.get("view"), fingerprint(record["sql"]))
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {"view": key[0], "sql": key[1], "count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            group["stack"] = record.get("stack") or []
+        group["count"] += 1
+        group["total_ms"] += record["duration_ms"]
+        group["max_ms"] = max(group["max_ms"], record["duration_ms"])
+    for group in groups.values():
+        group["avg_ms"] = group["total_ms"] / group["count"]
+    sort_key = {"total": "total_ms", "count": "count", "max": "max_ms", "avg": "avg_ms"}[sort]
+    return sorted(groups.values(), key=lambda group: group[sort_key], reverse=True)[:top]
@@ -0,0 +1,101 @@
+"""
+Metrics shared by the worker processes of a server, through files of a directory all of them can read.
+
+Each worker periodically writes a snapshot of its registry to <dir>/<pid>-<start>.json (atomic replace, so readers
+never see a partial file). A scrape merges every file. Observations of exited workers must not vanish (histograms
+only grow): their files are folded into archive.json, under a lock as several workers may be scraped at once.
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import time
+
+from pathlib import Path
+
+from .registry import Registry, Snapshot, merge
+
+
+ARCHIVE_NAME = "archive.json"
+
+
+class WorkerStore:
+    """Writes the snapshots of the registry of this process"""
+
+    def __init__(self, registry: Registry):
+        self.registry = registry
+        # monotonic time of the next periodic flush
+        self.next_flush = 0.0
+        self.reset()
+        os.register_at_fork(after_in_child=self.reset)
+
+    def reset(self):
+        # the start time tells apart a worker from an older one which had the same pid
+        self.name = f"{os.getpid()}-{time.time_ns()}.json"
+
+    def flush(self, directory: Path, interval: float = 0):
+        """Write the snapshot of this worker, and schedule the next periodic flush interval seconds later"""
+        directory.mkdir(parents=True, exist_ok=True)
+        write_json(directory / self.name, self.registry.snapshot())
+        self.next_flush = time.monotonic() + interval
+
+
+def write_json(path: Path, data):
+    temporary = path.with_name(f".{path.name}.tmp")
+    with open(temporary, "w") as file:
+        json.dump(data, file, separators=(",", ":"))
+    os.replace(temporary, path)
+
+
+def read_json(path: Path) -> Snapshot | None:
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # exists, owned by another user
+        return True
+    return True
+
+
+def worker_pid(path: Path) -> int | None:
+    try:
+        return int(path.name.split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+def collect(directory: Path) -> Snapshot:
+    """Merged observations of every worker, running or exited, whose files are in directory"""
+    if not directory.is_dir():
+        return merge([])
+    with open(directory / ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive_path = directory / ARCHIVE_NAME
+        archive = read_json(archive_path)
+        snapshots = [] if archive is None else [archive]
+        exited = []
+        for path in sorted(directory.glob("*-*.json")):
+            pid = worker_pid(path)
+            snapshot = read_json(path)
+            if pid is None or snapshot is None:
+                continue
+            snapshots.append(snapshot)
+            if pid != os.getpid() and not is_running(pid):
+                exited.append(path)
+        merged = merge(snapshots)
+        if exited:
+            write_json(archive_path, merge([archive or {}, *(read_json(path) or {} for path in exited)]))
+            for path in exited:
+                with contextlib.suppress(OSError):
+                    path.unlink()
+    return merged
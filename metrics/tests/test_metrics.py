@@ -0,0 +1,246 @@
+import json
+import os
+import time
+
+import pytest
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from rest_framework import status
+
+from config.db_utils import QueryCount
+from metrics.middleware import MetricsMiddleware, store
+from metrics.registry import DB_QUERIES, REQUEST_DURATION, Histogram, Registry, format_metrics, merge, registry
+from metrics.store import ARCHIVE_NAME, collect, write_json
+
+
+# per-request overhead of MetricsMiddleware (labels, 5 observations, flush check), ~12 µs measured
+OVERHEAD_BUDGET_SECONDS = 100e-6
+
+
+@pytest.fixture(autouse=True)
+def metrics_dir(settings, tmp_path):
+    settings.METRICS_DIR = tmp_path
+    registry.reset()
+    store.next_flush = 0.0
+    yield tmp_path
+    registry.reset()
+
+
+def series(histogram: Histogram, labels: tuple[str, ...]) -> list[float] | None:
+    return registry.series[histogram.name].get(labels)
+
+
+# ==================== Registry Tests ====================
+
+
+class TestRegistry:
+    """Tests for the histograms of a process and their text format"""
+
+    def test_observe_buckets(self):
+        """Success: values are counted in the first bucket whose bound is >= value, and summed"""
+        test_registry = Registry()
+        labels = ("View", "list")
+
+        test_registry.observe([(DB_QUERIES, labels, 0), (DB_QUERIES, labels, 4), (DB_QUERIES, labels, 1000)])
+
+        values = dict(test_registry.snapshot()[DB_QUERIES.name])[labels]
+        assert values[0] == 1  # le 0
+        assert values[DB_QUERIES.buckets.index(5)] == 1
+        assert values[-2] == 1  # above the last bucket
+        assert values[-1] == 1004
+
+    def test_format_metrics(self):
+        """Success: buckets are cumulative, with +Inf, _sum and _count, label values escaped"""
+        test_registry = Registry()
+        test_registry.observe([(DB_QUERIES, ('Say "hi"', "list"), 3), (DB_QUERIES, ('Say "hi"', "list"), 7)])
+
+        text = format_metrics(test_registry.snapshot())
+
+        assert "# TYPE softdesk_db_queries histogram" in text
+        assert 'softdesk_db_queries_bucket{view="Say \\"hi\\"",action="list",le="2"} 0' in text
+        assert 'softdesk_db_queries_bucket{view="Say \\"hi\\"",action="list",le="3"} 1' in text
+        assert 'softdesk_db_queries_bucket{view="Say \\"hi\\"",action="list",le="+Inf"} 2' in text
+        assert 'softdesk_db_queries_sum{view="Say \\"hi\\"",action="list"} 10' in text
+        assert 'softdesk_db_queries_count{view="Say \\"hi\\"",action="list"} 2' in text
+
+    def test_format_large_counts(self):
+        """Success: counts and sums past a million are written with every digit"""
+        snapshot = {REQUEST_DURATION.name: [(("View", "list", "GET", "200"), [1234567] + [0] * 11 + [98765.4321])]}
+
+        text = format_metrics(snapshot)
+
+        assert 'le="+Inf"} 1234567\n' in text
+        assert '_sum{view="View",action="list",method="GET",status="200"} 98765.4321\n' in text
+        assert '_count{view="View",action="list",method="GET",status="200"} 1234567\n' in text
+
+    def test_merge(self):
+        """Success: snapshots of several workers are summed per label values"""
+        first, second = Registry(), Registry()
+        first.observe([(DB_QUERIES, ("View", "list"), 1)])
+        second.observe([(DB_QUERIES, ("View", "list"), 2), (DB_QUERIES, ("View", "create"), 3)])
+
+        merged = dict(merge([first.snapshot(), second.snapshot()])[DB_QUERIES.name])
+
+        assert merged[("View", "list")][-1] == 3
+        assert sum(merged[("View", "list")][:-1]) == 2
+        assert merged[("View", "create")][-1] == 3
+
+
+# ==================== Worker store Tests ====================
+
+
+class TestCollect:
+    """Tests for the metrics shared by the workers of a server"""
+
+    def test_collect_running_workers(self, metrics_dir):
+        """Success: files of every worker are merged"""
+        registry.observe([(DB_QUERIES, ("View", "list"), 1)])
+        store.flush(metrics_dir)
+        write_json(metrics_dir / f"{os.getppid()}-1.json", registry.snapshot())
+
+        merged = dict(collect(metrics_dir)[DB_QUERIES.name])
+
+        assert sum(merged[("View", "list")][:-1]) == 2
+        assert len(list(metrics_dir.glob("*-*.json"))) == 2
+
+    def test_exited_worker_archived(self, metrics_dir):
+        """Success: observations of an exited worker are kept in the archive, and its file removed"""
+        registry.observe([(DB_QUERIES, ("View", "list"), 1)])
+        # no process has a pid above the kernel maximum (4194304)
+        exited = metrics_dir / "99999999-1.json"
+        write_json(exited, registry.snapshot())
+
+        first = dict(collect(metrics_dir)[DB_QUERIES.name])
+        second = dict(collect(metrics_dir)[DB_QUERIES.name])
+
+        assert not exited.exists()
+        assert first == second
+        assert sum(second[("View", "list")][:-1]) == 1
+        assert json.loads((metrics_dir / ARCHIVE_NAME).read_text())[DB_QUERIES.name]
+
+    def test_empty_directory(self, tmp_path):
+        """Success: without any file, every histogram is empty"""
+        assert all(series == [] for series in collect(tmp_path / "missing").values())
+
+
+# ==================== MetricsMiddleware Tests ====================
+
+
+@pytest.mark.django_db
+class TestMetricsMiddleware:
+    """Tests for the observation of requests"""
+
+    def test_viewset_request_observed(self, authenticated_client, create_project):
+        """Success: latency, queries, rendering time and size of a request are labelled with its view and action"""
+        response = authenticated_client.get(reverse("project:project-list"))
+        labels = ("ProjectModelViewSet", "list")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert sum(series(REQUEST_DURATION, (*labels, "GET", "200"))[:-1]) == 1
+        assert series(DB_QUERIES, labels)[-1] >= 1
+        for name in ("softdesk_db_duration_seconds", "softdesk_serialization_duration_seconds"):
+            assert sum(registry.series[name][labels][:-1]) == 1
+        assert registry.series["softdesk_http_response_size_bytes"][labels][-1] == len(response.content)
+
+    def test_async_view_observed(self, authenticated_client, create_project):
+        """Success: requests of async views are observed, with their queries run in threads"""
+        authenticated_client.get(reverse("project_async:project-list"))
+
+        assert series(DB_QUERIES, ("AsyncProjectView", "get"))[-1] >= 1
+
+    def test_unresolved_request_observed(self, api_client):
+        """Failure: requests of unknown paths are observed under an "unresolved" view"""
+        api_client.get("/not-a-route/")
+
+        assert series(REQUEST_DURATION, ("unresolved", "", "GET", "404")) is not None
+
+    def test_flushed_periodically(self, authenticated_client, metrics_dir):
+        """Success: the worker file is written when the flush interval has elapsed, not at every request"""
+        authenticated_client.get(reverse("project:project-list"))
+        (metrics_dir / store.name).unlink()
+        authenticated_client.get(reverse("project:project-list"))
+
+        assert not (metrics_dir / store.name).exists()
+        store.next_flush = 0.0
+        authenticated_client.get(reverse("project:project-list"))
+        assert (metrics_dir / store.name).exists()
+
+    def test_disabled(self, settings):
+        """Success: when metrics are disabled, the middleware is not loaded at all"""
+        settings.METRICS_ENABLED = False
+
+        with pytest.raises(MiddlewareNotUsed):
+            MetricsMiddleware(lambda request: None)
+
+    @pytest.mark.benchmark
+    def test_overhead_budget(self):
+        """Success: the middleware adds less than OVERHEAD_BUDGET_SECONDS per request"""
+        store.next_flush = time.monotonic() + 3600
+        request = RequestFactory().get(reverse("project:project-list"))
+        request.resolver_match = resolve(request.path)
+        response = HttpResponse(b"{}")
+        middleware = MetricsMiddleware(lambda request: response)
+        iterations = 5000
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            middleware(request)
+        with_metrics = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(iterations):
+            MetricsMiddleware.observe(request, response, 0.01, QueryCount(3, 0.001))
+        observe_only = time.perf_counter() - start
+
+        assert with_metrics / iterations < OVERHEAD_BUDGET_SECONDS
+        assert observe_only / iterations < OVERHEAD_BUDGET_SECONDS
+
+
+# ==================== /metrics endpoint Tests ====================
+
+
+@pytest.mark.django_db
+class TestMetricsView:
+    """Tests for the Prometheus endpoint"""
+
+    def test_metrics_success(self, staff_client):
+        """Success: observations of requests are exposed in Prometheus text format"""
+        staff_client.get(reverse("project:project-list"))
+
+        response = staff_client.get(reverse("metrics"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        text = response.content.decode()
+        assert 'softdesk_http_request_duration_seconds_count{view="ProjectModelViewSet",action="list"' in text
+
+    @pytest.mark.parametrize("client", ["api_client", "authenticated_client"])
+    def test_staff_required_failure(self, request, client):
+        """Failure: without METRICS_TOKEN, anonymous users and users who are not staff are refused"""
+        response = request.getfixturevalue(client).get(reverse("metrics"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_token_required_failure(self, api_client, settings):
+        """Failure: when METRICS_TOKEN is set, scrapes without it are refused"""
+        settings.METRICS_TOKEN = "secret"
+
+        assert api_client.get(reverse("metrics")).status_code == status.HTTP_401_UNAUTHORIZED
+        response = api_client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_token_success(self, api_client, settings):
+        """Success: scrapes with the bearer token are served"""
+        settings.METRICS_TOKEN = "secret"
+
+        response = api_client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_disabled_failure(self, api_client, settings):
+        """Failure: when metrics are disabled, the endpoint does not exist"""
+        settings.METRICS_ENABLED = False
+
+        assert api_client.get(reverse("metrics")).status_code == status.HTTP_404_NOT_FOUND
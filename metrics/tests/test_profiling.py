@@ -0,0 +1,185 @@
+import asyncio
+import sys
+
+from collections import Counter
+
+import pytest
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import reverse
+from rest_framework import status
+
+from config.factories import ProjectFactory
+from metrics.profiling import (
+    ProfilerMiddleware,
+    Sampler,
+    category_seconds,
+    current_sampler,
+    folded,
+    install,
+    uninstall,
+)
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(settings, tmp_path):
+    settings.PROFILE_DIR = tmp_path
+    settings.PROFILE_INTERVAL_MS = 0.1
+    return tmp_path
+
+
+@pytest.fixture
+def project_list_url(staff_client):
+    ProjectFactory.create_batch(5, author=staff_client.user)
+    return reverse("project:project-list")
+
+
+def profiled_work():
+    return sum(range(200))
+
+
+def other_work():
+    return sum(range(200))
+
+
+# ==================== Profile Tests ====================
+
+
+class TestProfile:
+    """Tests for the collapsed stacks and timings of a profile"""
+
+    def test_folded(self):
+        """Success: one line per stack, frames joined by ";", most sampled first"""
+        stacks = Counter({("main (a.py:1)", "view (b.py:2)"): 2, ("main (a.py:1)",): 3})
+
+        assert folded(stacks) == "main (a.py:1) 3\nmain (a.py:1);view (b.py:2) 2\n"
+
+    def test_concurrent_requests_not_sampled(self):
+        """Success: on a thread shared by requests (event loop), only the frames of the profiled one are sampled"""
+        sampler = Sampler(0)
+
+        async def profiled():
+            current_sampler.set(sampler)
+            install()
+            try:
+                for _ in range(50):
+                    profiled_work()
+                    await asyncio.sleep(0)
+            finally:
+                uninstall()
+
+        async def other():
+            for _ in range(50):
+                other_work()
+                await asyncio.sleep(0)
+
+        async def scenario():
+            await asyncio.gather(profiled(), other())
+
+        asyncio.run(scenario())
+
+        frames = {frame for stack in sampler.stacks for frame in stack}
+        assert any(frame.startswith("profiled_work") for frame in frames)
+        assert not any(frame.startswith(("other_work", "other ")) for frame in frames)
+
+    def test_previous_profile_function_restored(self):
+        """Success: once the last profiled request of a thread is done, its previous profile function is back"""
+
+        def previous(frame, event, arg):
+            pass
+
+        sys.setprofile(previous)
+        try:
+            install()
+            install()
+            uninstall()
+            assert sys.getprofile() is not previous
+            uninstall()
+            assert sys.getprofile() is previous
+        finally:
+            sys.setprofile(None)
+
+    def test_category_seconds(self):
+        """Success: time of a category is its share of samples, nested categories counted in both"""
+        stacks = Counter(
+            {
+                ("check_permissions (rest_framework/views.py:1)", "has_permission (project/permissions.py:9)"): 1,
+                ("has_permission (project/permissions.py:9)", "execute (django/db/backends/utils.py:1)"): 1,
+                ("render (djangorestframework_camel_case/render.py:12)",): 2,
+            }
+        )
+
+        timings = category_seconds(stacks, 0.4)
+
+        assert timings == pytest.approx({"orm": 0.1, "serializer": 0, "renderer": 0.2, "permissions": 0.2})
+        assert category_seconds(Counter(), 1) == {"orm": 0, "serializer": 0, "renderer": 0, "permissions": 0}
+
+
+# ==================== ProfilerMiddleware Tests ====================
+
+
+@pytest.mark.django_db
+class TestProfilerMiddleware:
+    """Tests for the on-demand profiling of requests"""
+
+    def test_profile_header_success(self, staff_client, project_list_url, profile_dir):
+        """Success: a staff request with X-Profile is profiled, its profile saved and timings returned"""
+        response = staff_client.get(project_list_url, HTTP_X_PROFILE="1")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["count"] == 5
+        assert response["X-Profile"].endswith(".folded")
+        assert "ProjectModelViewSet.list" in response["X-Profile"]
+        timings = dict(item.split(";dur=") for item in response["Server-Timing"].split(", "))
+        assert set(timings) == {"total", "orm", "serializer", "renderer", "permissions"}
+        lines = (profile_dir / response["X-Profile"]).read_text().splitlines()
+        assert lines
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    def test_profile_param_folded_success(self, staff_client, project_list_url):
+        """Success: ?profile=folded returns the profile itself, with project frames"""
+        response = staff_client.get(project_list_url, {"profile": "folded"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain")
+        profile = response.content.decode()
+        assert "(project/views.py:" in profile
+        assert "(django/db/backends/utils.py:" in profile
+
+    def test_async_view_profiled(self, staff_client, project_list_url):
+        """Success: requests of async views are profiled too"""
+        response = staff_client.get(reverse("project_async:project-list"), HTTP_X_PROFILE="1")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "AsyncProjectView.get" in response["X-Profile"]
+
+    def test_not_staff_ignored(self, authenticated_client, profile_dir):
+        """Failure: the header of users who are not staff is ignored"""
+        response = authenticated_client.get(reverse("project:project-list"), HTTP_X_PROFILE="1")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "X-Profile" not in response
+        assert list(profile_dir.iterdir()) == []
+
+    def test_invalid_token_ignored(self, api_client):
+        """Failure: the header of requests with an invalid token is ignored, the view rejects them"""
+        api_client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+
+        response = api_client.get(reverse("project:project-list"), HTTP_X_PROFILE="1")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert "X-Profile" not in response
+
+    def test_not_requested(self, staff_client, project_list_url):
+        """Success: requests of staff users without header nor parameter are not profiled"""
+        response = staff_client.get(project_list_url)
+
+        assert "X-Profile" not in response
+        assert "Server-Timing" not in response
+
+    def test_disabled(self, settings):
+        """Success: when profiling is disabled, the middleware is not loaded at all"""
+        settings.PROFILING_ENABLED = False
+
+        with pytest.raises(MiddlewareNotUsed):
+            ProfilerMiddleware(lambda request: None)
@@ -0,0 +1,197 @@
+import json
+import logging
+
+from datetime import datetime
+from io import StringIO
+
+import pytest
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+
+from config.factories import IssueFactory, ProjectFactory
+from metrics.slow_queries import SlowQueryMiddleware, fingerprint, params_shape, summarize
+from user.models import User
+
+
+@pytest.fixture
+def slow_queries(caplog):
+    """Slow-query records logged during the test"""
+    caplog.set_level(logging.WARNING, logger="metrics.slow_queries")
+
+    def records():
+        return [json.loads(record.message) for record in caplog.records if record.name == "metrics.slow_queries"]
+
+    return records
+
+
+@pytest.fixture
+def issue_list_url(authenticated_client):
+    user = authenticated_client.user
+    issue = IssueFactory(author=user, project=ProjectFactory(author=user))
+    return reverse("issue:issue-list", kwargs={"project_id": issue.project_id})
+
+
+def record(sql, duration_ms, view="IssueModelViewSet.list"):
+    return {"sql": sql, "duration_ms": duration_ms, "view": view, "stack": ["issue/views.py:42 in get_queryset"]}
+
+
+# ==================== Record Tests ====================
+
+
+class TestParamsShape:
+    """Tests for the shape of query parameters, logged instead of their values"""
+
+    def test_types_collapsed(self):
+        """Success: types of parameters are listed, repeated ones collapsed"""
+        shape = params_shape([1, 2, 3, "a", datetime(2026, 1, 1), None], False)
+
+        assert shape == ["int*3", "str", "datetime", "NoneType"]
+
+    def test_named_params(self):
+        """Success: named parameters are listed by name"""
+        assert params_shape({"id": 1, "name": "x"}, False) == {"id": "int", "name": "str"}
+
+    def test_executemany_and_none(self):
+        """Success: executemany parameters are counted, never iterated"""
+        assert params_shape([(1,), (2,)], True) == {"rows": 2}
+        assert params_shape(iter([(1,)]), True) == {"rows": None}
+        assert params_shape(None, False) is None
+
+
+class TestFingerprint:
+    """Tests for the grouping of similar queries"""
+
+    def test_placeholder_lists_and_literals(self):
+        """Success: IN lists of any length, quoted and numeric literals are replaced"""
+        first = 'SELECT "id" FROM "issue" WHERE "id" IN (%s, %s) AND "status" = \'todo\' LIMIT 21'
+        second = 'SELECT "id" FROM "issue" WHERE "id" IN (%s, %s, %s) AND "status" = \'done\' LIMIT 100'
+
+        assert fingerprint(first) == fingerprint(second)
+        assert fingerprint(first) == 'SELECT "id" FROM "issue" WHERE "id" IN (...) AND "status" = ? LIMIT ?'
+
+
+# ==================== SlowQueryMiddleware Tests ====================
+
+
+@pytest.mark.django_db
+class TestSlowQueryMiddleware:
+    """Tests for the logging of slow queries"""
+
+    def test_slow_queries_logged(self, authenticated_client, issue_list_url, settings, slow_queries):
+        """Success: queries over the threshold are logged with their view, action, params shape and app stack"""
+        settings.SLOW_QUERY_MS = 0
+
+        response = authenticated_client.get(issue_list_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        records = slow_queries()
+        assert records
+        assert {record["view"] for record in records} == {"IssueModelViewSet.list"}
+        assert all(record["method"] == "GET" and record["database"] for record in records)
+        assert all(isinstance(record["duration_ms"], float) for record in records)
+        stacks = [frame for record in records for frame in record["stack"]]
+        assert any(frame.startswith(("config/mixins.py", "issue/")) for frame in stacks)
+        instrumentation = ("metrics/slow_queries.py", "metrics/middleware.py", "config/db_utils.py")
+        assert not any("-packages" in frame or frame.startswith(instrumentation) for frame in stacks)
+
+    def test_fast_queries_not_logged(self, authenticated_client, issue_list_url, settings, slow_queries):
+        """Success: queries under the threshold are not logged"""
+        settings.SLOW_QUERY_MS = 60_000
+
+        authenticated_client.get(issue_list_url)
+
+        assert slow_queries() == []
+
+    def test_sampling(self, authenticated_client, issue_list_url, settings, slow_queries):
+        """Success: only a SLOW_QUERY_SAMPLE_RATE share of slow queries is logged"""
+        settings.SLOW_QUERY_MS = 0
+        settings.SLOW_QUERY_SAMPLE_RATE = 1e-12
+
+        authenticated_client.get(issue_list_url)
+
+        assert slow_queries() == []
+
+    def test_query_outside_request(self, authenticated_client, settings, slow_queries):
+        """Success: slow queries run outside requests are logged without view"""
+        authenticated_client.get(reverse("project:project-list"))
+        settings.SLOW_QUERY_MS = 0
+
+        User.objects.count()
+
+        assert [record["view"] for record in slow_queries()] == [None]
+
+    def test_disabled(self, settings):
+        """Success: with a sample rate of 0, the middleware is not loaded at all"""
+        settings.SLOW_QUERY_SAMPLE_RATE = 0
+
+        with pytest.raises(MiddlewareNotUsed):
+            SlowQueryMiddleware(lambda request: None)
+
+
+# ==================== slow_queries command Tests ====================
+
+
+class TestSummarize:
+    """Tests for the top offenders of a slow-query log"""
+
+    def test_grouped_and_sorted(self):
+        """Success: similar queries of a view are grouped, sorted by total time"""
+        records = [
+            record("SELECT 1 FROM t WHERE id IN (%s, %s)", 150),
+            record("SELECT 1 FROM t WHERE id IN (%s, %s, %s)", 250),
+            record("SELECT 2", 300, view="ProjectModelViewSet.list"),
+        ]
+
+        offenders = summarize(records)
+
+        assert [(offender["view"], offender["count"], offender["total_ms"]) for offender in offenders] == [
+            ("IssueModelViewSet.list", 2, 400),
+            ("ProjectModelViewSet.list", 1, 300),
+        ]
+        assert offenders[0]["avg_ms"] == 200
+        assert offenders[0]["max_ms"] == 250
+        assert summarize(records, sort="max")[0]["view"] == "ProjectModelViewSet.list"
+        assert len(summarize(records, top=1)) == 1
+
+
+class TestSlowQueriesCommand:
+    """Tests for the slow_queries management command"""
+
+    def test_summary_success(self, tmp_path):
+        """Success: top offenders of a log are shown, lines of other loggers skipped"""
+        log = tmp_path / "slow.log"
+        lines = [
+            "Internal Server Error: /api/project/",
+            json.dumps(record("SELECT * FROM issue", 900)),
+            "web-1  | " + json.dumps(record("SELECT * FROM comment", 120, view="CommentModelViewSet.list")),
+        ]
+        log.write_text("\n".join(lines) + "\n")
+        out = StringIO()
+
+        call_command("slow_queries", str(log), stdout=out)
+
+        output = out.getvalue()
+        assert output.index("IssueModelViewSet.list") < output.index("CommentModelViewSet.list")
+        assert "at issue/views.py:42 in get_queryset" in output
+
+    def test_empty_log(self, tmp_path):
+        """Success: an empty log has no offender"""
+        log = tmp_path / "slow.log"
+        log.write_text("")
+        out = StringIO()
+
+        call_command("slow_queries", str(log), stdout=out)
+
+        assert "No slow query logged" in out.getvalue()
+
+    def test_no_log_failure(self, settings, tmp_path):
+        """Failure: a log must be given or configured, and readable"""
+        settings.SLOW_QUERY_LOG = ""
+
+        with pytest.raises(CommandError):
+            call_command("slow_queries")
+        with pytest.raises(CommandError, match="Cannot read"):
+            call_command("slow_queries", str(tmp_path / "missing.log"))
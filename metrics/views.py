@@ -0,0 +1,34 @@
+import hmac
+
+from pathlib import Path
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from .middleware import store
+from .profiling import is_staff
+from .registry import format_metrics
+from .store import collect
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics(request):
+    """
+    Histograms of every worker in Prometheus text format: scrapes send the METRICS_TOKEN bearer token when it is set,
+    else the API JWT of a staff user
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    token = settings.METRICS_TOKEN
+    if token:
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return HttpResponse("Invalid metrics token\n", status=401, content_type=CONTENT_TYPE)
+    elif not is_staff(request):
+        return HttpResponse("Staff user or metrics token required\n", status=401, content_type=CONTENT_TYPE)
+
+    directory = Path(settings.METRICS_DIR)
+    # this worker's latest observations, the others' are at most METRICS_FLUSH_SECONDS old
+    store.flush(directory)
+    return HttpResponse(format_metrics(collect(directory)), content_type=CONTENT_TYPE)
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import async_views
+
+
+app_name = "project_async"
+
+urlpatterns = [
+    path("", async_views.AsyncProjectView.as_view(), name="project-list"),
+    path("<int:project_id>/", async_views.AsyncProjectView.as_view(), name="project-detail"),
+]
@@ -0,0 +1,35 @@
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from rest_framework.permissions import IsAuthenticated
+
+from config.async_views import AsyncReadOnlyAPIView
+from config.global_permissions import IsObjectAuthor
+from project.models import Project
+
+from .contributors import attach_contributor_ids, contributors_limit
+from .serializers import ProjectSerializer
+
+
+class AsyncProjectView(AsyncReadOnlyAPIView):
+    """Async list/retrieve of projects, same queryset and permissions as ProjectModelViewSet"""
+
+    serializer_class = ProjectSerializer
+    permission_classes = [IsAuthenticated, IsObjectAuthor]
+    lookup_url_kwarg = "project_id"
+    # list and retrieve (cf. config.query_budget)
+    query_budgets = {"get": 4}
+
+    def get_queryset(self):
+        user = self.request.user
+        return (
+            Project.objects.select_related("author")
+            .with_role_of(user)
+            .filter(Q(contributors=user) | Q(author=user))
+            .distinct()
+            # stable pages
+            .order_by("id")
+        )
+
+    async def prefetch(self, objects):
+        # serializers run on the event loop, where the ORM cannot be used synchronously
+        await sync_to_async(attach_contributor_ids)(objects, contributors_limit(self.request))
@@ -0,0 +1,68 @@
+"""
+Contributors of projects as user ids, read from the Contributor table only: prefetch_related("contributors") loads
+full User rows (password hash included) when project payloads only show their ids.
+"""
+
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from rest_framework.exceptions import ValidationError
+
+from .models import Contributor, Project
+
+
+LIMIT_PARAM = "contributors_limit"
+
+
+def attach_contributor_ids(projects: Iterable[Project], limit: int | None = None) -> None:
+    """
+    Set `contributor_ids` (user ids, in ascending order, the first `limit` ones only when given) and
+    `contributors_count` on projects, with one query of (project_id, user_id) pairs whatever their number.
+    Truncation is done by the database (ROW_NUMBER() per project): large projects send `limit` rows, not all of them.
+    """
+    by_id = {project.pk: project for project in projects}
+    if not by_id:
+        return
+    for project in by_id.values():
+        project.contributor_ids = []
+        project.contributors_count = 0
+
+    pairs = Contributor.objects.filter(project_id__in=by_id).order_by("project_id", "user_id")
+    if limit is None:
+        for project_id, user_id in pairs.values_list("project_id", "user_id"):
+            by_id[project_id].contributor_ids.append(user_id)
+        for project in by_id.values():
+            project.contributors_count = len(project.contributor_ids)
+        return
+
+    # the first row of each project is kept with a limit of 0, for its count
+    pairs = pairs.annotate(
+        total=Window(Count("pk"), partition_by=F("project_id")),
+        rank=Window(RowNumber(), partition_by=F("project_id"), order_by=F("user_id").asc()),
+    ).filter(rank__lte=max(limit, 1))
+    for project_id, user_id, total, rank in pairs.values_list("project_id", "user_id", "total", "rank"):
+        project = by_id[project_id]
+        project.contributors_count = total
+        if rank <= limit:
+            project.contributor_ids.append(user_id)
+
+
+def contributors_limit(request) -> int | None:
+    """
+    Max contributor ids per project of a response: ?contributors_limit=N (0 for the count only), capped by
+    settings.PROJECT_CONTRIBUTORS_LIMIT. None when both are unset.
+    """
+    limit = settings.PROJECT_CONTRIBUTORS_LIMIT
+    # GET: DRF requests and the Django ones of async views
+    value = request.GET.get(LIMIT_PARAM) if request is not None else None
+    if value:
+        try:
+            requested = int(value)
+        except ValueError:
+            requested = -1
+        if requested < 0:
+            raise ValidationError({LIMIT_PARAM: "A positive integer or 0 is required."})
+        limit = requested if limit is None else min(requested, limit)
+    return limit
@@ -0,0 +1,64 @@
+import logging
+
+from collections.abc import Callable
+
+from django.utils import timezone
+
+from config.db_utils import raw_delete
+from issue.models import ArchivedComment, ArchivedIssue, Comment, Issue
+from job.queue import enqueue
+
+from .models import Contributor, Project
+
+
+logger = logging.getLogger("projects")
+
+
+def mark_project_deleted(project: Project):
+    """
+    Hide a project at once: the default manager, so every API queryset, excludes it from now on.
+    Its rows are purged by a background job (cf. project.jobs).
+    """
+    project.deleted_at = timezone.now()
+    Project.all_objects.filter(pk=project.pk).update(deleted_at=project.deleted_at)
+    enqueue("project.purge", {"project_id": project.pk})
+
+
+def purge_project(
+    project_id: int, batch_size: int = 1000, progress: Callable[[str, int], None] | None = None
+) -> dict[str, int]:
+    """
+    Delete a project and all its rows, children first, with bounded DELETE statements.
+
+    Unlike Project.delete(), no row is loaded in memory and each batch is its own short transaction, so deleting a
+    huge project neither holds a giant transaction nor spikes memory. Return the number of deleted rows per table.
+    """
+    steps = {
+        "comments": Comment.objects.filter(issue__project_id=project_id),
+        "archived comments": ArchivedComment.objects.filter(issue__project_id=project_id),
+        "issues": Issue.objects.filter(project_id=project_id),
+        "archived issues": ArchivedIssue.objects.filter(project_id=project_id),
+        "contributors": Contributor.objects.filter(project_id=project_id),
+    }
+    deleted = dict.fromkeys(steps, 0)
+
+    for step, queryset in steps.items():
+        while ids := list(queryset.order_by("pk").values_list("pk", flat=True)[:batch_size]):
+            deleted[step] += raw_delete(queryset.model.objects.filter(pk__in=ids))
+            logger.info("Purging project %s: %s %s deleted", project_id, deleted[step], step)
+            if progress:
+                progress(step, deleted[step])
+
+    raw_delete(Project.all_objects.filter(pk=project_id))
+    logger.info("Project %s purged: %s", project_id, deleted)
+    return deleted
+
+
+def purge_deleted_projects(batch_size: int = 1000, progress: Callable[[str, int], None] | None = None) -> list[int]:
+    """Purge every project marked as deleted, return their ids"""
+    project_ids = list(
+        Project.all_objects.filter(deleted_at__isnull=False).order_by("deleted_at").values_list("pk", flat=True)
+    )
+    for project_id in project_ids:
+        purge_project(project_id, batch_size, progress)
+    return project_ids
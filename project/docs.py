@@ -0,0 +1,93 @@
+"""OpenAPI docs of project views, applied by config.docs.load_docs() when the schema is first requested"""
+
+from drf_spectacular.utils import extend_schema, extend_schema_view
+
+from config.docs import DocsTypingParameters
+
+from .serializers import ProjectCreateSerializer, ProjectUpdateSerializer
+from .views import ContributorModelViewSet, ProjectModelViewSet
+
+
+extend_schema_view(
+    list=extend_schema(
+        summary="Get all Projects",
+        tags=["Project"],
+    ),
+    retrieve=extend_schema(
+        summary="Get a Project",
+        tags=["Project"],
+        parameters=[DocsTypingParameters.project_id.value],
+    ),
+    create=extend_schema(
+        summary="Create a Project",
+        tags=["Project"],
+        request=ProjectCreateSerializer,
+    ),
+    update=extend_schema(
+        summary="Update entirely a Project",
+        tags=["Project"],
+        parameters=[DocsTypingParameters.project_id.value],
+        request=ProjectUpdateSerializer,
+    ),
+    partial_update=extend_schema(
+        summary="Update one or many Project's fields",
+        tags=["Project"],
+        parameters=[DocsTypingParameters.project_id.value],
+        request=ProjectUpdateSerializer,
+    ),
+    destroy=extend_schema(
+        summary="Delete Project",
+        tags=["Project"],
+        parameters=[DocsTypingParameters.project_id.value],
+    ),
+)(ProjectModelViewSet)
+
+extend_schema_view(
+    list=extend_schema(
+        summary="Get all contributors of a Project",
+        tags=["Project-Contributor"],
+        parameters=[
+            DocsTypingParameters.csv_format.value,
+            DocsTypingParameters.csv_all.value,
+        ],
+    ),
+    retrieve=extend_schema(
+        summary="Get a Project",
+        tags=["Project-Contributor"],
+        parameters=[
+            DocsTypingParameters.contributor_id.value,
+            DocsTypingParameters.project_id.value,
+        ],
+    ),
+    create=extend_schema(
+        summary="Create a Project",
+        tags=["Project-Contributor"],
+        parameters=[
+            DocsTypingParameters.project_id.value,
+        ],
+    ),
+    update=extend_schema(
+        summary="Update entirely a Project",
+        tags=["Project-Contributor"],
+        parameters=[
+            DocsTypingParameters.contributor_id.value,
+            DocsTypingParameters.project_id.value,
+        ],
+    ),
+    partial_update=extend_schema(
+        summary="Update one or many Project's fields",
+        tags=["Project-Contributor"],
+        parameters=[
+            DocsTypingParameters.contributor_id.value,
+            DocsTypingParameters.project_id.value,
+        ],
+    ),
+    destroy=extend_schema(
+        summary="Delete Project",
+        tags=["Project-Contributor"],
+        parameters=[
+            DocsTypingParameters.contributor_id.value,
+            DocsTypingParameters.project_id.value,
+        ],
+    ),
+)(ContributorModelViewSet)
@@ -0,0 +1,62 @@
+from collections.abc import Iterator
+
+from django.db.models import Max
+
+from activity.models import ProjectEvent
+from config.exports import Section, chain_archived, data_version, stream_sections, values
+from issue.models import ArchivedComment, ArchivedIssue, Comment, Issue
+
+from .models import Contributor, Project
+
+
+PROJECT_FIELDS = ["id", "name", "description", "type", "author_id", "created_at"]
+CONTRIBUTOR_FIELDS = ["user_id", "user__username"]
+ISSUE_FIELDS = ["id", "title", "content", "status", "priority", "tags", "author_id", "created_at", "closed_at"]
+COMMENT_FIELDS = ["id", "issue_id", "title", "content", "author_id", "created_at"]
+
+
+def project_export_sections(project: Project) -> Iterator[Section]:
+    """(section name, header, rows) of a project, its contributors, issues and comments, archived ones included"""
+    yield "project", PROJECT_FIELDS, values(Project.objects.filter(pk=project.pk), PROJECT_FIELDS)
+    yield (
+        "contributors",
+        ["user_id", "username"],
+        values(Contributor.objects.filter(project=project), CONTRIBUTOR_FIELDS),
+    )
+    yield (
+        "issues",
+        [*ISSUE_FIELDS, "archived"],
+        chain_archived(
+            Issue.objects.filter(project=project), ArchivedIssue.objects.filter(project=project), ISSUE_FIELDS
+        ),
+    )
+    yield (
+        "comments",
+        [*COMMENT_FIELDS, "archived"],
+        chain_archived(
+            Comment.objects.filter(issue__project=project),
+            ArchivedComment.objects.filter(issue__project=project),
+            COMMENT_FIELDS,
+        ),
+    )
+
+
+def stream_project_export(project: Project) -> Iterator[str]:
+    """Multi-section CSV of a project (cf. config.exports.stream_sections)"""
+    return stream_sections(project_export_sections(project))
+
+
+def project_data_version(project: Project) -> str:
+    """
+    Changes whenever the export of the project would change: its fields, its contributors as exported (usernames
+    change without event), its last event (issues, comments and contributors changes, cf. activity app) and its
+    archived rows (archiving records no event).
+    """
+    last_event = ProjectEvent.objects.filter(project_id=project.pk).aggregate(last=Max("id"))["last"]
+    return data_version(
+        list(values(Project.objects.filter(pk=project.pk), PROJECT_FIELDS)),
+        list(values(Contributor.objects.filter(project=project).order_by("user_id"), CONTRIBUTOR_FIELDS)),
+        last_event,
+        ArchivedIssue.objects.filter(project=project).count(),
+        ArchivedComment.objects.filter(issue__project=project).count(),
+    )
@@ -0,0 +1,13 @@
+from job.queue import report_progress, task
+
+from .deletion import purge_project
+from .models import Project
+
+
+@task("project.purge")
+def purge(project_id: int, batch_size: int = 1000):
+    # already purged, e.g. by the purge_deleted_projects command
+    if not Project.all_objects.filter(pk=project_id, deleted_at__isnull=False).exists():
+        return None
+    # rows deleted so far per table, on the job row while it runs (cf. job_stats --running)
+    return purge_project(project_id, batch_size, progress=report_progress)
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from project.deletion import purge_deleted_projects
+
+
+class Command(BaseCommand):
+    help = "Delete rows of projects marked as deleted, in bounded batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of rows deleted per statement")
+
+    def handle(self, *args, **options):
+        def report(step, deleted):
+            self.stdout.write(f"  {deleted} {step} deleted...")
+
+        project_ids = purge_deleted_projects(options["batch_size"], progress=report)
+        self.stdout.write(self.style.SUCCESS(f"{len(project_ids)} deleted projects purged"))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0002_remove_contributor_role'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='issue_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='open_issue_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:01
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def set_author_roles(apps, schema_editor):
+    Contributor = apps.get_model("project", "Contributor")
+    Contributor.objects.filter(user_id=F("project__author_id")).update(role="owner")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0004_project_deleted_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contributor',
+            name='role',
+            field=models.CharField(choices=[('owner', 'Owner'), ('maintainer', 'Maintainer'), ('member', 'Member'), ('reader', 'Reader')], default='member'),
+        ),
+        migrations.RunPython(set_author_roles, migrations.RunPython.noop),
+    ]
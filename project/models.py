@@ -5,13 +5,37 @@ from django.db import models
 
 from user.models import User
 
+from .roles import NO_PERMISSION, ROLE_PERMISSIONS, Permission
+
 
 logger = logging.getLogger("projects")
 
 
 class Contributor(models.Model):
+    class Role(models.TextChoices):
+        owner = "owner", "Owner"
+        maintainer = "maintainer", "Maintainer"
+        member = "member", "Member"
+        reader = "reader", "Reader"
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     project = models.ForeignKey("project.Project", on_delete=models.CASCADE)
+    # what the user may do in the project (cf. project.roles), the project author is an owner whatever its role
+    role = models.CharField(choices=Role, default=Role.member)
+
+
+class ProjectQuerySet(models.QuerySet):
+    def with_role_of(self, user):
+        """Annotate the role of user in each project (None if not a contributor): permissions() then runs no query"""
+        role = Contributor.objects.filter(project=models.OuterRef("pk"), user_id=user.pk).values("role")[:1]
+        return self.annotate(member_role=models.Subquery(role))
+
+
+class ProjectManager(models.Manager.from_queryset(ProjectQuerySet)):
+    """Default manager: projects marked as deleted are hidden everywhere while they are purged"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
 
 class Project(models.Model):
@@ -32,3 +56,24 @@ class Project(models.Model):
     description = models.TextField(blank=True)
     type = models.CharField(choices=ProjectTypes)
     created_at = models.DateTimeField(auto_now_add=True)
+    # denormalized counters, kept up to date by issue.signals (and repaired by the recount command)
+    # to show "N issues / M open" without a COUNT per project
+    issue_count = models.IntegerField(default=0, editable=False)
+    open_issue_count = models.IntegerField(default=0, editable=False)
+    # set on deletion: the project disappears at once, its rows are purged later in batches (cf. project.deletion)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = ProjectManager()
+    # includes projects waiting to be purged
+    all_objects = models.Manager()
+
+    def permissions(self, user) -> Permission:
+        """Permission bitmask of user in the project: owner ones for its author, the ones of their role for others"""
+        if user.pk is not None and self.author_id == user.pk:
+            return ROLE_PERMISSIONS[Contributor.Role.owner]
+        if not hasattr(self, "member_role"):
+            # not loaded with with_role_of(user)
+            self.member_role = (
+                Contributor.objects.filter(project=self, user_id=user.pk).values_list("role", flat=True).first()
+            )
+        return ROLE_PERMISSIONS.get(self.member_role, NO_PERMISSION)
@@ -1,15 +1,25 @@
 from rest_framework import permissions
 
+from .models import Contributor
+from .roles import Permission
+
 
 class WriteContributor(permissions.BasePermission):
     """
-    Custom permission: only allows users to create a contributor if they are the project author.
+    Custom permission: only allows users who manage the contributors of the project (owners and maintainers) to add,
+    read, change or remove them, other members only list them. Owners can only be changed or removed by owners.
     """
 
+    # the permissions of the user are loaded with view.project (cf. project.roles): no query
+
     def has_permission(self, request, view):
         if request.method == "POST":
-            return request.user == view.project.author
+            return bool(view.project.permissions(request.user) & Permission.MANAGE_CONTRIBUTORS)
         return True
 
     def has_object_permission(self, request, view, obj):
-        return request.user == view.project.author
+        if obj.role == Contributor.Role.owner and request.method not in permissions.SAFE_METHODS:
+            required = Permission.MANAGE_PROJECT
+        else:
+            required = Permission.MANAGE_CONTRIBUTORS
+        return bool(view.project.permissions(request.user) & required)
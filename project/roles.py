@@ -0,0 +1,29 @@
+"""
+Roles of project members and what they allow, as bitmasks: a request loads the role of its user with the project
+(cf. ProjectQuerySet.with_role_of), then every permission check is a bitwise AND, with no query.
+"""
+
+from enum import IntFlag
+
+
+class Permission(IntFlag):
+    # list the project, its issues, comments and contributors, export it (single issues and comments are only read by
+    # their authors, the project and single contributors by the ones who manage them)
+    VIEW = 1
+    # create issues and comments, edit and delete one's own (issues and comments are only accessed by their authors)
+    CONTRIBUTE = 2
+    # add, edit and remove contributors (owners excepted)
+    MANAGE_CONTRIBUTORS = 4
+    # edit and delete the project, grant the owner role
+    MANAGE_PROJECT = 8
+
+
+NO_PERMISSION = Permission(0)
+
+# keys are the values of Contributor.Role
+ROLE_PERMISSIONS = {
+    "reader": Permission.VIEW,
+    "member": Permission.VIEW | Permission.CONTRIBUTE,
+    "maintainer": Permission.VIEW | Permission.CONTRIBUTE | Permission.MANAGE_CONTRIBUTORS,
+    "owner": ~NO_PERMISSION,
+}
@@ -1,33 +1,71 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import IntegerField, ListField
 from rest_framework.relations import PrimaryKeyRelatedField
-from rest_framework.serializers import ModelSerializer
+from rest_framework.serializers import ListSerializer, ModelSerializer
 
 from user.models import User
 
+from .contributors import attach_contributor_ids, contributors_limit
 from .models import Contributor, Project
+from .roles import Permission
+
+
+class ProjectListSerializer(ListSerializer):
+    """Attach the contributor ids of all the projects of a page at once (cf. project.contributors)"""
+
+    def to_representation(self, data):
+        projects = list(data.all() if hasattr(data, "all") else data)
+        missing = [project for project in projects if not hasattr(project, "contributor_ids")]
+        attach_contributor_ids(missing, contributors_limit(self.context.get("request")))
+        return super().to_representation(projects)
 
 
 class ProjectSerializer(ModelSerializer):
+    # user ids read from the Contributor table only (no User row loaded), truncated with ?contributors_limit=N
+    contributors = ListField(child=IntegerField(), source="contributor_ids", read_only=True)
+    contributors_count = IntegerField(read_only=True)
+
     class Meta:
         model = Project
-        fields = ["id", "name", "type", "description", "author", "contributors", "created_at"]
+        list_serializer_class = ProjectListSerializer
+        fields = [
+            "id",
+            "name",
+            "type",
+            "description",
+            "author",
+            "contributors",
+            "contributors_count",
+            "created_at",
+            "issue_count",
+            "open_issue_count",
+        ]
         # add contributors to read_only_fields because they are handled in other endpoints
-        read_only_fields = ["created_at", "contributors"]
+        # counters are maintained by the DB (cf. issue.signals)
+        read_only_fields = ["created_at", "contributors", "issue_count", "open_issue_count"]
         # author is optional in input, but auto-set on creation
         # this allows transfer ownership of a project to another user on PUT/PATCH request
         extra_kwargs = {"author": {"required": False}}
 
     def create(self, validated_data):
-        # Automatically set user as author and contributor
-        validated_data["author"] = self.context["request"].user
-        validated_data["contributors"] = [self.context["request"].user]
-        return super().create(validated_data)
+        # Automatically set user as author and contributor, with the owner role
+        user = self.context["request"].user
+        validated_data["author"] = user
+        project = super().create(validated_data)
+        project.contributors.add(user, through_defaults={"role": Contributor.Role.owner})
+        return project
+
+    def to_representation(self, instance):
+        if not hasattr(instance, "contributor_ids"):
+            attach_contributor_ids([instance], contributors_limit(self.context.get("request")))
+        return super().to_representation(instance)
 
 
 class ProjectCreateSerializer(ProjectSerializer):
     """Serializer for Project creation - author is auto-set from request.user"""
 
     class Meta(ProjectSerializer.Meta):
-        read_only_fields = ["created_at", "contributors", "author"]
+        read_only_fields = ["created_at", "contributors", "author", "issue_count", "open_issue_count"]
 
 
 class ProjectUpdateSerializer(ProjectSerializer):
@@ -48,9 +86,23 @@ class ContributorSerializer(ModelSerializer):
 
     class Meta:
         model = Contributor
-        fields = ["id", "user_id", "user", "project"]
+        fields = ["id", "user_id", "user", "project", "role"]
         read_only_fields = ["id", "user", "project"]
 
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.instance is not None:
+            # a contributor changes role, never user: a user is removed and another one added instead
+            fields["user_id"].read_only = True
+        return fields
+
+    def validate_role(self, role):
+        """Only owners grant the owner role (cf. project.roles)"""
+        granted = self.context["view"].project.permissions(self.context["request"].user)
+        if role == Contributor.Role.owner and not granted & Permission.MANAGE_PROJECT:
+            raise ValidationError("Only owners can grant the owner role.")
+        return role
+
     def create(self, validated_data):
         """Create a new contributor with project from view context"""
         # Get project from view (set by ProjectMixin)
@@ -0,0 +1,144 @@
+import pytest
+
+from django.urls import reverse
+from rest_framework import status
+
+from config.factories import ProjectFactory, UserFactory, create_users
+from project.models import Project
+
+
+base_url = "project_async:"
+
+
+@pytest.mark.django_db
+class TestAsyncProjectList:
+    """Tests for the async project list (GET /api/async/project/)"""
+
+    def test_list_projects_success(self, authenticated_client, create_project):
+        """Success: same paginated, camelCase payload as the sync endpoint"""
+        ProjectFactory(author=UserFactory())
+        url = reverse(f"{base_url}project-list")
+
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["count"] == 1
+        assert data["next"] is None
+        assert data["results"][0]["id"] == create_project.pk
+        assert data["results"][0]["contributors"] == [authenticated_client.user.pk]
+        assert data["results"][0]["contributorsCount"] == 1
+        assert "issueCount" in data["results"][0]
+
+    def test_list_projects_contributors_limit_success(self, authenticated_client):
+        """Success: ?contributors_limit=N truncates contributor ids as in the sync endpoint"""
+        ProjectFactory(author=authenticated_client.user, contributors=create_users(3))
+
+        response = authenticated_client.get(reverse(f"{base_url}project-list"), {"contributors_limit": 1})
+
+        project = response.json()["results"][0]
+        assert len(project["contributors"]) == 1
+        assert project["contributorsCount"] == 4
+
+    def test_list_projects_pagination_success(self, authenticated_client):
+        """Success: pages follow PageNumberPagination links"""
+        ProjectFactory.create_batch(12, author=authenticated_client.user)
+        url = reverse(f"{base_url}project-list")
+
+        first_page = authenticated_client.get(url).json()
+        second_page = authenticated_client.get(first_page["next"]).json()
+
+        assert first_page["count"] == 12
+        assert len(first_page["results"]) == 10
+        assert len(second_page["results"]) == 2
+        assert second_page["next"] is None
+        assert second_page["previous"] is not None
+
+    def test_head_projects_success(self, authenticated_client, create_project):
+        """Success: HEAD runs the list as GET, with its headers and no body"""
+        response = authenticated_client.head(reverse(f"{base_url}project-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/json"
+        assert response.content == b""
+
+    def test_list_projects_invalid_page_failure(self, authenticated_client, create_project):
+        """Failure: a page out of range is a 404, as in DRF"""
+        url = reverse(f"{base_url}project-list")
+
+        response = authenticated_client.get(url, {"page": 5})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_list_projects_unauthenticated_failure(self, api_client):
+        """Failure: a token is required"""
+        response = api_client.get(reverse(f"{base_url}project-list"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert "WWW-Authenticate" in response.headers
+
+    def test_list_projects_invalid_token_failure(self, api_client):
+        """Failure: an invalid token is rejected"""
+        api_client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+
+        response = api_client.get(reverse(f"{base_url}project-list"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestAsyncProjectRetrieve:
+    """Tests for the async project retrieve (GET /api/async/project/{project_id}/)"""
+
+    def test_retrieve_project_success(self, authenticated_client, create_project):
+        """Success: retrieve own project"""
+        url = reverse(f"{base_url}project-detail", kwargs={"project_id": create_project.pk})
+
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["name"] == create_project.name
+
+    def test_retrieve_project_not_contributor_failure(self, authenticated_client):
+        """Failure: projects of others are not found"""
+        project = ProjectFactory(author=UserFactory())
+        url = reverse(f"{base_url}project-detail", kwargs={"project_id": project.pk})
+
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_write_method_not_allowed_failure(self, authenticated_client, create_project):
+        """Failure: async endpoints are read-only"""
+        url = reverse(f"{base_url}project-detail", kwargs={"project_id": create_project.pk})
+
+        response = authenticated_client.delete(url)
+
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+
+# ==================== Query budget Tests ====================
+
+
+@pytest.mark.django_db
+class TestAsyncProjectQueryBudget:
+    """Tests for the query budget of the async project view, as projects and contributors grow"""
+
+    def test_list_success(self, authenticated_client, assert_query_budget):
+        """Success: listing projects runs as many queries for 1 or 20 projects"""
+        user = authenticated_client.user
+
+        def grow(rows):
+            for _ in range(rows - Project.objects.filter(author=user).count()):
+                ProjectFactory(author=user, contributors=create_users(1))
+
+        assert_query_budget(lambda: authenticated_client.get(reverse(f"{base_url}project-list")), grow)
+
+    def test_retrieve_success(self, authenticated_client, create_project, assert_query_budget):
+        """Success: reading a project runs as many queries for 1 or 20 contributors"""
+        url = reverse(f"{base_url}project-detail", kwargs={"project_id": create_project.pk})
+
+        def grow(rows):
+            create_project.contributors.add(*create_users(rows - create_project.contributors.count()))
+
+        assert_query_budget(lambda: authenticated_client.get(url), grow)
@@ -1,9 +1,11 @@
+import csv
+
 import pytest
 
 from django.urls import reverse
 from rest_framework import status
 
-from config.factories import ProjectFactory, UserFactory
+from config.factories import ProjectFactory, UserFactory, create_users
 from project.models import Contributor
 
 
@@ -41,6 +43,23 @@ class TestContributorList:
         assert contributors_lists == []
 
 
+@pytest.mark.django_db
+class TestContributorCSVExport:
+    """Tests for CSV export of contributors (GET /projects/{project_id}/contributors/?format=csv&all=true)"""
+
+    def test_csv_full_export_success(self, authenticated_client, create_project):
+        """Success: every contributor is exported"""
+        url = reverse(f"{base_contributor_url}list", kwargs={"project_id": create_project.pk})
+        create_project.contributors.add(*UserFactory.create_batch(2))
+        contributor_count = Contributor.objects.filter(project=create_project).count()
+
+        response = authenticated_client.get(url, {"format": "csv", "all": "true"})
+
+        rows = list(csv.reader(b"".join(response.streaming_content).decode().splitlines()))
+        assert rows[0] == ["id", "user", "project", "role"]
+        assert len(rows) == 1 + contributor_count
+
+
 @pytest.mark.django_db
 class TestContributorRetrieve:
     """Tests for retrieving a single contributor (GET /projects/{project_id}/contributors/{id}/)"""
@@ -149,3 +168,57 @@ class TestContributorDelete:
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
         assert project.contributors.filter(id=contributor_user.id).exists()
+
+
+# ==================== Query budget Tests ====================
+
+
+@pytest.mark.django_db
+class TestContributorQueryBudgets:
+    """Tests for the query budgets of contributor actions, as contributors grow"""
+
+    @pytest.fixture
+    def grow(self, create_project):
+        def grow(rows):
+            create_project.contributors.add(*create_users(rows - create_project.contributors.count()))
+
+        return grow
+
+    def test_list_success(self, authenticated_client, create_project, grow, assert_query_budget):
+        """Success: listing contributors runs as many queries for 1 or 20 contributors"""
+        url = reverse(f"{base_contributor_url}list", kwargs={"project_id": create_project.pk})
+
+        assert_query_budget(lambda: authenticated_client.get(url), grow)
+
+    def test_create_success(self, authenticated_client, create_project, grow, assert_query_budget):
+        """Success: adding a contributor does not depend on the contributors of the project"""
+        url = reverse(f"{base_contributor_url}list", kwargs={"project_id": create_project.pk})
+        newcomers = []
+
+        def grow_and_prepare(rows):
+            grow(rows)
+            newcomers.extend(create_users(1))
+
+        assert_query_budget(
+            lambda: authenticated_client.post(url, {"user_id": newcomers[-1].pk}, format="json"), grow_and_prepare
+        )
+
+    @pytest.mark.parametrize("method", ["get", "put", "patch", "delete"])
+    def test_detail_success(self, authenticated_client, create_project, grow, assert_query_budget, method):
+        """Success: reading, updating and removing a contributor runs as many queries for 1 or 20 contributors"""
+        request = {}
+
+        def grow_and_prepare(rows):
+            # the author, and rows other contributors
+            grow(rows + 1)
+            contributor = Contributor.objects.filter(project=create_project).exclude(user=create_project.author).last()
+            request["url"] = reverse(
+                f"{base_contributor_url}detail",
+                kwargs={"project_id": create_project.pk, "contributor_id": contributor.pk},
+            )
+            request["data"] = None if method in ("get", "delete") else {"user_id": create_users(1)[0].pk}
+
+        assert_query_budget(
+            lambda: getattr(authenticated_client, method)(request["url"], request["data"], format="json"),
+            grow_and_prepare,
+        )
@@ -0,0 +1,93 @@
+import pytest
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from config.factories import CommentFactory, IssueFactory, ProjectFactory, UserFactory
+from issue.models import Comment, Issue
+from job.models import Job
+from project.deletion import mark_project_deleted, purge_project
+from project.models import Contributor, Project
+
+
+base_project_url = "project:"
+
+
+@pytest.fixture
+def large_project(authenticated_client):
+    """Create a project with contributors, issues and comments"""
+    project = ProjectFactory(author=authenticated_client.user, contributors=UserFactory.create_batch(2))
+    for issue in IssueFactory.create_batch(3, project=project):
+        CommentFactory.create_batch(2, issue=issue)
+    return project
+
+
+# ==================== Project deletion pipeline Tests ====================
+
+
+@pytest.mark.django_db
+class TestProjectSoftDelete:
+    """Tests for deleting a project (DELETE /projects/{id}/), rows are purged later"""
+
+    def test_deleted_project_is_hidden_at_once(self, authenticated_client, large_project):
+        """Success: Deleted project disappears from every endpoint before being purged"""
+        url = reverse(f"{base_project_url}project-detail", kwargs={"project_id": large_project.pk})
+
+        response = authenticated_client.delete(url)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert Project.all_objects.filter(pk=large_project.pk, deleted_at__isnull=False).exists()
+        assert authenticated_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+        issues_url = reverse("issue:issue-list", kwargs={"project_id": large_project.pk})
+        assert authenticated_client.get(issues_url).status_code == status.HTTP_404_NOT_FOUND
+        # rows are still there, waiting to be purged
+        assert Issue.objects.filter(project=large_project).count() == 3
+
+
+@pytest.mark.django_db
+class TestProjectPurge:
+    """Tests for batched purge of deleted projects"""
+
+    def test_purge_project_deletes_all_rows(self, large_project):
+        """Success: Every row of the project is deleted in batches, progress is reported"""
+        other_issue = IssueFactory(project=ProjectFactory(author=UserFactory()))
+        reports = []
+
+        deleted = purge_project(large_project.pk, batch_size=2, progress=lambda step, count: reports.append(step))
+
+        assert deleted == {
+            "comments": 6,
+            "archived comments": 0,
+            "issues": 3,
+            "archived issues": 0,
+            "contributors": 3,
+        }
+        # 6 comments by batch of 2: 3 reports
+        assert reports.count("comments") == 3
+        assert not Project.all_objects.filter(pk=large_project.pk).exists()
+        assert not Contributor.objects.filter(project_id=large_project.pk).exists()
+        assert not Comment.objects.filter(issue__project_id=large_project.pk).exists()
+        assert Issue.objects.filter(pk=other_issue.pk).exists()
+
+    def test_purge_command_only_purges_deleted_projects(self, large_project):
+        """Success: The command purges projects marked as deleted only"""
+        kept_project = ProjectFactory(author=large_project.author)
+        mark_project_deleted(large_project)
+
+        call_command("purge_deleted_projects", batch_size=5)
+
+        assert not Project.all_objects.filter(pk=large_project.pk).exists()
+        assert Project.objects.filter(pk=kept_project.pk).exists()
+
+    def test_purge_job_purges_deleted_project(self, large_project):
+        """Success: Marking a project as deleted queues its purge, run by the job worker"""
+        mark_project_deleted(large_project)
+
+        call_command("run_jobs", once=True)
+
+        assert not Project.all_objects.filter(pk=large_project.pk).exists()
+        assert not Issue.objects.filter(project_id=large_project.pk).exists()
+        # progress of the purge is saved on its job as it goes
+        job = Job.objects.get(name="project.purge")
+        assert job.progress == {"comments": 6, "issues": 3, "contributors": 3}
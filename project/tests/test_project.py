@@ -1,9 +1,12 @@
 import pytest
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
-from config.factories import ProjectFactory, UserFactory, fake
+from config.factories import ProjectFactory, UserFactory, create_users, fake
+from project.contributors import attach_contributor_ids
 from project.models import Project
 
 
@@ -205,3 +208,128 @@ class TestProjectDelete:
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
         assert Project.objects.filter(pk=project.pk).exists()
+
+
+# ==================== Contributor ids Tests ====================
+
+
+@pytest.mark.django_db
+class TestProjectContributors:
+    """Tests for the contributor ids and count of project payloads"""
+
+    @pytest.fixture
+    def large_project(self, authenticated_client):
+        return ProjectFactory(author=authenticated_client.user, contributors=create_users(4))
+
+    def test_ids_without_users(self, large_project):
+        """Success: ids and count of several projects come from one query on the contributor table"""
+        projects = [large_project, ProjectFactory(author=UserFactory()), ProjectFactory(author=UserFactory())]
+
+        with CaptureQueriesContext(connection) as queries:
+            attach_contributor_ids(projects)
+
+        assert len(queries) == 1
+        assert '"user_user"' not in queries[0]["sql"]
+        expected = sorted(large_project.contributors.values_list("id", flat=True))
+        assert large_project.contributor_ids == expected
+        assert large_project.contributors_count == 5
+        assert [project.contributors_count for project in projects[1:]] == [1, 1]
+
+    def test_limit(self, large_project):
+        """Success: a limit keeps the first ids of each project, counts stay totals"""
+        other = ProjectFactory(author=UserFactory(), contributors=create_users(2))
+
+        attach_contributor_ids([large_project, other], limit=2)
+
+        expected = sorted(large_project.contributors.values_list("id", flat=True))[:2]
+        assert large_project.contributor_ids == expected
+        assert (large_project.contributors_count, other.contributors_count) == (5, 3)
+        assert len(other.contributor_ids) == 2
+
+    def test_list_contributors_limit_success(self, authenticated_client, large_project):
+        """Success: ?contributors_limit=0 returns counts only"""
+        url = reverse(f"{base_project_url}project-list")
+
+        full = authenticated_client.get(url).json()["results"][0]
+        counted = authenticated_client.get(url, {"contributors_limit": 0}).json()["results"][0]
+
+        assert len(full["contributors"]) == full["contributorsCount"] == 5
+        assert counted["contributors"] == []
+        assert counted["contributorsCount"] == 5
+
+    def test_retrieve_setting_cap_success(self, authenticated_client, large_project, settings):
+        """Success: PROJECT_CONTRIBUTORS_LIMIT caps the ids, a greater requested limit cannot exceed it"""
+        settings.PROJECT_CONTRIBUTORS_LIMIT = 3
+        url = reverse(f"{base_project_url}project-detail", kwargs={"project_id": large_project.pk})
+
+        response = authenticated_client.get(url, {"contributors_limit": 10})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["contributors"]) == 3
+        assert response.json()["contributorsCount"] == 5
+
+    def test_invalid_contributors_limit_failure(self, authenticated_client, large_project):
+        """Failure: the limit must be a positive integer or 0"""
+        url = reverse(f"{base_project_url}project-list")
+
+        response = authenticated_client.get(url, {"contributors_limit": "-1"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "contributors_limit" in response.data
+
+
+# ==================== Query budget Tests ====================
+
+
+@pytest.mark.django_db
+class TestProjectQueryBudgets:
+    """Tests for the query budgets of project actions, as projects and contributors grow"""
+
+    def project_data(self):
+        return {"name": fake.catch_phrase(), "description": fake.text(max_nb_chars=200), "type": "backend"}
+
+    def test_list_success(self, authenticated_client, assert_query_budget):
+        """Success: listing projects runs as many queries for 1 or 20 projects"""
+        user = authenticated_client.user
+
+        def grow(rows):
+            for _ in range(rows - Project.objects.filter(author=user).count()):
+                ProjectFactory(author=user, contributors=create_users(1))
+
+        assert_query_budget(lambda: authenticated_client.get(reverse(f"{base_project_url}project-list")), grow)
+
+    def test_create_success(self, authenticated_client, assert_query_budget):
+        """Success: creating a project does not depend on the projects of the user"""
+        user = authenticated_client.user
+        url = reverse(f"{base_project_url}project-list")
+
+        def grow(rows):
+            for _ in range(rows - Project.objects.filter(author=user).count()):
+                ProjectFactory(author=user)
+
+        assert_query_budget(lambda: authenticated_client.post(url, self.project_data(), format="json"), grow)
+
+    @pytest.mark.parametrize("method", ["get", "put", "patch"])
+    def test_detail_success(self, authenticated_client, create_project, assert_query_budget, method):
+        """Success: reading and updating a project runs as many queries for 1 or 20 contributors"""
+        url = reverse(f"{base_project_url}project-detail", kwargs={"project_id": create_project.pk})
+
+        def grow(rows):
+            create_project.contributors.add(*create_users(rows - create_project.contributors.count()))
+
+        data = None if method == "get" else self.project_data()
+        assert_query_budget(lambda: getattr(authenticated_client, method)(url, data, format="json"), grow)
+
+    def test_delete_success(self, authenticated_client, assert_query_budget):
+        """Success: deleting a project runs as many queries for 1 or 20 contributors (rows are purged in background)"""
+        projects = []
+
+        def grow(rows):
+            projects.append(ProjectFactory(author=authenticated_client.user, contributors=create_users(rows)))
+
+        assert_query_budget(
+            lambda: authenticated_client.delete(
+                reverse(f"{base_project_url}project-detail", kwargs={"project_id": projects[-1].pk})
+            ),
+            grow,
+        )
@@ -0,0 +1,166 @@
+import pytest
+
+from django.urls import reverse
+from rest_framework import status
+
+from config.factories import IssueFactory, ProjectFactory, UserFactory
+from project.models import Contributor, Project
+from project.roles import ROLE_PERMISSIONS, Permission
+
+
+@pytest.fixture
+def join(authenticated_client):
+    """Return a function making the authenticated user a contributor of a new project, with the given role"""
+
+    def join(role):
+        project = ProjectFactory(author=UserFactory())
+        project.contributors.add(authenticated_client.user, through_defaults={"role": role})
+        return project
+
+    return join
+
+
+# ==================== Permissions Tests ====================
+
+
+@pytest.mark.django_db
+class TestProjectPermissions:
+    """Tests for the permission bitmasks of project members"""
+
+    def test_roles(self, authenticated_client, join):
+        """Success: contributors get the permissions of their role, the author those of owners"""
+        user = authenticated_client.user
+        reader_project = join(Contributor.Role.reader)
+        authored = ProjectFactory(author=user)
+
+        assert reader_project.permissions(user) == Permission.VIEW
+        assert authored.permissions(user) == ROLE_PERMISSIONS[Contributor.Role.owner]
+        assert authored.permissions(user) & Permission.MANAGE_PROJECT
+
+    def test_non_member(self, authenticated_client):
+        """Failure: users who are not contributors have no permission"""
+        project = ProjectFactory(author=UserFactory())
+
+        assert project.permissions(authenticated_client.user) == Permission(0)
+
+    def test_loaded_with_project(self, authenticated_client, join, django_assert_num_queries):
+        """Success: with_role_of() loads the role with the project, checks then run no query"""
+        user = authenticated_client.user
+        project_id = join(Contributor.Role.maintainer).pk
+
+        with django_assert_num_queries(1):
+            project = Project.objects.with_role_of(user).get(pk=project_id)
+            permissions = project.permissions(user)
+
+        assert permissions & Permission.MANAGE_CONTRIBUTORS
+        assert not permissions & Permission.MANAGE_PROJECT
+
+    def test_created_project_owner(self, authenticated_client):
+        """Success: the creator of a project is its owner contributor"""
+        data = {"name": "Roles", "description": "", "type": "backend"}
+
+        response = authenticated_client.post(reverse("project:project-list"), data, format="json")
+
+        contributor = Contributor.objects.get(project_id=response.data["id"])
+        assert contributor.user == authenticated_client.user
+        assert contributor.role == Contributor.Role.owner
+
+
+# ==================== Role access Tests ====================
+
+
+@pytest.mark.django_db
+class TestRoleAccess:
+    """Tests for what each role allows through the API"""
+
+    def test_reader_read_only(self, authenticated_client, join):
+        """Failure: readers can list issues, not create them"""
+        project = join(Contributor.Role.reader)
+        IssueFactory(project=project, author=project.author)
+        issues_url = reverse("issue:issue-list", kwargs={"project_id": project.pk})
+
+        list_response = authenticated_client.get(issues_url)
+        create_response = authenticated_client.post(issues_url, {"title": "Bug", "content": "x"}, format="json")
+
+        assert list_response.status_code == status.HTTP_200_OK
+        assert create_response.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.parametrize("role", [Contributor.Role.member, Contributor.Role.reader])
+    def test_member_cannot_read_project_or_contributor(self, authenticated_client, join, role):
+        """Failure: as before roles, members list the project and its contributors but do not read them one by one"""
+        project = join(role)
+        owner = Contributor.objects.get(project=project, user=project.author)
+        contributor_url = reverse(
+            "project:contributor-detail", kwargs={"project_id": project.pk, "contributor_id": owner.pk}
+        )
+
+        project_response = authenticated_client.get(
+            reverse("project:project-detail", kwargs={"project_id": project.pk})
+        )
+        contributor_response = authenticated_client.get(contributor_url)
+        list_response = authenticated_client.get(reverse("project:contributor-list", kwargs={"project_id": project.pk}))
+
+        assert project_response.status_code == status.HTTP_403_FORBIDDEN
+        assert contributor_response.status_code == status.HTTP_403_FORBIDDEN
+        assert list_response.status_code == status.HTTP_200_OK
+
+    def test_member_cannot_update_project(self, authenticated_client, join):
+        """Failure: only owners update a project"""
+        project = join(Contributor.Role.member)
+        url = reverse("project:project-detail", kwargs={"project_id": project.pk})
+
+        response = authenticated_client.patch(url, {"name": "Renamed"}, format="json")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_owner_contributor_updates_project(self, authenticated_client, join):
+        """Success: owners who are not the author update the project"""
+        project = join(Contributor.Role.owner)
+        url = reverse("project:project-detail", kwargs={"project_id": project.pk})
+
+        response = authenticated_client.patch(url, {"name": "Renamed"}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_maintainer_manages_contributors(self, authenticated_client, join):
+        """Success: maintainers add contributors with a role"""
+        project = join(Contributor.Role.maintainer)
+        url = reverse("project:contributor-list", kwargs={"project_id": project.pk})
+
+        response = authenticated_client.post(url, {"user_id": UserFactory().pk, "role": "reader"}, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["role"] == Contributor.Role.reader
+
+    def test_maintainer_cannot_grant_owner(self, authenticated_client, join):
+        """Failure: only owners grant the owner role"""
+        project = join(Contributor.Role.maintainer)
+        url = reverse("project:contributor-list", kwargs={"project_id": project.pk})
+
+        response = authenticated_client.post(url, {"user_id": UserFactory().pk, "role": "owner"}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_maintainer_cannot_remove_owner(self, authenticated_client, join):
+        """Failure: owners are only removed by owners"""
+        project = join(Contributor.Role.maintainer)
+        owner = Contributor.objects.get(project=project, user=project.author)
+        url = reverse("project:contributor-detail", kwargs={"project_id": project.pk, "contributor_id": owner.pk})
+
+        response = authenticated_client.delete(url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert Contributor.objects.filter(pk=owner.pk).exists()
+
+    def test_maintainer_cannot_change_contributor_user(self, authenticated_client, join):
+        """Failure: updating a contributor changes its role, never its user"""
+        project = join(Contributor.Role.maintainer)
+        user = UserFactory()
+        contributor = Contributor.objects.create(project=project, user=user, role=Contributor.Role.member)
+        url = reverse("project:contributor-detail", kwargs={"project_id": project.pk, "contributor_id": contributor.pk})
+
+        response = authenticated_client.patch(url, {"user_id": UserFactory().pk, "role": "reader"}, format="json")
+
+        contributor.refresh_from_db()
+        assert response.status_code == status.HTTP_200_OK
+        assert (contributor.user_id, contributor.role) == (user.pk, Contributor.Role.reader)
@@ -1,54 +1,23 @@
 from django.db.models import Q
-from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
 
-from config.docs import DocsTypingParameters
 from config.global_permissions import IsObjectAuthor
-from config.mixins import ProjectMixin
+from config.mixins import CSVExportMixin, ProjectMixin
 from project.models import Contributor, Project
 
+from .deletion import mark_project_deleted
 from .permissions import WriteContributor
 from .serializers import ContributorSerializer, ProjectCreateSerializer, ProjectSerializer, ProjectUpdateSerializer
 
 
-@extend_schema_view(
-    list=extend_schema(
-        summary="Get all Projects",
-        tags=["Project"],
-    ),
-    retrieve=extend_schema(
-        summary="Get a Project",
-        tags=["Project"],
-        parameters=[DocsTypingParameters.project_id.value],
-    ),
-    create=extend_schema(
-        summary="Create a Project",
-        tags=["Project"],
-        request=ProjectCreateSerializer,
-    ),
-    update=extend_schema(
-        summary="Update entirely a Project",
-        tags=["Project"],
-        parameters=[DocsTypingParameters.project_id.value],
-        request=ProjectUpdateSerializer,
-    ),
-    partial_update=extend_schema(
-        summary="Update one or many Project's fields",
-        tags=["Project"],
-        parameters=[DocsTypingParameters.project_id.value],
-        request=ProjectUpdateSerializer,
-    ),
-    destroy=extend_schema(
-        summary="Delete Project",
-        tags=["Project"],
-        parameters=[DocsTypingParameters.project_id.value],
-    ),
-)
 class ProjectModelViewSet(ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated, IsObjectAuthor]
     lookup_url_kwarg = "project_id"
+    # max queries per action, whatever the number of rows (cf. config.query_budget)
+    # update: validation of the author, for ownership transfers
+    query_budgets = {"list": 4, "create": 6, "retrieve": 3, "update": 6, "partial_update": 6, "destroy": 5}
 
     def get_serializer_class(self):
         if self.action == "create":
@@ -62,61 +31,22 @@ class ProjectModelViewSet(ModelViewSet):
         user = self.request.user
         return (
             Project.objects.select_related("author")
-            .prefetch_related("contributors")
+            .with_role_of(user)
             .filter(Q(contributors=user) | Q(author=user))
             .distinct()
         )
 
+    def perform_destroy(self, instance: Project):
+        # Project.delete() would load every issue, comment and contributor in memory in one transaction:
+        # the project is hidden at once, its rows are purged in batches by purge_deleted_projects command
+        mark_project_deleted(instance)
 
-@extend_schema_view(
-    list=extend_schema(
-        summary="Get all contributors of a Project",
-        tags=["Project-Contributor"],
-    ),
-    retrieve=extend_schema(
-        summary="Get a Project",
-        tags=["Project-Contributor"],
-        parameters=[
-            DocsTypingParameters.contributor_id.value,
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-    create=extend_schema(
-        summary="Create a Project",
-        tags=["Project-Contributor"],
-        parameters=[
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-    update=extend_schema(
-        summary="Update entirely a Project",
-        tags=["Project-Contributor"],
-        parameters=[
-            DocsTypingParameters.contributor_id.value,
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-    partial_update=extend_schema(
-        summary="Update one or many Project's fields",
-        tags=["Project-Contributor"],
-        parameters=[
-            DocsTypingParameters.contributor_id.value,
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-    destroy=extend_schema(
-        summary="Delete Project",
-        tags=["Project-Contributor"],
-        parameters=[
-            DocsTypingParameters.contributor_id.value,
-            DocsTypingParameters.project_id.value,
-        ],
-    ),
-)
-class ContributorModelViewSet(ProjectMixin, ModelViewSet):
+
+class ContributorModelViewSet(ProjectMixin, CSVExportMixin, ModelViewSet):
     serializer_class = ContributorSerializer
     permission_classes = [IsAuthenticated, WriteContributor]
     lookup_url_kwarg = "contributor_id"
+    query_budgets = {"list": 4, "create": 5, "retrieve": 3, "update": 5, "partial_update": 5, "destroy": 5}
 
     def get_queryset(self):
         user = self.request.user
@@ -0,0 +1,144 @@
+import logging
+
+from collections.abc import Callable
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from activity.models import ProjectEvent
+from config.db_utils import raw_delete
+from export.artifacts import expire_exports
+from export.models import Export
+from issue.models import ArchivedComment, ArchivedIssue, Comment, Issue
+from issue.serializers import CommentSerializer, IssueSerializer
+from job.queue import enqueue
+from project.deletion import purge_project
+from project.models import Contributor, Project
+
+from .export import user_project_ids
+from .models import AccountDeletion, User
+
+
+logger = logging.getLogger(__name__)
+
+# rows kept to preserve history, their author is set to NULL
+AUTHORED_MODELS = {
+    "issues": Issue,
+    "comments": Comment,
+    "archived issues": ArchivedIssue,
+    "archived comments": ArchivedComment,
+}
+
+
+def anonymized_events(model, ids: list[int]) -> list[ProjectEvent]:
+    """
+    Events recorded by activity.signals if authors were nulled with save(): SSE clients and export versions follow
+    the change. Archived rows have no event (cf. project_data_version).
+    """
+    if model is Issue:
+        return [
+            ProjectEvent(project_id=data["project"], kind="issue.updated", object_id=data["id"], data=data)
+            for data in IssueSerializer(Issue.objects.filter(pk__in=ids).order_by("pk"), many=True).data
+        ]
+    if model is Comment:
+        comments = Comment.objects.filter(pk__in=ids).annotate(project_id=F("issue__project_id")).order_by("pk")
+        return [
+            ProjectEvent(
+                project_id=comment.project_id,
+                kind="comment.updated",
+                object_id=comment.pk,
+                data={"id": comment.pk, "issue": comment.issue_id, **CommentSerializer(comment).data},
+            )
+            for comment in comments
+        ]
+    return []
+
+
+def delete_user_account(
+    user_id: int, batch_size: int = 1000, progress: Callable[[str, int], None] | None = None
+) -> dict[str, int]:
+    """
+    Delete a user account, keeping the history of what they wrote.
+
+    User.delete() would load every issue and comment ever written by the user to apply SET_NULL row by row:
+    authors are nulled here with chunked set-based UPDATEs and memberships removed with a single DELETE, so the final
+    delete() has nothing left to collect. The events signals would have recorded are bulk inserted with each change.
+    Return the number of rows processed per step.
+    """
+    processed = {}
+    # built exports would keep serving the user's data: projects are listed before memberships are removed
+    project_ids = user_project_ids(user_id)
+
+    for step, model in AUTHORED_MODELS.items():
+        processed[step] = 0
+        queryset = model.objects.filter(author_id=user_id)
+        while ids := list(queryset.order_by("pk").values_list("pk", flat=True)[:batch_size]):
+            with transaction.atomic():
+                processed[step] += model.objects.filter(pk__in=ids).update(author=None)
+                ProjectEvent.objects.bulk_create(anonymized_events(model, ids))
+            if progress:
+                progress(step, processed[step])
+
+    memberships = Contributor.objects.filter(user_id=user_id)
+    with transaction.atomic():
+        # as record_contributor_delete: members lose access, SSE streams of the user are closed
+        ProjectEvent.objects.bulk_create(
+            ProjectEvent(project_id=project_id, kind="contributor.deleted", object_id=user_id, data={"user": user_id})
+            for project_id in memberships.values_list("project_id", flat=True)
+        )
+        processed["memberships"] = raw_delete(memberships)
+    if progress:
+        progress("memberships", processed["memberships"])
+
+    # projects deleted but not purged yet still reference their author (PROTECT)
+    for project_id in Project.all_objects.filter(author_id=user_id, deleted_at__isnull=False).values_list(
+        "pk", flat=True
+    ):
+        purge_project(project_id, batch_size)
+
+    User.objects.filter(pk=user_id).delete()
+    expire_exports(Export.Kind.project, project_ids)
+    expire_exports(Export.Kind.gdpr, [user_id])
+    logger.info("User %s deleted: %s", user_id, processed)
+    return processed
+
+
+def request_account_deletion(user: User) -> AccountDeletion:
+    """Deactivate an account at once (no more login nor token use) and schedule its deletion (cf. user.jobs)"""
+    User.objects.filter(pk=user.pk).update(is_active=False)
+    deletion = AccountDeletion.objects.create(user_id=user.pk)
+    # personal data removal is a legal obligation: before purges and maintenance jobs
+    enqueue("user.delete_account", {"deletion_id": str(deletion.pk)}, priority=10)
+    return deletion
+
+
+def run_account_deletion(deletion: AccountDeletion, batch_size: int = 1000):
+    """Run a scheduled account deletion, saving its progress as it goes"""
+    deletion.status = AccountDeletion.Status.running
+    deletion.save(update_fields=["status"])
+
+    def save_progress(step, count):
+        deletion.progress[step] = count
+        deletion.save(update_fields=["progress"])
+
+    try:
+        delete_user_account(deletion.user_id, batch_size, progress=save_progress)
+    except Exception as error:
+        logger.exception("Deletion of user %s failed", deletion.user_id)
+        deletion.status = AccountDeletion.Status.failed
+        deletion.error = str(error)
+    else:
+        deletion.status = AccountDeletion.Status.done
+    deletion.finished_at = timezone.now()
+    deletion.save(update_fields=["status", "error", "finished_at"])
+
+
+def run_pending_account_deletions(batch_size: int = 1000) -> int:
+    """Run every pending account deletion, return how many were run"""
+    pending = AccountDeletion.objects.filter(status=AccountDeletion.Status.pending).order_by("created_at")
+    count = 0
+    for deletion in pending:
+        run_account_deletion(deletion, batch_size)
+        count += 1
+    return count
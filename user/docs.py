@@ -0,0 +1,103 @@
+"""OpenAPI docs of user views, applied by config.docs.load_docs() when the schema is first requested"""
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    OpenApiExample,
+    OpenApiParameter,
+    OpenApiResponse,
+    extend_schema,
+    extend_schema_view,
+)
+
+from config.docs import DocsTypingParameters
+
+from .serializers import AccountDeletionSerializer
+from .views import AccountDeletionStatusView, GDPRExportView, SignupView, UserProfileView
+
+
+extend_schema(summary="Create a user account", tags=["User"])(SignupView)
+
+extend_schema_view(
+    get=extend_schema(
+        summary="Get user profile",
+        tags=["User"],
+        parameters=[
+            DocsTypingParameters.user_id.value,
+        ],
+    ),
+    put=extend_schema(
+        summary="Update entirely user's profile",
+        tags=["User"],
+        parameters=[
+            DocsTypingParameters.user_id.value,
+        ],
+    ),
+    patch=extend_schema(
+        summary="Update one or many user's profile fields",
+        tags=["User"],
+        parameters=[
+            DocsTypingParameters.user_id.value,
+        ],
+    ),
+    delete=extend_schema(
+        summary="Delete user's account",
+        tags=["User"],
+        parameters=[
+            DocsTypingParameters.user_id.value,
+            OpenApiParameter(
+                name="background",
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                description="Deactivate the account at once and delete it in background",
+            ),
+        ],
+        responses={204: None, 202: AccountDeletionSerializer},
+    ),
+)(UserProfileView)
+
+extend_schema(summary="Get the status of an account deletion", tags=["User"])(AccountDeletionStatusView)
+
+extend_schema(
+    summary="Export user's personal data (GDPR)",
+    description="Returns all personal data associated with the user account as a multi-section CSV: profile, "
+    "projects, memberships, issues and comments (archived ones included). Each section starts with a `[section]` "
+    "line and a header line, and ends with an empty line. "
+    "<br>Returns a `200` response code on success."
+    "<br>Raises a `403` error code if the user is not authenticated."
+    "<br>Raises a `403` error code if the user tries to access another user's data."
+    "<br>"
+    "<br>**Authentification required**: Yes"
+    "<br>**Permissions required**: `IsAuthenticated`, `IsUserSelf`",
+    tags=["User"],
+    responses={
+        200: OpenApiResponse(
+            response=OpenApiTypes.BINARY,
+            description="CSV file containing user's personal data",
+            examples=[
+                OpenApiExample(
+                    name="GDPR CSV Export",
+                    value="[user]\n"
+                    "username,email,date_of_birth,consent,age,id,first_name,last_name,date_joined,last_login\n"
+                    "john_doe,john@example.com,1990-01-15,True,36,1,John,Doe,2024-01-01T10:00:00Z,2026-01-09T08:00:00Z\n"
+                    "\n"
+                    "[projects]\n"
+                    "id,name,description,type,created_at\n"
+                    "3,SoftDesk,Project management API,backend,2024-02-01T09:00:00+00:00\n"
+                    "\n"
+                    "[memberships]\n"
+                    "project_id,project_name\n"
+                    "3,SoftDesk\n"
+                    "\n"
+                    "[issues]\n"
+                    "id,project_id,title,content,status,priority,tags,created_at,closed_at,archived\n"
+                    "12,3,Login fails,,todo,high,bug,2024-02-02T10:00:00+00:00,,False\n"
+                    "\n"
+                    "[comments]\n"
+                    "id,issue_id,title,content,created_at,archived\n"
+                    "40,12,Reproduced,On Firefox,2024-02-03T11:00:00+00:00,False\n",
+                    media_type="text/csv",
+                )
+            ],
+        )
+    },
+)(GDPRExportView)
@@ -0,0 +1,76 @@
+from collections.abc import Iterator
+
+from django.db.models import Max
+
+from activity.models import ProjectEvent
+from config.exports import Section, chain_archived, data_version, stream_sections, values
+from issue.models import ArchivedComment, ArchivedIssue, Comment, Issue
+from project.models import Contributor, Project
+
+from .models import User
+from .serializers import GDPRExportSerializer
+
+
+PROJECT_FIELDS = ["id", "name", "description", "type", "created_at"]
+MEMBERSHIP_FIELDS = ["project_id", "project__name"]
+ISSUE_FIELDS = ["id", "project_id", "title", "content", "status", "priority", "tags", "created_at", "closed_at"]
+COMMENT_FIELDS = ["id", "issue_id", "title", "content", "created_at"]
+
+
+def gdpr_export_sections(user: User) -> Iterator[Section]:
+    """(section name, header, rows) of every piece of personal data of a user"""
+    user_data = GDPRExportSerializer(user).data
+    yield "user", list(user_data.keys()), iter([list(user_data.values())])
+    yield "projects", PROJECT_FIELDS, values(Project.objects.filter(author=user), PROJECT_FIELDS)
+    yield (
+        "memberships",
+        ["project_id", "project_name"],
+        values(Contributor.objects.filter(user=user), MEMBERSHIP_FIELDS),
+    )
+    yield (
+        "issues",
+        [*ISSUE_FIELDS, "archived"],
+        chain_archived(Issue.objects.filter(author=user), ArchivedIssue.objects.filter(author=user), ISSUE_FIELDS),
+    )
+    yield (
+        "comments",
+        [*COMMENT_FIELDS, "archived"],
+        chain_archived(
+            Comment.objects.filter(author=user), ArchivedComment.objects.filter(author=user), COMMENT_FIELDS
+        ),
+    )
+
+
+def stream_gdpr_export(user: User) -> Iterator[str]:
+    """Multi-section CSV of a user's data (cf. config.exports.stream_sections)"""
+    return stream_sections(gdpr_export_sections(user))
+
+
+def user_project_ids(user_id: int) -> set[int]:
+    """Projects a user is a contributor of, or wrote issues or comments in"""
+    project_ids = set(Contributor.objects.filter(user_id=user_id).values_list("project_id", flat=True))
+    project_ids.update(Issue.objects.filter(author_id=user_id).values_list("project_id", flat=True).distinct())
+    project_ids.update(Comment.objects.filter(author_id=user_id).values_list("issue__project_id", flat=True).distinct())
+    return project_ids
+
+
+def gdpr_data_version(user: User) -> str:
+    """
+    Changes whenever the GDPR export of the user would change, at the cost of a few indexed queries.
+
+    Issues and comments are covered by the last event of every project they belong to (cf. activity app), plus
+    row counts for changes without events (archiving). Profile, projects and memberships are small: hashed as is.
+    """
+    project_ids = user_project_ids(user.pk)
+    last_event = ProjectEvent.objects.filter(project_id__in=project_ids).aggregate(last=Max("id"))["last"]
+    return data_version(
+        GDPRExportSerializer(user).data,
+        list(values(Project.objects.filter(author=user), PROJECT_FIELDS)),
+        list(values(Contributor.objects.filter(user=user), MEMBERSHIP_FIELDS)),
+        sorted(project_ids),
+        last_event,
+        [
+            queryset.filter(author=user).count()
+            for queryset in (Issue.objects, Comment.objects, ArchivedIssue.objects, ArchivedComment.objects)
+        ],
+    )
@@ -0,0 +1,15 @@
+from job.queue import task
+
+from .deletion import run_account_deletion
+from .models import AccountDeletion
+
+
+# run_account_deletion records failures on the AccountDeletion itself: no automatic retry
+@task("user.delete_account", max_attempts=1)
+def delete_account(deletion_id: str, batch_size: int = 1000):
+    deletion = AccountDeletion.objects.filter(pk=deletion_id, status=AccountDeletion.Status.pending).first()
+    # already run, e.g. by the process_account_deletions command
+    if deletion is None:
+        return None
+    run_account_deletion(deletion, batch_size)
+    return deletion.progress
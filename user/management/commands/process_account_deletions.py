@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from user.deletion import run_pending_account_deletions
+
+
+class Command(BaseCommand):
+    help = "Run account deletions requested with DELETE /api/user/profile/{user_id}/?background=true"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of rows updated per statement")
+
+    def handle(self, *args, **options):
+        count = run_pending_account_deletions(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{count} account deletions processed"))
@@ -1,3 +1,5 @@
+import uuid
+
 from datetime import date, datetime
 
 from django.contrib.auth.models import AbstractUser
@@ -21,3 +23,24 @@ class User(AbstractUser):
                 (today.month, today.day) < (date_of_birth.month, date_of_birth.day)
             )
         )
+
+
+class AccountDeletion(models.Model):
+    """Tracks an account deletion run in background (cf. user.deletion)"""
+
+    class Status(models.TextChoices):
+        pending = "pending", "Pending"
+        running = "running", "Running"
+        done = "done", "Done"
+        failed = "failed", "Failed"
+
+    # random id: the status URL is readable without authentication, as the account does not exist anymore once done
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # not a ForeignKey: the user row is deleted at the end
+    user_id = models.BigIntegerField()
+    status = models.CharField(choices=Status, default=Status.pending)
+    # number of rows processed per step
+    progress = models.JSONField(default=dict)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
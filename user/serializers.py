@@ -2,7 +2,7 @@ from datetime import date, datetime
 
 from rest_framework import serializers
 
-from .models import User
+from .models import AccountDeletion, User
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -92,3 +92,12 @@ class GDPRExportSerializer(UserSerializer):
             "date_joined",
             "last_login",
         ]
+
+
+class AccountDeletionSerializer(serializers.ModelSerializer):
+    """Serializer for the status of an account deletion run in background"""
+
+    class Meta:
+        model = AccountDeletion
+        fields = ["id", "status", "progress", "error", "created_at", "finished_at"]
+        read_only_fields = fields
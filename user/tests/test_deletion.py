@@ -0,0 +1,102 @@
+import pytest
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from activity.models import ProjectEvent
+from config.factories import CommentFactory, IssueFactory, ProjectFactory, UserFactory
+from issue.models import Comment, Issue
+from project.models import Contributor
+
+from ..deletion import delete_user_account
+from ..models import AccountDeletion, User
+
+
+base_user_url = "user:"
+
+
+@pytest.fixture
+def prolific_user():
+    """Create a user contributing to a project, author of issues and comments"""
+    user = UserFactory()
+    project = ProjectFactory(author=UserFactory(), contributors=[user])
+    for issue in IssueFactory.create_batch(3, project=project, author=user):
+        CommentFactory.create_batch(2, issue=issue, author=user)
+    return user
+
+
+# ==================== Account deletion Tests ====================
+
+
+@pytest.mark.django_db
+class TestDeleteUserAccount:
+    """Tests for batched account deletion"""
+
+    def test_history_is_kept_without_author(self, prolific_user):
+        """Success: Issues and comments are kept with a NULL author, memberships are removed"""
+        processed = delete_user_account(prolific_user.pk, batch_size=2)
+
+        assert processed["issues"] == 3
+        assert processed["comments"] == 6
+        assert processed["memberships"] == 1
+        assert not User.objects.filter(pk=prolific_user.pk).exists()
+        assert Issue.objects.filter(author__isnull=True).count() == 3
+        assert Comment.objects.filter(author__isnull=True).count() == 6
+        assert not Contributor.objects.filter(user_id=prolific_user.pk).exists()
+
+    def test_events_recorded(self, prolific_user):
+        """Success: anonymized issues and comments, and removed memberships, are recorded as project events"""
+        ProjectEvent.objects.all().delete()
+
+        delete_user_account(prolific_user.pk, batch_size=2)
+
+        events = ProjectEvent.objects.all()
+        assert events.filter(kind="issue.updated", data__author=None).count() == 3
+        assert events.filter(kind="comment.updated", data__author=None).count() == 6
+        assert events.filter(kind="contributor.deleted", object_id=prolific_user.pk).count() == 1
+        assert set(events.values_list("project_id", flat=True)) == {Contributor.objects.get().project_id}
+
+
+@pytest.mark.django_db
+class TestBackgroundAccountDeletion:
+    """Tests for DELETE /api/user/profile/{user_id}/?background=true"""
+
+    def test_background_deletion_success(self, authenticated_client):
+        """Success: Account is deactivated at once, deleted by the background command"""
+        user = authenticated_client.user
+        url = reverse(f"{base_user_url}profile", kwargs={"user_id": user.pk})
+
+        response = authenticated_client.delete(f"{url}?background=true")
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data["status"] == AccountDeletion.Status.pending
+        user.refresh_from_db()
+        assert not user.is_active
+
+        call_command("process_account_deletions")
+
+        status_response = authenticated_client.get(response["Location"])
+        assert status_response.status_code == status.HTTP_200_OK
+        assert status_response.data["status"] == AccountDeletion.Status.done
+        assert not User.objects.filter(pk=user.pk).exists()
+
+    def test_background_deletion_by_job_worker_success(self, authenticated_client):
+        """Success: The deletion is queued as a job, run by the job worker"""
+        user = authenticated_client.user
+        url = reverse(f"{base_user_url}profile", kwargs={"user_id": user.pk})
+
+        authenticated_client.delete(f"{url}?background=true")
+        call_command("run_jobs", once=True)
+
+        assert AccountDeletion.objects.get(user_id=user.pk).status == AccountDeletion.Status.done
+        assert not User.objects.filter(pk=user.pk).exists()
+
+    def test_background_deletion_project_author_failure(self, authenticated_client, create_project):
+        """Failure: Cannot delete an account still author of active projects"""
+        url = reverse(f"{base_user_url}profile", kwargs={"user_id": authenticated_client.user.pk})
+
+        response = authenticated_client.delete(f"{url}?background=true")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not AccountDeletion.objects.exists()
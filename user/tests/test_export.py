@@ -0,0 +1,95 @@
+import csv
+import warnings
+
+import pytest
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+
+from config import exports
+from config.factories import CommentFactory, IssueFactory, ProjectFactory, UserFactory
+from issue.archive import archive_issues
+from issue.models import Issue
+
+
+base_user_url = "user:"
+
+
+def read_sections(response) -> dict[str, list[list[str]]]:
+    """Rows of each section (header included) of a multi-section CSV export"""
+    sections = {}
+    rows = []
+    for row in csv.reader(b"".join(response.streaming_content).decode("utf-8").splitlines()):
+        if len(row) == 1 and row[0].startswith("["):
+            rows = sections[row[0].strip("[]")] = []
+        elif row:
+            rows.append(row)
+    return sections
+
+
+@pytest.mark.django_db
+class TestGDPRExport:
+    """Tests for the complete GDPR export (GET /api/user/profile/{user_id}/export-data/)"""
+
+    def test_export_contains_all_user_data(self, authenticated_client):
+        """Success: profile, projects, memberships, issues and comments, archived ones included, are exported"""
+        user = authenticated_client.user
+        own_project = ProjectFactory(author=user, contributors=[user])
+        other_project = ProjectFactory(author=UserFactory(), contributors=[user])
+        issue = IssueFactory(project=other_project, author=user, status=Issue.Status.todo)
+        CommentFactory.create_batch(2, issue=issue, author=user)
+        archived_issue = IssueFactory(project=other_project, author=user, status=Issue.Status.closed)
+        CommentFactory(issue=archived_issue, author=user)
+        archive_issues([archived_issue.pk])
+        # not user data
+        CommentFactory(issue=issue, author=UserFactory())
+
+        response = authenticated_client.get(reverse(f"{base_user_url}gdpr-export", kwargs={"user_id": user.pk}))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert "attachment" in response["Content-Disposition"]
+        sections = read_sections(response)
+        assert list(sections) == ["user", "projects", "memberships", "issues", "comments"]
+        assert sections["user"][1][0] == user.username
+        assert [row[0] for row in sections["projects"][1:]] == [str(own_project.pk)]
+        assert {row[0] for row in sections["memberships"][1:]} == {str(own_project.pk), str(other_project.pk)}
+        assert [(row[0], row[-1]) for row in sections["issues"][1:]] == [
+            (str(issue.pk), "False"),
+            (str(archived_issue.pk), "True"),
+        ]
+        assert [row[-1] for row in sections["comments"][1:]] == ["False", "False", "True"]
+
+    def test_rows_are_streamed_by_chunks(self, authenticated_client, monkeypatch):
+        """Success: rows are written in several chunks, not in one buffer"""
+        monkeypatch.setattr(exports, "EXPORT_CHUNK_SIZE", 3)
+        user = authenticated_client.user
+        IssueFactory.create_batch(10, project=ProjectFactory(author=user), author=user)
+
+        response = authenticated_client.get(reverse(f"{base_user_url}gdpr-export", kwargs={"user_id": user.pk}))
+
+        # 10 issue rows (plus their section and header lines) in chunks of 3 lines
+        assert len(list(response.streaming_content)) > 8
+
+    def test_export_is_streamed_under_asgi(self, authenticated_client):
+        """Success: under ASGI, rows are sent as they are read instead of being collected first"""
+        user = authenticated_client.user
+        IssueFactory.create_batch(3, project=ProjectFactory(author=user), author=user)
+        url = reverse(f"{base_user_url}gdpr-export", kwargs={"user_id": user.pk})
+
+        async def scenario():
+            response = await AsyncClient().get(
+                url, headers={"Authorization": f"Bearer {authenticated_client.access_token}"}
+            )
+            return response, [chunk async for chunk in response.streaming_content]
+
+        with warnings.catch_warnings():
+            # raised by Django when it consumes a sync iterator into a list
+            warnings.simplefilter("error")
+            response, chunks = async_to_sync(scenario)()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.is_async
+        assert b"[issues]" in b"".join(chunks)
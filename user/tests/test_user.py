@@ -4,10 +4,11 @@ import pytest
 
 from django.urls import reverse
 from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
 
-from config.factories import UserFactory, fake
+from config.factories import CommentFactory, IssueFactory, ProjectFactory, UserFactory, create_users, fake
 
-from ..models import User
+from ..models import AccountDeletion, User
 
 
 base_user_url = "user:"
@@ -233,7 +234,7 @@ class TestGDPRExportView:
         assert response.status_code == status.HTTP_200_OK
         assert response["Content-Type"].startswith("text/csv")
         # Verify CSV content contains user data
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         assert authenticated_client.user.username in content
         assert authenticated_client.user.email in content
 
@@ -245,3 +246,77 @@ class TestGDPRExportView:
         response = authenticated_client.get(url)
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+# ==================== Query budget Tests ====================
+
+
+@pytest.mark.django_db
+class TestUserQueryBudgets:
+    """Tests for the query budgets of user views, as the rows of the user grow"""
+
+    @pytest.fixture
+    def grow(self, authenticated_client):
+        """Issues and comments written by the user"""
+
+        def grow(rows):
+            user = authenticated_client.user
+            issue = IssueFactory(project=ProjectFactory(author=UserFactory()), author=user)
+            CommentFactory.create_batch(rows, issue=issue, author=user)
+
+        return grow
+
+    def test_signup_success(self, api_client, grow, assert_query_budget):
+        """Success: signing up does not depend on existing rows"""
+        url = reverse(f"{base_user_url}signup")
+
+        def send():
+            data = {"username": fake.unique.user_name(), "password": "Pass123!@#", "date_of_birth": "1990-01-01"}
+            return api_client.post(url, {**data, "consent": True}, format="json")
+
+        assert_query_budget(send, grow)
+
+    @pytest.mark.parametrize("method", ["get", "put", "patch"])
+    def test_profile_success(self, authenticated_client, grow, assert_query_budget, method):
+        """Success: reading and updating a profile runs as many queries for 1 or 20 comments of the user"""
+        url = reverse(f"{base_user_url}profile", kwargs={"user_id": authenticated_client.user.pk})
+
+        def send():
+            data = {"username": fake.unique.user_name(), "email": fake.email(), "password": "NewPass456!@#"}
+            data = {**data, "date_of_birth": "1995-05-20", "consent": True}
+            return getattr(authenticated_client, method)(url, None if method == "get" else data, format="json")
+
+        assert_query_budget(send, grow)
+
+    def test_delete_success(self, api_client, assert_query_budget):
+        """Success: deleting an account runs as many queries for 1 or 20 issues and comments of the user"""
+        author = UserFactory()
+        urls = []
+
+        def grow(rows):
+            user = create_users(1)[0]
+            project = ProjectFactory(author=author)
+            IssueFactory.create_batch(rows, project=project, author=user)
+            CommentFactory.create_batch(rows, issue=IssueFactory(project=project, author=author), author=user)
+            api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+            urls.append(reverse(f"{base_user_url}profile", kwargs={"user_id": user.pk}))
+
+        assert_query_budget(lambda: api_client.delete(urls[-1]), grow)
+
+    def test_gdpr_export_success(self, authenticated_client, grow, assert_query_budget):
+        """Success: starting the GDPR export stream runs as many queries for 1 or 20 comments of the user"""
+        url = reverse(f"{base_user_url}gdpr-export", kwargs={"user_id": authenticated_client.user.pk})
+
+        assert_query_budget(lambda: authenticated_client.get(url), grow)
+
+    def test_deletion_status_success(self, api_client, assert_query_budget):
+        """Success: reading a deletion status does not depend on the number of deletions"""
+        deletions = []
+
+        def grow(rows):
+            deletions.extend(AccountDeletion.objects.create(user_id=0) for _ in range(rows - len(deletions)))
+
+        assert_query_budget(
+            lambda: api_client.get(reverse(f"{base_user_url}deletion-status", kwargs={"deletion_id": deletions[0].pk})),
+            grow,
+        )
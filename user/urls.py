@@ -9,4 +9,5 @@ urlpatterns = [
     path("signup/", views.SignupView.as_view(), name="signup"),
     path("profile/<int:user_id>/", views.UserProfileView.as_view(), name="profile"),
     path("profile/<int:user_id>/export-data/", views.GDPRExportView.as_view(), name="gdpr-export"),
+    path("deletion/<uuid:deletion_id>/", views.AccountDeletionStatusView.as_view(), name="deletion-status"),
 ]
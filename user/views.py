@@ -1,18 +1,20 @@
-from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import OpenApiExample, OpenApiResponse, extend_schema, extend_schema_view
+from django.urls import reverse
+from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import CreateAPIView, RetrieveAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
 
-from config.docs import DocsTypingParameters
+from config.renderers import CSVRenderer
+from config.streaming import streaming_response
 
-from .models import User
+from .deletion import delete_user_account, request_account_deletion
+from .export import stream_gdpr_export
+from .models import AccountDeletion, User
 from .permissions import IsUserSelf
-from .renderers import CSVRenderer
-from .serializers import GDPRExportSerializer, UserSerializer
+from .serializers import AccountDeletionSerializer, GDPRExportSerializer, UserSerializer
 
 
-@extend_schema(summary="Create a user account", tags=["User"])
 class SignupView(CreateAPIView):
     """
     Represents a view for handling user signup operations in order to create a new account.
@@ -26,38 +28,9 @@ class SignupView(CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [AllowAny]
+    query_budgets = {"post": 3}
 
 
-@extend_schema_view(
-    get=extend_schema(
-        summary="Get user profile",
-        tags=["User"],
-        parameters=[
-            DocsTypingParameters.user_id.value,
-        ],
-    ),
-    put=extend_schema(
-        summary="Update entirely user's profile",
-        tags=["User"],
-        parameters=[
-            DocsTypingParameters.user_id.value,
-        ],
-    ),
-    patch=extend_schema(
-        summary="Update one or many user's profile fields",
-        tags=["User"],
-        parameters=[
-            DocsTypingParameters.user_id.value,
-        ],
-    ),
-    delete=extend_schema(
-        summary="Delete user's account",
-        tags=["User"],
-        parameters=[
-            DocsTypingParameters.user_id.value,
-        ],
-    ),
-)
 class UserProfileView(RetrieveUpdateDestroyAPIView):
     """
     Represents the user profile view for interacting with authenticated user data.
@@ -68,6 +41,7 @@ class UserProfileView(RetrieveUpdateDestroyAPIView):
      <br>DELETE a User object in DB.
     <br>
     <br>Returns a `200` response code on success.
+    <br>Returns a `202` response code on DELETE with `?background=true`, with the deletion status URL in `Location`.
     <br>Raises a `400` error code if the request body is not valid.
     <br>Raises a `403` error code if the user is not authenticated.
     <br>Raises a `403` error code if the user is not the owner of the profile manipulated.
@@ -81,51 +55,73 @@ class UserProfileView(RetrieveUpdateDestroyAPIView):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated, IsUserSelf]
     lookup_url_kwarg = "user_id"
+    query_budgets = {"get": 2, "put": 4, "patch": 4, "delete": 41}
 
-    def perform_destroy(self, instance: "User"):
-        # delete() handles the HTTP request/response logic,
-        # while perform_destroy() is specifically meant for the database deletion logic.
+    def destroy(self, request, *args, **kwargs):
+        instance = self.get_object()
+        if request.query_params.get("background", "").lower() not in ("true", "1"):
+            self.perform_destroy(instance)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        self.check_no_active_project(instance)
+        deletion = request_account_deletion(instance)
+        status_url = request.build_absolute_uri(reverse("user:deletion-status", kwargs={"deletion_id": deletion.pk}))
+        return Response(
+            AccountDeletionSerializer(deletion).data, status=status.HTTP_202_ACCEPTED, headers={"Location": status_url}
+        )
+
+    @staticmethod
+    def check_no_active_project(instance: "User"):
         if instance.projects.exists():
             raise ValidationError(
                 "You cannot delete your account while you are the author of active projects."
                 "Please transfer ownership of your projects first."
             )
-        instance.delete()
-
-
-@extend_schema(
-    summary="Export user's personal data (GDPR)",
-    description="Returns all personal data associated with the user account in JSON format. "
-    "<br>Returns a `200` response code on success."
-    "<br>Raises a `403` error code if the user is not authenticated."
-    "<br>Raises a `403` error code if the user tries to access another user's data."
-    "<br>"
-    "<br>**Authentification required**: Yes"
-    "<br>**Permissions required**: `IsAuthenticated`, `IsUserSelf`",
-    tags=["User"],
-    responses={
-        200: OpenApiResponse(
-            response=OpenApiTypes.BINARY,
-            description="CSV file containing user's personal data",
-            examples=[
-                OpenApiExample(
-                    name="GDPR CSV Export",
-                    value="username,email,date_of_birth,consent,age,id,first_name,last_name,date_joined,last_login\n"
-                    "john_doe,john@example.com,1990-01-15,true,36,1,John,Doe,2024-01-01T10:00:00Z,2026-01-09T08:00:00Z",
-                    media_type="text/csv",
-                )
-            ],
-        )
-    },
-)
+
+    def perform_destroy(self, instance: "User"):
+        # delete() handles the HTTP request/response logic,
+        # while perform_destroy() is specifically meant for the database deletion logic.
+        self.check_no_active_project(instance)
+        # nulls authorship with set-based UPDATEs instead of letting instance.delete() do it row by row
+        delete_user_account(instance.pk)
+
+
+class AccountDeletionStatusView(RetrieveAPIView):
+    """
+    Represents the status of an account deletion run in background.
+    <br>Returns a `200` response code on success.
+    <br>Raises a `404` error code if the deletion is not found.
+    <br>
+    <br>**Authentification required**: No, the account may not exist anymore (deletion id is a random UUID)
+    <br>**Permissions required**: None
+    """
+
+    queryset = AccountDeletion.objects.all()
+    serializer_class = AccountDeletionSerializer
+    # a token of the deleted account must not make the request fail
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    lookup_url_kwarg = "deletion_id"
+    query_budgets = {"get": 1}
+
+
 class GDPRExportView(RetrieveAPIView):
     """
     Endpoint for GDPR-compliant data export.
-    Allows users to download all their personal data.
+    Allows users to download all their personal data: profile, projects, memberships, issues and comments
+    (archived ones included), as a multi-section CSV streamed while it is read from the DB.
     """
 
     queryset = User.objects.all()
     serializer_class = GDPRExportSerializer
     permission_classes = [IsAuthenticated, IsUserSelf]
+    query_budgets = {"get": 2}
+    # renders errors, the export itself is streamed
     renderer_classes = [CSVRenderer]
     lookup_url_kwarg = "user_id"
+
+    def retrieve(self, request, *args, **kwargs):
+        user = self.get_object()
+        response = streaming_response(request, stream_gdpr_export(user), content_type="text/csv; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="gdpr-export-{user.pk}.csv"'
+        return response